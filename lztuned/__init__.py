@@ -0,0 +1,41 @@
+"""LZTuned Architect Pro - nucleul de analiză (headless, fără Streamlit)"""
+from .engines import (
+    ChannelDetectionEngine,
+    OperatingModeEngine,
+    FuelAnalysisEngine,
+    IgnitionAnalysisEngine,
+    ThermalStressEngine,
+    ElectricalHealthEngine,
+    AnomalyDetectionEngine,
+    CorrelationEngine,
+    CellMapEngine,
+    PullAnalysisEngine,
+    PredictiveRiskEngine,
+    DEFAULT_THRESHOLDS,
+    threshold_profile,
+)
+from .cache import ResultCache, content_hash, file_hash
+from .channels import ChannelMatcher, ChannelProfiles, channel_profiles, header_issues
+from .compact import CompactLog, PackedMasks
+from .readers import LOG_READERS, LogReader, MLGReader, log_reader, reader_for
+from .sources import ArchiveMember, archive_members, open_log, sniff_dialect
+from .store import ColumnStore, STORE_VERSION
+from .intervals import IntervalIndex
+from .timebase import Timebase, ChunkTime, resample_uniform
+from .signals import DERIVED_SIGNALS, SignalStore, derived_signal
+from .profiling import StageProfiler, profiled
+from .pipeline import (
+    DEFAULT_OPTIONS,
+    load_log,
+    load_channels,
+    load_full_table,
+    iter_chunks,
+    source_hash,
+    analyze_log,
+    analyze_dataframe,
+    analyze_chunks,
+    rescore,
+)
+from .windows import WindowIndex
+
+__version__ = "1.0.0"
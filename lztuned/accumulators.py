@@ -0,0 +1,999 @@
+"""Agregate incrementale (running) folosite de engine-uri pe chunk-uri"""
+import warnings
+
+import numpy as np
+
+from .xcorr import lagged_sums
+
+def _as_float(values):
+    return np.asarray(values, dtype=np.float64)
+
+def as_float_array(values):
+    """ndarray float care păstrează precizia coloanei (float32 rămâne float32)
+
+    Pragurile (ex. knock > 1.2) se compară astfel în precizia datelor:
+    float32(1.2) nu trebuie să devină „peste” 1.2 după conversia la float64.
+    """
+    to_numpy = getattr(values, 'to_numpy', None)
+    if to_numpy is None:
+        arr = np.asarray(values)
+        return arr if arr.dtype.kind == 'f' else arr.astype(np.float64)
+    dtype = values.dtype if isinstance(values.dtype, np.dtype) and values.dtype.kind == 'f' else np.float64
+    return to_numpy(dtype=dtype, na_value=np.nan)
+
+# ======================================================
+# RUNNING STATISTICS
+# ======================================================
+class RunningStats:
+    """count / mean / var / min / max pe valorile non-null, combinabile
+
+    Folosește formula de combinare Chan et al., stabilă numeric, astfel
+    încât rezultatul pe chunk-uri este identic cu cel pe tot semnalul.
+    """
+
+    __slots__ = ('n', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+
+    def update(self, values):
+        arr = _as_float(values)
+        arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return self
+        mean = arr.mean()
+        self._combine(arr.size, mean, float(((arr - mean) ** 2).sum()), arr.min(), arr.max())
+        return self
+
+    def merge(self, other):
+        if other.n:
+            self._combine(other.n, other.mean, other.m2, other.min, other.max)
+        return self
+
+    def _combine(self, n_b, mean_b, m2_b, min_b, max_b):
+        if self.n == 0:
+            self.n, self.mean, self.m2 = int(n_b), float(mean_b), float(m2_b)
+            self.min, self.max = float(min_b), float(max_b)
+            return
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * self.n * n_b / n
+        self.n = n
+        self.min = min(self.min, float(min_b))
+        self.max = max(self.max, float(max_b))
+
+    @property
+    def sum(self):
+        return self.mean * self.n
+
+    @property
+    def var(self):
+        """Varianță de eșantion (ddof=1), ca pandas"""
+        return self.m2 / (self.n - 1) if self.n > 1 else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.var) if self.n > 1 else np.nan
+
+    @property
+    def avg(self):
+        return self.mean if self.n else np.nan
+
+    @property
+    def is_constant(self):
+        """Echivalentul lui std() == 0 (cel puțin 2 valori, toate egale)"""
+        return self.n > 1 and self.min == self.max
+
+# ======================================================
+# RUNNING CORRELATION / REGRESSION
+# ======================================================
+class RunningCorr:
+    """Produse încrucișate pentru corelație Pearson și regresie liniară
+
+    Ține doar perechile complete (ambele valori non-null), ca Series.corr;
+    `rows` numără toate perechile văzute pentru compatibilitate cu linregress.
+    """
+
+    __slots__ = ('n', 'rows', 'mean_x', 'mean_y', 'm2x', 'm2y', 'cxy')
+
+    def __init__(self):
+        self.n = 0
+        self.rows = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2x = 0.0
+        self.m2y = 0.0
+        self.cxy = 0.0
+
+    def update(self, x, y):
+        x = _as_float(x)
+        y = _as_float(y)
+        self.rows += x.size
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x = x[valid]
+        y = y[valid]
+        if x.size == 0:
+            return self
+        mx = x.mean()
+        my = y.mean()
+        dx = x - mx
+        dy = y - my
+        self._combine(x.size, 0, mx, my, float((dx * dx).sum()), float((dy * dy).sum()), float((dx * dy).sum()))
+        return self
+
+    def merge(self, other):
+        self._combine(other.n, other.rows, other.mean_x, other.mean_y, other.m2x, other.m2y, other.cxy)
+        return self
+
+    def _combine(self, n_b, rows_b, mx_b, my_b, m2x_b, m2y_b, cxy_b):
+        self.rows += rows_b
+        if n_b == 0:
+            return
+        if self.n == 0:
+            self.n = int(n_b)
+            self.mean_x, self.mean_y = float(mx_b), float(my_b)
+            self.m2x, self.m2y, self.cxy = m2x_b, m2y_b, cxy_b
+            return
+        n = self.n + n_b
+        dx = mx_b - self.mean_x
+        dy = my_b - self.mean_y
+        f = self.n * n_b / n
+        self.mean_x += dx * n_b / n
+        self.mean_y += dy * n_b / n
+        self.m2x += m2x_b + dx * dx * f
+        self.m2y += m2y_b + dy * dy * f
+        self.cxy += cxy_b + dx * dy * f
+        self.n = n
+
+    @property
+    def corr(self):
+        """Corelația Pearson pe perechile complete (NaN dacă e nedefinită)"""
+        if self.n < 2 or self.m2x == 0 or self.m2y == 0:
+            return np.nan
+        return float(np.clip(self.cxy / np.sqrt(self.m2x * self.m2y), -1.0, 1.0))
+
+    @property
+    def r_value(self):
+        """r ca în scipy.stats.linregress (NaN dacă au existat valori lipsă)"""
+        if self.n != self.rows or self.n < 2:
+            return np.nan
+        if self.m2x == 0 or self.m2y == 0:
+            return 0.0
+        return float(np.clip(self.cxy / np.sqrt(self.m2x * self.m2y), -1.0, 1.0))
+
+    @property
+    def slope(self):
+        return self.cxy / self.m2x if self.m2x else np.nan
+
+    @property
+    def intercept(self):
+        return self.mean_y - self.slope * self.mean_x
+
+class RunningCorrMatrix:
+    """Matricea de corelație Pearson între k canale, pe perechile complete (ca DataFrame.corr)
+
+    Sumele per pereche vin din produse matriceale pe chunk: XᵀX pentru
+    rândurile complete, plus XᵀM, (X²)ᵀM și MᵀM pentru rândurile cu valori
+    lipsă (puse pe 0; M e masca valorilor prezente). Valorile sunt deplasate
+    cu o referință per canal (prima valoare văzută), ca sumele să nu piardă
+    precizie; merge() aduce sumele celeilalte partiții la aceeași referință.
+    """
+
+    __slots__ = ('shift', 'n', 'sx', 'sxx', 'sxy')
+
+    def __init__(self, k):
+        self.shift = None
+        self.n = np.zeros((k, k))
+        self.sx = np.zeros((k, k))
+        self.sxx = np.zeros((k, k))
+        self.sxy = np.zeros((k, k))
+
+    def update(self, values):
+        """Adaugă rândurile unui array (rânduri × k)"""
+        values = np.asarray(values)
+        if values.shape[0] == 0:
+            return self
+        if self.shift is None:
+            self.shift = self._reference(_as_float(values))
+        x = np.subtract(values, self.shift, dtype=np.float64)
+        incomplete = np.isnan(x.sum(axis=1))
+        if incomplete.any():
+            # Doar rândurile cu valori lipsă trec prin produsele cu masca
+            self._update_masked(x[incomplete])
+            x = x[~incomplete]
+        gram = x.T @ x
+        self.n += x.shape[0]
+        self.sx += x.sum(axis=0)[:, None]
+        self.sxx += np.diag(gram)[:, None]
+        self.sxy += gram
+        return self
+
+    def _update_masked(self, x):
+        valid = ~np.isnan(x)
+        mask = valid.astype(np.float64)
+        x[~valid] = 0.0
+        self.n += mask.T @ mask
+        self.sx += x.T @ mask
+        self.sxx += (x * x).T @ mask
+        self.sxy += x.T @ x
+
+    @staticmethod
+    def _reference(x):
+        """Prima valoare validă a fiecărui canal (0 pentru canalele fără valori)"""
+        valid = ~np.isnan(x)
+        first = x[valid.argmax(axis=0), np.arange(x.shape[1])]
+        return np.where(valid.any(axis=0), first, 0.0)
+
+    def merge(self, other):
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.shift = other.shift
+            self.n, self.sx, self.sxx, self.sxy = other.n.copy(), other.sx.copy(), other.sxx.copy(), other.sxy.copy()
+            return self
+        # Valorile celeilalte partiții față de referința lui self: x + d
+        d = other.shift - self.shift
+        self.sxx += other.sxx + 2 * d[:, None] * other.sx + (d * d)[:, None] * other.n
+        self.sxy += other.sxy + d[:, None] * other.sx.T + d[None, :] * other.sx + np.outer(d, d) * other.n
+        self.sx += other.sx + d[:, None] * other.n
+        self.n += other.n
+        return self
+
+    @property
+    def corr(self):
+        """Matricea k × k (NaN unde perechea are sub 2 valori sau varianță zero)"""
+        n = self.n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var = n * self.sxx - self.sx * self.sx
+            r = (n * self.sxy - self.sx * self.sx.T) / np.sqrt(var * var.T)
+        defined = (n >= 2) & (var > 0) & (var.T > 0)
+        r = np.where(defined, np.clip(r, -1.0, 1.0), np.nan)
+        np.fill_diagonal(r, np.where(np.diag(defined), 1.0, np.nan))
+        return r
+
+# ======================================================
+# CHUNK-BOUNDARY STATE
+# ======================================================
+class RunningDiff:
+    """Series.diff() care continuă peste granițele dintre chunk-uri
+
+    Cu skipna=True ignoră valorile lipsă (echivalent cu dropna().diff()).
+    Păstrează prima și ultima valoare, astfel încât două partiții procesate
+    separat pot fi unite cu merge(), care întoarce diferența de la graniță.
+    """
+
+    __slots__ = ('skipna', 'first', 'last')
+
+    def __init__(self, skipna=False):
+        self.skipna = skipna
+        self.first = None
+        self.last = None
+
+    def update(self, values):
+        arr = _as_float(values)
+        if self.skipna:
+            arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return arr
+        prev = np.nan if self.last is None else self.last
+        diffs = np.diff(arr, prepend=prev)
+        if self.first is None:
+            self.first = arr[0]
+        self.last = arr[-1]
+        return diffs
+
+    def merge(self, other):
+        """Continuă cu partiția următoare; întoarce diferența de la graniță (NaN dacă lipsește)"""
+        if other.first is None:
+            return np.nan
+        boundary = np.nan if self.last is None else other.first - self.last
+        if self.first is None:
+            self.first = other.first
+        self.last = other.last
+        return boundary
+
+class RisingEdgeCounter:
+    """Numără tranzițiile False → True ale unei măști, peste chunk-uri"""
+
+    __slots__ = ('count', 'first', 'last')
+
+    def __init__(self):
+        self.count = 0
+        self.first = None
+        self.last = None
+
+    def update(self, mask):
+        mask = np.asarray(mask, dtype=bool)
+        if mask.size == 0:
+            return self
+        rising = int(np.count_nonzero(mask[1:] & ~mask[:-1]))
+        if self.last is not None and not self.last and mask[0]:
+            rising += 1
+        self.count += rising
+        if self.first is None:
+            self.first = bool(mask[0])
+        self.last = bool(mask[-1])
+        return self
+
+    def merge(self, other):
+        """Adaugă partiția următoare, inclusiv tranziția de la graniță"""
+        if other.first is None:
+            return self
+        if self.last is not None and not self.last and other.first:
+            self.count += 1
+        self.count += other.count
+        if self.first is None:
+            self.first = other.first
+        self.last = other.last
+        return self
+
+# ======================================================
+# LAGGED CROSS-CORRELATION
+# ======================================================
+class RunningXcorr:
+    """Corelația încrucișată x → y pentru decalajele -max_lag..max_lag, pe chunk-uri
+
+    Sumele decalate (xcorr.lagged_sums) se adaugă pe loturi de cel puțin
+    BATCH rânduri: fiecare lot se corelează împreună cu ultimele max_lag
+    rânduri dinainte, minus perechile aflate numai în acestea, deci fiecare
+    pereche (t, t + k) e numărată o dată. Mediile și normele întregului
+    semnal (RunningStats) intră abia în xcorr(), ca în xcorr.xcorr pe logul
+    întreg: rezultatul nu depinde de chunk-uri. Partițiile se combină
+    adăugând perechile dintre coada uneia și începutul celeilalte.
+    """
+
+    __slots__ = ('max_lag', 'rows', 'stats', 'sums', 'head', 'tail', '_pending')
+
+    BATCH = 1 << 16
+
+    def __init__(self, max_lag):
+        self.max_lag = int(max_lag)
+        self.rows = 0
+        self.stats = (RunningStats(), RunningStats())
+        self.sums = np.zeros((4, 2 * self.max_lag + 1))
+        # Primele / ultimele max_lag rânduri (x, y), pentru merge
+        self.head = np.zeros((2, 0))
+        self.tail = np.zeros((2, 0))
+        self._pending = []
+
+    def update(self, x, y):
+        pair = np.vstack([_as_float(x), _as_float(y)])
+        if pair.shape[1] == 0:
+            return self
+        self.rows += pair.shape[1]
+        self.stats[0].update(pair[0])
+        self.stats[1].update(pair[1])
+        if self.head.shape[1] < self.max_lag:
+            self.head = np.concatenate([self.head, pair[:, :self.max_lag - self.head.shape[1]]], axis=1)
+        self._pending.append(pair)
+        if sum(part.shape[1] for part in self._pending) >= self.BATCH:
+            self._flush()
+        return self
+
+    def _flush(self):
+        if not self._pending:
+            return
+        pending = np.concatenate(self._pending, axis=1)
+        self._pending = []
+        step = max(self.BATCH, 4 * self.max_lag)
+        for start in range(0, pending.shape[1], step):
+            window = np.concatenate([self.tail, pending[:, start:start + step]], axis=1)
+            self.sums += self._cross(self.tail, window)
+            self.tail = window[:, max(0, window.shape[1] - self.max_lag):]
+
+    def _cross(self, before, window):
+        """Sumele perechilor din `window` care nu sunt toate în `before` (prefixul lui)"""
+        sums = lagged_sums(window[0], window[1], self.max_lag)
+        if before.shape[1]:
+            sums -= lagged_sums(before[0], before[1], self.max_lag)
+        return sums
+
+    def merge(self, other):
+        if other.max_lag != self.max_lag:
+            raise ValueError("Corelațiile combinate trebuie să aibă același decalaj maxim")
+        self._flush()
+        other._flush()
+        if other.rows == 0:
+            return self
+        # Perechile dintre coada acestei părți și începutul celeilalte
+        joined = np.concatenate([self.tail, other.head], axis=1)
+        self.sums += other.sums + self._cross(self.tail, joined)
+        if other.head.shape[1]:
+            self.sums -= lagged_sums(other.head[0], other.head[1], self.max_lag)
+        self.rows += other.rows
+        self.stats[0].merge(other.stats[0])
+        self.stats[1].merge(other.stats[1])
+        self.head = np.concatenate([self.head, other.head], axis=1)[:, :self.max_lag]
+        tail = np.concatenate([self.tail, other.tail], axis=1)
+        self.tail = tail[:, max(0, tail.shape[1] - self.max_lag):]
+        return self
+
+    def xcorr(self):
+        """(decalaje, r) ca xcorr.xcorr pe tot semnalul: r[k] = corr(x[t], y[t + k])"""
+        self._flush()
+        max_lag = max(0, min(self.max_lag, self.rows - 1))
+        lags = np.arange(-max_lag, max_lag + 1)
+        sx, sy = self.stats
+        norm = np.sqrt(sx.m2 * sy.m2)
+        if self.rows == 0 or norm == 0:
+            return lags, np.full(lags.size, np.nan)
+        xy, x_vy, vx_y, vx_vy = self.sums[:, self.max_lag - max_lag:self.max_lag + max_lag + 1]
+        # Centrare cu mediile finale: Σ (x - mx)(y - my) pe perechile valide
+        return lags, (xy - sy.mean * x_vy - sx.mean * vx_y + sx.mean * sy.mean * vx_vy) / norm
+
+# ======================================================
+# CHANNEL STATISTICS
+# ======================================================
+class ChannelStats:
+    """Statistici per canal pentru toate canalele deodată, într-o singură trecere
+
+    Canalele unui chunk formează o matrice 2-D (canale × eșantioane) redusă
+    vectorizat pe rânduri: null-uri, count / mean / var / min / max (combinare
+    Chan, ca RunningStats), valori consecutive identice (ignorând null-urile,
+    pentru flatline) și o histogramă cu BINS bucket-uri fixe, calibrate din
+    primele eșantioane, din care se estimează cuantilele. Totul se poate
+    combina cu merge(), deci rezultatul nu depinde de împărțirea în chunk-uri.
+    """
+
+    BINS = 256
+    CALIBRATION_SAMPLES = 4096
+    # Felii de rânduri: memoria matricei 2-D e limitată și pentru un DataFrame întreg
+    SLICE_ROWS = 1 << 16
+
+    def __init__(self, channels):
+        self.channels = dict(channels)
+        self.names = list(self.channels)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        k = len(self.names)
+        self.rows = 0
+        self.nulls = np.zeros(k, dtype=np.int64)
+        self.n = np.zeros(k, dtype=np.int64)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.min = np.full(k, np.nan)
+        self.max = np.full(k, np.nan)
+        self.same = np.zeros(k, dtype=np.int64)
+        # Prima și ultima valoare validă, pentru valorile identice peste granițe
+        self.first = np.full(k, np.nan)
+        self.last = np.full(k, np.nan)
+        self.edges = None
+        self.hist = np.zeros((k, self.BINS + 2), dtype=np.int64)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __getitem__(self, name):
+        """RunningStats pentru un canal (vedere la momentul apelului)"""
+        i = self._index[name]
+        stats = RunningStats()
+        if self.n[i]:
+            stats._combine(self.n[i], self.mean[i], self.m2[i], self.min[i], self.max[i])
+        return stats
+
+    def null_count(self, name):
+        return int(self.nulls[self._index[name]])
+
+    def repeat_count(self, name):
+        """Eșantioane valide egale cu valoarea validă anterioară"""
+        return int(self.same[self._index[name]])
+
+    def matrix(self, chunk):
+        """Canalele din chunk ca matrice float64 (canale × eșantioane)"""
+        return np.vstack([as_float_array(chunk[col]).astype(np.float64)
+                          for col in self.channels.values()])
+
+    def calibrate(self, head):
+        """Marginile histogramei din primele eșantioane (DataFrame sau matrice)"""
+        if not isinstance(head, np.ndarray):
+            head = head.iloc[:self.CALIBRATION_SAMPLES]
+            head = self.matrix(head) if self.names and len(head) else np.empty((len(self.names), 0))
+        head = head[:, :self.CALIBRATION_SAMPLES]
+        lo = np.zeros(len(self.names))
+        hi = np.zeros(len(self.names))
+        if head.shape[1]:
+            with warnings.catch_warnings():
+                # Canal fără date în head: interval implicit în jurul lui 0
+                warnings.simplefilter('ignore', RuntimeWarning)
+                lo = np.nan_to_num(np.nanmin(head, axis=1))
+                hi = np.nan_to_num(np.nanmax(head, axis=1))
+        flat = hi <= lo
+        lo, hi = np.where(flat, lo - 0.5, lo), np.where(flat, hi + 0.5, hi)
+        self.edges = lo[:, None] + (hi - lo)[:, None] * np.linspace(0.0, 1.0, self.BINS + 1)
+        return self
+
+    def update(self, chunk):
+        if not self.names:
+            return self
+        if self.edges is None and len(chunk):
+            self.calibrate(chunk)
+        for start in range(0, len(chunk), self.SLICE_ROWS):
+            self._update(self.matrix(chunk.iloc[start:start + self.SLICE_ROWS]))
+        return self
+
+    def _update(self, m):
+        k, n = m.shape
+        rows = np.arange(k)
+        valid = ~np.isnan(m)
+        dense = valid.all()
+        count = np.full(k, n) if dense else valid.sum(axis=1)
+        self.rows += n
+        self.nulls += n - count
+
+        if dense:
+            # Cazul obișnuit (fără null-uri): reduceri directe, fără măști
+            mean = m.mean(axis=1)
+            dev = m - mean[:, None]
+            self._combine(count, mean, np.einsum('ij,ij->i', dev, dev), m.min(axis=1), m.max(axis=1))
+            self.same += (m[:, 1:] == m[:, :-1]).sum(axis=1) + (m[:, 0] == self.last)
+            self.first = np.where(np.isnan(self.first), m[:, 0], self.first)
+            self.last = m[:, -1].copy()
+        else:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean = np.where(valid, m, 0.0).sum(axis=1) / count
+            dev = np.where(valid, m - mean[:, None], 0.0)
+            self._combine(count, mean, np.einsum('ij,ij->i', dev, dev),
+                          np.where(valid, m, np.inf).min(axis=1), np.where(valid, m, -np.inf).max(axis=1))
+
+            # Valori identice cu ultima valoare validă (null-urile sunt sărite, ca dropna().diff())
+            ext = np.concatenate([self.last[:, None], m], axis=1)
+            pos = np.where(np.concatenate([~np.isnan(self.last)[:, None], valid], axis=1),
+                           np.arange(n + 1), 0)
+            pos = np.maximum.accumulate(pos, axis=1)
+            self.same += (m == ext[rows[:, None], pos[:, :-1]]).sum(axis=1)
+            start = np.isnan(self.first) & (count > 0)
+            self.first[start] = m[rows[start], valid[start].argmax(axis=1)]
+            self.last = ext[rows, pos[:, -1]]
+
+        # Histogramă: bucket-ul 0 = sub interval, BINS + 1 = peste interval
+        # (după clip la [-1, BINS] și +1 valorile sunt ≥ 0, deci astype = floor)
+        lo = self.edges[:, :1]
+        scale = self.BINS / (self.edges[:, -1:] - lo)
+        codes = (m - lo) * scale
+        np.clip(codes, -1, self.BINS, out=codes)
+        codes += rows[:, None] * (self.BINS + 2) + 1
+        codes = codes.astype(np.int64) if dense else codes[valid].astype(np.int64)
+        self.hist += np.bincount(codes.ravel(), minlength=self.hist.size).reshape(self.hist.shape)
+
+    def merge(self, other):
+        """Adaugă statisticile partiției următoare (calibrată din același head)"""
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self._combine(other.n, other.mean, other.m2,
+                      np.where(other.n > 0, other.min, np.inf), np.where(other.n > 0, other.max, -np.inf))
+        self.same += other.same + (other.first == self.last)
+        self.first = np.where(np.isnan(self.first), other.first, self.first)
+        self.last = np.where(np.isnan(other.last), self.last, other.last)
+        if self.edges is None:
+            self.edges = other.edges
+        elif other.edges is not None and not np.array_equal(self.edges, other.edges):
+            raise ValueError("Partițiile trebuie calibrate din același head (histograme diferite)")
+        self.hist += other.hist
+        return self
+
+    def _combine(self, n_b, mean_b, m2_b, min_b, max_b):
+        has = n_b > 0
+        n = self.n + n_b
+        with np.errstate(divide='ignore', invalid='ignore'):
+            w = np.where(has, n_b / n, 0.0)
+            delta = np.where(has, mean_b - self.mean, 0.0)
+            self.mean = self.mean + delta * w
+            self.m2 = self.m2 + np.where(has, m2_b, 0.0) + delta * delta * self.n * w
+        self.min = np.where(has, np.fmin(self.min, min_b), self.min)
+        self.max = np.where(has, np.fmax(self.max, max_b), self.max)
+        self.n = n
+
+    def quantile(self, name, q):
+        """Cuantila `q` estimată din histogramă (interpolare liniară în bucket)"""
+        i = self._index[name]
+        if not self.n[i]:
+            return np.nan
+        edges = np.concatenate([[min(self.min[i], self.edges[i, 0])], self.edges[i],
+                                [max(self.max[i], self.edges[i, -1])]])
+        cum = np.concatenate([[0], np.cumsum(self.hist[i])])
+        value = float(np.interp(q * self.n[i], cum, edges))
+        return min(max(value, self.min[i]), self.max[i])
+
+    def summary(self):
+        """Rezumat JSON-friendly per canal"""
+        out = {}
+        for name in self.names:
+            stats = self[name]
+            out[name] = {
+                'min': round(stats.min, 3) if stats.n else None,
+                'max': round(stats.max, 3) if stats.n else None,
+                'mean': round(stats.avg, 3) if stats.n else None,
+                'std': round(float(stats.std), 3) if stats.n > 1 else None,
+                'p5': round(self.quantile(name, 0.05), 3) if stats.n else None,
+                'p50': round(self.quantile(name, 0.50), 3) if stats.n else None,
+                'p95': round(self.quantile(name, 0.95), 3) if stats.n else None,
+                'nulls': self.null_count(name),
+            }
+        return out
+
+# ======================================================
+# CELL STATISTICS (RPM × LOAD MAPS)
+# ======================================================
+def add_bincount(target, index, weights=None):
+    """target[i] += numărul (sau suma `weights`) eșantioanelor cu indexul i
+
+    Fără minlength: np.bincount alocă doar până la cel mai mare index prezent,
+    nu câte un contor pentru fiecare celulă a hărții.
+    """
+    counts = np.bincount(index, weights)
+    target[:counts.size] += counts.astype(target.dtype, copy=False)
+    return target
+
+class CellStats:
+    """Statisticile unui semnal pe celulele unei hărți, acumulate vectorizat
+
+    Eșantioanele vin cu indexul celulei lor; count, suma și histograma se
+    reduc cu np.bincount, min / max cu np.minimum.at / np.maximum.at, fără
+    bucle per celulă. Histograma are BINS bucket-uri fixe pe [lo, hi] (plus
+    câte unul sub și peste interval), din care se estimează cuantilele; cu
+    intervalul fix, partițiile se combină cu merge() fără calibrare.
+    """
+
+    BINS = 64
+
+    def __init__(self, cells, lo, hi):
+        self.cells = cells
+        self.lo = float(lo)
+        self.hi = float(hi)
+        self.sum = np.zeros(cells)
+        self.min = np.full(cells, np.inf)
+        self.max = np.full(cells, -np.inf)
+        # Bucket-ul 0 = sub lo, BINS + 1 = peste hi; suma pe rând este count-ul celulei
+        self.hist = np.zeros((cells, self.BINS + 2), dtype=np.int64)
+
+    @property
+    def count(self):
+        return self.hist.sum(axis=1)
+
+    def update(self, cell, values, offsets=None):
+        """Adaugă eșantioanele `values` din celulele `cell` (intp)
+
+        `offsets` = cell * (BINS + 2), dacă apelantul îl are deja (aceleași
+        celule pentru mai multe semnale). Histograma se calculează în
+        precizia valorilor (float32 rămâne float32, de 2× mai rapid).
+        """
+        valid = ~np.isnan(values)
+        if not valid.all():
+            cell, values = cell[valid], values[valid]
+            offsets = None
+        if not values.size:
+            return self
+        add_bincount(self.sum, cell, values)
+        # ufunc.at are cale rapidă doar pentru același dtype ca acumulatorul
+        exact = values.astype(np.float64, copy=False)
+        np.minimum.at(self.min, cell, exact)
+        np.maximum.at(self.max, cell, exact)
+        # După clip la [-1, BINS] și +1 valorile sunt ≥ 0, deci astype = floor
+        codes = values - self.lo
+        codes *= self.BINS / (self.hi - self.lo)
+        np.clip(codes, -1, self.BINS, out=codes)
+        codes += 1
+        codes = codes.astype(np.intp)
+        codes += cell * (self.BINS + 2) if offsets is None else offsets
+        add_bincount(self.hist.reshape(-1), codes)
+        return self
+
+    def merge(self, other):
+        if (self.cells, self.lo, self.hi) != (other.cells, other.lo, other.hi):
+            raise ValueError("Hărțile combinate trebuie să aibă aceleași celule și același interval")
+        self.sum += other.sum
+        np.minimum(self.min, other.min, out=self.min)
+        np.maximum(self.max, other.max, out=self.max)
+        self.hist += other.hist
+        return self
+
+    def regroup(self, index, cells):
+        """Statisticile unite pe `cells` celule; celula i devine celula index[i]"""
+        out = CellStats(cells, self.lo, self.hi)
+        np.add.at(out.sum, index, self.sum)
+        np.minimum.at(out.min, index, self.min)
+        np.maximum.at(out.max, index, self.max)
+        np.add.at(out.hist, index, self.hist)
+        return out
+
+    def mean(self):
+        """Media per celulă (NaN pentru celulele goale)"""
+        count = self.count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(count > 0, self.sum / count, np.nan)
+
+    def extremes(self):
+        """(min, max) per celulă, NaN pentru celulele goale"""
+        empty = self.count == 0
+        return np.where(empty, np.nan, self.min), np.where(empty, np.nan, self.max)
+
+    def quantile(self, q):
+        """Cuantila `q` per celulă, din histogramă (interpolare liniară în bucket)"""
+        count = self.count
+        inner = np.linspace(self.lo, self.hi, self.BINS + 1)
+        out = np.full(self.cells, np.nan)
+        for i in np.flatnonzero(count):
+            edges = np.concatenate([[min(self.min[i], self.lo)], inner, [max(self.max[i], self.hi)]])
+            cum = np.concatenate([[0], np.cumsum(self.hist[i])])
+            value = float(np.interp(q * count[i], cum, edges))
+            out[i] = min(max(value, self.min[i]), self.max[i])
+        return out
+
+# ======================================================
+# SEGMENT STATISTICS (PER-INTERVAL SUMMARIES)
+# ======================================================
+class SegmentStats:
+    """count / sum / min / max / prima / ultima valoare per segment contiguu [start, end)
+
+    Segmentele sunt felii ale aceluiași semnal (ex. tracțiunile WOT); fiecare
+    statistică se reduce cu ufunc.reduceat pe felii, fără gather după mască.
+    Un segment deschis la finalul unui chunk continuă în chunk-ul următor
+    cu concat(join=True); segmentele vecine se unesc cu regroup().
+    """
+
+    __slots__ = ('n', 'sum', 'min', 'max', 'first', 'last')
+
+    def __init__(self, segments=0):
+        self.n = np.zeros(segments, dtype=np.int64)
+        self.sum = np.zeros(segments)
+        self.min = np.full(segments, np.nan)
+        self.max = np.full(segments, np.nan)
+        self.first = np.full(segments, np.nan)
+        self.last = np.full(segments, np.nan)
+
+    @classmethod
+    def from_slices(cls, values, starts, ends):
+        """Statisticile feliilor values[starts[i]:ends[i]] (segmente nevide, sortate, disjuncte)
+
+        Doar rândurile din segmente sunt copiate (felii contigue), apoi
+        reduse cu reduceat. Fără semnal (`values` None) segmentele rămân goale (NaN).
+        """
+        out = cls(len(starts))
+        if values is None or not len(starts):
+            return out
+        values, starts, ends = np.asarray(values), np.asarray(starts), np.asarray(ends)
+        arr = np.concatenate([values[start:end] for start, end in zip(starts.tolist(), ends.tolist())])
+        bounds = np.concatenate(([0], np.cumsum(ends - starts)[:-1]))
+        # Măștile (ex. knock > prag) nu au valori lipsă; suma lor este numărul de eșantioane True
+        valid = ~np.isnan(arr) if arr.dtype.kind == 'f' else np.ones(arr.size, dtype=bool)
+        out.n = np.add.reduceat(valid, bounds, dtype=np.int64)
+        out.sum = np.add.reduceat(np.where(valid, arr, 0), bounds, dtype=np.float64)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            out.min = np.fmin.reduceat(arr, bounds).astype(np.float64)
+            out.max = np.fmax.reduceat(arr, bounds).astype(np.float64)
+        out.first = arr[bounds].astype(np.float64)
+        out.last = arr[np.concatenate((bounds[1:], [arr.size])) - 1].astype(np.float64)
+        return out
+
+    def __len__(self):
+        return int(self.n.size)
+
+    @property
+    def mean(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.n > 0, self.sum / self.n, np.nan)
+
+    def concat(self, other, join=False):
+        """Segmentele lui self urmate de ale lui other; cu `join`, ultimul segment continuă în primul"""
+        out = SegmentStats()
+        for name in self.__slots__:
+            setattr(out, name, np.concatenate((getattr(self, name), getattr(other, name))))
+        if join and len(self) and len(other):
+            i = len(self) - 1
+            out.n[i] += out.n[i + 1]
+            out.sum[i] += out.sum[i + 1]
+            out.min[i] = np.fmin(out.min[i], out.min[i + 1])
+            out.max[i] = np.fmax(out.max[i], out.max[i + 1])
+            out.last[i] = out.last[i + 1]
+            out = out.select(np.arange(len(out)) != i + 1)
+        return out
+
+    def select(self, keep):
+        out = SegmentStats()
+        for name in self.__slots__:
+            setattr(out, name, getattr(self, name)[keep])
+        return out
+
+    def regroup(self, groups):
+        """Segmentele unite în grupuri consecutive; `groups` = indicele primului segment din fiecare grup"""
+        out = SegmentStats()
+        if not len(groups):
+            return out
+        last = np.concatenate((groups[1:], [len(self)])) - 1
+        out.n = np.add.reduceat(self.n, groups)
+        out.sum = np.add.reduceat(self.sum, groups)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            out.min = np.fmin.reduceat(self.min, groups)
+            out.max = np.fmax.reduceat(self.max, groups)
+        out.first = self.first[groups]
+        out.last = self.last[last]
+        return out
+
+# ======================================================
+# EXCEEDANCE COUNTS (THRESHOLD-FREE EVENTS)
+# ======================================================
+def _value_counts(values):
+    """(valori unice sortate, apariții), fără NaN"""
+    values = values[~np.isnan(values)] if values.dtype.kind == 'f' else values
+    return np.unique(values, return_counts=True)
+
+def _merge_counts(parts):
+    """Contopește listele (unice, apariții) ale mai multor partiții"""
+    if len(parts) == 1:
+        return parts[0]
+    if not parts:
+        return np.empty(0), np.empty(0, dtype=np.int64)
+    unique, inverse = np.unique(np.concatenate([values for values, _ in parts]), return_inverse=True)
+    counts = np.bincount(inverse, weights=np.concatenate([counts for _, counts in parts]), minlength=unique.size)
+    return unique, counts.astype(np.int64)
+
+def exceeds(values, threshold):
+    """Masca values > prag, cu pragul convertit în precizia datelor
+
+    Comparația comună a tuturor numărătorilor de evenimente (ignition, hărți,
+    tracțiuni, ferestre): float32(1.2) nu este „peste” pragul 1.2.
+    """
+    values = np.asarray(values)
+    return values > values.dtype.type(threshold)
+
+def _grid_steps(values, steps):
+    """Pasul grilei 1/steps al fiecărei valori: cel mai mic m cu values ≤ m / steps în precizia datelor
+
+    Pentru orice pas m, values > m / steps ⇔ pas > m, deci numărarea pe
+    pași coincide cu exceeds() pentru pragurile de pe grilă. NaN rămâne NaN.
+    """
+    values = np.asarray(values)
+    step = np.ceil(values.astype(np.float64) * steps)
+    finite = np.isfinite(step)
+    bound = lambda m: (m / steps).astype(values.dtype)
+    # Produsul în float64 poate greși cu un pas față de comparația în precizia datelor
+    while (up := finite & (values > bound(step))).any():
+        step[up] += 1
+    while (down := finite & (values <= bound(step - 1))).any():
+        step[down] -= 1
+    return step
+
+def _count_above(values, at_most, step):
+    """Câte valori (pași ai grilei, sortați) sunt peste pasul dat"""
+    return int(at_most[-1] - at_most[np.searchsorted(values, step, side='right')])
+
+class ExceedanceCounts:
+    """Evenimente (valori > prag) și episoade (tranziții ≤ prag → > prag) pentru orice prag
+
+    Pentru pragurile profilului analizei (`thresholds`) evenimentele și
+    perechile consecutive peste prag se numără exact, cu exceeds(). Pentru
+    celelalte praguri (rescore) valorile și minimele perechilor de eșantioane
+    consecutive se păstrează ca pași ai unei grile fixe (`resolution`) cu
+    numărul de apariții: starea are cel mult o intrare per pas, oricât de
+    lung e logul. Pasul unei valori este cel mai mic m cu valoare ≤ m ×
+    resolution, deci o valoare strict peste prag nu cade niciodată în pasul
+    pragului: numărarea e exactă pentru pragurile de pe grilă, iar între
+    pași numără în plus cel mult valorile dintre pas și prag, niciodată în
+    minus. events(t) = valorile > t, bursts(t) = events(t) − perechile cu
+    ambele valori > t − [primul eșantion > t], adică tranzițiile
+    False → True numărate de RisingEdgeCounter pe masca values > t.
+    """
+
+    __slots__ = ('_values', '_pairs', '_exact', 'first', 'last', 'dtype', 'resolution')
+
+    RESOLUTION = 1e-3
+    # Partiții necontopite păstrate înainte de compactare
+    MAX_PARTS = 16
+
+    def __init__(self, thresholds=(), resolution=None):
+        self.resolution = self.RESOLUTION if resolution is None else float(resolution)
+        self._values = []
+        self._pairs = []
+        # Prag → [evenimente, perechi consecutive peste prag]
+        self._exact = {float(t): [0, 0] for t in thresholds}
+        self.first = None
+        self.last = None
+        self.dtype = None
+
+    @property
+    def steps(self):
+        return round(1 / self.resolution)
+
+    def update(self, values):
+        values = np.asarray(values)
+        if values.size == 0:
+            return self
+        for threshold, counts in self._exact.items():
+            above = exceeds(values, threshold)
+            counts[0] += int(above.sum())
+            counts[1] += int((above[1:] & above[:-1]).sum())
+            if self.last is not None:
+                counts[1] += int(exceeds(self.last, threshold) and above[0])
+        grid = _grid_steps(values, self.steps)
+        pairs = np.minimum(grid[1:], grid[:-1])
+        if self.last is not None:
+            pairs = np.concatenate((_grid_steps(np.minimum(self.last, values[:1]), self.steps), pairs))
+        self._add(self._values, [_value_counts(grid)])
+        self._add(self._pairs, [_value_counts(pairs)])
+        if self.first is None:
+            self.first = values[0]
+            self.dtype = values.dtype
+        self.last = values[-1]
+        return self
+
+    def merge(self, other):
+        """Adaugă partiția următoare, inclusiv perechea de la graniță"""
+        if other.first is None:
+            return self
+        for threshold, counts in other._exact.items():
+            mine = self._exact.setdefault(threshold, [0, 0])
+            mine[0] += counts[0]
+            mine[1] += counts[1]
+            if self.last is not None:
+                mine[1] += int(exceeds(self.last, threshold) and exceeds(other.first, threshold))
+        self._add(self._values, other._values)
+        boundary = ([_value_counts(_grid_steps(np.minimum(self.last, np.asarray([other.first])), self.steps))]
+                    if self.last is not None else [])
+        self._add(self._pairs, other._pairs + boundary)
+        if self.first is None:
+            self.first = other.first
+            self.dtype = other.dtype
+        self.last = other.last
+        return self
+
+    def _add(self, parts, new):
+        parts.extend(new)
+        if len(parts) > self.MAX_PARTS:
+            parts[:] = [_merge_counts(parts)]
+
+    def features(self):
+        """Pașii valorilor și ai minimelor perechilor, sortați, cu numărul cumulat, plus numărările exacte
+
+        at_most[i] = apariții cu pasul < values[i]; 'exact' = {prag: {'events', 'bursts'}}.
+        """
+        dtype = self.dtype if self.dtype is not None else np.dtype(np.float64)
+        first = self.first if self.first is not None else dtype.type(np.nan)
+        out = {
+            'first': first,
+            'dtype': dtype.str,
+            'resolution': self.resolution,
+            'exact': {
+                threshold: {'events': events, 'bursts': events - pairs - int(exceeds(first, threshold))}
+                for threshold, (events, pairs) in self._exact.items()
+            },
+        }
+        for name, parts in (('values', self._values), ('pairs', self._pairs)):
+            parts[:] = [_merge_counts(parts)] if parts else []
+            values, counts = parts[0] if parts else (np.empty(0), np.empty(0, dtype=np.int64))
+            out[name] = values
+            out[name + '_at_most'] = np.concatenate(([0], np.cumsum(counts)))
+        return out
+
+    @staticmethod
+    def _step(features, threshold):
+        """Cel mai mare pas al grilei care nu depășește pragul (în precizia datelor)"""
+        steps = round(1 / features['resolution'])
+        limit = np.asarray([threshold], dtype=np.dtype(features['dtype']))
+        step = _grid_steps(limit, steps)
+        return float(step[0] if (step / steps).astype(limit.dtype)[0] == limit[0] else step[0] - 1)
+
+    @staticmethod
+    def events(features, threshold):
+        """Eșantioanele > prag"""
+        exact = features['exact'].get(float(threshold))
+        if exact is not None:
+            return exact['events']
+        return _count_above(features['values'], features['values_at_most'], ExceedanceCounts._step(features, threshold))
+
+    @staticmethod
+    def bursts(features, threshold):
+        """Tranzițiile False → True ale măștii values > prag"""
+        exact = features['exact'].get(float(threshold))
+        if exact is not None:
+            return exact['bursts']
+        step = ExceedanceCounts._step(features, threshold)
+        first = _grid_steps(np.asarray([features['first']], dtype=np.dtype(features['dtype'])),
+                           round(1 / features['resolution']))[0]
+        return (_count_above(features['values'], features['values_at_most'], step) - int(first > step)
+                - _count_above(features['pairs'], features['pairs_at_most'], step))
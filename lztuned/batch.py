@@ -0,0 +1,230 @@
+"""Analiză batch paralelă pentru arhive întregi de loguri"""
+import glob
+import json
+import os
+import sys
+import time
+import zipfile
+import multiprocessing as mp
+from multiprocessing.connection import wait
+
+from .pipeline import analyze_log, source_hash, summarize_results
+from .sources import archive_members
+
+# ======================================================
+# INPUT DISCOVERY
+# ======================================================
+# Tipare implicite pentru directoare: CSV, MLG și arhivele lor
+LOG_PATTERNS = ('*.csv', '*.mlg', '*.gz', '*.zst', '*.zip')
+
+def discover_logs(sources, pattern=LOG_PATTERNS):
+    """Expandează directoare, glob-uri și fișiere într-o listă de loguri
+
+    `pattern` (unul sau mai multe tipare) se aplică directoarelor. O arhivă
+    zip cu mai multe loguri devine câte un ArchiveMember per log.
+    """
+    patterns = (pattern,) if isinstance(pattern, str) else tuple(pattern)
+    seen = set()
+    for source in sources:
+        if os.path.isdir(source):
+            matches = sorted({path for pat in patterns
+                              for path in glob.glob(os.path.join(source, '**', pat), recursive=True)})
+        elif os.path.isfile(source):
+            matches = [source]
+        else:
+            matches = sorted(glob.glob(source, recursive=True))
+
+        for path in matches:
+            if os.path.isfile(path) and path not in seen:
+                seen.add(path)
+                yield from _archive_logs(path)
+
+def _archive_logs(path):
+    """Logurile dintr-o arhivă zip cu mai multe loguri; altfel fișierul însuși"""
+    try:
+        members = archive_members(path)
+    except (OSError, zipfile.BadZipFile):
+        # Arhiva coruptă ajunge la worker, care raportează eroarea
+        members = []
+    if len(members) > 1:
+        yield from members
+    else:
+        yield path
+
+def load_done_hashes(output_path):
+    """Hash-urile logurilor deja analizate cu succes în fișierul de output (JSONL)
+
+    Înregistrările 'error' / 'timeout' nu contează: --resume le reîncearcă.
+    """
+    done = set()
+    if not output_path or not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Linie trunchiată de o rulare întreruptă
+                continue
+            if record.get('hash') and record.get('status') == 'ok':
+                done.add(record['hash'])
+    return done
+
+# ======================================================
+# WORKER
+# ======================================================
+def _analyze_worker(path, options, conn):
+    """Rulează lanțul complet de engine-uri pe un log într-un proces separat"""
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        results = analyze_log(path, options)
+        record = {
+            'status': 'ok',
+            'results': summarize_results(results),
+        }
+        record['rows'] = record['results'].pop('rows')
+        record['profile'] = results['profile']
+    except Exception as e:
+        record = {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+
+    record['elapsed_s'] = round(time.perf_counter() - start, 4)
+    record['cpu_s'] = round(time.process_time() - cpu_start, 4)
+    conn.send(record)
+    conn.close()
+
+# ======================================================
+# BATCH RUNNER
+# ======================================================
+class BatchRunner:
+    """Rulează analiza pe mai multe loguri în paralel, cu timeout per fișier
+
+    Fiecare log rulează în propriul proces, astfel încât un fișier corupt
+    sau blocat poate fi oprit la timeout fără să afecteze restul rulării.
+    Cu `log` (un stream text), fiecare etapă măsurată a fiecărui log este
+    scrisă acolo ca o linie JSON {'event': 'stage', ...}.
+    """
+
+    def __init__(self, jobs=None, timeout=None, options=None, log=None):
+        self.jobs = max(1, jobs or os.cpu_count() or 1)
+        self.timeout = timeout
+        self.options = options or {}
+        self.log = log
+        if self.jobs > 1:
+            # Procesele rulează deja în paralel; engine-urile din fiecare rămân secvențiale
+            self.options = {'workers': 1, **self.options}
+        self.counts = {'ok': 0, 'error': 0, 'timeout': 0, 'skipped': 0}
+
+    def run(self, paths, out, done_hashes=None):
+        """Procesează logurile și scrie câte o linie JSON per log în `out`"""
+        done = set(done_hashes or ())
+        pending = self._pending(paths, done, out)
+        running = {}
+        ctx = mp.get_context()
+
+        while True:
+            # Umple pool-ul până la numărul de job-uri
+            while len(running) < self.jobs:
+                item = next(pending, None)
+                if item is None:
+                    break
+                path, data_hash = item
+                recv_conn, send_conn = ctx.Pipe(duplex=False)
+                proc = ctx.Process(
+                    target=_analyze_worker,
+                    args=(path, self.options, send_conn),
+                    daemon=True
+                )
+                proc.start()
+                send_conn.close()
+                running[recv_conn] = (proc, path, data_hash, time.monotonic())
+
+            if not running:
+                break
+
+            ready = wait(list(running), timeout=self._next_wait(running))
+            now = time.monotonic()
+
+            for conn in list(running):
+                proc, path, data_hash, started = running[conn]
+                record = None
+
+                if conn in ready:
+                    try:
+                        record = conn.recv()
+                    except EOFError:
+                        proc.join()
+                        record = {
+                            'status': 'error',
+                            'error': f"worker exited with code {proc.exitcode}",
+                            'elapsed_s': round(now - started, 4),
+                        }
+                elif self.timeout is not None and now - started > self.timeout:
+                    proc.terminate()
+                    record = {
+                        'status': 'timeout',
+                        'error': f"exceeded {self.timeout}s",
+                        'elapsed_s': round(now - started, 4),
+                    }
+
+                if record is None:
+                    continue
+
+                proc.join()
+                conn.close()
+                del running[conn]
+                self._emit(out, path, data_hash, record)
+
+        return self.counts
+
+    def _pending(self, paths, done, out):
+        """Generator de (path, hash) care sare peste conținutul deja analizat"""
+        for path in paths:
+            try:
+                data_hash = source_hash(path)
+            except (OSError, ValueError, zipfile.BadZipFile) as e:
+                self._emit(out, path, None, {'status': 'error', 'error': str(e)})
+                continue
+            if data_hash in done:
+                self.counts['skipped'] += 1
+                continue
+            done.add(data_hash)
+            yield path, data_hash
+
+    def _next_wait(self, running):
+        """Cât timp putem aștepta până la următorul timeout posibil"""
+        if self.timeout is None:
+            return None
+        now = time.monotonic()
+        deadlines = [started + self.timeout - now for _, _, _, started in running.values()]
+        return max(0.0, min(deadlines))
+
+    def _emit(self, out, path, data_hash, record):
+        """Scrie o linie JSON și o trimite imediat pe disc"""
+        self.counts[record['status']] = self.counts.get(record['status'], 0) + 1
+        profile = record.pop('profile', None)
+        line = {'file': str(path), 'hash': data_hash, **record}
+        out.write(json.dumps(line, ensure_ascii=False) + '\n')
+        out.flush()
+        if self.log is not None and profile:
+            self._log_stages(path, data_hash, profile)
+
+    def _log_stages(self, path, data_hash, profile):
+        """Log structurat: o linie JSON per etapă a analizei unui log"""
+        for stage in profile:
+            self.log.write(json.dumps({'event': 'stage', 'file': str(path), 'hash': data_hash, **stage},
+                                      ensure_ascii=False) + '\n')
+        self.log.flush()
+
+def run_batch(sources, output=None, jobs=None, timeout=None, resume=False,
+              pattern=LOG_PATTERNS, options=None, log=None):
+    """Punct de intrare pentru analiza batch; returnează contoarele finale"""
+    done = load_done_hashes(output) if resume else set()
+    runner = BatchRunner(jobs=jobs, timeout=timeout, options=options, log=log)
+    paths = discover_logs(sources, pattern)
+
+    if output is None:
+        return runner.run(paths, sys.stdout, done)
+
+    with open(output, 'a' if resume else 'w', encoding='utf-8') as out:
+        return runner.run(paths, out, done)
@@ -0,0 +1,229 @@
+"""Benchmark-uri: timpul și memoria fiecărei etape a pipeline-ului, pe loguri sintetice
+
+Fiecare caz (rânduri × coloane × dialect CSV) rulează etapele pipeline-ului
+separat, în ordinea din analyze_dataframe: încărcare, detecție, regimuri,
+fiecare engine, risc și pregătirea graficelor (decimare + intervale WOT).
+Timpul e minimul din `repeat` rulări; memoria de vârf per etapă se măsoară
+într-o rulare separată, cu tracemalloc (ar distorsiona timpii), deci include
+alocările Python/NumPy, nu și bufferele interne pyarrow. Rezultatele sunt un
+JSON care poate servi drept baseline pentru compare().
+"""
+import datetime
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from .channels import ChannelProfiles
+from .decimate import MAX_POINTS, decimate, mask_intervals
+from .engines import (
+    ChannelDetectionEngine,
+    OperatingModeEngine,
+    FuelAnalysisEngine,
+    IgnitionAnalysisEngine,
+    ThermalStressEngine,
+    ElectricalHealthEngine,
+    AnomalyDetectionEngine,
+    CorrelationEngine,
+    CellMapEngine,
+    PullAnalysisEngine,
+    PredictiveRiskEngine,
+)
+from .pipeline import load_channels
+from .signals import SignalStore
+from .synthetic import DIALECTS, write_log
+from .timebase import Timebase
+
+# Versiunea formatului de rezultate; compare() refuză fișiere cu altă versiune
+BENCH_VERSION = 1
+
+STAGES = (
+    'load', 'detection', 'modes', 'fuel', 'ignition', 'thermal', 'electrical',
+    'anomalies', 'correlations', 'cell_maps', 'pulls', 'risk', 'charts',
+)
+DEFAULT_ROWS = (10_000, 100_000, 1_000_000)
+DEFAULT_COLUMNS = (20, 100)
+
+# Regresie = mai lent / mai multă memorie cu peste `tolerance` și peste pragul absolut
+DEFAULT_TOLERANCE = 0.25
+MIN_TIME_DELTA_S = 0.005
+MIN_MEMORY_DELTA_MB = 1.0
+
+# ======================================================
+# STAGES
+# ======================================================
+def pipeline_stages(path):
+    """(etapă, funcție) în ordinea pipeline-ului; etapele își pasează starea"""
+    state = {}
+
+    def load():
+        state['df'] = load_channels(path, profiles=ChannelProfiles())
+
+    def detection():
+        df = state['df']
+        detector = ChannelDetectionEngine(df)
+        detector.map_channels(ChannelProfiles())
+        state['timebase'] = Timebase.from_frame(df, detector.time_column)
+        detector.update(df)
+        state['channels'] = detector.finalize()
+        state['detector'] = detector
+        state['signals'] = SignalStore(df, state['channels'])
+
+    def modes():
+        state['modes'] = OperatingModeEngine(state['df'], state['channels'], state['timebase']).detect_modes()
+
+    def engine_stage(name, make):
+        def run():
+            engine = make()
+            engine.step(state['df'], {'modes': state['modes'], 'derived': state['signals']},
+                        state['timebase'].chunk_time)
+            state[name] = engine.finalize()
+        return run
+
+    def risk():
+        all_results = {**state['fuel'], **state['ignition'], **state['thermal'], **state['electrical']}
+        state['risk'] = PredictiveRiskEngine(all_results).assess()
+
+    def charts():
+        # Ce face graficul avansat din UI pentru toată fereastra, fără Plotly
+        df, channels, signals = state['df'], state['channels'], state['signals']
+        traces = [df[channels[name]] for name in ('rpm', 'load', 'oil_temp', 'coolant_temp') if name in channels]
+        traces += [signals[name] for name in ('Knock_Peak', 'Lambda_Avg') if name in signals]
+        for values in traces:
+            decimate(values, 0, len(df), MAX_POINTS)
+        mask_intervals(state['modes']['WOT'].to_numpy(), 0, len(df), min_gap=len(df) // MAX_POINTS)
+
+    stats = lambda: state['detector'].stats
+    engines = {
+        'fuel': lambda: FuelAnalysisEngine(state['df'], state['channels'], None, stats()),
+        'ignition': lambda: IgnitionAnalysisEngine(state['df'], state['channels'], None),
+        'thermal': lambda: ThermalStressEngine(state['df'], state['channels'], state['timebase'], stats()),
+        'electrical': lambda: ElectricalHealthEngine(state['df'], state['channels'], stats()),
+        'anomalies': lambda: AnomalyDetectionEngine(state['df'], state['channels'], state['timebase']),
+        'correlations': lambda: CorrelationEngine(state['df'], state['channels'], state['timebase']),
+        'cell_maps': lambda: CellMapEngine(state['df'], state['channels'], state['timebase']),
+        'pulls': lambda: PullAnalysisEngine(state['df'], state['channels'], state['timebase']),
+    }
+    stages = {'load': load, 'detection': detection, 'modes': modes, 'risk': risk, 'charts': charts}
+    stages.update((name, engine_stage(name, make)) for name, make in engines.items())
+    return [(name, stages[name]) for name in STAGES]
+
+def measure(path, repeat=3, memory=True):
+    """{etapă: {'time_s', 'peak_mb'}} pentru un log"""
+    results = {name: {'time_s': float('inf')} for name in STAGES}
+    for _ in range(repeat):
+        for name, run in pipeline_stages(path):
+            start = time.perf_counter()
+            run()
+            results[name]['time_s'] = min(results[name]['time_s'], time.perf_counter() - start)
+
+    if memory:
+        tracemalloc.start()
+        try:
+            for name, run in pipeline_stages(path):
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                run()
+                peak = tracemalloc.get_traced_memory()[1]
+                results[name]['peak_mb'] = (peak - before) / 1024 ** 2
+        finally:
+            tracemalloc.stop()
+
+    return {
+        name: {key: round(value, 6 if key == 'time_s' else 3) for key, value in stage.items()}
+        for name, stage in results.items()
+    }
+
+# ======================================================
+# SUITE
+# ======================================================
+def case_id(rows, columns, dialect):
+    return f'{rows}x{columns}-{dialect}'
+
+def environment():
+    """Contextul rulării, salvat lângă rezultate (comparabil doar pe aceeași mașină)"""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def run_suite(rows=DEFAULT_ROWS, columns=DEFAULT_COLUMNS, dialects=tuple(DIALECTS), repeat=3,
+              memory=True, data_dir=None, seed=0, progress=None):
+    """Rulează toate cazurile; logurile sintetice sunt generate o singură dată în `data_dir`"""
+    data_dir = data_dir or os.path.join(tempfile.gettempdir(), 'lztuned-bench')
+    os.makedirs(data_dir, exist_ok=True)
+    report = progress or (lambda message: None)
+
+    cases = {}
+    for n_rows in rows:
+        for n_columns in columns:
+            for dialect in dialects:
+                path = os.path.join(data_dir, f'synthetic-{case_id(n_rows, n_columns, dialect)}-s{seed}.csv')
+                if not os.path.exists(path):
+                    report(f"generating {os.path.basename(path)}")
+                    write_log(path + '.tmp', n_rows, n_columns, dialect, seed)
+                    os.replace(path + '.tmp', path)
+
+                stages = measure(path, repeat, memory)
+                case = {
+                    'rows': n_rows,
+                    'columns': n_columns,
+                    'dialect': dialect,
+                    'file_mb': round(os.path.getsize(path) / 1024 ** 2, 2),
+                    'total_s': round(sum(stage['time_s'] for stage in stages.values()), 6),
+                    'stages': stages,
+                }
+                cases[case_id(n_rows, n_columns, dialect)] = case
+                report(f"{case_id(n_rows, n_columns, dialect)}: {case['total_s']:.3f}s")
+
+    return {
+        'bench_version': BENCH_VERSION,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment(),
+        'seed': seed,
+        'repeat': repeat,
+        'cases': cases,
+    }
+
+# ======================================================
+# COMPARISON
+# ======================================================
+def compare(baseline, current, tolerance=DEFAULT_TOLERANCE):
+    """Regresiile din `current` față de `baseline` (listă de dict-uri)
+
+    O etapă regresează dacă timpul (sau memoria de vârf) crește cu peste
+    `tolerance` relativ și peste pragul absolut MIN_TIME_DELTA_S /
+    MIN_MEMORY_DELTA_MB (zgomotul etapelor foarte scurte).
+    """
+    for results in (baseline, current):
+        if results.get('bench_version') != BENCH_VERSION:
+            raise ValueError(f"Versiune de benchmark incompatibilă: {results.get('bench_version')}")
+
+    regressions = []
+    for case, base_case in baseline['cases'].items():
+        cur_case = current['cases'].get(case)
+        if cur_case is None:
+            continue
+        for stage, base in base_case['stages'].items():
+            cur = cur_case['stages'].get(stage, {})
+            for metric, min_delta in (('time_s', MIN_TIME_DELTA_S), ('peak_mb', MIN_MEMORY_DELTA_MB)):
+                if metric not in base or metric not in cur:
+                    continue
+                delta = cur[metric] - base[metric]
+                if delta > min_delta and cur[metric] > base[metric] * (1 + tolerance):
+                    regressions.append({
+                        'case': case,
+                        'stage': stage,
+                        'metric': metric,
+                        'baseline': base[metric],
+                        'current': cur[metric],
+                        'ratio': round(cur[metric] / base[metric], 3) if base[metric] else None,
+                    })
+    return regressions
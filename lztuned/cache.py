@@ -0,0 +1,130 @@
+"""Cache LRU pentru rezultatele analizei, indexat după hash-ul conținutului"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import numpy as np
+
+from .compact import CompactLog, PackedMasks
+from .signals import SignalStore
+from .windows import WindowIndex
+
+# ======================================================
+# HASHING
+# ======================================================
+def content_hash(data):
+    """Hash stabil pentru conținutul unui log (bytes)"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def stream_hash(stream, block_size=1 << 20):
+    """Hash pentru un stream binar, citit în blocuri (ex. un log decomprimat)"""
+    h = hashlib.blake2b(digest_size=16)
+    for block in iter(lambda: stream.read(block_size), b''):
+        h.update(block)
+    return h.hexdigest()
+
+def file_hash(path, block_size=1 << 20):
+    """Hash pentru un fișier de pe disc, citit în blocuri"""
+    with open(path, 'rb') as f:
+        return stream_hash(f, block_size)
+
+def options_key(options):
+    """Cheie deterministă pentru opțiunile care influențează analiza
+
+    Opțiunile de tip dict (ex. 'thresholds') devin tupluri sortate, hashable.
+    """
+    return tuple(sorted(
+        (name, options_key(value) if isinstance(value, dict) else value) for name, value in options.items()
+    ))
+
+def estimate_nbytes(value):
+    """Estimare aproximativă a memoriei ocupate de o valoare din cache"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=False))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (CompactLog, PackedMasks)):
+        return value.nbytes
+    if isinstance(value, SignalStore):
+        # Semnalele derivate se calculează după ce rezultatele intră în cache
+        return value.max_nbytes()
+    if isinstance(value, WindowIndex):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(v) for v in value.values()) + 64 * len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_nbytes(v) for v in value) + 8 * len(value)
+    return 64
+
+# ======================================================
+# LRU CACHE
+# ======================================================
+class ResultCache:
+    """Cache LRU limitat ca număr de intrări și ca memorie totală"""
+
+    def __init__(self, max_entries=16, max_bytes=2 * 1024 ** 3):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Returnează valoarea și o marchează ca recent folosită"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key, value, nbytes=None):
+        """Adaugă o valoare și evacuează intrările cele mai vechi la nevoie"""
+        size = estimate_nbytes(value) if nbytes is None else nbytes
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._sizes.pop(key)
+                del self._entries[key]
+
+            # O intrare mai mare decât tot bugetul nu se păstrează
+            if size > self.max_bytes:
+                return value
+
+            self._entries[key] = value
+            self._sizes[key] = size
+            self.total_bytes += size
+
+            while (len(self._entries) > self.max_entries or
+                   self.total_bytes > self.max_bytes):
+                old_key, _ = self._entries.popitem(last=False)
+                self.total_bytes -= self._sizes.pop(old_key)
+        return value
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.total_bytes = 0
+
+    def get_stats(self):
+        """Statistici de utilizare a cache-ului"""
+        return {
+            'entries': len(self._entries),
+            'bytes': self.total_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -0,0 +1,238 @@
+"""Potrivirea fuzzy a coloanelor din header pe canalele standard + cache de profiluri ECU
+
+Numele de alias și header-ele sunt normalizate în tokeni (litere mici, fără
+unități între paranteze și punctuație, '#1' / 'No. 1' / '01' → '1',
+camelCase separat). Un index invers pe prefixele tokenilor dă, pentru
+fiecare coloană, doar aliasurile candidate; scorul combină cât din alias
+acoperă coloana și cât din coloană e explicat de alias. Asignarea e
+globală: perechile (canal, coloană) se aleg în ordinea scorului, fiecare
+coloană fiind folosită o singură dată.
+
+Maparea rezolvată se păstrează într-un ChannelProfiles, cheiat după
+semnătura header-ului: logurile repetate de la același ECU sar complet
+peste potrivire.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+
+# Versiunea algoritmului de potrivire; incrementarea invalidează profilurile salvate
+MATCHER_VERSION = 1
+# Scorul minim pentru o potrivire fuzzy (1.0 = aceiași tokeni)
+MIN_SCORE = 0.75
+# Cuvinte care schimbă mărimea măsurată: 'Lambda #1 post-cat heating' nu e lambda1
+QUALIFIERS = frozenset({
+    'heating', 'heater', 'post', 'duty', 'status', 'target', 'desired', 'setpoint',
+    'request', 'requested', 'correction', 'adaptation', 'limit', 'flag', 'error',
+})
+# Cuvinte care anunță un număr ('No. 1', 'Nr 2')
+NUMBER_WORDS = frozenset({'no', 'nr', 'num', 'number'})
+
+_UNITS = re.compile(r'[\(\[\{][^\)\]\}]*[\)\]\}]')
+_CAMEL = re.compile(r'(?<=[a-z])(?=[A-Z])')
+_DIGITS = re.compile(r'(?<=[A-Za-z]{2})(?=\d)|(?<=\d)(?=[A-Za-z])')
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+# Sufixul adăugat de pandas duplicatelor din header ('X', 'X.1', 'X.2')
+_MANGLED = re.compile(r'^(.*)\.(\d+)$')
+
+def normalize(name):
+    """Tokenii normalizați ai unui nume de canal, ca tuplu"""
+    text = _UNITS.sub(' ', str(name))
+    text = _DIGITS.sub(' ', _CAMEL.sub(' ', text))
+    tokens = _NON_ALNUM.sub(' ', text.casefold()).split()
+    out = []
+    for i, token in enumerate(tokens):
+        if token.isdigit():
+            out.append(str(int(token)))
+        elif not (token in NUMBER_WORDS and i + 1 < len(tokens) and tokens[i + 1].isdigit()):
+            out.append(token)
+    return tuple(out)
+
+def _token_match(a, b):
+    """Același token sau abreviere ('temp' / 'temperature', 'pos' / 'position')"""
+    if a == b:
+        return True
+    return min(len(a), len(b)) >= 3 and (a.startswith(b) or b.startswith(a))
+
+# ======================================================
+# MATCHER
+# ======================================================
+class _Name:
+    """Un nume normalizat: cuvinte + numere"""
+
+    __slots__ = ('raw', 'tokens', 'words', 'numbers')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.tokens = normalize(raw)
+        self.words = tuple(t for t in self.tokens if not t.isdigit())
+        self.numbers = frozenset(t for t in self.tokens if t.isdigit())
+
+class ChannelMatcher:
+    """Index de tokeni peste toate aliasurile unui CHANNEL_MAP"""
+
+    def __init__(self, channel_map):
+        self.channel_map = channel_map
+        # (canal, index alias, nume normalizat), în ordinea din CHANNEL_MAP
+        self.aliases = [
+            (std_name, rank, _Name(alias))
+            for std_name, aliases in channel_map.items()
+            for rank, alias in enumerate(aliases)
+        ]
+        self.order = {std_name: i for i, std_name in enumerate(channel_map)}
+        self.index = {}
+        for i, (_, _, alias) in enumerate(self.aliases):
+            for word in alias.words:
+                self.index.setdefault(word[:3], set()).add(i)
+
+    @staticmethod
+    def score(column, alias):
+        """Similaritatea coloană ↔ alias, în [0, 1]"""
+        if column.tokens == alias.tokens:
+            return 1.0
+        if column.numbers != alias.numbers or not alias.words:
+            return 0.0
+        matched_alias = sum(any(_token_match(a, c) for c in column.words) for a in alias.words)
+        if matched_alias == 0:
+            return 0.0
+        extra = [c for c in column.words if not any(_token_match(c, a) for a in alias.words)]
+        if any(word in QUALIFIERS for word in extra):
+            return 0.0
+        recall = matched_alias / len(alias.words)
+        precision = (len(column.words) - len(extra)) / len(column.words)
+        return 0.7 * recall + 0.3 * precision
+
+    def candidates(self, column):
+        """Aliasurile care au cel puțin un token în comun cu coloana"""
+        ids = set()
+        for word in column.words:
+            ids.update(self.index.get(word[:3], ()))
+        return sorted(ids)
+
+    def match(self, columns, min_score=MIN_SCORE):
+        """{canal: (coloană, scor)}, fiecare coloană folosită cel mult o dată"""
+        pairs = []
+        for position, raw in enumerate(columns):
+            column = _Name(raw)
+            if not column.words:
+                continue
+            for i in self.candidates(column):
+                std_name, rank, alias = self.aliases[i]
+                score = 1.0 if raw == alias.raw else self.score(column, alias)
+                if score >= min_score:
+                    # La scor egal: potrivirea exactă, ordinea canalelor, ordinea aliasurilor
+                    pairs.append((-score, raw != alias.raw, self.order[std_name], rank, position,
+                                  std_name, raw))
+
+        pairs.sort()
+        assigned, used = {}, set()
+        for neg_score, _, _, _, _, std_name, raw in pairs:
+            if std_name in assigned or raw in used:
+                continue
+            assigned[std_name] = (raw, -neg_score)
+            used.add(raw)
+        return {std_name: assigned[std_name] for std_name in self.channel_map if std_name in assigned}
+
+def header_signature(columns, channel_map, time_variants=()):
+    """Semnătura unui header: aceleași coloane și aceleași aliasuri → aceeași mapare"""
+    payload = json.dumps([MATCHER_VERSION, channel_map, list(time_variants), [str(c) for c in columns]],
+                         ensure_ascii=False)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+def header_issues(columns, used=()):
+    """Coloanele duplicate dintr-un header citit cu pandas
+
+    `renamed`: duplicatele exacte, redenumite de pandas ('X' → 'X.1').
+    `duplicates`: grupurile de coloane cu același nume normalizat (ex.
+    'Lambda #1 integrator ' și 'Lambda #1 integrator'), cu coloana din
+    grup folosită de detecție (`used`), dacă e vreuna.
+    """
+    names = [str(c) for c in columns]
+    present = set(names)
+    renamed = {}
+    for name in names:
+        match = _MANGLED.match(name)
+        if match and match.group(1) in present:
+            renamed[name] = match.group(1)
+    groups = {}
+    for name in names:
+        groups.setdefault(normalize(renamed.get(name, name)), []).append(name)
+    used = set(used)
+    duplicates = [
+        {'columns': group, 'used': next((name for name in group if name in used), None)}
+        for group in groups.values() if len(group) > 1
+    ]
+    return {'renamed': renamed, 'duplicates': duplicates}
+
+# ======================================================
+# PROFILE CACHE
+# ======================================================
+class ChannelProfiles:
+    """Mapările rezolvate per semnătură de header (profilul unui ECU)
+
+    Fără `root` profilurile stau doar în memoria procesului; cu `root`
+    fiecare profil e și un fișier JSON pe disc, scris atomic.
+    """
+
+    def __init__(self, root=None):
+        self.root = root
+        self._profiles = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if root:
+            os.makedirs(root, exist_ok=True)
+
+    def _path(self, signature):
+        return os.path.join(self.root, f'{signature}.json')
+
+    def get(self, signature):
+        """Profilul salvat pentru semnătură, sau None"""
+        with self._lock:
+            profile = self._profiles.get(signature)
+        if profile is None and self.root:
+            try:
+                with open(self._path(signature), encoding='utf-8') as f:
+                    profile = json.load(f)
+            except (OSError, ValueError):
+                profile = None
+            if profile is not None and profile.get('matcher_version') != MATCHER_VERSION:
+                profile = None
+            if profile is not None:
+                with self._lock:
+                    self._profiles[signature] = profile
+        with self._lock:
+            if profile is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return profile
+
+    def put(self, signature, profile):
+        profile = {'matcher_version': MATCHER_VERSION, **profile}
+        with self._lock:
+            self._profiles[signature] = profile
+        if self.root:
+            fd, tmp = tempfile.mkstemp(prefix='.tmp-', suffix='.json', dir=self.root)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(profile, f, ensure_ascii=False)
+                os.replace(tmp, self._path(signature))
+            except OSError:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        return profile
+
+_PROFILES = {}
+_PROFILES_LOCK = threading.Lock()
+
+def channel_profiles(root=None):
+    """Cache-ul de profiluri partajat în proces pentru un director (None = doar în memorie)"""
+    key = os.path.abspath(root) if root else None
+    with _PROFILES_LOCK:
+        if key not in _PROFILES:
+            _PROFILES[key] = ChannelProfiles(key)
+        return _PROFILES[key]
@@ -0,0 +1,152 @@
+"""Interfața linie de comandă: python -m lztuned <comandă>"""
+import argparse
+import json
+import sys
+import time
+
+def _cmd_batch(args):
+    """Analiză batch pe directoare / glob-uri de loguri"""
+    from .batch import LOG_PATTERNS, run_batch
+
+    start = time.perf_counter()
+    counts = run_batch(
+        args.sources,
+        output=args.output,
+        jobs=args.jobs,
+        timeout=args.timeout,
+        resume=args.resume,
+        pattern=args.pattern or LOG_PATTERNS,
+        options={'chunksize': args.chunksize, 'store_dir': args.store, 'profile_dir': args.profiles,
+                 'thresholds': dict(args.threshold) or None},
+        log=sys.stderr if args.log_stages else None,
+    )
+    counts['elapsed_s'] = round(time.perf_counter() - start, 2)
+    print(json.dumps({'summary': counts}), file=sys.stderr)
+    return 0 if counts.get('error', 0) + counts.get('timeout', 0) == 0 else 1
+
+def _threshold(text):
+    """NAME=VALUE pentru --threshold (numele din DEFAULT_THRESHOLDS)"""
+    from .engines import DEFAULT_THRESHOLDS
+
+    name, sep, value = text.partition('=')
+    if not sep or name not in DEFAULT_THRESHOLDS:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE with NAME in {', '.join(DEFAULT_THRESHOLDS)}")
+    try:
+        return name, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid threshold value: {value!r}") from None
+
+def _cmd_bench_run(args):
+    """Rulează suita de benchmark și scrie rezultatele JSON"""
+    from .bench import run_suite
+
+    results = run_suite(
+        rows=args.rows,
+        columns=args.columns,
+        dialects=args.dialects,
+        repeat=args.repeat,
+        memory=not args.no_memory,
+        data_dir=args.data_dir,
+        seed=args.seed,
+        progress=lambda message: print(message, file=sys.stderr),
+    )
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return 0
+
+def _cmd_bench_compare(args):
+    """Compară două rezultate de benchmark; cod 1 dacă există regresii"""
+    from .bench import compare
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, encoding='utf-8') as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.tolerance)
+    for r in regressions:
+        print(json.dumps(r))
+    print(json.dumps({'summary': {'regressions': len(regressions), 'tolerance': args.tolerance}}), file=sys.stderr)
+    return 1 if regressions else 0
+
+def _cmd_bench_generate(args):
+    """Scrie un singur log sintetic"""
+    from .synthetic import write_log
+
+    write_log(args.output, args.rows, args.columns, args.dialect, args.seed)
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m lztuned',
+        description='LZTuned Architect Pro - headless ECU log analysis'
+    )
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    batch = sub.add_parser('batch', help='analyze a directory or glob of logs in parallel')
+    batch.add_argument('sources', nargs='+', help='log files, directories or glob patterns')
+    batch.add_argument('-o', '--output', help='JSONL output file (default: stdout)')
+    batch.add_argument('-j', '--jobs', type=int, default=None,
+                       help='parallel worker processes (default: CPU count)')
+    batch.add_argument('--timeout', type=float, default=None,
+                       help='per-file timeout in seconds')
+    batch.add_argument('--resume', action='store_true',
+                       help='append to --output and skip logs whose content hash is already there')
+    batch.add_argument('--pattern', action='append', default=None,
+                       help='file pattern used when a source is a directory, repeatable '
+                            '(default: *.csv *.mlg *.gz *.zst *.zip)')
+    batch.add_argument('--chunksize', type=int, default=None,
+                       help='stream each log in chunks of N rows (bounded memory for huge logs)')
+    batch.add_argument('--store', default=None,
+                       help='columnar on-disk cache directory (memory-mapped re-analysis)')
+    batch.add_argument('--profiles', default=None,
+                       help='directory of cached per-ECU channel mappings (skips header matching on repeat logs)')
+    batch.add_argument('--threshold', type=_threshold, action='append', default=[], metavar='NAME=VALUE',
+                       help='verdict threshold override, e.g. knock_event=1.4 (repeatable)')
+    batch.add_argument('--log-stages', action='store_true',
+                       help='log per-stage wall/CPU time, peak RSS delta and rows/s as JSON lines on stderr')
+    batch.set_defaults(func=_cmd_batch)
+
+    from .bench import DEFAULT_COLUMNS, DEFAULT_ROWS, DEFAULT_TOLERANCE
+    from .synthetic import DIALECTS
+
+    bench = sub.add_parser('bench', help='per-stage timing and memory benchmarks on synthetic logs')
+    bench_sub = bench.add_subparsers(dest='bench_command', required=True)
+
+    run = bench_sub.add_parser('run', help='run the benchmark suite and write a JSON baseline')
+    run.add_argument('-o', '--output', required=True, help='JSON results file')
+    run.add_argument('--rows', type=int, nargs='+', default=list(DEFAULT_ROWS),
+                     help='log lengths to benchmark (default: %(default)s)')
+    run.add_argument('--columns', type=int, nargs='+', default=list(DEFAULT_COLUMNS),
+                     help='column counts to benchmark (default: %(default)s)')
+    run.add_argument('--dialects', nargs='+', choices=list(DIALECTS), default=list(DIALECTS),
+                     help='CSV dialects (default: all)')
+    run.add_argument('--repeat', type=int, default=3, help='timing runs per case; the minimum is kept')
+    run.add_argument('--no-memory', action='store_true', help='skip the tracemalloc peak-memory pass')
+    run.add_argument('--data-dir', default=None,
+                     help='where synthetic logs are generated and reused (default: system temp dir)')
+    run.add_argument('--seed', type=int, default=0, help='synthetic data seed')
+    run.set_defaults(func=_cmd_bench_run)
+
+    cmp_ = bench_sub.add_parser('compare', help='flag regressions of a run against a baseline')
+    cmp_.add_argument('baseline', help='baseline JSON from "bench run"')
+    cmp_.add_argument('current', help='JSON of the run to check')
+    cmp_.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                      help='allowed relative slowdown / memory growth (default: %(default)s)')
+    cmp_.set_defaults(func=_cmd_bench_compare)
+
+    gen = bench_sub.add_parser('generate', help='write one synthetic ECU log')
+    gen.add_argument('output', help='CSV file to write')
+    gen.add_argument('--rows', type=int, default=100_000)
+    gen.add_argument('--columns', type=int, default=20)
+    gen.add_argument('--dialect', choices=list(DIALECTS), default='semicolon')
+    gen.add_argument('--seed', type=int, default=0)
+    gen.set_defaults(func=_cmd_bench_generate)
+
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'resume', False) and not getattr(args, 'output', None):
+        parser.error('--resume requires --output')
+    return args.func(args)
@@ -0,0 +1,234 @@
+"""Container compact pentru logurile ținute în memorie (flote de loguri pe server)
+
+CompactLog păstrează canalele unui log parsat cât mai mic: float32 în loc de
+float64, iar canalele cu rezoluție zecimală fixă (RPM întreg, temperaturi la
+0.25°C, ...) ca int16 scalat, valoare = (cod + offset) / scale, doar dacă
+decodarea redă exact valorile float32 (rezultatele nu se schimbă). Timpul
+își păstrează tipul (float32 pierde ms). Măștile de regim se păstrează
+bit-packed (PackedMasks, 1 bit per eșantion în loc de 1 byte).
+
+Containerul expune partea din interfața DataFrame folosită de engine-uri,
+SignalStore și Timebase (df[col] → Series, iloc pe felii de rânduri,
+index, columns, dtypes, attrs), deci pipeline-ul rulează direct pe el;
+coloanele int16 se decodează la acces, doar pentru felia cerută.
+"""
+import numpy as np
+import pandas as pd
+
+# Felii de rânduri la decodare: temporarele float64 rămân mici
+DECODE_ROWS = 1 << 18
+
+class CompactColumn:
+    """O coloană: date brute (float32 / alt tip) sau coduri int16 cu scale și offset"""
+
+    __slots__ = ('data', 'scale', 'offset')
+
+    # Scale-urile încercate, în ordine: primul care codează exact câștigă
+    SCALES = (1, 10, 100, 1000, 10000)
+    # Codul rezervat pentru NaN; codurile valide sunt în [-32767, 32767]
+    NULL = np.iinfo(np.int16).min
+    MAX_SPAN = 2 * np.iinfo(np.int16).max
+    PROBE_SAMPLES = 4096
+
+    def __init__(self, data, scale=None, offset=0):
+        self.data = data
+        self.scale = scale
+        self.offset = offset
+
+    @classmethod
+    def encode(cls, values, int16=True):
+        """Coloana compactă pentru `values`; float64 devine float32, apoi int16 dacă e exact"""
+        arr = np.asarray(values)
+        if arr.dtype.kind != 'f':
+            return cls(arr)
+        arr = arr.astype(np.float32, copy=False)
+        return (int16 and cls._int16(arr)) or cls(arr)
+
+    @classmethod
+    def _int16(cls, arr):
+        valid = ~np.isnan(arr)
+        finite = arr[valid]
+        if not finite.size or not np.isfinite(finite).all():
+            return None
+        lo, hi = float(finite.min()), float(finite.max())
+        for scale in cls.SCALES:
+            if (hi - lo) * scale > cls.MAX_SPAN:
+                break
+            offset = int(round((lo + hi) / 2 * scale))
+            # Verificarea pe primele eșantioane respinge repede canalele fără rezoluție fixă
+            if not cls._exact(finite[:cls.PROBE_SAMPLES], scale, offset)[0]:
+                continue
+            exact, codes = cls._exact(finite, scale, offset)
+            if exact:
+                data = np.full(arr.size, cls.NULL, dtype=np.int16)
+                data[valid] = codes
+                return cls(data, scale, offset)
+        return None
+
+    @staticmethod
+    def _exact(values, scale, offset):
+        """(codarea e exactă, coduri); aceeași formulă ca la decodare"""
+        codes = np.round(values.astype(np.float64) * scale) - offset
+        return np.array_equal(((codes + offset) / scale).astype(np.float32), values), codes
+
+    @property
+    def dtype(self):
+        """Tipul valorilor decodate"""
+        return np.dtype(np.float32) if self.scale is not None else self.data.dtype
+
+    @property
+    def encoding(self):
+        return f'int16/{self.scale}' if self.scale is not None else str(self.data.dtype)
+
+    @property
+    def nbytes(self):
+        return int(self.data.nbytes)
+
+    def take(self, rows):
+        """Vedere pe felia `rows` (fără copiere)"""
+        return CompactColumn(self.data[rows], self.scale, self.offset)
+
+    def decode(self):
+        """Valorile (float32 pentru coduri int16; altfel datele, fără copiere)"""
+        if self.scale is None:
+            return self.data
+        out = np.empty(self.data.size, dtype=np.float32)
+        for start in range(0, self.data.size, DECODE_ROWS):
+            codes = self.data[start:start + DECODE_ROWS]
+            values = (codes + float(self.offset)) / self.scale
+            values[codes == self.NULL] = np.nan
+            out[start:start + DECODE_ROWS] = values
+        return out
+
+class _RowSlicer:
+    """log.iloc[start:stop] → CompactLog pe felia de rânduri (vederi, fără copiere)"""
+
+    def __init__(self, log):
+        self._log = log
+
+    def __getitem__(self, rows):
+        if not isinstance(rows, slice):
+            raise TypeError("CompactLog.iloc acceptă doar felii de rânduri")
+        start, stop, step = rows.indices(len(self._log))
+        if step != 1:
+            raise TypeError("CompactLog.iloc acceptă doar felii contigue")
+        stop = max(start, stop)
+        columns = {name: column.take(slice(start, stop)) for name, column in self._log._columns.items()}
+        return CompactLog(columns, stop - start, self._log._start + start, self._log.attrs)
+
+# ======================================================
+# COMPACT LOG
+# ======================================================
+class CompactLog:
+    """Canalele unui log, codate compact, cu interfața de DataFrame a engine-urilor"""
+
+    def __init__(self, columns, rows, start=0, attrs=None):
+        self._columns = columns
+        self._rows = int(rows)
+        self._start = int(start)
+        self.attrs = dict(attrs or {})
+
+    @classmethod
+    def from_frame(cls, df, time_column=None, int16=True):
+        """Codează un DataFrame; `time_column` rămâne în tipul lui"""
+        columns = {}
+        for col in df.columns:
+            values = df[col].to_numpy()
+            columns[col] = CompactColumn(values) if col == time_column else CompactColumn.encode(values, int16)
+        log = cls(columns, len(df), attrs=df.attrs)
+        log.attrs.setdefault('source_columns', list(df.columns))
+        return log
+
+    def __len__(self):
+        return self._rows
+
+    def __contains__(self, col):
+        return col in self._columns
+
+    def __getitem__(self, key):
+        if isinstance(key, (list, tuple, pd.Index)):
+            return pd.DataFrame({col: self._series(col) for col in key}, index=self.index)
+        return self._series(key)
+
+    def _series(self, col):
+        return pd.Series(self._columns[col].decode(), index=self.index, name=col, copy=False)
+
+    def __repr__(self):
+        return f"CompactLog({self._rows} rows × {len(self._columns)} columns, {self.nbytes / 1024 ** 2:.1f} MB)"
+
+    @property
+    def columns(self):
+        return pd.Index(list(self._columns))
+
+    @property
+    def index(self):
+        return pd.RangeIndex(self._start, self._start + self._rows)
+
+    @property
+    def dtypes(self):
+        return pd.Series({col: column.dtype for col, column in self._columns.items()}, dtype=object)
+
+    @property
+    def shape(self):
+        return self._rows, len(self._columns)
+
+    @property
+    def iloc(self):
+        return _RowSlicer(self)
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self._columns.values())
+
+    def to_frame(self):
+        """DataFrame cu valorile decodate (ex. pentru export)"""
+        frame = self[list(self._columns)]
+        frame.attrs.update(self.attrs)
+        return frame
+
+    def memory_report(self):
+        """Memoria containerului față de același log ca float64, plus codarea fiecărei coloane"""
+        frame_bytes = sum(max(column.dtype.itemsize, 8) * self._rows for column in self._columns.values())
+        return {
+            'float64_mb': round(frame_bytes / 1024 ** 2, 3),
+            'compact_mb': round(self.nbytes / 1024 ** 2, 3),
+            'ratio': round(self.nbytes / frame_bytes, 3) if frame_bytes else None,
+            'encodings': {col: column.encoding for col, column in self._columns.items()},
+        }
+
+# ======================================================
+# PACKED MASKS
+# ======================================================
+class PackedMasks:
+    """Măști booleene (ex. regimurile) bit-packed; masks[name] → Series bool"""
+
+    def __init__(self, bits, rows, index=None):
+        self._bits = bits
+        self._rows = int(rows)
+        self.index = index if index is not None else pd.RangeIndex(self._rows)
+
+    @classmethod
+    def from_frame(cls, masks):
+        bits = {col: np.packbits(masks[col].to_numpy(dtype=bool)) for col in masks.columns}
+        return cls(bits, len(masks), masks.index)
+
+    def __len__(self):
+        return self._rows
+
+    def __contains__(self, name):
+        return name in self._bits
+
+    def __getitem__(self, name):
+        values = np.unpackbits(self._bits[name], count=self._rows).view(bool)
+        return pd.Series(values, index=self.index, name=name, copy=False)
+
+    @property
+    def columns(self):
+        return pd.Index(list(self._bits))
+
+    @property
+    def nbytes(self):
+        return sum(bits.nbytes for bits in self._bits.values())
+
+    def to_frame(self):
+        return pd.DataFrame({name: self[name] for name in self._bits}, index=self.index)
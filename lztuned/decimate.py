@@ -0,0 +1,96 @@
+"""Decimare pentru grafice: puține puncte trimise în browser, forma păstrată"""
+import numpy as np
+
+from .accumulators import as_float_array
+
+# Puncte per trace trimise în browser (~ lățimea unui grafic în pixeli)
+MAX_POINTS = 2000
+
+def minmax_indices(values, start=0, stop=None, n_buckets=MAX_POINTS // 2):
+    """Indicii min și max din fiecare bucket (păstrează vârfurile, ex. knock)
+
+    Complet vectorizat: fereastra e împărțită în bucket-uri egale, rearanjată
+    ca matrice 2-D și redusă pe rânduri. Bucket-urile fără date păstrează un
+    punct NaN, astfel încât golurile rămân vizibile în grafic.
+    """
+    y = as_float_array(values)
+    stop = len(y) if stop is None else stop
+    n = stop - start
+    if n <= 2 * n_buckets:
+        return np.arange(start, stop)
+
+    size = -(-n // n_buckets)
+    rows = -(-n // size)
+    seg = np.full(rows * size, np.nan, dtype=y.dtype)
+    seg[:n] = y[start:stop]
+    seg = seg.reshape(rows, size)
+
+    missing = np.isnan(seg)
+    lo = np.where(missing, np.inf, seg).argmin(axis=1)
+    hi = np.where(missing, -np.inf, seg).argmax(axis=1)
+
+    offsets = start + np.arange(rows) * size
+    idx = np.sort(np.stack([offsets + lo, offsets + hi], axis=1), axis=1).ravel()
+    idx = idx[idx < stop]
+    return idx[np.concatenate(([True], np.diff(idx) != 0))]
+
+def lttb_indices(values, start=0, stop=None, n_out=MAX_POINTS):
+    """Largest-Triangle-Three-Buckets: `n_out` puncte care păstrează forma vizuală"""
+    y = as_float_array(values)
+    stop = len(y) if stop is None else stop
+    n = stop - start
+    if n <= n_out or n_out < 3:
+        return np.arange(start, stop)
+
+    y = y[start:stop].astype(np.float64)
+    x = np.arange(n, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_hi = edges[i + 2] if i + 2 < len(edges) else n
+        nxt = y[hi:nxt_hi]
+        avg_x = x[hi:nxt_hi].mean()
+        avg_y = np.nanmean(nxt) if not np.isnan(nxt).all() else y[a]
+
+        # Aria triunghiului (a, candidat, media bucket-ului următor)
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        area = np.nan_to_num(area, nan=-1.0)
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out + start
+
+DECIMATORS = {
+    'minmax': lambda values, start, stop, max_points: minmax_indices(values, start, stop, max_points // 2),
+    'lttb': lambda values, start, stop, max_points: lttb_indices(values, start, stop, max_points),
+}
+
+def decimate(values, start=0, stop=None, max_points=MAX_POINTS, method='minmax'):
+    """(indici, valori) decimate pentru fereastra [start, stop)"""
+    y = as_float_array(values)
+    stop = len(y) if stop is None else min(stop, len(y))
+    idx = DECIMATORS[method](y, start, stop, max_points)
+    return idx, y[idx]
+
+# ======================================================
+# MASK INTERVALS
+# ======================================================
+def mask_intervals(mask, start=0, stop=None, min_gap=0):
+    """Intervalele [început, sfârșit) în care masca e True
+
+    Intervalele separate de cel mult `min_gap` eșantioane sunt unite
+    (sub rezoluția graficului nu s-ar distinge oricum).
+    """
+    mask = np.asarray(mask, dtype=bool)
+    stop = len(mask) if stop is None else min(stop, len(mask))
+    edges = np.diff(np.concatenate(([0], mask[start:stop].view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if starts.size > 1 and min_gap > 0:
+        keep = (starts[1:] - ends[:-1]) > min_gap
+        starts = starts[np.concatenate(([True], keep))]
+        ends = ends[np.concatenate((keep, [True]))]
+    return starts + start, ends + start
@@ -0,0 +1,2079 @@
+"""Motoarele de analiză LZTuned - fără dependențe de UI"""
+import warnings
+
+import pandas as pd
+import numpy as np
+
+from .accumulators import add_bincount, as_float_array, CellStats, ChannelStats, exceeds, ExceedanceCounts, RunningStats, RunningCorr, RunningCorrMatrix, RunningDiff, RunningXcorr, SegmentStats
+from .channels import ChannelMatcher, channel_profiles, header_issues, header_signature, normalize
+from .intervals import IntervalIndex
+from .profiling import profiled
+from .signals import SignalStore
+from .timebase import ChunkTime, Timebase, boundary_time
+from .xcorr import peak_lag
+
+# Versiunea logicii de detecție/regimuri; incrementarea invalidează cache-urile de pe disc
+ENGINE_VERSION = 3
+
+# Pragurile verdictelor (sliderele din UI). Engine-urile extrag o dată
+# trăsăturile independente de praguri; verdictele se recalculează din ele
+# pentru orice profil (score / pipeline.rescore), fără să reanalizeze logul.
+DEFAULT_THRESHOLDS = {
+    'knock_event': 1.2,         # V: eșantion peste prag = eveniment de knock
+    'knock_severe': 1.5,        # V: vârf peste prag = detonație severă
+    'knock_sustained_pct': 5,   # % din eșantioane cu knock = knock susținut
+    'lambda_lean': 0.86,        # lambda medie WOT peste prag = amestec sărac
+    'lambda_rich': 0.78,        # lambda medie WOT sub prag = amestec prea bogat
+    'duty_warning': 85,         # % duty injectoare aproape de limită
+    'duty_critical': 90,        # % duty injectoare saturate
+}
+
+def threshold_profile(overrides=None):
+    """Profilul complet de praguri: DEFAULT_THRESHOLDS cu `overrides` aplicate
+
+    Pragurile critice nu coboară sub cele de avertizare (un slider de knock
+    la 1.8 V face ca și detonația severă să înceapă de la 1.8 V).
+    """
+    unknown = set(overrides or ()) - set(DEFAULT_THRESHOLDS)
+    if unknown:
+        raise ValueError(f"Praguri necunoscute: {', '.join(sorted(unknown))}")
+    profile = {**DEFAULT_THRESHOLDS, **(overrides or {})}
+    profile['knock_severe'] = max(profile['knock_severe'], profile['knock_event'])
+    profile['duty_critical'] = max(profile['duty_critical'], profile['duty_warning'])
+    return profile
+
+def _chunk_time(timebase, chunk):
+    """dt-ul chunk-ului curent; fără Timebase se presupune 1 Hz (comportamentul istoric)"""
+    if timebase is not None and timebase.chunk_time is not None:
+        return timebase.chunk_time
+    return ChunkTime.uniform(len(chunk))
+
+# ======================================================
+# CORE: ENGINE PROTOCOL
+# ======================================================
+class AnalysisEngine:
+    """Protocolul comun al engine-urilor: update(chunk) → merge(parțial) → finalize()
+
+    Starea internă este formată doar din agregate combinabile (numărători,
+    RunningStats, RunningCorr, RunningDiff, ExceedanceCounts), deci același
+    engine rulează pe tot DataFrame-ul, pe chunk-uri în streaming, pe
+    partiții procesate în paralel și unite apoi în ordine cu merge(), sau pe
+    un feed live, cu aceleași rezultate finale.
+    
+    Statisticile simple per canal (null-uri, min/max, medie, dispersie) vin
+    dintr-un ChannelStats partajat, calculat o singură dată de
+    ChannelDetectionEngine; fără el, engine-ul calculează singur doar
+    canalele din STATS_CHANNELS. Semnalele derivate (Lambda_Avg, ...) vin
+    dintr-un SignalStore; engine-urile nu scriu coloane în chunk.
+    """
+    
+    # Canalele standard citite din ChannelStats (None = toate canalele primite)
+    STATS_CHANNELS = ()
+    # Semnalele citite / produse, pentru scheduler-ul DAG: canale standard,
+    # măștile de regim ('modes') și semnale derivate (ex. 'Lambda_Avg').
+    # READS = None înseamnă toate canalele detectate. Semnalele derivate sunt
+    # calculate leneș de SignalStore, deci nu creează dependențe între engine-uri.
+    READS = ()
+    PRODUCES = ()
+    
+    def __init__(self, df, channels, modes=None, timebase=None, stats=None):
+        self.df = df
+        self.channels = channels
+        self.modes = modes
+        self.timebase = timebase
+        self.results = {}
+        self._derived = None
+        self._owns_stats = stats is None
+        if stats is None:
+            names = channels if self.STATS_CHANNELS is None else \
+                [name for name in self.STATS_CHANNELS if name in channels]
+            stats = ChannelStats({name: channels[name] for name in names})
+        self.stats = stats
+    
+    def analyze(self):
+        """Rulează engine-ul pe tot DataFrame-ul, ca un singur chunk"""
+        self.update(self.df, self.modes, _chunk_time(self.timebase, self.df))
+        return self.finalize()
+    
+    def update(self, chunk, modes=None, chunk_time=None):
+        """Acumulează starea dintr-un chunk, cu măștile de regim și timpul lui"""
+        raise NotImplementedError
+    
+    def merge(self, other):
+        """Adaugă starea partiției care urmează imediat după cea a lui self"""
+        raise NotImplementedError
+    
+    def step(self, chunk, signals, chunk_time=None):
+        """update() ca task de scheduler; întoarce semnalele din PRODUCES
+        
+        Semnalele derivate se citesc din SignalStore-ul partajat
+        signals['derived'], deci fiecare e calculat o singură dată per chunk,
+        indiferent câte engine-uri îl folosesc.
+        """
+        self._derived = signals.get('derived')
+        try:
+            self.update(chunk, signals.get('modes'), chunk_time)
+        finally:
+            self._derived = None
+        return {}
+    
+    def finalize(self):
+        """Verdictele finale din starea acumulată (poate fi apelat repetat)"""
+        raise NotImplementedError
+    
+    def _signal(self, chunk, name):
+        """Semnalul derivat `name` pentru chunk, sau None dacă lipsesc canalele"""
+        derived = self._derived
+        if derived is None or derived.frame is not chunk:
+            derived = SignalStore(chunk, self.channels)
+        return derived.get(name)
+    
+    def _update_stats(self, chunk):
+        # Un ChannelStats partajat e actualizat o singură dată, de proprietarul lui
+        if self._owns_stats:
+            self.stats.update(chunk)
+    
+    def _merge_stats(self, other):
+        if self._owns_stats:
+            self.stats.merge(other.stats)
+    
+    def _track_time(self, chunk_time):
+        """Reține timpii de la marginile partiției, pentru pasul de la graniță în merge()"""
+        if self._t_first is None:
+            self._t_first = chunk_time.t_first
+        self._t_last = chunk_time.t_last
+        self._nominal_dt = chunk_time.nominal_dt
+    
+    def _boundary_time(self, other):
+        """(dt, step) al primului eșantion din `other`, ca la procesarea secvențială"""
+        return boundary_time(self._t_last, other._t_first, self._nominal_dt)
+    
+    def _merge_time(self, other):
+        if self._t_first is None:
+            self._t_first = other._t_first
+        if other._t_last is not None:
+            self._t_last = other._t_last
+
+# ======================================================
+# CORE: CHANNEL DETECTION & NORMALIZATION ENGINE
+# ======================================================
+class ChannelDetectionEngine(AnalysisEngine):
+    """Detectează și normalizează coloanele din orice log ECU
+    
+    Aliasurile din CHANNEL_MAP sunt potrivite fuzzy (vezi lztuned.channels),
+    nu doar exact: 'Coolant temp' sau 'Engine Speed (rpm)' sunt recunoscute.
+    """
+    
+    CHANNEL_MAP = {
+        'rpm': ['Motor RPM', 'RPM', 'Engine RPM', 'EngineRPM', 'rpm', 'Engine Speed'],
+        'load': ['Engine load', 'Load', 'Engine Load', 'MAP', 'Manifold Pressure'],
+        'lambda1': ['Lambda #1 integrator ', 'Lambda 1', 'AFR 1', 'Lambda#1', 'O2 Sensor 1'],
+        'lambda2': ['Lambda #2 integrator', 'Lambda 2', 'AFR 2', 'Lambda#2', 'O2 Sensor 2'],
+        'knock1': ['Knock sensor #1', 'Knock 1', 'KnockSensor1', 'Knock #1'],
+        'knock2': ['Knock sensor #2', 'Knock 2', 'KnockSensor2', 'Knock #2'],
+        'inj_time': ['Injection time', 'Injector PW', 'Pulse Width', 'InjTime'],
+        'oil_temp': ['Oil temp.', 'Oil Temp', 'Oil Temperature', 'OilTemp'],
+        'coolant_temp': ['Coolant temp.', 'Coolant Temp', 'Water Temp', 'ECT'],
+        'iat': ['IAT', 'Intake Air Temp', 'Air Temp', 'IntakeTemp'],
+        'egt1': ['EGT 1', 'Exhaust Gas Temp 1', 'EGT#1'],
+        'egt2': ['EGT 2', 'Exhaust Gas Temp 2', 'EGT#2'],
+        'boost': ['Boost', 'Turbo Pressure', 'Manifold Pressure'],
+        'fuel_pressure': ['Fuel Pressure', 'FuelPress', 'Rail Pressure'],
+        'ignition_timing': ['Ignition timing', 'Timing', 'Spark Advance', 'IgnTiming', 'Ignition angle'],
+        'battery_voltage': ['Battery voltage', 'Voltage', 'Batt V', 'VBatt'],
+        'tps': ['TPS', 'Throttle Position', 'Throttle %'],
+        'stft': ['STFT', 'Short Term Fuel Trim', 'FuelTrimShort'],
+        'ltft': ['LTFT', 'Long Term Fuel Trim', 'FuelTrimLong'],
+    }
+    
+    TIME_VARIANTS = ['time', 'Time', 'TIME', 'Timestamp', 'Time (s)', 'Time (ms)', 'Seconds']
+    
+    _matcher = None
+    
+    def __init__(self, df):
+        super().__init__(df, {})
+        # Un DataFrame încărcat cu coloane selectate păstrează header-ul original în attrs
+        self.columns = list(df.attrs.get('source_columns', df.columns))
+        self.time_column = None
+        self.detected = self.channels
+        self.missing = []
+        self.noisy = []
+        self.confidence = {}
+        self.match_scores = {}
+        self.profile_hit = False
+        
+    def detect_channels(self):
+        """Mapează automat coloanele din CSV către canale standard"""
+        self.map_channels()
+        self.update(self.df)
+        self.finalize()
+        
+        return self.detected
+    
+    def map_channels(self, profiles=None):
+        """Mapează doar după header (fără a citi datele)
+        
+        `profiles` (ChannelProfiles) păstrează maparea rezolvată per
+        semnătură de header; implicit, cache-ul din memoria procesului.
+        """
+        profiles = channel_profiles() if profiles is None else profiles
+        signature = header_signature(self.columns, self.CHANNEL_MAP, self.TIME_VARIANTS)
+        profile = profiles.get(signature)
+        self.profile_hit = profile is not None
+        if profile is None:
+            profile = profiles.put(signature, self._match_header())
+        
+        self.time_column = profile['time_column']
+        self.detected.clear()
+        self.detected.update(profile['channels'])
+        self.match_scores = dict(profile['scores'])
+        self.missing = [name for name in self.CHANNEL_MAP if name not in self.detected]
+        # Statisticile tuturor canalelor detectate, partajate cu celelalte engine-uri
+        self.stats = ChannelStats(self.detected)
+        return self.detected
+    
+    def _match_header(self):
+        """Potrivirea fuzzy a header-ului: {'channels', 'scores', 'time_column'}"""
+        cls = type(self)
+        if cls.__dict__.get('_matcher') is None:
+            cls._matcher = ChannelMatcher(cls.CHANNEL_MAP)
+        
+        time_column = next((c for c in self.TIME_VARIANTS if c in self.columns), None)
+        if time_column is None:
+            time_names = {normalize(variant) for variant in self.TIME_VARIANTS}
+            time_column = next((c for c in self.columns if normalize(c) in time_names), None)
+        
+        matches = cls._matcher.match([c for c in self.columns if c != time_column])
+        return {
+            'time_column': time_column,
+            'channels': {name: col for name, (col, _) in matches.items()},
+            'scores': {name: round(score, 3) for name, (_, score) in matches.items()},
+        }
+    
+    def required_columns(self):
+        """Coloanele de citit din CSV: timpul + canalele detectate"""
+        cols = [self.time_column] if self.time_column else []
+        return list(dict.fromkeys(cols + list(self.detected.values())))
+    
+    def update(self, chunk, modes=None, chunk_time=None):
+        """Acumulează statisticile de calitate pentru canalele detectate"""
+        self.stats.update(chunk)
+    
+    def merge(self, other):
+        self.stats.merge(other.stats)
+        return self
+    
+    def finalize(self):
+        """Calculează confidence-ul final pentru fiecare canal detectat"""
+        self.noisy = []
+        for std_name, col in self.detected.items():
+            self.confidence[std_name] = self._assess_signal_quality(std_name, col)
+        return self.detected
+    
+    def _assess_signal_quality(self, std_name, col):
+        """Evaluează calitatea semnalului pentru o coloană"""
+        stats = self.stats[std_name]
+        valid = stats.n
+        
+        if valid == 0:
+            return 0.0
+        
+        # Verificări de calitate
+        null_pct = self.stats.null_count(std_name) / self.stats.rows * 100
+        constant_check = stats.is_constant
+        
+        # Detectare flatline (valori constante consecutive)
+        flatline_pct = 0
+        if not constant_check:
+            consecutive_same = self.stats.repeat_count(std_name) / valid * 100
+            flatline_pct = consecutive_same
+        
+        # Scor de confidence
+        confidence = 100.0
+        confidence -= null_pct
+        if constant_check:
+            confidence = 0
+        elif flatline_pct > 50:
+            confidence -= 40
+            self.noisy.append(col)
+        
+        return max(0, min(100, confidence))
+    
+    def get_report(self):
+        """Returnează raport detaliat despre detectare"""
+        total_possible = len(self.CHANNEL_MAP)
+        detected_count = len(self.detected)
+        
+        report = {
+            'total_channels': len(self.columns),
+            'detected': detected_count,
+            'missing': len(self.missing),
+            'noisy': len(self.noisy),
+            'coverage': (detected_count / total_possible) * 100,
+            # Canalele găsite prin potrivire fuzzy (nu după un alias exact)
+            'fuzzy_matches': {name: {'column': self.detected[name], 'score': score}
+                              for name, score in self.match_scores.items() if score < 1.0},
+            'profile_cached': self.profile_hit,
+            # Duplicatele din header (redenumite de pandas sau cu același nume normalizat)
+            'header_issues': header_issues(self.columns, self.detected.values()),
+        }
+        
+        return report
+
+# ======================================================
+# CORE: OPERATING MODE DETECTION ENGINE
+# ======================================================
+class OperatingModeEngine(AnalysisEngine):
+    """Identifică regimurile de funcționare ale motorului
+
+    Pe lângă măștile per eșantion, fiecare regim este păstrat ca
+    IntervalIndex în `intervals` (rânduri și secunde din tot logul), și în
+    streaming, unde măștile nu se păstrează.
+    """
+    
+    MODES = ('Idle', 'Cruise', 'Acceleration', 'WOT', 'Overrun', 'Heat_Soak')
+    READS = ('rpm', 'load', 'tps', 'coolant_temp', 'oil_temp')
+    PRODUCES = ('modes',)
+    
+    def __init__(self, df, channels, timebase=None):
+        super().__init__(df, channels, None, timebase)
+        self._rows = 0
+        self._counts = dict.fromkeys(self.MODES, 0)
+        self._rate_diff = RunningDiff()
+        # Condiția de sarcină/RPM a primului rând, pentru Acceleration la granița din merge()
+        self._first_accel_cond = None
+        self._t_first = self._t_last = None
+        self._nominal_dt = 1.0
+        self.intervals = {mode: IntervalIndex() for mode in self.MODES}
+        # Secundele (suma dt) din rândurile procesate, pentru timpii intervalelor
+        self._clock = 0.0
+        
+    def detect_modes(self):
+        """Detectează toate regimurile de funcționare"""
+        self.modes = self.update(self.df, chunk_time=_chunk_time(self.timebase, self.df))
+        return self.modes
+    
+    def step(self, chunk, signals, chunk_time=None):
+        return {'modes': self.update(chunk, chunk_time=chunk_time)}
+    
+    def load_modes(self, modes, chunk_time=None):
+        """Folosește măști de regim deja calculate (ex. din ColumnStore)"""
+        self.modes = modes
+        self._append_intervals(modes, chunk_time or ChunkTime.uniform(len(modes)))
+        self._rows += len(modes)
+        for mode in self.MODES:
+            self._counts[mode] += int(modes[mode].sum())
+        return self.modes
+    
+    def update(self, chunk, modes=None, chunk_time=None):
+        """Detectează regimurile pentru un chunk și returnează măștile lui
+
+        `chunk_time` (ChunkTime) dă pasul real de timp pentru ratele TPS/load;
+        implicit se presupune 1 Hz.
+        """
+        if chunk_time is None:
+            chunk_time = ChunkTime.uniform(len(chunk))
+        self._track_time(chunk_time)
+        modes = pd.DataFrame(index=chunk.index)
+        rpm = self._get_channel(chunk, 'rpm', 0)
+        load = self._get_channel(chunk, 'load', 0)
+        tps = self._get_channel(chunk, 'tps', 0)
+        
+        # IDLE: RPM < 1500, Load < 30%
+        modes['Idle'] = (rpm < 1500) & (load < 30)
+        
+        # CRUISE: RPM 1500-4000, Load 30-60%, TPS stabil
+        modes['Cruise'] = (rpm >= 1500) & (rpm <= 4000) & (load >= 30) & (load <= 60)
+        
+        # ACCELERATION: TPS rate > 5%/s, Load crescător
+        # (diff-ul continuă de la ultima valoare din chunk-ul anterior; rata e pe secundă)
+        if 'tps' in self.channels:
+            tps_rate = pd.Series(chunk_time.rate(self._rate_diff.update(tps)), index=chunk.index).fillna(0)
+            accel_cond = load > 40
+            modes['Acceleration'] = (tps_rate > 5) & accel_cond
+        else:
+            load_rate = pd.Series(chunk_time.rate(self._rate_diff.update(load)), index=chunk.index).fillna(0)
+            accel_cond = rpm > 2000
+            modes['Acceleration'] = (load_rate > 10) & accel_cond
+        if self._first_accel_cond is None and len(chunk):
+            self._first_accel_cond = bool(accel_cond.iloc[0])
+        
+        # WOT: Load > 70%, RPM > 3000
+        modes['WOT'] = (load > 70) & (rpm > 3000)
+        
+        # OVERRUN: TPS < 5%, RPM > 2000 (deceleration cu motor brake)
+        if 'tps' in self.channels:
+            modes['Overrun'] = (tps < 5) & (rpm > 2000)
+        else:
+            modes['Overrun'] = (load < 20) & (rpm > 2000)
+        
+        # HEAT SOAK: Coolant > 95°C sau Oil > 110°C
+        coolant = self._get_channel(chunk, 'coolant_temp', 0)
+        oil = self._get_channel(chunk, 'oil_temp', 0)
+        modes['Heat_Soak'] = (coolant > 95) | (oil > 110)
+        
+        self._append_intervals(modes, chunk_time)
+        self._rows += len(chunk)
+        for mode in self.MODES:
+            self._counts[mode] += int(modes[mode].sum())
+        
+        return modes
+    
+    def merge(self, other):
+        """Unește numărătorile; reface Acceleration pe primul rând al lui `other`
+
+        Măștile deja returnate de update() nu se modifică: la graniță,
+        primul rând al partiției a fost evaluat fără rândul anterior.
+        """
+        dt, step = self._boundary_time(other)
+        # Timpii din `other` după primul rând au fost calculați cu pasul nominal
+        shift = dt - other._nominal_dt if other._rows else 0.0
+        for mode in self.MODES:
+            self.intervals[mode] = self.intervals[mode].concat(
+                other.intervals[mode].shift(self._rows, self._clock, shift))
+        self._clock += other._clock + shift
+        boundary = self._rate_diff.merge(other._rate_diff)
+        threshold = 5 if 'tps' in self.channels else 10
+        with np.errstate(invalid='ignore'):
+            if other._first_accel_cond and boundary / step > threshold:
+                self._counts['Acceleration'] += 1
+        self._rows += other._rows
+        for mode in self.MODES:
+            self._counts[mode] += other._counts[mode]
+        if self._first_accel_cond is None:
+            self._first_accel_cond = other._first_accel_cond
+        self._merge_time(other)
+        return self
+    
+    def finalize(self):
+        return self.get_mode_summary()
+    
+    def _append_intervals(self, modes, chunk_time):
+        """Adaugă intervalele regimurilor din chunk (continuă intervalele deschise)"""
+        chunk_intervals = IntervalIndex.from_masks(modes, chunk_time.dt, self._rows, self._clock, self.MODES)
+        for mode in self.MODES:
+            self.intervals[mode] = self.intervals[mode].concat(chunk_intervals[mode])
+        self._clock = chunk_intervals[self.MODES[0]].t_total
+    
+    def _get_channel(self, chunk, name, default):
+        """Helper pentru a obține canal cu fallback"""
+        if name in self.channels:
+            col = self.channels[name]
+            return chunk[col].fillna(default)
+        return pd.Series(default, index=chunk.index)
+    
+    def get_mode_summary(self):
+        """Returnează statistici despre regimuri"""
+        summary = {}
+        for mode, count in self._counts.items():
+            pct = (count / self._rows) * 100 if self._rows else 0.0
+            summary[mode] = {'count': int(count), 'percentage': round(pct, 1), **self.intervals[mode].summary()}
+        return summary
+
+# ======================================================
+# CORE: ADVANCED FUEL ANALYSIS ENGINE
+# ======================================================
+class FuelAnalysisEngine(AnalysisEngine):
+    """Analiză avansată a sistemului de alimentare
+
+    finalize() extrage trăsăturile (extract_features) și le transformă în
+    verdicte cu score(), care poate fi rerulat pe aceleași trăsături cu alt
+    profil de praguri.
+    """
+    
+    STATS_CHANNELS = ('stft',)
+    READS = ('modes', 'lambda1', 'lambda2', 'inj_time', 'rpm', 'stft')
+    
+    def __init__(self, df, channels, modes, stats=None, thresholds=None):
+        super().__init__(df, channels, modes, stats=stats)
+        self.thresholds = threshold_profile(thresholds)
+        self.features = {}
+        self._wot_rows = 0
+        self._wot_lambda = RunningStats()
+        self._duty = RunningStats()
+        self._wot_rpm_duty = RunningCorr()
+        self._wot_duty_lambda = RunningCorr()
+    
+    def update(self, chunk, modes=None, chunk_time=None):
+        """Acumulează statisticile de fuel dintr-un chunk"""
+        wot = modes['WOT'].to_numpy(dtype=bool)
+        self._wot_rows += int(wot.sum())
+        
+        lambda_avg = self._update_lambda(chunk, wot)
+        duty = self._update_injector_duty(chunk, wot)
+        self._update_stats(chunk)
+        
+        # Linearitate: duty vs lambda în WOT
+        if lambda_avg is not None and duty is not None:
+            self._wot_duty_lambda.update(duty[wot], lambda_avg[wot])
+    
+    def merge(self, other):
+        self._wot_rows += other._wot_rows
+        self._wot_lambda.merge(other._wot_lambda)
+        self._duty.merge(other._duty)
+        self._wot_rpm_duty.merge(other._wot_rpm_duty)
+        self._merge_stats(other)
+        self._wot_duty_lambda.merge(other._wot_duty_lambda)
+        return self
+    
+    def finalize(self):
+        """Calculează verdictele finale din statisticile acumulate"""
+        # Reconstruit la fiecare apel: finalize poate rula repetat (modul live)
+        self.features = self.extract_features()
+        self.results = self.score(self.features, self.thresholds)
+        return self.results
+    
+    @profiled
+    def extract_features(self):
+        """Trăsăturile independente de praguri, din statisticile acumulate"""
+        has = lambda *names: all(name in self.channels for name in names)
+        wot_rows = self._wot_rows
+        features = {'wot_rows': wot_rows, 'lambda': None, 'duty': None, 'stft': None,
+                    'ltft': has('ltft'), 'duty_lambda_corr': None}
+        if has('lambda1'):
+            features['lambda'] = {'sensors': 2 if has('lambda2') else 1}
+            if wot_rows > 0:
+                features['lambda'].update(mean=self._wot_lambda.avg, std=self._wot_lambda.std,
+                                          min=self._wot_lambda.min)
+        if has('inj_time', 'rpm'):
+            features['duty'] = {
+                'max': self._duty.max,
+                'linearity': abs(self._wot_rpm_duty.r_value) if wot_rows > 10 else 0,
+            }
+        if has('stft'):
+            features['stft'] = {'mean': self.stats['stft'].avg, 'std': self.stats['stft'].std}
+        if has('lambda1', 'inj_time', 'rpm') and wot_rows > 10:
+            features['duty_lambda_corr'] = self._wot_duty_lambda.corr
+        return features
+    
+    @classmethod
+    def score(cls, features, thresholds=None):
+        """Verdictele pentru un profil de praguri, doar din trăsături (microsecunde)"""
+        thresholds = threshold_profile(thresholds)
+        results = {
+            'lambda': cls._analyze_lambda(features, thresholds),
+            'duty': cls._analyze_injector_duty(features, thresholds),
+            'fuel_trim': cls._analyze_fuel_trims(features),
+            'linearity': cls._analyze_linearity(features),
+        }
+        return {name: result for name, result in results.items() if result is not None}
+    
+    @profiled
+    def _update_lambda(self, chunk, wot):
+        lambda_avg = self._signal(chunk, 'Lambda_Avg')
+        
+        if lambda_avg is None:
+            return None
+        
+        lambda_avg = as_float_array(lambda_avg)
+        self._wot_lambda.update(lambda_avg[wot])
+        return lambda_avg
+    
+    @profiled
+    def _update_injector_duty(self, chunk, wot):
+        duty = self._signal(chunk, 'Inj_Duty')
+        
+        if duty is None:
+            return None
+        
+        rpm = self._get_channel(chunk, 'rpm')
+        duty = as_float_array(duty)
+        self._duty.update(duty)
+        self._wot_rpm_duty.update(as_float_array(rpm)[wot], duty[wot])
+        return duty
+    
+    @staticmethod
+    def _analyze_lambda(features, thresholds):
+        """Analiză Lambda cu separare pe regimuri"""
+        wot_lambda = features['lambda']
+        if wot_lambda is None:
+            return {'status': 'NO_DATA', 'confidence': 0}
+        
+        # Analiză pe WOT
+        if features['wot_rows'] > 0:
+            mean_wot = wot_lambda['mean']
+            
+            # Verdict
+            if mean_wot > thresholds['lambda_lean']:
+                status = 'LEAN_DANGER'
+                severity = 'CRITICAL'
+            elif mean_wot < thresholds['lambda_rich']:
+                status = 'RICH_INEFFICIENT'
+                severity = 'WARNING'
+            else:
+                status = 'OPTIMAL'
+                severity = 'SAFE'
+            
+            return {
+                'status': status,
+                'severity': severity,
+                'mean_wot': round(mean_wot, 3),
+                'std_wot': round(wot_lambda['std'], 3),
+                'min_wot': round(wot_lambda['min'], 3),
+                'confidence': 95 if wot_lambda['sensors'] == 2 else 75
+            }
+        return {
+            'status': 'NO_WOT_DATA',
+            'confidence': 0
+        }
+    
+    @staticmethod
+    def _analyze_injector_duty(features, thresholds):
+        """Analiză duty cycle injectoare"""
+        duty = features['duty']
+        if duty is None:
+            return {'status': 'NO_DATA', 'confidence': 0}
+        
+        max_duty = duty['max']
+        
+        # Verdict
+        if max_duty > thresholds['duty_critical']:
+            status = 'SATURATED'
+            severity = 'CRITICAL'
+        elif max_duty > thresholds['duty_warning']:
+            status = 'NEAR_LIMIT'
+            severity = 'WARNING'
+        else:
+            status = 'HEALTHY'
+            severity = 'SAFE'
+        
+        return {
+            'status': status,
+            'severity': severity,
+            'max_duty': round(max_duty, 1),
+            'linearity': round(duty['linearity'], 2),
+            'confidence': 90
+        }
+    
+    @staticmethod
+    def _analyze_fuel_trims(features):
+        """Analiză fuel trim (STFT/LTFT)"""
+        stft = features['stft']
+        if stft is None and not features['ltft']:
+            return {'status': 'NO_DATA', 'confidence': 0}
+        
+        # Analiză deviație
+        if stft is not None:
+            if abs(stft['mean']) > 10:
+                status = 'ADAPTATION_ACTIVE'
+                severity = 'WARNING'
+            else:
+                status = 'STABLE'
+                severity = 'SAFE'
+            
+            return {
+                'status': status,
+                'severity': severity,
+                'stft_mean': round(stft['mean'], 2),
+                'stft_std': round(stft['std'], 2),
+                'confidence': 85
+            }
+        return None
+    
+    @staticmethod
+    def _analyze_linearity(features):
+        """Verifică liniaritatea fuel delivery"""
+        # Duty crescător ar trebui să producă Lambda descrescător
+        correlation = features['duty_lambda_corr']
+        
+        if correlation is not None and correlation > -0.3:  # Corelație slabă sau pozitivă = PROBLEMĂ
+            return {
+                'status': 'NON_LINEAR',
+                'severity': 'WARNING',
+                'correlation': round(correlation, 2),
+                'explanation': 'Creșterea duty-ului nu produce scădere lambda → injectoare subdimensionate sau presiune inconsistentă'
+            }
+        return None
+    
+    def _get_channel(self, chunk, name):
+        """Helper cu None fallback"""
+        if name in self.channels:
+            return chunk[self.channels[name]]
+        return None
+
+# ======================================================
+# CORE: ADVANCED IGNITION ANALYSIS ENGINE
+# ======================================================
+class IgnitionAnalysisEngine(AnalysisEngine):
+    """Analiză avansată a sistemului de aprindere
+
+    Evenimentele și burst-urile de knock se numără exact la pragul
+    profilului și pe o grilă fixă de valori (ExceedanceCounts) pentru
+    celelalte, deci score() le renumără cu searchsorted pentru orice prag.
+    """
+    
+    READS = ('modes', 'knock1', 'knock2', 'ignition_timing', 'Lambda_Avg')
+    
+    def __init__(self, df, channels, modes, thresholds=None):
+        super().__init__(df, channels, modes)
+        self.thresholds = threshold_profile(thresholds)
+        self.features = {}
+        self._rows = 0
+        self._wot_rows = 0
+        self._knock = RunningStats()
+        # Exact la pragul de eveniment al profilului, pe grilă pentru celelalte praguri
+        self._knock_counts = ExceedanceCounts((self.thresholds['knock_event'],))
+        self._wot_timing = RunningStats()
+        self._knock_lambda = RunningCorr()
+    
+    def update(self, chunk, modes=None, chunk_time=None):
+        """Acumulează statisticile de ignition dintr-un chunk"""
+        wot = modes['WOT'].to_numpy(dtype=bool)
+        self._rows += len(chunk)
+        self._wot_rows += int(wot.sum())
+        
+        knock_peak = self._update_knock(chunk)
+        
+        timing = self._get_channel(chunk, 'ignition_timing')
+        if timing is not None:
+            self._wot_timing.update(as_float_array(timing)[wot])
+        
+        # Corelație knock ↔ lambda
+        lambda_avg = self._signal(chunk, 'Lambda_Avg') if knock_peak is not None else None
+        if lambda_avg is not None:
+            self._knock_lambda.update(knock_peak, lambda_avg)
+    
+    def merge(self, other):
+        self._rows += other._rows
+        self._wot_rows += other._wot_rows
+        self._knock.merge(other._knock)
+        self._knock_counts.merge(other._knock_counts)
+        self._wot_timing.merge(other._wot_timing)
+        self._knock_lambda.merge(other._knock_lambda)
+        return self
+    
+    def finalize(self):
+        """Calculează verdictele finale din statisticile acumulate"""
+        self.features = self.extract_features()
+        self.results = self.score(self.features, self.thresholds)
+        return self.results
+    
+    @profiled
+    def extract_features(self):
+        """Trăsăturile independente de praguri, din statisticile acumulate"""
+        features = {'rows': self._rows, 'knock': None, 'timing_std': None, 'knock_lambda_corr': None}
+        if 'knock1' in self.channels:
+            features['knock'] = {
+                'max': self._knock.max,
+                'mean': self._knock.avg,
+                'sensors': 2 if 'knock2' in self.channels else 1,
+                **self._knock_counts.features(),
+            }
+            # Corelație cu Lambda (doar dacă Lambda_Avg a fost disponibil)
+            if self._knock_lambda.rows > 0:
+                features['knock_lambda_corr'] = self._knock_lambda.corr
+        if 'ignition_timing' in self.channels and self._wot_rows > 0:
+            features['timing_std'] = self._wot_timing.std
+        return features
+    
+    @classmethod
+    def score(cls, features, thresholds=None):
+        """Verdictele pentru un profil de praguri, doar din trăsături (microsecunde)"""
+        thresholds = threshold_profile(thresholds)
+        results = {
+            'knock': cls._analyze_knock(features, thresholds),
+            'timing_stability': cls._analyze_timing_stability(features),
+            'knock_cause': cls._analyze_knock_correlation(features),
+        }
+        return {name: result for name, result in results.items() if result is not None}
+    
+    @profiled
+    def _update_knock(self, chunk):
+        knock_peak = self._signal(chunk, 'Knock_Peak')
+        
+        if knock_peak is None:
+            return None
+        
+        knock_peak = as_float_array(knock_peak)
+        self._knock.update(knock_peak)
+        self._knock_counts.update(knock_peak)
+        return knock_peak
+    
+    @staticmethod
+    def _analyze_knock(features, thresholds):
+        """Analiză detonație cu clustering și threshold adaptat"""
+        knock = features['knock']
+        # Fără eșantioane (log gol, fereastră vidă) nu există frecvență a evenimentelor
+        if knock is None or not features['rows']:
+            return {'status': 'NO_DATA', 'confidence': 0}
+        
+        # Statistici
+        max_knock = knock['max']
+        mean_knock = knock['mean']
+        
+        # Detectare evenimente knock (peste pragul de eveniment, implicit 1.2V)
+        # și clustering (eventi în burst vs sporadic); trăsăturile unei ferestre
+        # (WindowIndex) vin deja numărate la pragul profilului
+        if 'values' in knock:
+            knock_events = ExceedanceCounts.events(knock, thresholds['knock_event'])
+            knock_bursts = ExceedanceCounts.bursts(knock, thresholds['knock_event'])
+        else:
+            knock_events, knock_bursts = knock['events'], knock['bursts']
+        knock_event_pct = (knock_events / features['rows']) * 100
+        
+        # Verdict
+        if max_knock > thresholds['knock_severe']:
+            status = 'SEVERE_DETONATION'
+            severity = 'CRITICAL'
+        elif knock_events > 0:
+            if knock_event_pct > thresholds['knock_sustained_pct']:
+                status = 'SUSTAINED_KNOCK'
+                severity = 'CRITICAL'
+            else:
+                status = 'SPORADIC_KNOCK'
+                severity = 'WARNING'
+        else:
+            status = 'SAFE'
+            severity = 'SAFE'
+        
+        return {
+            'status': status,
+            'severity': severity,
+            'max_knock': round(max_knock, 3),
+            'mean_knock': round(mean_knock, 3),
+            'events': int(knock_events),
+            'event_pct': round(knock_event_pct, 2),
+            'bursts': int(knock_bursts),
+            'confidence': 90 if knock['sensors'] == 2 else 70
+        }
+    
+    @staticmethod
+    def _analyze_timing_stability(features):
+        """Analiză stabilitate avans la aprindere"""
+        std_timing = features['timing_std']
+        if std_timing is None:
+            return None
+        
+        if std_timing > 3:
+            status = 'UNSTABLE'
+            severity = 'WARNING'
+        else:
+            status = 'STABLE'
+            severity = 'SAFE'
+        
+        return {
+            'status': status,
+            'severity': severity,
+            'std': round(std_timing, 2),
+            'confidence': 80
+        }
+    
+    @staticmethod
+    def _analyze_knock_correlation(features):
+        """Analiză corelație knock cu alți parametri"""
+        lambda_corr = features['knock_lambda_corr']
+        if lambda_corr is None:
+            return None
+        
+        if abs(lambda_corr) < 0.2:
+            # Knock independent de lambda = PROBLEMA MECHANICĂ
+            return {
+                'type': 'MECHANICAL',
+                'explanation': 'Knock apare independent de lambda → zgomot mecanic sau timing problem, nu fueling'
+            }
+        return {
+            'type': 'FUELING_RELATED',
+            'explanation': 'Knock corelat cu lambda → verifică amestec și calitate combustibil'
+        }
+    
+    def _get_channel(self, chunk, name):
+        if name in self.channels:
+            return chunk[self.channels[name]]
+        return None
+
+# ======================================================
+# CORE: THERMAL & MECHANICAL STRESS ENGINE
+# ======================================================
+class ThermalStressEngine(AnalysisEngine):
+    """Analiză stres termic și mecanic
+
+    Ca la fuel / ignition, finalize() extrage trăsăturile (maxime, timpul
+    peste OIL_HIGH, rata maximă) și score() le transformă în verdicte;
+    WindowIndex construiește aceleași trăsături pentru o fereastră din log.
+    """
+    
+    STATS_CHANNELS = ('oil_temp', 'coolant_temp', 'egt1')
+    READS = ('oil_temp', 'coolant_temp', 'egt1')
+    # °C: uleiul peste prag se numără ca timp petrecut la temperatură ridicată
+    OIL_HIGH = 110
+    
+    def __init__(self, df, channels, timebase=None, stats=None):
+        super().__init__(df, channels, None, timebase, stats)
+        self.features = {}
+        self._oil_high_s = 0.0
+        self._oil_diff = RunningDiff()
+        self._oil_max_rate = np.nan
+        self._oil_first_high = None
+        self._t_first = self._t_last = None
+        self._nominal_dt = 1.0
+    
+    def update(self, chunk, modes=None, chunk_time=None):
+        """Acumulează statisticile termice dintr-un chunk (implicit 1 Hz)"""
+        if chunk_time is None:
+            chunk_time = ChunkTime.uniform(len(chunk))
+        self._track_time(chunk_time)
+        self._update_stats(chunk)
+        oil = self._get_channel(chunk, 'oil_temp')
+        if oil is not None:
+            oil = as_float_array(oil)
+            if self._oil_first_high is None and oil.size:
+                self._oil_first_high = bool(oil[0] > self.OIL_HIGH)
+            self._oil_high_s += chunk_time.duration(oil > self.OIL_HIGH)
+            
+            # Rata °C/s peste granița dintre chunk-uri, pe pasul real de timp
+            rate = np.abs(chunk_time.rate(self._oil_diff.update(oil)))
+            if rate.size and not np.isnan(rate).all():
+                self._oil_max_rate = np.fmax(self._oil_max_rate, np.nanmax(rate))
+    
+    def merge(self, other):
+        """Unește statisticile; corectează pasul și rata la granița cu `other`"""
+        dt, step = self._boundary_time(other)
+        if other._oil_first_high:
+            # Primul rând din `other` a fost numărat cu pasul nominal
+            self._oil_high_s += dt - other._nominal_dt
+        with np.errstate(invalid='ignore'):
+            rate = abs(self._oil_diff.merge(other._oil_diff) / step)
+        self._oil_max_rate = np.fmax(np.fmax(self._oil_max_rate, rate), other._oil_max_rate)
+        self._oil_high_s += other._oil_high_s
+        self._merge_stats(other)
+        if self._oil_first_high is None:
+            self._oil_first_high = other._oil_first_high
+        self._merge_time(other)
+        return self
+    
+    def finalize(self):
+        """Calculează verdictele finale din statisticile acumulate"""
+        self.features = self.extract_features()
+        self.results = self.score(self.features)
+        return self.results
+    
+    @profiled
+    def extract_features(self):
+        """Maximele, timpul cu uleiul peste OIL_HIGH și rata maximă a uleiului"""
+        features = {'oil': None, 'coolant_max': None, 'egt_max': None}
+        if 'oil_temp' in self.channels:
+            features['oil'] = {
+                'max': self.stats['oil_temp'].max,
+                'high_s': self._oil_high_s,
+                'max_rate': self._oil_max_rate,
+            }
+        if 'coolant_temp' in self.channels:
+            features['coolant_max'] = self.stats['coolant_temp'].max
+        if 'egt1' in self.channels:
+            features['egt_max'] = self.stats['egt1'].max
+        return features
+    
+    @classmethod
+    def score(cls, features):
+        """Verdictele termice, doar din trăsături"""
+        results = {
+            'oil': cls._analyze_oil_stress(features),
+            'coolant': cls._analyze_coolant_stress(features),
+            'egt': cls._analyze_egt(features),
+            'thermal_shock': cls._analyze_thermal_rate(features),
+        }
+        return {name: result for name, result in results.items() if result is not None}
+    
+    @staticmethod
+    def _analyze_oil_stress(features):
+        """Analiză stres termic ulei"""
+        oil = features['oil']
+        if oil is None:
+            return {'status': 'NO_DATA'}
+        
+        max_oil = oil['max']
+        
+        # Detectare sustained high temp (durata reală, din dt)
+        high_temp_minutes = oil['high_s'] / 60
+        
+        if max_oil > 125:
+            status = 'CRITICAL_OVERHEAT'
+            severity = 'CRITICAL'
+        elif max_oil > 115:
+            status = 'OVERHEAT'
+            severity = 'WARNING'
+        elif high_temp_minutes > 5:
+            status = 'SUSTAINED_HIGH'
+            severity = 'WARNING'
+        else:
+            status = 'HEALTHY'
+            severity = 'SAFE'
+        
+        return {
+            'status': status,
+            'severity': severity,
+            'max': round(max_oil, 1),
+            'sustained_high_min': round(high_temp_minutes, 1),
+            'confidence': 90
+        }
+    
+    @staticmethod
+    def _analyze_coolant_stress(features):
+        """Analiză stres termic coolant"""
+        max_coolant = features['coolant_max']
+        if max_coolant is None:
+            return None
+        
+        if max_coolant > 105:
+            status = 'OVERHEATING'
+            severity = 'CRITICAL'
+        elif max_coolant > 98:
+            status = 'HIGH'
+            severity = 'WARNING'
+        else:
+            status = 'NORMAL'
+            severity = 'SAFE'
+        
+        return {
+            'status': status,
+            'severity': severity,
+            'max': round(max_coolant, 1),
+            'confidence': 90
+        }
+    
+    @staticmethod
+    def _analyze_egt(features):
+        """Analiză EGT (Exhaust Gas Temperature)"""
+        max_egt = features['egt_max']
+        if max_egt is None:
+            return None
+        
+        if max_egt > 950:
+            status = 'TURBO_RISK'
+            severity = 'CRITICAL'
+        elif max_egt > 900:
+            status = 'HIGH'
+            severity = 'WARNING'
+        else:
+            status = 'SAFE'
+            severity = 'SAFE'
+        
+        return {
+            'status': status,
+            'severity': severity,
+            'max': round(max_egt, 0),
+            'confidence': 85
+        }
+    
+    @staticmethod
+    def _analyze_thermal_rate(features):
+        """Analiză rată de creștere termică"""
+        if features['oil'] is None:
+            return None
+        
+        # Rata maximă (°C/sec)
+        max_rate = features['oil']['max_rate']
+        
+        if max_rate > 5:
+            return {
+                'status': 'RAPID_CHANGE',
+                'severity': 'WARNING',
+                'max_rate': round(max_rate, 2),
+                'explanation': 'Schimbare termică rapidă poate cauza stress material'
+            }
+        return None
+    
+    def _get_channel(self, chunk, name):
+        if name in self.channels:
+            return chunk[self.channels[name]]
+        return None
+
+# ======================================================
+# CORE: ELECTRICAL HEALTH ENGINE
+# ======================================================
+class ElectricalHealthEngine(AnalysisEngine):
+    """Analiză sănătate electrică și senzori"""
+    
+    STATS_CHANNELS = None
+    READS = None
+    
+    def __init__(self, df, channels, stats=None):
+        super().__init__(df, channels, stats=stats)
+    
+    def update(self, chunk, modes=None, chunk_time=None):
+        """Acumulează statisticile pe senzori dintr-un chunk"""
+        self._update_stats(chunk)
+    
+    def merge(self, other):
+        self._merge_stats(other)
+        return self
+    
+    def finalize(self):
+        """Calculează verdictele finale din statisticile acumulate"""
+        self.results = {}
+        self._analyze_voltage()
+        self._analyze_sensor_health()
+        
+        return self.results
+    
+    @profiled
+    def _analyze_voltage(self):
+        """Analiză stabilitate voltage"""
+        if 'battery_voltage' not in self.channels:
+            return
+        
+        voltage = self.stats['battery_voltage']
+        min_v = voltage.min
+        max_v = voltage.max
+        std_v = voltage.std
+        
+        if min_v < 12.5:
+            status = 'LOW_VOLTAGE'
+            severity = 'WARNING'
+        elif std_v > 1.0:
+            status = 'UNSTABLE'
+            severity = 'WARNING'
+        else:
+            status = 'STABLE'
+            severity = 'SAFE'
+        
+        self.results['voltage'] = {
+            'status': status,
+            'severity': severity,
+            'min': round(min_v, 2),
+            'max': round(max_v, 2),
+            'std': round(std_v, 2),
+            'confidence': 85
+        }
+    
+    @profiled
+    def _analyze_sensor_health(self):
+        """Detectare senzori defecți (flatline, dropout)"""
+        sensor_issues = []
+        
+        for sensor_name in self.channels:
+            # Flatline detection
+            if self.stats[sensor_name].is_constant:
+                sensor_issues.append({
+                    'sensor': sensor_name,
+                    'issue': 'FLATLINE',
+                    'description': f'{sensor_name} returnează valoare constantă'
+                })
+            
+            # Dropout detection (mai mult de 10% null)
+            if not self.stats.rows:
+                continue
+            null_pct = self.stats.null_count(sensor_name) / self.stats.rows * 100
+            if null_pct > 10:
+                sensor_issues.append({
+                    'sensor': sensor_name,
+                    'issue': 'DROPOUT',
+                    'description': f'{sensor_name} are {null_pct:.1f}% date lipsă'
+                })
+        
+        if sensor_issues:
+            self.results['sensor_health'] = {
+                'status': 'ISSUES_DETECTED',
+                'issues': sensor_issues,
+                'confidence': 75
+            }
+    
+# ======================================================
+# CORE: ANOMALY DETECTION ENGINE
+# ======================================================
+class AnomalyDetectionEngine(AnalysisEngine):
+    """Detectare anomalii: scor robust (mediană/MAD locală) pe toate canalele deodată
+
+    Canalele detectate formează o matrice 2-D (eșantioane × canale) procesată
+    în blocuri consecutive de `window` eșantioane (~WINDOW_S secunde). Pentru
+    fiecare bloc se calculează mediana și MAD-ul (prin partiționare, O(n)),
+    iar scorul este modified z-score-ul Iglewicz-Hoaglin față de ele, deci o
+    deriva lentă (ex. încălzirea uleiului) nu maschează spike-urile locale.
+    MAD-ul are ca prag minim pasul de cuantizare al canalului, calibrat o
+    singură dată din primele eșantioane (calibrate()), ca semnalele în trepte
+    să nu dea scoruri infinite. Eșantioanele consecutive peste prag devin
+    evenimente în tabelul `table` (start, end, channel, peak_score).
+    
+    Blocurile sunt aliniate la indexul global al rândurilor (RangeIndex,
+    ca în iter_chunks): o partiție care începe în interiorul unui bloc
+    păstrează rândurile până la primul bloc aliniat (`_head`) nescorate,
+    iar merge() le scorează împreună cu blocul parțial al partiției
+    anterioare.
+    """
+    
+    WINDOW_S = 5.0
+    MIN_WINDOW = 16
+    THRESHOLD = 3.5
+    # Felii de rânduri procesate odată (memoria matricei 2-D e limitată)
+    SLICE_ROWS = 1 << 16
+    READS = None
+    
+    def __init__(self, df, channels, timebase=None):
+        super().__init__(df, channels, None, timebase)
+        self.sensors = list(channels)
+        self.columns = [channels[name] for name in self.sensors]
+        self.window = max(self.MIN_WINDOW, (timebase or Timebase()).window_samples(self.WINDOW_S))
+        self.anomalies = []
+        self.table = None
+        self._carry = np.empty((0, len(self.columns)))
+        self._head = self._carry
+        # Rânduri până la primul bloc aliniat; None până la primul chunk
+        self._lead = None
+        self._offset = 0
+        self._quantum = None
+        self._flagged = np.zeros(len(self.columns), dtype=np.int64)
+        self._events = []
+        self._rpm_diff = RunningDiff()
+        self._rpm_drops = 0
+        
+    def detect(self):
+        """Detectează anomalii în toate canalele principale"""
+        self.update(self.df)
+        return self.finalize()
+    
+    analyze = detect
+    
+    def calibrate(self, head):
+        """Pasul de cuantizare per canal: cel mai mic |diff| nenul din `head`
+        
+        Partițiile aceluiași log trebuie calibrate din același head, ca
+        scorurile lor să fie identice cu ale unei rulări secvențiale.
+        """
+        head = head.iloc[:Timebase.CALIBRATION_SAMPLES]
+        self._quantum = np.full(len(self.columns), np.inf)
+        for i, col in enumerate(self.columns):
+            steps = np.abs(np.diff(as_float_array(head[col]).astype(np.float64)))
+            steps = steps[steps > 0]
+            if steps.size:
+                self._quantum[i] = steps.min()
+        return self
+    
+    def update(self, chunk, modes=None, chunk_time=None):
+        """Scorează blocurile complete din chunk; restul rămâne în carry"""
+        # Detectare sudden drops (căderi bruște)
+        rpm_col = self.channels.get('rpm')
+        if rpm_col:
+            rpm_diff = np.abs(self._rpm_diff.update(chunk[rpm_col]))
+            self._rpm_drops += int((rpm_diff > 1000).sum())  # Drop > 1000 RPM
+        
+        if self._lead is None and len(chunk):
+            first = int(chunk.index[0]) if isinstance(chunk.index, pd.RangeIndex) else 0
+            self._lead = -first % self.window
+        if not self.columns or len(chunk) == 0:
+            return
+        if self._quantum is None:
+            self.calibrate(chunk)
+        
+        # Felii de rânduri: memoria matricei 2-D e limitată și pentru un DataFrame întreg
+        for start in range(0, len(chunk), self.SLICE_ROWS):
+            part = chunk.iloc[start:start + self.SLICE_ROWS]
+            matrix = np.column_stack([as_float_array(part[col]) for col in self.columns]).astype(np.float64)
+            if self._lead:
+                # Capul partiției: se scorează în merge(), cu finalul partiției anterioare
+                head = matrix[:self._lead]
+                self._head = np.concatenate([self._head, head])
+                self._lead -= len(head)
+                self._offset += len(head)
+                matrix = matrix[len(head):]
+            if len(self._carry):
+                matrix = np.concatenate([self._carry, matrix])
+            full = len(matrix) // self.window * self.window
+            if full:
+                self._score(matrix[:full], self.window)
+            self._carry = matrix[full:]
+    
+    @profiled
+    def _score(self, matrix, window, at=None):
+        """Scor robust pe blocuri de `window` rânduri; colectează evenimentele
+
+        `at` = rândul primului eșantion, dacă nu urmează rândurilor scorate până acum.
+        """
+        n_rows, n_cols = matrix.shape
+        blocks = matrix.reshape(-1, window, n_cols)
+        
+        with warnings.catch_warnings():
+            # Blocuri fără date pe un canal: mediana NaN → scor 0
+            warnings.simplefilter('ignore', RuntimeWarning)
+            median = np.nanmedian if np.isnan(blocks).any() else np.median
+            center = median(blocks, axis=1, keepdims=True)
+            deviation = np.abs(blocks - center)
+            mad = median(deviation, axis=1, keepdims=True)
+        
+        # Pasul de cuantizare calibrat; canalele constante în head folosesc pasul din bloc
+        quantum = np.broadcast_to(self._quantum, (len(blocks), n_cols))
+        if not np.isfinite(self._quantum).all():
+            steps = np.abs(np.diff(blocks, axis=1))
+            steps[~(steps > 0)] = np.inf
+            quantum = np.where(np.isfinite(quantum), quantum, steps.min(axis=1))
+        scale = np.maximum(mad, quantum[:, None, :])
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            score = 0.6745 * deviation / scale
+        score = np.nan_to_num(score, nan=0.0).reshape(n_rows, n_cols)
+        flagged = score > self.THRESHOLD
+        self._flagged += flagged.sum(axis=0)
+        
+        # Intervale de eșantioane consecutive peste prag, canal cu canal (column-major)
+        edges = np.diff(flagged.T.astype(np.int8), axis=1, prepend=0, append=0)
+        start_ch, start_row = np.nonzero(edges == 1)
+        _, end_row = np.nonzero(edges == -1)
+        if start_row.size:
+            flat = np.append(score.T.ravel(), 0.0)
+            bounds = np.column_stack([start_ch * n_rows + start_row, start_ch * n_rows + end_row]).ravel()
+            peak = np.maximum.reduceat(flat, bounds)[::2]
+            row = self._offset if at is None else at
+            self._events.append((start_row + row, end_row + row, start_ch, peak))
+        if at is None:
+            self._offset += n_rows
+    
+    def _build_table(self):
+        """Tabelul rar al evenimentelor; unește evenimentele tăiate de granițe de bloc"""
+        if not self._events:
+            starts = ends = channels = np.empty(0, dtype=np.int64)
+            peaks = np.empty(0)
+        else:
+            starts, ends, channels, peaks = (np.concatenate(parts) for parts in zip(*self._events))
+            order = np.lexsort((starts, channels))
+            starts, ends, channels, peaks = starts[order], ends[order], channels[order], peaks[order]
+            new = np.ones(starts.size, dtype=bool)
+            new[1:] = (channels[1:] != channels[:-1]) | (starts[1:] != ends[:-1])
+            first = np.flatnonzero(new)
+            starts, channels = starts[first], channels[first]
+            ends = np.maximum.reduceat(ends, first)
+            peaks = np.maximum.reduceat(peaks, first)
+        
+        table = pd.DataFrame({
+            'start': starts,
+            'end': ends,
+            'channel': pd.Categorical.from_codes(channels, categories=self.sensors),
+            'peak_score': peaks.astype(np.float32),
+        })
+        return table.sort_values(['start', 'channel'], kind='stable', ignore_index=True)
+    
+    def merge(self, other):
+        """Adaugă evenimentele partiției următoare
+        
+        Blocul parțial de la finalul lui self (carry) se completează cu capul
+        lui other și se scorează aici, deci partițiile se pot tăia oriunde.
+        """
+        rpm_drop = abs(self._rpm_diff.merge(other._rpm_diff))
+        self._rpm_drops += int(rpm_drop > 1000) + other._rpm_drops
+        self._flagged += other._flagged
+        if self._quantum is None:
+            self._quantum = other._quantum
+        if other._lead is None:
+            return self
+        if self._lead is None:
+            self._head, self._lead, self._carry = other._head, other._lead, other._carry
+            self._offset, self._events = other._offset, list(other._events)
+            return self
+        
+        base = self._offset + len(self._carry)
+        if self._lead:
+            # self nu ajunge la un bloc aliniat: capul lui other îi continuă capul
+            self._head = np.concatenate([self._head, other._head])
+            self._lead = other._lead
+        elif other._lead:
+            # other nu ajunge la un bloc aliniat: rămâne în blocul parțial al lui self
+            self._carry = np.concatenate([self._carry, other._head])
+            return self
+        elif len(self._carry) or len(other._head):
+            block = np.concatenate([self._carry, other._head])
+            self._score(block, len(block))
+        self._events.extend((s + base, e + base, ch, peak) for s, e, ch, peak in other._events)
+        self._offset = base + other._offset
+        self._carry = other._carry
+        return self
+    
+    def finalize(self):
+        """Scorează ultimul bloc parțial și construiește lista finală de anomalii"""
+        if len(self._head) >= 3:
+            # Logul începe în interiorul unui bloc (index care nu pornește de la 0)
+            self._score(self._head, len(self._head), at=0)
+        if len(self._carry) >= 3:
+            self._score(self._carry, len(self._carry))
+        self._head = self._carry = self._carry[:0]
+        self.table = self._build_table()
+        self.anomalies = []
+        
+        # Un rezumat per canal; lista completă de evenimente e în self.table
+        by_sensor = self.table.groupby('channel', observed=True, sort=False)
+        for i, sensor_name in enumerate(self.sensors):
+            if sensor_name not in by_sensor.groups:
+                continue
+            events = by_sensor.get_group(sensor_name)
+            self.anomalies.append({
+                'type': 'SPIKE',
+                'sensor': sensor_name,
+                'count': int(self._flagged[i]),
+                'events': len(events),
+                'max_deviation': round(float(events['peak_score'].max()), 2),
+                'indices': events['start'].head(5).tolist(),  # Primele 5
+                'severity': 'WARNING' if len(events) < 3 else 'CRITICAL'
+            })
+        
+        # Detectare sudden drops (căderi bruște)
+        if self.channels.get('rpm') and self._rpm_drops > 0:
+            self.anomalies.append({
+                'type': 'SUDDEN_DROP',
+                'sensor': 'rpm',
+                'count': self._rpm_drops,
+                'explanation': 'Posibil wheel hop, misfire sau întrerupere în log',
+                'severity': 'WARNING'
+            })
+        
+        return self.anomalies
+
+# ======================================================
+# CORE: CORRELATION ENGINE
+# ======================================================
+class CorrelationEngine(AnalysisEngine):
+    """Analiză corelații între parametri
+    
+    Perechile fixe (RPM–knock, lambda–EGT, duty–load) sunt Pearson la
+    decalaj 0. Matricea tuturor canalelor detectate vine dintr-un singur
+    RunningCorrMatrix (produse matriceale pe chunk). Pentru perechile din
+    LAG_PAIRS, corelația încrucișată (RunningXcorr, sume decalate prin FFT)
+    dă decalajul vârfului în secunde, la pasul nominal al bazei de timp, cu
+    rezoluția unui eșantion în memorie și în streaming. Vârful are semnul
+    așteptat al relației; dacă nu există unul, verdictul este corelația la
+    decalaj 0 (exactă, RunningCorr).
+    """
+    
+    # Matricea folosește toate canalele detectate
+    READS = None
+    # Perechi (cauză, efect, semnul așteptat) pentru decalaj: canale standard sau
+    # semnale derivate; mai mult combustibil coboară lambda, sarcina încălzește
+    LAG_PAIRS = {
+        'duty_lambda': ('Inj_Duty', 'Lambda_Avg', -1),
+        'load_egt': ('load', 'egt1', 1),
+        'load_oil': ('load', 'oil_temp', 1),
+        'load_coolant': ('load', 'coolant_temp', 1),
+    }
+    MAX_LAG_S = 60.0
+    # Rânduri per produs matriceal (limitează temporarul rânduri × canale)
+    MATRIX_ROWS = 1 << 16
+    
+    def __init__(self, df, channels, timebase=None, lag_pairs=None, max_lag_s=None):
+        super().__init__(df, channels, timebase=timebase)
+        self.correlations = {}
+        self._pairs = {}
+        self.lag_pairs = self._lag_pairs(self.LAG_PAIRS if lag_pairs is None else lag_pairs)
+        self.max_lag_s = self.MAX_LAG_S if max_lag_s is None else float(max_lag_s)
+        self._columns = list(channels)
+        self._matrix = RunningCorrMatrix(len(self._columns))
+        self._xcorr = {}
+        self._zero_lag = {}
+        self.matrix = None
+        self.lags = {}
+    
+    @staticmethod
+    def _lag_pairs(pairs):
+        """{nume: (x, y, semn)}; semnul lipsă este 0 (vârful |r|), o listă primește numele 'x→y'"""
+        if not isinstance(pairs, dict):
+            pairs = {f"{pair[0]}→{pair[1]}": pair for pair in pairs}
+        lag_pairs = {}
+        for name, pair in pairs.items():
+            if len(pair) not in (2, 3):
+                raise ValueError(f"Pereche de decalaj invalidă {name!r}: (cauză, efect[, semn]) așteptat")
+            sign = int(np.sign(pair[2])) if len(pair) == 3 else 0
+            lag_pairs[name] = (pair[0], pair[1], sign)
+        return lag_pairs
+    
+    def update(self, chunk, modes=None, chunk_time=None):
+        """Acumulează produsele încrucișate pentru perechi, matrice și decalaje"""
+        
+        knock_peak = self._signal(chunk, 'Knock_Peak')
+        lambda_avg = self._signal(chunk, 'Lambda_Avg')
+        duty = self._signal(chunk, 'Inj_Duty')
+        
+        # RPM vs Knock
+        if 'rpm' in self.channels and knock_peak is not None:
+            self._update_pair('rpm_knock', chunk[self.channels['rpm']], knock_peak)
+        
+        # Lambda vs EGT
+        if lambda_avg is not None and 'egt1' in self.channels:
+            self._update_pair('lambda_egt', lambda_avg, chunk[self.channels['egt1']])
+        
+        # Duty vs Load
+        if duty is not None and 'load' in self.channels:
+            self._update_pair('duty_load', duty, chunk[self.channels['load']])
+        
+        if not len(chunk):
+            return
+        self._update_matrix(chunk)
+        
+        # Perechile cu decalaj: sumele decalate continuă peste granițele chunk-urilor
+        signals = {}
+        for name in {name for x_name, y_name, _ in self.lag_pairs.values() for name in (x_name, y_name)}:
+            values = self._lag_signal(chunk, name)
+            if values is not None:
+                signals[name] = values
+        for name, (x_name, y_name, _) in self.lag_pairs.items():
+            if x_name in signals and y_name in signals:
+                if name not in self._xcorr:
+                    self._xcorr[name] = RunningXcorr(self._max_lag())
+                self._xcorr[name].update(signals[x_name], signals[y_name])
+                # Decalaj 0 pe perechile complete, ca Series.corr
+                self._zero_lag.setdefault(name, RunningCorr()).update(signals[x_name], signals[y_name])
+    
+    @profiled
+    def _update_matrix(self, chunk):
+        """Matricea tuturor canalelor, pe felii de MATRIX_ROWS rânduri"""
+        if not self._columns:
+            return
+        columns = [self.channels[name] for name in self._columns]
+        for start in range(0, len(chunk), self.MATRIX_ROWS):
+            part = chunk.iloc[start:start + self.MATRIX_ROWS][columns]
+            self._matrix.update(part.to_numpy(dtype=np.float64, na_value=np.nan))
+    
+    def _dt(self):
+        return self.timebase.nominal_dt if self.timebase is not None else 1.0
+    
+    def _max_lag(self):
+        """max_lag_s în eșantioane, la pasul nominal"""
+        return max(1, int(round(self.max_lag_s / self._dt())))
+    
+    def _lag_signal(self, chunk, name):
+        """Canal standard sau semnal derivat; None dacă lipsește"""
+        if name in self.channels:
+            return chunk[self.channels[name]]
+        return self._signal(chunk, name)
+    
+    def _update_pair(self, name, x, y):
+        if name not in self._pairs:
+            self._pairs[name] = RunningCorr()
+        self._pairs[name].update(x, y)
+    
+    def merge(self, other):
+        for name, pair in other._pairs.items():
+            self._pairs.setdefault(name, RunningCorr()).merge(pair)
+        self._matrix.merge(other._matrix)
+        for name, xcorr in other._xcorr.items():
+            self._xcorr.setdefault(name, RunningXcorr(xcorr.max_lag)).merge(xcorr)
+        for name, pair in other._zero_lag.items():
+            self._zero_lag.setdefault(name, RunningCorr()).merge(pair)
+        return self
+    
+    def finalize(self):
+        """Calculează corelațiile finale"""
+        for name, pair in self._pairs.items():
+            param1, param2 = name.split('_')
+            corr = pair.corr
+            
+            self.correlations[name] = {
+                'value': round(corr, 3),
+                'interpretation': self._interpret_correlation(corr, param1, param2)
+            }
+        
+        if self._columns and self._matrix.shift is not None:
+            self.matrix = {'channels': self._columns, 'corr': np.round(self._matrix.corr, 3)}
+        self.lags = self._finalize_lags()
+        return self.correlations
+    
+    @profiled
+    def _finalize_lags(self):
+        """Decalajul vârfului pentru fiecare pereche din lag_pairs"""
+        dt = self._dt()
+        lags = {}
+        for name, (x_name, y_name, sign) in self.lag_pairs.items():
+            if name not in self._xcorr:
+                continue
+            peak = peak_lag(*self._xcorr[name].xcorr(), sign)
+            if peak is None:
+                continue
+            zero_lag_corr = self._zero_lag[name].corr
+            resolution_s = dt
+            # Niciun decalaj cu semnul așteptat: verdictul este relația la decalaj 0
+            matches = not sign or peak['corr'] * sign > 0
+            lag_samples = peak['lag'] if matches else 0
+            corr = peak['corr'] if matches else zero_lag_corr
+            lag_s = lag_samples * dt
+            lags[name] = {
+                'x': x_name,
+                'y': y_name,
+                'expected_sign': sign,
+                'sign_matches': matches,
+                'lag_s': round(lag_s, 3),
+                'lag_samples': lag_samples,
+                'corr': round(corr, 3),
+                'zero_lag_corr': round(zero_lag_corr, 3),
+                'resolution_s': round(resolution_s, 3),
+                'interpretation': self._interpret_lag(x_name, y_name, lag_s, corr, resolution_s, matches),
+            }
+        return lags
+    
+    @staticmethod
+    def _interpret_lag(x_name, y_name, lag_s, corr, resolution_s, matches=True):
+        """Cine urmează pe cine și cu cât"""
+        if not matches:
+            return f"{y_name} nu urmează {x_name} cu semnul așteptat (r = {corr:+.2f} la decalaj 0)"
+        if abs(lag_s) < resolution_s:
+            return f"{y_name} și {x_name} variază simultan (r = {corr:+.2f})"
+        leader, follower = (x_name, y_name) if lag_s > 0 else (y_name, x_name)
+        return f"{follower} urmează {leader} cu {abs(lag_s):.2f} s (r = {corr:+.2f})"
+    
+    def _interpret_correlation(self, corr, param1, param2):
+        """Interpretează semnificația corelației"""
+        abs_corr = abs(corr)
+        
+        if abs_corr > 0.8:
+            strength = "corelație PUTERNICĂ"
+        elif abs_corr > 0.5:
+            strength = "corelație MODERATĂ"
+        elif abs_corr > 0.3:
+            strength = "corelație SLABĂ"
+        else:
+            strength = "corelație NEGLIJABILĂ"
+        
+        direction = "pozitivă" if corr > 0 else "negativă"
+        
+        return f"{strength} {direction} între {param1} și {param2}"
+
+# ======================================================
+# CORE: RPM × LOAD CELL MAP ENGINE
+# ======================================================
+def axis_index(values, axis):
+    """Celula fiecărei valori pe o axă de breakpoint-uri (ca tabelele din ECU)
+
+    Celula i acoperă [axis[i], axis[i+1]); valorile din afara axei intră în
+    celula de margine. O axă uniformă se rezolvă printr-o împărțire,
+    restul cu searchsorted. NaN intră în celula 0 (exclus de apelant).
+    """
+    axis = np.asarray(axis, dtype=np.float64)
+    last = len(axis) - 1
+    steps = np.diff(axis)
+    if last > 0 and np.allclose(steps, steps[0]) and steps[0] > 0:
+        # Împărțire (nu înmulțire cu 1/pas): breakpoint-urile exacte rămân exacte
+        idx = values - float(axis[0])
+        idx /= float(steps[0])
+        np.fmax(idx, 0.0, out=idx)
+        np.minimum(idx, last, out=idx)
+        return idx.astype(np.intp)
+    idx = np.searchsorted(axis, values, side='right') - 1
+    np.clip(idx, 0, last, out=idx)
+    return idx
+
+class CellMapEngine(AnalysisEngine):
+    """Hărți RPM × Load pentru lambda, knock, duty și avans, într-o singură trecere
+
+    Fiecare eșantion este încadrat pe axele RPM / Load, iar semnalele sunt
+    reduse per celulă vectorizat (CellStats): count, medie, min, max, p95,
+    plus timpul petrecut în celulă și, pentru knock, evenimentele peste
+    pragul de eveniment al profilului (thresholds['knock_event']). Hărțile
+    au forma (load × rpm), ca tabelele de tuning.
+    
+    Unitatea sarcinii diferă între ECU-uri (%, kPa, mg/cursă), deci fără
+    `load_axis` eșantioanele sunt încadrate pe o grilă fină (FINE_LOAD_AXIS)
+    și regrupate în finalize() pe o axă cu pas „rotund”, aleasă din
+    distribuția sarcinii; rezultatul nu depinde de împărțirea în chunk-uri.
+    """
+    
+    READS = ('rpm', 'load', 'ignition_timing', 'Lambda_Avg', 'Knock_Peak', 'Inj_Duty')
+    RPM_AXIS = tuple(range(500, 8001, 500))
+    FINE_LOAD_AXIS = tuple(range(0, 2001, 5))
+    # Axa Load automată: LOAD_CELLS pași, primul din LOAD_STEPS care acoperă
+    # percentila LOAD_QUANTILE (toți multipli ai pasului grilei fine)
+    LOAD_CELLS = 10
+    LOAD_STEPS = (5, 10, 20, 25, 50, 100, 200, 250)
+    LOAD_QUANTILE = 0.99
+    # Harta → (semnal, etichetă, intervalul histogramei pentru p95)
+    MAPS = {
+        'lambda': ('Lambda_Avg', 'Lambda', (0.6, 1.6)),
+        'knock': ('Knock_Peak', 'Knock Peak', (0.0, 5.0)),
+        'duty': ('Inj_Duty', 'Injector Duty %', (0.0, 120.0)),
+        'timing': ('ignition_timing', 'Ignition Timing', (-20.0, 60.0)),
+    }
+    # Felii de rânduri: temporarele rămân în cache și pentru un DataFrame întreg
+    SLICE_ROWS = 1 << 18
+    
+    def __init__(self, df, channels, timebase=None, rpm_axis=None, load_axis=None, thresholds=None):
+        super().__init__(df, channels, None, timebase)
+        self.knock_event = threshold_profile(thresholds)['knock_event']
+        self.rpm_axis = tuple(rpm_axis or self.RPM_AXIS)
+        self.load_axis = tuple(load_axis) if load_axis else None
+        # Axa pe care se acumulează (grila fină dacă axa Load e automată)
+        self._load_bins = self.load_axis or self.FINE_LOAD_AXIS
+        self.cells = len(self.rpm_axis) * len(self._load_bins)
+        self._samples = np.zeros(self.cells, dtype=np.int64)
+        self._time_s = np.zeros(self.cells)
+        self._events = np.zeros(self.cells, dtype=np.int64)
+        self._maps = {}
+    
+    def update(self, chunk, modes=None, chunk_time=None):
+        """Încadrează eșantioanele chunk-ului în celule și acumulează hărțile"""
+        if 'rpm' not in self.channels or 'load' not in self.channels:
+            return
+        if chunk_time is None:
+            chunk_time = ChunkTime.uniform(len(chunk))
+        
+        rpm = as_float_array(chunk[self.channels['rpm']])
+        load = as_float_array(chunk[self.channels['load']])
+        values = {}
+        for name, (signal, _, (lo, hi)) in self.MAPS.items():
+            series = chunk[self.channels[signal]] if signal in self.channels else self._signal(chunk, signal)
+            if series is not None:
+                values[name] = as_float_array(series)
+                if name not in self._maps:
+                    self._maps[name] = CellStats(self.cells, lo, hi)
+        
+        for start in range(0, len(chunk), self.SLICE_ROWS):
+            window = slice(start, start + self.SLICE_ROWS)
+            self._update_cells(rpm[window], load[window], chunk_time.dt[window],
+                               {name: v[window] for name, v in values.items()})
+    
+    @profiled
+    def _update_cells(self, rpm, load, dt, values):
+        cell = axis_index(load, self._load_bins)
+        cell *= len(self.rpm_axis)
+        cell += axis_index(rpm, self.rpm_axis)
+        valid = ~(np.isnan(rpm) | np.isnan(load))
+        if not valid.all():
+            cell, dt = cell[valid], dt[valid]
+            values = {name: v[valid] for name, v in values.items()}
+        
+        add_bincount(self._samples, cell)
+        add_bincount(self._time_s, cell, dt)
+        if 'knock' in values:
+            # Aceeași comparație ca în IgnitionAnalysisEngine și WindowIndex
+            add_bincount(self._events, cell[exceeds(values['knock'], self.knock_event)])
+        offsets = cell * (CellStats.BINS + 2)
+        for name, v in values.items():
+            self._maps[name].update(cell, v, offsets)
+    
+    def merge(self, other):
+        if (self.rpm_axis, self._load_bins) != (other.rpm_axis, other._load_bins):
+            raise ValueError("Hărțile combinate trebuie să aibă aceleași axe")
+        self._samples += other._samples
+        self._time_s += other._time_s
+        self._events += other._events
+        for name, cells in other._maps.items():
+            if name in self._maps:
+                self._maps[name].merge(cells)
+            else:
+                self._maps[name] = CellStats(cells.cells, cells.lo, cells.hi).merge(cells)
+        return self
+    
+    def finalize(self):
+        """Hărțile finale: axe, eșantioane și timp per celulă, statistici per semnal"""
+        self.results = {}
+        if 'rpm' not in self.channels or 'load' not in self.channels:
+            return self.results
+        
+        load_axis, samples, time_s, events, cell_maps = self._final_cells()
+        shape = (len(load_axis), len(self.rpm_axis))
+        grid = lambda values, digits=3: np.round(values, digits).reshape(shape)
+        maps = {}
+        for name, cells in cell_maps.items():
+            low, high = cells.extremes()
+            maps[name] = {
+                'signal': self.MAPS[name][0],
+                'label': self.MAPS[name][1],
+                'count': cells.count.reshape(shape),
+                'mean': grid(cells.mean()),
+                'min': grid(low),
+                'max': grid(high),
+                'p95': grid(cells.quantile(0.95)),
+            }
+        if 'knock' in maps:
+            maps['knock']['events'] = events.reshape(shape)
+        
+        self.results = {
+            'rpm_axis': list(self.rpm_axis),
+            'load_axis': list(load_axis),
+            'samples': samples.reshape(shape),
+            'time_s': grid(time_s, 2),
+            'maps': maps,
+        }
+        return self.results
+    
+    def _final_cells(self):
+        """(axa Load, eșantioane, timp, evenimente knock, hărți) pe axa finală"""
+        if self.load_axis is not None:
+            return self.load_axis, self._samples, self._time_s, self._events, self._maps
+        
+        n_rpm = len(self.rpm_axis)
+        fine = np.asarray(self.FINE_LOAD_AXIS)
+        per_load = self._samples.reshape(len(fine), n_rpm).sum(axis=1)
+        top = fine[-1]
+        if per_load.sum():
+            # Marginea superioară a bin-ului fin care conține cuantila
+            cum = np.cumsum(per_load)
+            top = fine[min(int(np.searchsorted(cum, self.LOAD_QUANTILE * cum[-1])) + 1, len(fine) - 1)]
+        step = next((step for step in self.LOAD_STEPS if step * self.LOAD_CELLS >= top), self.LOAD_STEPS[-1])
+        load_axis = tuple(range(0, step * self.LOAD_CELLS + 1, step))
+        
+        # Bin-ul fin → celula axei finale (pașii sunt multipli ai grilei fine, deci exact)
+        load_index = np.minimum(fine // step, len(load_axis) - 1)
+        index = (load_index[:, None] * n_rpm + np.arange(n_rpm)).ravel()
+        cells = len(load_axis) * n_rpm
+        regroup = lambda values: np.bincount(index, weights=values, minlength=cells)
+        return (
+            load_axis,
+            regroup(self._samples).astype(np.int64),
+            regroup(self._time_s),
+            regroup(self._events).astype(np.int64),
+            {name: stats.regroup(index, cells) for name, stats in self._maps.items()},
+        )
+
+# ======================================================
+# CORE: WOT PULL ENGINE
+# ======================================================
+class PullAnalysisEngine(AnalysisEngine):
+    """Rezumat per tracțiune WOT: lambda, duty, knock pe fiecare interval
+
+    Tracțiunile sunt intervalele WOT (IntervalIndex); statisticile se reduc
+    pe felii contigue ale semnalelor (SegmentStats), fără gather după mască.
+    O tracțiune care trece peste granița unui chunk continuă în chunk-ul
+    următor. În finalize(), căderile din WOT mai scurte de MAX_GAP_S nu
+    întrerup tracțiunea (histerezis), iar tracțiunile mai scurte de
+    MIN_PULL_S sunt ignorate. Timpii sunt cei din ChunkTime.dt (golurile
+    din log numără cu pasul nominal), adunați ca ticks întregi.
+    
+    Flag-urile (LEAN, DUTY, KNOCK) se recalculează cu score() pentru orice
+    profil de praguri; coloana knock_events rămâne numărată la pragul de
+    eveniment din profilul analizei.
+    """
+    
+    READS = ('modes', 'rpm', 'Lambda_Avg', 'Inj_Duty', 'Knock_Peak')
+    MIN_PULL_S = 1.0
+    MAX_GAP_S = 0.5
+    # Ceasul intervalelor numără pasul fiecărui rând în ticks întregi de o
+    # microsecundă: sumele sunt exacte, deci duratele nu depind de chunk-uri
+    TICKS_PER_S = 1_000_000
+    # Statistică → semnalul redus pe fiecare tracțiune
+    SIGNALS = {
+        'rpm': 'rpm',
+        'lambda': 'Lambda_Avg',
+        'duty': 'Inj_Duty',
+        'knock': 'Knock_Peak',
+        'knock_events': 'Knock_Peak',
+    }
+    
+    def __init__(self, df, channels, timebase=None, thresholds=None):
+        super().__init__(df, channels, None, timebase)
+        self.thresholds = threshold_profile(thresholds)
+        self.features = {}
+        self._rows = 0
+        self._clock = 0.0
+        # Tipul valorilor de knock: flag-ul KNOCK compară pragul cu exceeds(), în precizia datelor
+        self._knock_dtype = None
+        self._pulls = IntervalIndex()
+        self._heat_soak = IntervalIndex()
+        self._stats = {name: SegmentStats() for name in self.SIGNALS}
+        self._t_first = self._t_last = None
+        self._nominal_dt = 1.0
+    
+    def update(self, chunk, modes=None, chunk_time=None):
+        """Adaugă tracțiunile WOT ale chunk-ului și statisticile lor"""
+        if chunk_time is None:
+            chunk_time = ChunkTime.uniform(len(chunk))
+        self._track_time(chunk_time)
+        intervals = IntervalIndex.from_masks(modes, self._ticks(chunk_time.dt), self._rows, self._clock,
+                                             ('WOT', 'Heat_Soak'))
+        pulls = intervals['WOT']
+        self._append(pulls, intervals['Heat_Soak'], self._update_pulls(chunk, pulls))
+        self._rows += len(chunk)
+        self._clock = pulls.t_total
+    
+    def _ticks(self, seconds):
+        """Secunde → ticks întregi (ca float64, exacte sub 2**53)"""
+        return np.round(np.asarray(seconds, dtype=np.float64) * self.TICKS_PER_S)
+    
+    @profiled
+    def _update_pulls(self, chunk, pulls):
+        """Statisticile feliilor [start, end) ale chunk-ului, per semnal"""
+        starts, ends = pulls.starts - self._rows, pulls.ends - self._rows
+        stats = {}
+        for name, signal in self.SIGNALS.items():
+            values = self._get_channel(chunk, signal) if signal in self.channels else self._signal(chunk, signal)
+            if values is not None:
+                values = as_float_array(values)
+                if name == 'knock':
+                    self._knock_dtype = values.dtype
+                if name == 'knock_events':
+                    # Aceeași comparație ca în IgnitionAnalysisEngine și WindowIndex
+                    values = exceeds(values, self.thresholds['knock_event'])
+            stats[name] = SegmentStats.from_slices(values, starts, ends)
+        return stats
+    
+    def _append(self, pulls, heat_soak, stats):
+        join = bool(len(self._pulls) and len(pulls) and self._pulls.ends[-1] == pulls.starts[0])
+        self._pulls = self._pulls.concat(pulls)
+        self._heat_soak = self._heat_soak.concat(heat_soak)
+        for name in self.SIGNALS:
+            self._stats[name] = self._stats[name].concat(stats[name], join)
+    
+    def merge(self, other):
+        """Adaugă tracțiunile lui `other`, deplasate după rândurile și timpul lui self"""
+        dt, _ = self._boundary_time(other)
+        shift = float(self._ticks(dt) - self._ticks(other._nominal_dt)) if other._rows else 0.0
+        self._append(other._pulls.shift(self._rows, self._clock, shift),
+                     other._heat_soak.shift(self._rows, self._clock, shift), other._stats)
+        self._rows += other._rows
+        self._clock += other._clock + shift
+        if self._knock_dtype is None:
+            self._knock_dtype = other._knock_dtype
+        self._merge_time(other)
+        return self
+    
+    def finalize(self):
+        """Lista tracțiunilor cu statisticile lor și rezumatul"""
+        self.features = self.extract_features()
+        self.results = self.score(self.features, self.thresholds)
+        return self.results
+    
+    @profiled
+    def extract_features(self):
+        """Coloanele tabelului de tracțiuni, fără flag-uri, și valorile pe care se aplică pragurile"""
+        max_gap = float(self._ticks(self.MAX_GAP_S))
+        groups = self._pulls.gap_groups(max_gap)
+        pulls = self._pulls.close_gaps(max_gap)
+        stats = {name: values.regroup(groups) for name, values in self._stats.items()}
+        keep = pulls.durations >= float(self._ticks(self.MIN_PULL_S))
+        pulls = pulls.select(keep)
+        stats = {name: values.select(keep) for name, values in stats.items()}
+        heat_soak = pulls.overlap(self._heat_soak) / self.TICKS_PER_S
+        # Timpii în secunde, din ticks exacte
+        pulls = IntervalIndex(pulls.starts, pulls.ends, pulls.t_starts / self.TICKS_PER_S,
+                              pulls.t_ends / self.TICKS_PER_S, pulls.rows, pulls.t_total / self.TICKS_PER_S)
+        
+        # Coloanele tabelului, rotunjite vectorizat; NaN (semnal lipsă) devine None
+        column = lambda values, digits: [None if v != v else v for v in np.round(values, digits).tolist()]
+        lambda_mean = stats['lambda'].mean
+        columns = {
+            'pull': range(1, len(pulls) + 1),
+            'start_row': pulls.starts.tolist(),
+            'end_row': pulls.ends.tolist(),
+            't_start_s': column(pulls.t_starts, 2),
+            'duration_s': column(pulls.durations, 2),
+            'rpm_start': column(stats['rpm'].first, 0),
+            'rpm_end': column(stats['rpm'].last, 0),
+            'rpm_max': column(stats['rpm'].max, 0),
+            'lambda_min': column(stats['lambda'].min, 3),
+            'lambda_mean': column(lambda_mean, 3),
+            'lambda_max': column(stats['lambda'].max, 3),
+            'duty_max': column(stats['duty'].max, 1),
+            'knock_max': column(stats['knock'].max, 3),
+            'knock_events': stats['knock_events'].sum.astype(np.int64).tolist(),
+            'heat_soak_s': column(heat_soak, 2),
+        }
+        return {
+            'summary': pulls.summary(),
+            'columns': columns,
+            'lambda_mean': lambda_mean,
+            'duty_max': stats['duty'].max,
+            # Maximul e o valoare din date, deci revine exact în tipul lor
+            'knock_max': stats['knock'].max.astype(self._knock_dtype or np.float64),
+        }
+    
+    @classmethod
+    def score(cls, features, thresholds=None):
+        """Tabelul tracțiunilor cu flag-urile pentru un profil de praguri"""
+        thresholds = threshold_profile(thresholds)
+        knock_max = features['knock_max']
+        hits = {
+            'LEAN': features['lambda_mean'] > thresholds['lambda_lean'],
+            'DUTY': features['duty_max'] > thresholds['duty_warning'],
+            'KNOCK': exceeds(knock_max, thresholds['knock_event']),
+        }
+        columns = {**features['columns'], 'flags': [
+            [flag for flag, hit in hits.items() if hit[i]] for i in range(len(knock_max))
+        ]}
+        rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        return {**features['summary'], 'flagged': sum(1 for row in rows if row['flags']), 'pulls': rows}
+    
+    def _get_channel(self, chunk, name):
+        if name in self.channels:
+            return chunk[self.channels[name]]
+        return None
+
+# ======================================================
+# CORE: PREDICTIVE RISK ENGINE
+# ======================================================
+class PredictiveRiskEngine:
+    """Evaluare risc predictiv pe baza pattern-urilor"""
+    
+    def __init__(self, results_dict):
+        self.results = results_dict
+        self.risk_score = 0
+        self.risk_factors = []
+        
+    def assess(self):
+        """Calculează risk score global"""
+        
+        # Factor risc: Knock
+        if 'knock' in self.results:
+            knock = self.results['knock']
+            if knock.get('severity') == 'CRITICAL':
+                self.risk_score += 40
+                self.risk_factors.append({
+                    'factor': 'DETONATION',
+                    'impact': 'HIGH',
+                    'consequence': 'Risc deteriorare piston, segmenți sau chiuloasă'
+                })
+            elif knock.get('severity') == 'WARNING':
+                self.risk_score += 20
+                self.risk_factors.append({
+                    'factor': 'KNOCK_EVENTS',
+                    'impact': 'MEDIUM',
+                    'consequence': 'Uzură accelerată în timp'
+                })
+        
+        # Factor risc: Lambda lean
+        if 'lambda' in self.results:
+            lamb = self.results['lambda']
+            if lamb.get('status') == 'LEAN_DANGER':
+                self.risk_score += 35
+                self.risk_factors.append({
+                    'factor': 'LEAN_MIXTURE',
+                    'impact': 'HIGH',
+                    'consequence': 'Risc topire piston, ardere supape evacuare'
+                })
+        
+        # Factor risc: Oil overheat
+        if 'oil' in self.results:
+            oil = self.results['oil']
+            if oil.get('severity') == 'CRITICAL':
+                self.risk_score += 30
+                self.risk_factors.append({
+                    'factor': 'OIL_OVERHEAT',
+                    'impact': 'HIGH',
+                    'consequence': 'Pierdere viscozitate, risc gripare lagăre'
+                })
+            elif oil.get('sustained_high_min', 0) > 5:
+                self.risk_score += 15
+                self.risk_factors.append({
+                    'factor': 'SUSTAINED_HIGH_OIL',
+                    'impact': 'MEDIUM',
+                    'consequence': 'Degradare accelerată a uleiului'
+                })
+        
+        # Factor risc: Injector saturation
+        if 'duty' in self.results:
+            duty = self.results['duty']
+            if duty.get('severity') == 'CRITICAL':
+                self.risk_score += 25
+                self.risk_factors.append({
+                    'factor': 'INJECTOR_LIMIT',
+                    'impact': 'MEDIUM',
+                    'consequence': 'Risc amestec sărac la turații mari'
+                })
+        
+        # Factor risc: EGT
+        if 'egt' in self.results:
+            egt = self.results['egt']
+            if egt.get('severity') == 'CRITICAL':
+                self.risk_score += 30
+                self.risk_factors.append({
+                    'factor': 'EGT_CRITICAL',
+                    'impact': 'HIGH',
+                    'consequence': 'Risc deteriorare turbină'
+                })
+        
+        return {
+            'risk_score': min(100, self.risk_score),
+            'risk_level': self._get_risk_level(),
+            'factors': self.risk_factors
+        }
+    
+    def _get_risk_level(self):
+        """Returnează nivelul de risc"""
+        if self.risk_score >= 70:
+            return 'CRITICAL'
+        elif self.risk_score >= 40:
+            return 'HIGH'
+        elif self.risk_score >= 20:
+            return 'MEDIUM'
+        else:
+            return 'LOW'
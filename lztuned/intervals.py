@@ -0,0 +1,225 @@
+"""Index de intervale (run-length) pentru regimurile de funcționare
+
+O mască per eșantion (ex. modes['WOT']) devine o listă sortată de intervale
+disjuncte [start, end) în rânduri, cu timpul de la începutul logului la
+fiecare margine (suma pasului `dt`, ca ChunkTime.duration). Pe intervale se
+filtrează după durată, se unesc golurile scurte (histerezis în timp), se
+aplică histerezisul pe praguri (intră pe o mască strictă, rămâne pe una
+relaxată) și se fac operații de mulțime (WOT ∩ Heat_Soak) fără să se
+reconstruiască măștile. Engine-urile parcurg intervalele ca felii contigue.
+"""
+import numpy as np
+
+def _clock(dt, n):
+    """Timpul de la începutul măștii la fiecare margine de eșantion (n + 1 valori)"""
+    if dt is None:
+        return np.arange(n + 1, dtype=np.float64)
+    clock = np.empty(n + 1)
+    clock[0] = 0.0
+    np.cumsum(dt, out=clock[1:])
+    return clock
+
+class IntervalIndex:
+    """Intervale disjuncte, sortate, [start, end) în rânduri, cu timpii marginilor
+
+    `t_starts` / `t_ends` sunt secunde de la începutul logului; durata unui
+    interval este t_end - t_start. `rows` și `t_total` descriu întregul log
+    (necesare pentru complement).
+    """
+
+    __slots__ = ('starts', 'ends', 't_starts', 't_ends', 'rows', 't_total')
+
+    def __init__(self, starts=(), ends=(), t_starts=None, t_ends=None, rows=0, t_total=None):
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        # Fără timpi: un eșantion = o secundă (comportamentul istoric, 1 Hz)
+        self.t_starts = self.starts.astype(np.float64) if t_starts is None else np.asarray(t_starts, dtype=np.float64)
+        self.t_ends = self.ends.astype(np.float64) if t_ends is None else np.asarray(t_ends, dtype=np.float64)
+        self.rows = int(rows)
+        self.t_total = float(rows if t_total is None else t_total)
+
+    @classmethod
+    def from_mask(cls, mask, dt=None, offset=0, t_offset=0.0):
+        """Intervalele în care masca e True; `dt` = pasul fiecărui eșantion (secunde)
+
+        `offset` / `t_offset` deplasează rândurile și timpii (mască de chunk).
+        """
+        return cls._from_clock(mask, _clock(dt, len(mask)), offset, t_offset)
+
+    @classmethod
+    def from_masks(cls, masks, dt=None, offset=0, t_offset=0.0, names=None):
+        """{nume: IntervalIndex} pentru coloanele unui DataFrame de măști (ex. regimurile)
+
+        Ceasul (suma cumulată a lui `dt`) se calculează o singură dată.
+        """
+        names = masks.columns if names is None else names
+        clock = _clock(dt, len(masks))
+        return {name: cls._from_clock(masks[name], clock, offset, t_offset) for name in names}
+
+    @classmethod
+    def _from_clock(cls, mask, clock, offset, t_offset):
+        mask = np.asarray(mask, dtype=bool)
+        # Pozițiile unde masca își schimbă valoarea, plus marginile logului dacă e True acolo
+        edges = np.flatnonzero(mask[1:] != mask[:-1]) + 1
+        if mask.size and mask[0]:
+            edges = np.concatenate(([0], edges))
+        if mask.size and mask[-1]:
+            edges = np.concatenate((edges, [mask.size]))
+        starts, ends = edges[0::2], edges[1::2]
+        return cls(starts + offset, ends + offset, clock[starts] + t_offset, clock[ends] + t_offset,
+                   rows=offset + mask.size, t_total=t_offset + clock[-1])
+
+    def __len__(self):
+        return int(self.starts.size)
+
+    def __iter__(self):
+        """(start, end) pentru fiecare interval, ca int-uri pentru felii"""
+        return zip(self.starts.tolist(), self.ends.tolist())
+
+    def __repr__(self):
+        return f"IntervalIndex({len(self)} intervals, {self.total_duration():.1f}s of {self.t_total:.1f}s)"
+
+    @property
+    def durations(self):
+        return self.t_ends - self.t_starts
+
+    @property
+    def samples(self):
+        return self.ends - self.starts
+
+    def total_duration(self):
+        return float(self.durations.sum())
+
+    def select(self, keep):
+        return IntervalIndex(self.starts[keep], self.ends[keep], self.t_starts[keep], self.t_ends[keep],
+                             self.rows, self.t_total)
+
+    def mask(self, rows=None):
+        """Masca per eșantion reconstruită (pentru afișare / compatibilitate)"""
+        out = np.zeros(self.rows if rows is None else rows, dtype=bool)
+        delta = np.zeros(out.size + 1, dtype=np.int64)
+        np.add.at(delta, self.starts, 1)
+        np.add.at(delta, self.ends, -1)
+        out[:] = np.cumsum(delta[:-1]) > 0
+        return out
+
+    # ======================================================
+    # FILTERING
+    # ======================================================
+    def filter(self, min_duration=0.0, min_samples=0):
+        """Doar intervalele de cel puțin `min_duration` secunde și `min_samples` eșantioane"""
+        return self.select((self.durations >= min_duration) & (self.samples >= min_samples))
+
+    def gap_groups(self, max_gap):
+        """Indicii primului interval din fiecare grup unit de close_gaps(max_gap)"""
+        split = (self.t_starts[1:] - self.t_ends[:-1]) > max_gap
+        return np.flatnonzero(np.concatenate(([len(self) > 0], split)))
+
+    def close_gaps(self, max_gap):
+        """Unește intervalele separate de goluri de cel mult `max_gap` secunde (histerezis în timp)"""
+        if not len(self):
+            return self
+        first = self.gap_groups(max_gap)
+        last = np.concatenate((first[1:], [len(self)])) - 1
+        return IntervalIndex(self.starts[first], self.ends[last], self.t_starts[first], self.t_ends[last],
+                             self.rows, self.t_total)
+
+    def hysteresis(self, enter):
+        """Intervalele din self (masca relaxată) care conțin cel puțin un interval `enter`
+
+        Ex.: WOT intră la load > 70 și rămâne până când load < 65: `self` sunt
+        intervalele load > 65, `enter` cele load > 70.
+        """
+        if not len(self) or not len(enter):
+            return self.select(np.zeros(len(self), dtype=bool))
+        j = np.searchsorted(enter.ends, self.starts, side='right')
+        hit = j < len(enter)
+        hit[hit] = enter.starts[j[hit]] < self.ends[hit]
+        return self.select(hit)
+
+    # ======================================================
+    # SET OPERATIONS
+    # ======================================================
+    def _sweep(self, other, level, touching=False):
+        """Intervalele acoperite de cel puțin `level` dintre self și other
+
+        Cu `touching`, intervalele care se ating ([a, b) și [b, c)) se unesc.
+        """
+        pos = np.concatenate((self.starts, other.starts, self.ends, other.ends))
+        times = np.concatenate((self.t_starts, other.t_starts, self.t_ends, other.t_ends))
+        delta = np.concatenate((np.ones(len(self) + len(other), dtype=np.int64),
+                                -np.ones(len(self) + len(other), dtype=np.int64)))
+        # La aceeași poziție, sfârșiturile (-1) înaintea începuturilor: [a, b) și [b, c) nu se suprapun
+        order = np.lexsort((-delta if touching else delta, pos))
+        pos, times, delta = pos[order], times[order], delta[order]
+        cover = np.cumsum(delta)
+        before = cover - delta
+        opening = (before < level) & (cover >= level)
+        closing = (before >= level) & (cover < level)
+        out = IntervalIndex(pos[opening], pos[closing], times[opening], times[closing],
+                            max(self.rows, other.rows), max(self.t_total, other.t_total))
+        return out.select(out.ends > out.starts)
+
+    def intersect(self, other):
+        return self._sweep(other, 2)
+
+    def union(self, other):
+        return self._sweep(other, 1, touching=True)
+
+    def complement(self):
+        """Intervalele din [0, rows) neacoperite de self"""
+        starts = np.concatenate(([0], self.ends))
+        ends = np.concatenate((self.starts, [self.rows]))
+        t_starts = np.concatenate(([0.0], self.t_ends))
+        t_ends = np.concatenate((self.t_starts, [self.t_total]))
+        out = IntervalIndex(starts, ends, t_starts, t_ends, self.rows, self.t_total)
+        return out.select(out.ends > out.starts)
+
+    def difference(self, other):
+        return self.intersect(other.complement())
+
+    def overlap(self, other):
+        """Secundele din fiecare interval al lui self acoperite de other (ex. WOT ∩ Heat_Soak)"""
+        common = self.intersect(other)
+        owner = np.searchsorted(self.starts, common.starts, side='right') - 1
+        return np.bincount(owner, weights=common.durations, minlength=len(self))
+
+    # ======================================================
+    # STREAMING
+    # ======================================================
+    def concat(self, other):
+        """Adaugă intervalele partiției următoare (rânduri / timpi deja deplasați)
+
+        Un interval deschis la finalul lui self care continuă la începutul
+        lui other devine un singur interval.
+        """
+        join = len(self) and len(other) and self.ends[-1] == other.starts[0]
+        head = slice(1, None) if join else slice(None)
+        out = IntervalIndex(
+            np.concatenate((self.starts, other.starts[head])),
+            np.concatenate((self.ends[:-1], other.ends)) if join else np.concatenate((self.ends, other.ends)),
+            np.concatenate((self.t_starts, other.t_starts[head])),
+            np.concatenate((self.t_ends[:-1], other.t_ends)) if join else np.concatenate((self.t_ends, other.t_ends)),
+            max(self.rows, other.rows), max(self.t_total, other.t_total),
+        )
+        return out
+
+    def shift(self, rows, seconds, boundary_dt=0.0):
+        """Deplasat după o partiție de `rows` rânduri / `seconds` secunde
+
+        `boundary_dt` corectează timpii de după primul rând, al cărui pas a
+        fost presupus nominal la procesarea separată a partiției.
+        """
+        fix = lambda pos, t: t + seconds + np.where(pos > 0, boundary_dt, 0.0)
+        return IntervalIndex(self.starts + rows, self.ends + rows,
+                             fix(self.starts, self.t_starts), fix(self.ends, self.t_ends),
+                             self.rows + rows, self.t_total + seconds + (boundary_dt if self.rows else 0.0))
+
+    def summary(self):
+        """Rezumat JSON-friendly: număr de intervale, durate"""
+        durations = self.durations
+        return {
+            'events': len(self),
+            'duration_s': round(float(durations.sum()), 2),
+            'longest_s': round(float(durations.max()), 2) if len(self) else 0.0,
+        }
@@ -0,0 +1,289 @@
+"""Modul live: urmărește un log în creștere și actualizează rezultatele incremental"""
+import io
+import os
+import socket
+import time
+
+import numpy as np
+import pandas as pd
+
+from .engines import (
+    ChannelDetectionEngine,
+    OperatingModeEngine,
+    FuelAnalysisEngine,
+    IgnitionAnalysisEngine,
+    ThermalStressEngine,
+    ElectricalHealthEngine,
+    PredictiveRiskEngine,
+    threshold_profile,
+)
+from .pipeline import to_jsonable
+from .signals import SignalStore
+from .sources import SNIFF_LINES, detect_decimal, detect_encoding, detect_separator
+from .timebase import Timebase
+
+# ======================================================
+# LINE SOURCES
+# ======================================================
+class _LineSource:
+    """Bază pentru sursele de linii: păstrează linia parțială între citiri"""
+
+    def __init__(self):
+        self._partial = b''
+
+    def _split(self, data):
+        data = self._partial + data
+        lines = data.split(b'\n')
+        self._partial = lines.pop()
+        return [line.rstrip(b'\r') for line in lines if line.strip()]
+
+    def close(self):
+        pass
+
+class FileTail(_LineSource):
+    """Liniile noi, complete, dintr-un fișier în care loggerul scrie (tail -f)"""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._offset = 0
+
+    def read_lines(self):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return []
+        if size < self._offset:
+            # Fișier trunchiat / rescris: se reia de la început
+            self._offset = 0
+            self._partial = b''
+        if size == self._offset:
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+        self._offset += len(data)
+        return self._split(data)
+
+class SocketTail(_LineSource):
+    """Linii CSV primite pe un socket TCP (stand-in pentru un stream serial)"""
+
+    def __init__(self, host, port, timeout=5.0):
+        super().__init__()
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setblocking(False)
+
+    def read_lines(self):
+        parts = []
+        while True:
+            try:
+                data = self.sock.recv(1 << 16)
+            except (BlockingIOError, InterruptedError):
+                break
+            if not data:
+                break
+            parts.append(data)
+        return self._split(b''.join(parts)) if parts else []
+
+    def close(self):
+        self.sock.close()
+
+def open_source(spec):
+    """'tcp://host:port' → SocketTail, altfel cale de fișier → FileTail"""
+    if spec.startswith('tcp://'):
+        host, _, port = spec[len('tcp://'):].rpartition(':')
+        return SocketTail(host or 'localhost', int(port))
+    return FileTail(spec)
+
+# ======================================================
+# RING BUFFER
+# ======================================================
+class RingBuffer:
+    """Ultimele `capacity` rânduri, într-un array 2-D prealocat (memorie fixă)"""
+
+    def __init__(self, columns, capacity):
+        self.columns = list(columns)
+        self.capacity = capacity
+        self.total = 0
+        self._data = np.full((capacity, len(self.columns)), np.nan)
+
+    def append(self, values):
+        values = np.asarray(values, dtype=np.float64)[-self.capacity:]
+        pos = self.total % self.capacity
+        first = min(len(values), self.capacity - pos)
+        self._data[pos:pos + first] = values[:first]
+        self._data[:len(values) - first] = values[first:]
+        self.total += len(values)
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def to_frame(self):
+        """Copie ordonată cronologic; indexul este indexul global al eșantionului"""
+        size = len(self)
+        if self.total > self.capacity:
+            pos = self.total % self.capacity
+            data = np.concatenate([self._data[pos:], self._data[:pos]])
+        else:
+            data = self._data[:size]
+        index = pd.RangeIndex(self.total - size, self.total)
+        return pd.DataFrame(data, columns=self.columns, index=index)
+
+# ======================================================
+# LIVE SESSION
+# ======================================================
+class LiveSession:
+    """Rulează engine-urile incremental pe rândurile noi ale unei surse live
+
+    Fiecare tick() parsează doar liniile apărute de la tick-ul anterior,
+    le trece prin update()-ul engine-urilor (O(rânduri noi)) și reface
+    verdictele din agregate (O(1)). Returnează panourile ale căror
+    rezultate s-au schimbat, ca UI-ul să redeseneze doar acele panouri.
+    """
+
+    PANELS = ('kpi', 'modes', 'fuel', 'ignition', 'thermal', 'electrical', 'risk')
+    # Rânduri strânse înainte de calibrarea bazei de timp
+    MIN_CALIBRATION_ROWS = 10
+
+    def __init__(self, source, capacity=30_000, time_unit=None, thresholds=None):
+        self.source = source
+        self.capacity = capacity
+        self.time_unit = time_unit
+        self.thresholds = threshold_profile(thresholds)
+        self.header = None
+        self.rows = 0
+        self.results = {}
+        self.buffer = None
+        self.last_tick_s = 0.0
+        self._pending = []
+
+    def _start(self, header_line):
+        """Inițializează detecția și engine-urile din linia de header"""
+        self.header = header_line
+        # Exporturile ECU de pe Windows pot fi cp1252; BOM-ul nu intră în numele primei coloane
+        self.encoding = detect_encoding(header_line)
+        text = header_line.decode(self.encoding, errors='replace').lstrip('\ufeff')
+        self.sep = detect_separator(text)
+        self.decimal = None
+        columns = pd.read_csv(io.StringIO(text), sep=self.sep, nrows=0).columns
+
+        self.detector = ChannelDetectionEngine(pd.DataFrame(columns=columns))
+        self.channels = self.detector.map_channels()
+        self.usecols = self.detector.required_columns()
+        self.timebase = Timebase(self.detector.time_column, self.time_unit)
+
+        self.mode_engine = OperatingModeEngine(None, self.channels, self.timebase)
+        stats = self.detector.stats
+        self.fuel = FuelAnalysisEngine(None, self.channels, None, stats, self.thresholds)
+        self.ignition = IgnitionAnalysisEngine(None, self.channels, None, self.thresholds)
+        self.thermal = ThermalStressEngine(None, self.channels, self.timebase, stats)
+        self.electrical = ElectricalHealthEngine(None, self.channels, stats)
+
+    def set_thresholds(self, thresholds):
+        """Schimbă profilul de praguri; verdictele se recalculează din agregate, fără recitire"""
+        profile = threshold_profile(thresholds)
+        if profile == self.thresholds:
+            return set()
+        self.thresholds = profile
+        if self.header is None:
+            return set()
+        self.fuel.thresholds = self.ignition.thresholds = profile
+        return self._snapshot() if self.rows else set()
+
+    def _parse(self, lines):
+        """Parsează un lot de linii cu header-ul original (aceleași nume ca din fișier)"""
+        if self.decimal is None:
+            # Virgula zecimală se vede abia în primele rânduri de date
+            sample = [line.decode(self.encoding, errors='replace') for line in lines[:SNIFF_LINES]]
+            self.decimal = detect_decimal(sample, self.sep)
+        data = self.header + b'\n' + b'\n'.join(lines)
+        chunk = pd.read_csv(io.BytesIO(data), sep=self.sep, decimal=self.decimal, encoding=self.encoding,
+                            usecols=self.usecols or None, on_bad_lines='skip')
+        for col in chunk.columns:
+            if col != self.timebase.column:
+                chunk[col] = pd.to_numeric(chunk[col], errors='coerce').astype(np.float32)
+        chunk.index = pd.RangeIndex(self.rows, self.rows + len(chunk))
+        return chunk
+
+    def tick(self):
+        """Procesează rândurile noi; returnează setul de panouri modificate"""
+        started = time.perf_counter()
+        lines = self.source.read_lines()
+        if self.header is None:
+            if not lines:
+                return set()
+            self._start(lines.pop(0))
+
+        # Header-ul repetat (fișier rescris) nu e un rând de date
+        self._pending.extend(line for line in lines if line != self.header)
+        if not self._pending:
+            return set()
+        if self.timebase.has_time and self.timebase.nominal_dt is None and \
+                len(self._pending) < self.MIN_CALIBRATION_ROWS:
+            return set()
+
+        chunk = self._parse(self._pending)
+        self._pending = []
+        if chunk.empty:
+            return set()
+        if self.timebase.has_time and self.timebase.nominal_dt is None:
+            self.timebase.calibrate(chunk[self.timebase.column])
+
+        self._update(chunk)
+        changed = self._snapshot()
+        self.last_tick_s = time.perf_counter() - started
+        return changed
+
+    def _update(self, chunk):
+        chunk_time = self.timebase.update(chunk)
+        self.detector.update(chunk)
+        modes = self.mode_engine.update(chunk, chunk_time=chunk_time)
+        signals = {'modes': modes, 'derived': SignalStore(chunk, self.channels)}
+        for engine in (self.fuel, self.ignition, self.thermal, self.electrical):
+            engine.step(chunk, signals, chunk_time)
+
+        # Bufferul păstrează și semnalele derivate (Lambda_Avg, Knock_Peak, ...) pentru grafice
+        derived = signals['derived']
+        for name in derived.available():
+            chunk[name] = derived[name]
+        chunk['WOT'] = modes['WOT'].to_numpy(dtype=np.float32)
+        if self.buffer is None:
+            columns = [col for col in chunk.columns if col != self.timebase.column]
+            self.buffer = RingBuffer(columns, self.capacity)
+        self.buffer.append(chunk[self.buffer.columns].to_numpy(dtype=np.float64))
+        self.rows += len(chunk)
+
+    def _snapshot(self):
+        """Verdictele curente din agregate; compară cu tick-ul anterior"""
+        self.detector.finalize()
+        fuel = self.fuel.finalize()
+        ignition = self.ignition.finalize()
+        thermal = self.thermal.finalize()
+        electrical = self.electrical.finalize()
+        all_results = {**fuel, **ignition, **thermal, **electrical}
+
+        results = {
+            'rows': self.rows,
+            'channels': self.channels,
+            'timebase': self.timebase.report(),
+            'channel_stats': self.detector.stats.summary(),
+            'kpi': {'peak_rpm': self.detector.stats['rpm'].max if 'rpm' in self.channels else np.nan},
+            'modes': self.mode_engine.get_mode_summary(),
+            'fuel': fuel,
+            'ignition': ignition,
+            'thermal': thermal,
+            'electrical': electrical,
+            'all_results': all_results,
+            'risk': PredictiveRiskEngine(all_results).assess(),
+        }
+        results = to_jsonable(results)
+        changed = {panel for panel in self.PANELS if results[panel] != self.results.get(panel)}
+        self.results = results
+        return changed
+
+    def frame(self):
+        """Ultimele rânduri (ring buffer) ca DataFrame, pentru grafice"""
+        return self.buffer.to_frame() if self.buffer is not None else None
+
+    def close(self):
+        self.source.close()
@@ -0,0 +1,665 @@
+"""Pipeline-ul complet de analiză (pașii 1-9), fără dependențe de UI"""
+import codecs
+import os
+import pandas as pd
+import numpy as np
+
+# Parser CSV multithreaded, dacă pyarrow este instalat
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+from .cache import content_hash, file_hash, stream_hash, options_key, estimate_nbytes
+from .channels import channel_profiles
+from .compact import CompactLog, PackedMasks
+from .profiling import StageProfiler, stage
+from .readers import reader_for
+from .sources import compression, open_log, sniff_dialect
+from .store import ColumnStore
+from .scheduler import Task, TaskGraph
+from .signals import SignalStore
+from .timebase import Timebase, resample_uniform
+from .windows import WindowIndex
+from .engines import (
+    ChannelDetectionEngine,
+    OperatingModeEngine,
+    FuelAnalysisEngine,
+    IgnitionAnalysisEngine,
+    ThermalStressEngine,
+    ElectricalHealthEngine,
+    AnomalyDetectionEngine,
+    CorrelationEngine,
+    CellMapEngine,
+    PullAnalysisEngine,
+    PredictiveRiskEngine,
+    threshold_profile,
+)
+
+# ======================================================
+# OPTIONS
+# ======================================================
+DEFAULT_OPTIONS = {
+    'anomalies': True,
+    'correlations': True,
+    # Perechi (cauză, efect) pentru corelația cu decalaj; None = CorrelationEngine.LAG_PAIRS
+    'lag_pairs': None,
+    # Decalajul maxim căutat (secunde); None = CorrelationEngine.MAX_LAG_S
+    'max_lag_s': None,
+    # Hărți RPM × Load (lambda, knock, duty, avans); axele implicite din CellMapEngine
+    'cell_maps': True,
+    'rpm_axis': None,
+    'load_axis': None,
+    # Rezumat per tracțiune WOT (lambda, duty, knock pe fiecare interval)
+    'pulls': True,
+    # Pragurile verdictelor (dict peste DEFAULT_THRESHOLDS); rescore() le schimbă fără reanaliză
+    'thresholds': None,
+    # Număr de rânduri per chunk; None = tot logul în memorie
+    'chunksize': None,
+    # Citește doar timpul + canalele detectate, cu tipul de mai jos
+    'prune_columns': True,
+    'dtype': 'float32',
+    # Log ținut compact în memorie (CompactLog: float32 / int16 scalat, măști bit-packed)
+    'compact': False,
+    # Director pentru cache-ul columnar pe disc (ColumnStore); None = dezactivat
+    'store_dir': None,
+    # Unitatea coloanei de timp ('s', 'ms', 'us'); None = detectată automat
+    'time_unit': None,
+    # Reeșantionare pe grilă uniformă (Hz) înainte de analiză; doar in-memory
+    'resample_hz': None,
+    # Thread-uri pentru engine-urile independente; None = câte nuclee, 1 = secvențial
+    'workers': None,
+    # Director pentru profilurile de mapare a canalelor per ECU; None = doar în memorie
+    'profile_dir': None,
+}
+
+# Opțiuni care nu schimbă rezultatele (excluse din cheia de cache)
+RESULT_NEUTRAL_OPTIONS = ('workers', 'profile_dir')
+
+# ======================================================
+# LOADING
+# ======================================================
+def _column_dtypes(usecols, dtype, time_column=None):
+    """Tipul per coloană; timpul își păstrează tipul inferat (float32 pierde ms)"""
+    if usecols is None or not dtype:
+        return None
+    return {col: dtype for col in usecols if col != time_column}
+
+def _csv_options(dialect):
+    """Argumentele pd.read_csv pentru dialectul detectat (sniff_dialect)"""
+    return {'sep': dialect['sep'], 'decimal': dialect['decimal'], 'encoding': dialect['encoding']}
+
+def load_log(path_or_buffer, usecols=None, dtype=None, time_column=None, columns=None):
+    """Citește un log dintr-o cale sau dintr-un buffer (file-like)
+
+    Formatele binare (ex. .mlg) sunt citite de cititorul lor (readers);
+    restul e CSV. Logurile comprimate (.gz, .zip, .zst) sunt decomprimate
+    în flux (sources.open_log). Cu `usecols` se parsează doar coloanele
+    cerute, tipizate cu `dtype` (cu excepția `time_column`), folosind
+    parser-ul CSV rapid (pyarrow) când e disponibil. `columns` sunt numele
+    din read_header(): duplicatele din header au aceleași nume ('X.1') în
+    ambele parsere.
+    """
+    reader = reader_for(path_or_buffer)
+    dialect = sniff_dialect(path_or_buffer) if reader is None else None
+    with open_log(path_or_buffer) as source:
+        if reader is not None:
+            return reader.read(source, usecols, dtype, time_column)
+        if usecols is None:
+            return pd.read_csv(source, **_csv_options(dialect))
+        if pa is not None:
+            return _read_columns_arrow(source, dialect, usecols, dtype, time_column, columns)
+        return pd.read_csv(
+            source, usecols=usecols,
+            dtype=_column_dtypes(usecols, dtype, time_column), **_csv_options(dialect)
+        )
+
+def _read_columns_arrow(source, dialect, usecols, dtype, time_column=None, columns=None):
+    """Citire multithreaded cu pyarrow.csv, doar pentru coloanele cerute
+
+    Folosit direct (nu prin engine='pyarrow' din pandas), care ar
+    materializa toate coloanele și ar tripla memoria de vârf.
+    """
+    dtypes = _column_dtypes(usecols, dtype, time_column)
+    column_types = {col: pa.from_numpy_dtype(np.dtype(t)) for col, t in dtypes.items()} if dtypes else None
+    # 'utf8' e citit nativ (BOM-ul inclus); alte encoding-uri trec printr-un stream de transcodare
+    encoding = 'utf8' if codecs.lookup(dialect['encoding']).name == 'utf-8' else dialect['encoding']
+    # pyarrow păstrează numele duplicate; cu numele din pandas, 'X.1' e a doua coloană 'X'
+    if columns is not None:
+        read_options = pa_csv.ReadOptions(column_names=list(columns), skip_rows=1, encoding=encoding)
+    else:
+        read_options = pa_csv.ReadOptions(encoding=encoding)
+    table = pa_csv.read_csv(
+        source,
+        read_options=read_options,
+        # Rândurile trunchiate (ex. logger oprit în timpul scrierii) sunt ignorate
+        parse_options=pa_csv.ParseOptions(delimiter=dialect['sep'], invalid_row_handler=lambda row: 'skip'),
+        convert_options=pa_csv.ConvertOptions(include_columns=usecols, column_types=column_types,
+                                              decimal_point=dialect['decimal']),
+    )
+    return table.to_pandas()
+
+def load_channels(path_or_buffer, dtype='float32', profiles=None):
+    """Header-first: detectează canalele din header și parsează doar ce e necesar"""
+    header = read_header(path_or_buffer)
+    detector = ChannelDetectionEngine(header)
+    detector.map_channels(profiles)
+    usecols = detector.required_columns()
+    if not usecols:
+        return load_log(path_or_buffer)
+
+    df = load_log(path_or_buffer, usecols=usecols, dtype=dtype, time_column=detector.time_column,
+                  columns=header.columns)
+    df.attrs['source_columns'] = list(header.columns)
+    return df
+
+def iter_chunks(path_or_buffer, chunksize, usecols=None, dtype=None, time_column=None):
+    """Citește logul în chunk-uri de `chunksize` rânduri (index continuu)"""
+    reader = reader_for(path_or_buffer)
+    dialect = sniff_dialect(path_or_buffer) if reader is None else None
+    with open_log(path_or_buffer) as source:
+        if reader is not None:
+            yield from reader.iter_chunks(source, chunksize, usecols, dtype, time_column)
+            return
+        with pd.read_csv(source, chunksize=chunksize, usecols=usecols,
+                         dtype=_column_dtypes(usecols, dtype, time_column), **_csv_options(dialect)) as chunks:
+            yield from chunks
+
+def read_head(path_or_buffer, nrows, usecols=None, dtype=None, time_column=None):
+    """Primele `nrows` rânduri, cu aceleași tipuri ca iter_chunks (calibrări)"""
+    reader = reader_for(path_or_buffer)
+    dialect = sniff_dialect(path_or_buffer) if reader is None else None
+    with open_log(path_or_buffer) as source:
+        if reader is not None:
+            return reader.read(source, usecols, dtype, time_column, rows=slice(0, nrows))
+        return pd.read_csv(source, nrows=nrows, usecols=usecols,
+                           dtype=_column_dtypes(usecols, dtype, time_column), **_csv_options(dialect))
+
+def read_header(path_or_buffer):
+    """Citește doar header-ul logului, ca DataFrame gol"""
+    reader = reader_for(path_or_buffer)
+    dialect = sniff_dialect(path_or_buffer) if reader is None else None
+    with open_log(path_or_buffer) as source:
+        if reader is not None:
+            return reader.read_header(source)
+        return pd.read_csv(source, nrows=0, **_csv_options(dialect))
+
+def source_hash(path_or_buffer):
+    """Hash-ul conținutului unui log, fie cale, fie buffer
+
+    Logurile comprimate (.gz, .zip, .zst, membrii unei arhive) sunt hash-uite
+    pe conținutul decomprimat: același log are aceeași cheie oricum ar veni.
+    """
+    if compression(path_or_buffer) is not None:
+        with open_log(path_or_buffer) as stream:
+            return stream_hash(stream)
+    if isinstance(path_or_buffer, (str, os.PathLike)):
+        return file_hash(path_or_buffer)
+    if hasattr(path_or_buffer, 'getvalue'):
+        return content_hash(path_or_buffer.getvalue())
+    data = path_or_buffer.read()
+    path_or_buffer.seek(0)
+    return content_hash(data if isinstance(data, bytes) else data.encode('utf-8'))
+
+# ======================================================
+# ANALYSIS
+# ======================================================
+def analyze_log(path_or_buffer, options=None, progress=None, cache=None):
+    """Rulează pipeline-ul complet pe un log și returnează rezultatele
+
+    `progress` este un callback opțional progress(pct, message) apelat
+    la începutul fiecărui pas. Dacă se dă un `cache` (ResultCache),
+    DataFrame-ul parsat și rezultatele sunt reutilizate pentru același
+    conținut și aceleași opțiuni. Cu options['chunksize'] setat, logul
+    este procesat în streaming (vezi analyze_chunks). Cu
+    options['store_dir'] setat, coloanele parsate și măștile de regim sunt
+    păstrate pe disc (ColumnStore) și memory-mapped la următoarea analiză.
+    results['profile'] conține durata, CPU-ul și memoria fiecărei etape.
+    """
+    opts = {**DEFAULT_OPTIONS, **(options or {})}
+    profiler = StageProfiler()
+
+    def report(pct, message):
+        if progress is not None:
+            progress(pct, message)
+
+    if isinstance(path_or_buffer, pd.DataFrame):
+        report(10, "📥 Loading data...")
+        return analyze_dataframe(path_or_buffer, opts, report, profiler=profiler)
+
+    if cache is None and opts['chunksize']:
+        return analyze_chunks(path_or_buffer, opts, report, profiler=profiler)
+
+    data_hash = None
+    if cache is not None or opts['store_dir']:
+        data_hash = source_hash(path_or_buffer)
+
+    if cache is not None:
+        results_key = ('results', data_hash,
+                       options_key({k: v for k, v in opts.items() if k not in RESULT_NEUTRAL_OPTIONS}))
+        results = cache.get(results_key)
+        if results is not None:
+            report(100, "✅ Loaded from cache")
+            return results
+
+    if opts['chunksize']:
+        results = analyze_chunks(path_or_buffer, opts, report, profiler=profiler)
+        results['source_hash'] = data_hash
+        return cache.put(results_key, results)
+
+    # Step 1: Load data (din cache-ul de memorie, din store sau din CSV)
+    report(10, "📥 Loading data...")
+    df_key = ('df', data_hash, opts['prune_columns'], opts['dtype'], opts['compact'])
+    modes = None
+    # Un log reeșantionat nu corespunde rând cu rând coloanelor din store
+    store = ColumnStore(opts['store_dir']) if opts['store_dir'] and not opts['resample_hz'] else None
+    variant = f"{opts['prune_columns']}-{opts['dtype']}"
+
+    with profiler.stage('load') as span:
+        df = cache.get(df_key) if cache is not None else None
+        if df is None and store is not None:
+            entry = store.load(data_hash, variant)
+            if entry is not None:
+                df, _, modes = entry
+        if df is None:
+            df = _load_for_analysis(path_or_buffer, opts)
+            if opts['compact']:
+                df = _compact(df, opts)
+        if cache is not None:
+            cache.put(df_key, df)
+        span.rows = len(df)
+
+    results = analyze_dataframe(df, opts, report, modes=modes, profiler=profiler)
+    results['source_hash'] = data_hash
+
+    # Prima analiză a logului scrie sidecar-ul
+    if store is not None and modes is None and not store.has(data_hash, variant):
+        store.save(data_hash, df, results['channels'], results['modes'], variant)
+
+    if cache is None:
+        return results
+
+    # DataFrame-ul e deja contabilizat în intrarea 'df'
+    nbytes = estimate_nbytes({k: v for k, v in results.items() if k != 'df'})
+    return cache.put(results_key, results, nbytes=nbytes)
+
+def _load_for_analysis(path_or_buffer, opts):
+    if opts['prune_columns']:
+        return load_channels(path_or_buffer, dtype=opts['dtype'],
+                             profiles=channel_profiles(opts['profile_dir']))
+    return load_log(path_or_buffer)
+
+def _compact(df, opts):
+    """CompactLog pentru un log abia parsat; coloana de timp rămâne în tipul ei"""
+    detector = ChannelDetectionEngine(df)
+    detector.map_channels(channel_profiles(opts['profile_dir']))
+    return CompactLog.from_frame(df, detector.time_column)
+
+def load_full_table(path_or_buffer, results, cache=None):
+    """Tabelul complet (toate coloanele) pentru Engineer Mode, încărcat la cerere
+
+    Conține doar datele brute; semnalele derivate (Lambda_Avg, ...) se
+    adaugă la cerere cu results['signals'].with_signals(full).
+    """
+    key = ('full', results.get('source_hash'))
+    full = cache.get(key) if cache is not None and key[1] else None
+    if full is None:
+        full = load_log(path_or_buffer)
+        if cache is not None and key[1]:
+            cache.put(key, full)
+    return full
+
+# ======================================================
+# ENGINE GRAPH
+# ======================================================
+# Mesajele de progres afișate când un engine termină
+ENGINE_LABELS = {
+    'modes': "⚙️ Operating modes",
+    'fuel': "⛽ Fuel analysis",
+    'ignition': "⚡ Ignition analysis",
+    'thermal': "🌡️ Thermal analysis",
+    'electrical': "🔌 Electrical health",
+    'anomalies': "🚨 Anomaly detection",
+    'correlations': "🔗 Correlations",
+    'cell_maps': "🗺️ RPM × Load maps",
+    'pulls': "🏁 WOT pulls",
+}
+
+def engine_graph(engines, workers=None):
+    """Câte un task per engine, cu dependențele din READS/PRODUCES
+
+    Fiecare task rulează engine.step() pe chunk-ul din signals['chunk'];
+    canalele brute și semnalele derivate (SignalStore-ul din
+    signals['derived']) sunt intrări, deci doar măștile de regim creează
+    dependențe.
+    """
+    tasks = [
+        Task(name, _engine_task(name, engine), reads=engine.READS or (), produces=engine.PRODUCES)
+        for name, engine in engines.items()
+    ]
+    return TaskGraph(tasks, workers)
+
+def _engine_task(name, engine):
+    """engine.step() pe chunk, măsurat ca etapă a profilerului activ"""
+    def run(signals):
+        chunk = signals['chunk']
+        with stage(name, rows=len(chunk)):
+            return engine.step(chunk, signals, signals.get('chunk_time'))
+    return run
+
+def _finalize(engine, name):
+    with stage(name):
+        return engine.finalize()
+
+def _features(engines):
+    """Trăsăturile din care rescore() recalculează verdictele"""
+    return {name: engines[name].features for name in ('fuel', 'ignition', 'pulls') if name in engines}
+
+def assess_risk(fuel, ignition, thermal, electrical):
+    """(all_results, evaluarea riscului) din verdictele engine-urilor"""
+    all_results = {**fuel, **ignition, **thermal, **electrical}
+    return all_results, PredictiveRiskEngine(all_results).assess()
+
+def rescore(results, thresholds=None):
+    """Rezultatele cu verdictele și riscul recalculate pentru alt profil de praguri
+
+    Folosește doar results['features'] (fazele score() ale engine-urilor),
+    fără să reanalizeze logul, deci e destul de rapid pentru un slider.
+    Returnează un dict nou; `results` (ex. din cache) rămâne neschimbat.
+    """
+    profile = threshold_profile(thresholds)
+    features = results['features']
+    fuel = FuelAnalysisEngine.score(features['fuel'], profile)
+    ignition = IgnitionAnalysisEngine.score(features['ignition'], profile)
+    pulls = PullAnalysisEngine.score(features['pulls'], profile) if 'pulls' in features else results['pulls']
+    all_results, risk_assessment = assess_risk(fuel, ignition, results['thermal'], results['electrical'])
+    return {**results, 'fuel': fuel, 'ignition': ignition, 'pulls': pulls,
+            'all_results': all_results, 'risk': risk_assessment, 'thresholds': profile}
+
+def analyze_dataframe(df, options=None, progress=None, modes=None, profiler=None):
+    """Rulează pașii 2-9 pe un DataFrame deja încărcat
+
+    `modes` sunt măștile de regim deja calculate (ex. din ColumnStore);
+    dacă lipsesc, sunt detectate din date. `df` poate fi și un CompactLog;
+    cu options['compact'], măștile returnate sunt bit-packed (PackedMasks). Etapele sunt măsurate de
+    `profiler` (un StageProfiler nou dacă lipsește).
+    """
+    opts = {**DEFAULT_OPTIONS, **(options or {})}
+    report = progress or (lambda pct, message: None)
+    profiler = profiler or StageProfiler()
+
+    # Step 2: Channel Detection + Timebase
+    report(20, "🔍 Detecting channels...")
+    with profiler.stage('detection', rows=len(df)):
+        detector = ChannelDetectionEngine(df)
+        profiles = channel_profiles(opts['profile_dir'])
+        detector.map_channels(profiles)
+        timebase = Timebase.from_frame(df, detector.time_column, opts['time_unit'])
+        if opts['resample_hz'] and modes is None:
+            with profiler.stage('resample'):
+                df = resample_uniform(df, timebase, opts['resample_hz'])
+            detector = ChannelDetectionEngine(df)
+            detector.map_channels(profiles)
+            timebase = Timebase.from_frame(df, detector.time_column, timebase.unit)
+        detector.update(df)
+        detected_channels = detector.finalize()
+        detection_report = detector.get_report()
+
+    # Steps 3-8: engine-urile rulează ca graf de dependențe, cele independente în paralel
+    report(35, "⚙️ Running analysis engines...")
+    thresholds = threshold_profile(opts['thresholds'])
+    mode_engine = OperatingModeEngine(df, detected_channels, timebase)
+    engines = {
+        'modes': mode_engine,
+        'fuel': FuelAnalysisEngine(df, detected_channels, None, detector.stats, thresholds),
+        'ignition': IgnitionAnalysisEngine(df, detected_channels, None, thresholds),
+        'thermal': ThermalStressEngine(df, detected_channels, timebase, detector.stats),
+        'electrical': ElectricalHealthEngine(df, detected_channels, detector.stats),
+    }
+    if opts['anomalies']:
+        engines['anomalies'] = AnomalyDetectionEngine(df, detected_channels, timebase)
+    if opts['correlations']:
+        engines['correlations'] = CorrelationEngine(df, detected_channels, timebase, opts['lag_pairs'],
+                                                    opts['max_lag_s'])
+    if opts['cell_maps']:
+        engines['cell_maps'] = CellMapEngine(df, detected_channels, timebase, opts['rpm_axis'], opts['load_axis'],
+                                             thresholds)
+    if opts['pulls']:
+        engines['pulls'] = PullAnalysisEngine(df, detected_channels, timebase, thresholds)
+    # Semnalele derivate se calculează la primul acces, fără să modifice df
+    derived = SignalStore(df, detected_channels)
+    inputs = {'chunk': df, 'chunk_time': timebase.chunk_time, 'derived': derived}
+    if modes is not None:
+        # Măștile din ColumnStore înlocuiesc task-ul de detecție a regimurilor
+        inputs['modes'] = mode_engine.load_modes(modes, timebase.chunk_time)
+        del engines['modes']
+
+    def on_done(name, done, total):
+        report(35 + 55 * done // total, f"{ENGINE_LABELS[name]} done")
+
+    graph = engine_graph(engines, opts['workers'])
+    try:
+        with profiler.stage('engines', rows=len(df)):
+            signals = graph.run(inputs, on_done)
+    finally:
+        graph.close()
+    modes = signals['modes']
+    if opts['compact']:
+        modes = PackedMasks.from_frame(modes)
+
+    with profiler.stage('finalize'):
+        mode_summary = _finalize(mode_engine, 'modes')
+        fuel_results = _finalize(engines['fuel'], 'fuel')
+        ign_results = _finalize(engines['ignition'], 'ignition')
+        thermal_results = _finalize(engines['thermal'], 'thermal')
+        elec_results = _finalize(engines['electrical'], 'electrical')
+        anomalies, anomaly_table = [], None
+        if opts['anomalies']:
+            anomalies, anomaly_table = _finalize(engines['anomalies'], 'anomalies'), engines['anomalies'].table
+        correlations, correlation_matrix, lags = {}, None, {}
+        if opts['correlations']:
+            correlations = _finalize(engines['correlations'], 'correlations')
+            correlation_matrix, lags = engines['correlations'].matrix, engines['correlations'].lags
+        cell_maps = _finalize(engines['cell_maps'], 'cell_maps') if opts['cell_maps'] else {}
+        pulls = _finalize(engines['pulls'], 'pulls') if opts['pulls'] else {}
+
+    # Step 9: Risk Assessment
+    report(95, "🎯 Computing risk score...")
+    with profiler.stage('risk'):
+        all_results, risk_assessment = assess_risk(fuel_results, ign_results, thermal_results, elec_results)
+    report(100, "✅ Done")
+
+    return {
+        'df': df,
+        'signals': derived,
+        # Statistici / verdicte pe orice fereastră [start, end) (selecția din grafic)
+        'windows': WindowIndex(df, detected_channels, derived, mode_engine.intervals, timebase.chunk_time),
+        'rows': len(df),
+        'memory': df.memory_report() if isinstance(df, CompactLog) else None,
+        'channels': detected_channels,
+        'detection_report': detection_report,
+        'timebase': timebase.report(),
+        'channel_stats': detector.stats.summary(),
+        'schedule': graph.report(),
+        'profile': profiler.report(),
+        'missing': detector.missing,
+        'noisy': detector.noisy,
+        'confidence': detector.confidence,
+        'modes': modes,
+        'mode_intervals': mode_engine.intervals,
+        'mode_summary': mode_summary,
+        'fuel': fuel_results,
+        'ignition': ign_results,
+        'thermal': thermal_results,
+        'electrical': elec_results,
+        'anomalies': anomalies,
+        'anomaly_table': anomaly_table,
+        'correlations': correlations,
+        'correlation_matrix': correlation_matrix,
+        'lags': lags,
+        'cell_maps': cell_maps,
+        'pulls': pulls,
+        'all_results': all_results,
+        'risk': risk_assessment,
+        'thresholds': thresholds,
+        'features': _features(engines),
+    }
+
+def analyze_chunks(path_or_buffer, options=None, progress=None, profiler=None):
+    """Rulează pipeline-ul în streaming, chunk cu chunk
+
+    Memoria maximă depinde de options['chunksize'], nu de lungimea
+    logului: fiecare engine păstrează doar agregate incrementale. Nu se
+    returnează DataFrame-ul, măștile de regim și nici indexul de ferestre
+    ('df', 'modes' și 'windows' sunt None); regimurile rămân disponibile ca
+    intervale ('mode_intervals').
+    """
+    opts = {**DEFAULT_OPTIONS, **(options or {})}
+    report = progress or (lambda pct, message: None)
+    profiler = profiler or StageProfiler()
+    chunksize = opts['chunksize'] or 100_000
+
+    # Step 1-2: Header + Channel Detection
+    report(10, "🔍 Detecting channels...")
+    with profiler.stage('detection') as span:
+        detector = ChannelDetectionEngine(read_header(path_or_buffer))
+        detected_channels = detector.map_channels(channel_profiles(opts['profile_dir']))
+        usecols = detector.required_columns() if opts['prune_columns'] else None
+        dtype = opts['dtype'] if opts['prune_columns'] else None
+
+        # Timebase și anomaliile calibrate pe primele eșantioane, identic cu modul in-memory
+        head = read_head(path_or_buffer, Timebase.CALIBRATION_SAMPLES, usecols=usecols or None,
+                         dtype=dtype, time_column=detector.time_column)
+        timebase = Timebase(detector.time_column, opts['time_unit'])
+        if detector.time_column:
+            timebase.calibrate(head[detector.time_column])
+
+        detector.stats.calibrate(head)
+        span.rows = len(head)
+    thresholds = threshold_profile(opts['thresholds'])
+    mode_engine = OperatingModeEngine(None, detected_channels, timebase)
+    engines = {
+        # Statisticile per canal sunt citite de celelalte engine-uri doar în finalize()
+        'detection': detector,
+        'modes': mode_engine,
+        'fuel': FuelAnalysisEngine(None, detected_channels, None, detector.stats, thresholds),
+        'ignition': IgnitionAnalysisEngine(None, detected_channels, None, thresholds),
+        'thermal': ThermalStressEngine(None, detected_channels, timebase, detector.stats),
+        'electrical': ElectricalHealthEngine(None, detected_channels, detector.stats),
+    }
+    if opts['anomalies']:
+        engines['anomalies'] = AnomalyDetectionEngine(None, detected_channels, timebase).calibrate(head)
+    if opts['correlations']:
+        engines['correlations'] = CorrelationEngine(None, detected_channels, timebase, opts['lag_pairs'],
+                                                    opts['max_lag_s'])
+    if opts['cell_maps']:
+        engines['cell_maps'] = CellMapEngine(None, detected_channels, timebase, opts['rpm_axis'], opts['load_axis'],
+                                             thresholds)
+    if opts['pulls']:
+        engines['pulls'] = PullAnalysisEngine(None, detected_channels, timebase, thresholds)
+
+    # Steps 3-8: un singur pas prin fișier; per chunk, engine-urile rulează ca graf
+    report(20, "⚙️ Streaming chunks through engines...")
+    rows = 0
+    chunks = iter_chunks(path_or_buffer, chunksize, usecols=usecols or None,
+                         dtype=dtype, time_column=detector.time_column)
+    graph = engine_graph(engines, opts['workers'])
+    try:
+        for chunk in profiler.iterate('load', chunks):
+            with profiler.stage('engines', rows=len(chunk)):
+                graph.run({'chunk': chunk, 'chunk_time': timebase.update(chunk),
+                           'derived': SignalStore(chunk, detected_channels)})
+            rows += len(chunk)
+    finally:
+        graph.close()
+
+    with profiler.stage('finalize'):
+        _finalize(detector, 'detection')
+        mode_summary = mode_engine.get_mode_summary()
+        anomalies, anomaly_table = [], None
+        if opts['anomalies']:
+            anomalies, anomaly_table = _finalize(engines['anomalies'], 'anomalies'), engines['anomalies'].table
+        fuel_results = _finalize(engines['fuel'], 'fuel')
+        ign_results = _finalize(engines['ignition'], 'ignition')
+        thermal_results = _finalize(engines['thermal'], 'thermal')
+        elec_results = _finalize(engines['electrical'], 'electrical')
+        correlations, correlation_matrix, lags = {}, None, {}
+        if opts['correlations']:
+            correlations = _finalize(engines['correlations'], 'correlations')
+            correlation_matrix, lags = engines['correlations'].matrix, engines['correlations'].lags
+        cell_maps = _finalize(engines['cell_maps'], 'cell_maps') if opts['cell_maps'] else {}
+        pulls = _finalize(engines['pulls'], 'pulls') if opts['pulls'] else {}
+
+    # Step 9: Risk Assessment
+    report(95, "🎯 Computing risk score...")
+    with profiler.stage('risk'):
+        all_results, risk_assessment = assess_risk(fuel_results, ign_results, thermal_results, elec_results)
+    report(100, "✅ Done")
+
+    return {
+        'df': None,
+        'signals': None,
+        'windows': None,
+        'rows': rows,
+        'memory': None,
+        'channels': detected_channels,
+        'detection_report': detector.get_report(),
+        'timebase': timebase.report(),
+        'channel_stats': detector.stats.summary(),
+        'schedule': graph.report(),
+        'profile': profiler.report(),
+        'missing': detector.missing,
+        'noisy': detector.noisy,
+        'confidence': detector.confidence,
+        'modes': None,
+        'mode_intervals': mode_engine.intervals,
+        'mode_summary': mode_summary,
+        'fuel': fuel_results,
+        'ignition': ign_results,
+        'thermal': thermal_results,
+        'electrical': elec_results,
+        'anomalies': anomalies,
+        'anomaly_table': anomaly_table,
+        'correlations': correlations,
+        'correlation_matrix': correlation_matrix,
+        'lags': lags,
+        'cell_maps': cell_maps,
+        'pulls': pulls,
+        'all_results': all_results,
+        'risk': risk_assessment,
+        'thresholds': thresholds,
+        'features': _features(engines),
+    }
+
+# ======================================================
+# SERIALIZATION
+# ======================================================
+SUMMARY_KEYS = (
+    'channels', 'detection_report', 'timebase', 'missing', 'noisy', 'confidence',
+    'mode_summary', 'all_results', 'anomalies', 'correlations', 'lags', 'cell_maps', 'pulls', 'risk',
+)
+
+def to_jsonable(value):
+    """Convertește recursiv tipurile NumPy/pandas în tipuri JSON native"""
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        value = float(value)
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if isinstance(value, np.ndarray):
+        return to_jsonable(value.tolist())
+    return value
+
+def summarize_results(results):
+    """Rezumat JSON-serializabil al rezultatelor (fără DataFrame și măști)"""
+    summary = {key: results[key] for key in SUMMARY_KEYS if key in results}
+    summary['rows'] = results['rows']
+    return to_jsonable(summary)
@@ -0,0 +1,159 @@
+"""Instrumentare per etapă: wall time, CPU, creșterea RSS de vârf, rânduri/s
+
+Un StageProfiler măsoară etapele pipeline-ului (încărcare, detecție, fiecare
+engine, finalize, risc) și, prin decoratorul @profiled, sub-analizele
+engine-urilor (_analyze_knock, _analyze_linearity, ...). Etapele sunt
+imbricate după contextul în care rulează ('engines/fuel/_update_lambda'),
+iar apelurile repetate ale aceleiași etape (un chunk, o fereastră) se adună.
+Profilerul activ stă într-un ContextVar: fără profiler, @profiled costă o
+singură citire, iar thread-urile scheduler-ului moștenesc contextul.
+
+Timpul CPU este al procesului (include thread-urile pyarrow); etapele care
+rulează simultan pe thread pool îl împart. RSS-ul este vârful procesului
+(ru_maxrss), deci o etapă raportează doar cât a ridicat vârful.
+"""
+import contextlib
+import contextvars
+import functools
+import sys
+import threading
+import time
+
+# resource lipsește pe Windows; fără el, RSS-ul nu este raportat
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# (profiler, calea etapei curente) sau None
+_ACTIVE = contextvars.ContextVar('lztuned_profile', default=None)
+# Sfârșitul iterației în StageProfiler.iterate
+_DONE = object()
+
+def peak_rss_mb():
+    """Vârful RSS al procesului până acum (MB), sau None dacă nu e disponibil"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux raportează KB, macOS bytes
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+class _Span:
+    """Etapa în curs; `rows` poate fi setat după ce se știe câte rânduri au trecut"""
+
+    __slots__ = ('rows',)
+
+    def __init__(self, rows=None):
+        self.rows = rows
+
+# ======================================================
+# PROFILER
+# ======================================================
+class StageProfiler:
+    """Duratele și resursele etapelor unei analize, agregate per cale"""
+
+    def __init__(self):
+        # cale → agregat, în ordinea primei porniri (părintele înaintea copiilor)
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, name, rows=None):
+        """Măsoară blocul ca etapa `name`, copil al etapei curente a acestui profiler"""
+        active = _ACTIVE.get()
+        path = f'{active[1]}/{name}' if active is not None and active[0] is self else name
+        with self._lock:
+            if path not in self._stages:
+                self._stages[path] = {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0,
+                                      'rss_peak_delta_mb': None, 'rows': None}
+        span = _Span(rows)
+        token = _ACTIVE.set((self, path))
+        rss_start = peak_rss_mb()
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - cpu_start
+            rss_end = peak_rss_mb()
+            _ACTIVE.reset(token)
+            with self._lock:
+                entry = self._stages[path]
+                entry['calls'] += 1
+                entry['wall_s'] += wall
+                entry['cpu_s'] += cpu
+                if rss_end is not None:
+                    entry['rss_peak_delta_mb'] = max(entry['rss_peak_delta_mb'] or 0.0, rss_end - rss_start)
+                if span.rows is not None:
+                    entry['rows'] = (entry['rows'] or 0) + int(span.rows)
+
+    def iterate(self, name, iterable):
+        """Iterează `iterable`, măsurând fiecare next() ca etapa `name` (ex. citirea unui chunk)"""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name) as span:
+                item = next(iterator, _DONE)
+                if item is not _DONE:
+                    span.rows = len(item)
+            if item is _DONE:
+                return
+            yield item
+
+    def report(self):
+        """Etapele ca listă de dict-uri, în ordinea unui flame graph (fiecare părinte urmat de copii)"""
+        with self._lock:
+            stages = {path: dict(entry) for path, entry in self._stages.items()}
+
+        children = {}
+        for path in stages:
+            parent = path.rpartition('/')[0]
+            children.setdefault(parent, []).append(path)
+        total = sum(stages[path]['wall_s'] for path in children.get('', ()))
+
+        rows = []
+
+        def visit(path):
+            entry = stages[path]
+            wall = entry['wall_s']
+            rss = entry['rss_peak_delta_mb']
+            rows.append({
+                'stage': path,
+                'name': path.rpartition('/')[2],
+                'depth': path.count('/'),
+                'calls': entry['calls'],
+                'wall_s': round(wall, 6),
+                'cpu_s': round(entry['cpu_s'], 6),
+                'rss_peak_delta_mb': round(rss, 3) if rss is not None else None,
+                'rows': entry['rows'],
+                'rows_per_s': round(entry['rows'] / wall) if entry['rows'] is not None and wall > 0 else None,
+                'share_pct': round(100.0 * wall / total, 2) if total > 0 else 0.0,
+            })
+            for child in children.get(path, ()):
+                visit(child)
+
+        for path in children.get('', ()):
+            visit(path)
+        return rows
+
+def stage(name, rows=None):
+    """Etapa `name` a profilerului activ; fără profiler activ nu măsoară nimic"""
+    active = _ACTIVE.get()
+    if active is None:
+        return contextlib.nullcontext(_Span(rows))
+    return active[0].stage(name, rows)
+
+def profiled(fn):
+    """Decorator pentru metodele engine-urilor: fiecare apel devine o sub-etapă
+
+    Rândurile sunt cele ale primului argument, dacă e un chunk (ex. _update_knock).
+    """
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        active = _ACTIVE.get()
+        if active is None:
+            return fn(self, *args, **kwargs)
+        rows = args[0].shape[0] if args and hasattr(args[0], 'shape') else None
+        with active[0].stage(fn.__name__, rows):
+            return fn(self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,324 @@
+"""Cititoare pentru formatele binare de log, ca pluginuri lângă calea CSV
+
+Un format se înregistrează cu @log_reader (ca @derived_signal pentru
+semnale): o clasă LogReader cu semnătura de la începutul fișierului
+(`magic`) și extensiile ei. Funcțiile de încărcare din pipeline
+(load_log, read_header, read_head, iter_chunks) întreabă întâi
+reader_for(); dacă niciun cititor nu recunoaște fișierul, logul e CSV.
+Cititorii produc același DataFrame ca parser-ul CSV (coloane cu numele din
+log, float32 pentru canalele cerute, timpul în float64), deci detecția
+canalelor și engine-urile nu depind de format.
+
+MLGReader citește formatul binar MegaLogViewer (.mlg, versiunile 1 și 2):
+fișierul e memory-mapped, blocurile de date sunt un array structurat
+(numpy, big-endian) peste bufferul fișierului, fără copiere, iar scale /
+transform se aplică vectorizat doar pe coloanele cerute. Un .mlg comprimat
+(.gz / .zip / .zst, vezi sources) ajunge la cititor ca stream decomprimat.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from .sources import sample
+
+# ======================================================
+# REGISTRY
+# ======================================================
+class LogReader:
+    """Interfața unui format de log
+
+    Subclasele implementează read_header() și read(); `rows` este o felie
+    de rânduri (citire pe bucăți), `usecols` / `dtype` / `time_column` au
+    sensul din pipeline.load_log.
+    """
+
+    name = None
+    extensions = ()
+    magic = b''
+
+    def read_header(self, source):
+        """Coloanele logului, ca DataFrame gol"""
+        raise NotImplementedError
+
+    def read(self, source, usecols=None, dtype=None, time_column=None, rows=None):
+        raise NotImplementedError
+
+    def iter_chunks(self, source, chunksize, usecols=None, dtype=None, time_column=None):
+        """Chunk-uri de `chunksize` rânduri, cu index continuu (ca pd.read_csv cu chunksize)"""
+        start = 0
+        while True:
+            chunk = self.read(source, usecols, dtype, time_column, rows=slice(start, start + chunksize))
+            if chunk.empty:
+                return
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            yield chunk
+            start += len(chunk)
+
+LOG_READERS = {}
+
+def log_reader(cls=None, registry=None):
+    """Decorator: înregistrează o subclasă LogReader după `name`"""
+    registry = LOG_READERS if registry is None else registry
+
+    def register(cls):
+        if cls.name in registry:
+            raise ValueError(f"Cititorul de loguri '{cls.name}' este deja definit")
+        registry[cls.name] = cls()
+        return cls
+    return register(cls) if cls is not None else register
+
+def reader_for(source, registry=None):
+    """Cititorul pentru un log (după semnătură, apoi după extensie); None = CSV"""
+    registry = LOG_READERS if registry is None else registry
+    if not registry or isinstance(source, pd.DataFrame):
+        return None
+    head = sample(source, 16)
+    for reader in registry.values():
+        if reader.magic and head.startswith(reader.magic):
+            return reader
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    extension = os.path.splitext(str(name))[1].lower()
+    for reader in registry.values():
+        if extension in reader.extensions:
+            return reader
+    return None
+
+def _buffer(source):
+    """Conținutul logului ca array uint8: memory-mapped pentru căi, vedere pentru buffere"""
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.getsize(source):
+            return np.empty(0, dtype=np.uint8)
+        return np.memmap(source, dtype=np.uint8, mode='r')
+    if hasattr(source, 'getbuffer'):
+        return np.frombuffer(source.getbuffer(), dtype=np.uint8)
+    # Stream (ex. decomprimat din .gz / .zip): citit întreg, formatul binar cere acces aleator
+    if source.seekable():
+        source.seek(0)
+    data = source.read()
+    if source.seekable():
+        source.seek(0)
+    return np.frombuffer(data, dtype=np.uint8)
+
+def _decimal(value):
+    """Valoarea zecimală scrisă în header pentru un float32 (0.001, nu 0.0010000000475)"""
+    return float(np.format_float_positional(np.float32(value), unique=True, trim='0'))
+
+def _unique_names(names):
+    """Numele duplicate primesc sufixul '.1', '.2', ... (ca header-ele duplicate din pandas)"""
+    seen = {}
+    out = []
+    for name in names:
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        out.append(f'{name}.{count}' if count else name)
+    return out
+
+# ======================================================
+# MEGALOGVIEWER BINARY (.mlg)
+# ======================================================
+@log_reader
+class MLGReader(LogReader):
+    """Format binar MegaLogViewer (MLVLG), versiunile 1 și 2
+
+    Header-ul descrie câmpurile unei înregistrări (tip, nume, unitate,
+    scale, transform); valoarea afișată este (brut + transform) × scale.
+    Datele sunt blocuri de lungime fixă (tip 0: contor, timestamp în 10 µs,
+    înregistrarea, CRC) întrerupte rar de markere (tip 1, mesaj de 50 bytes);
+    fiecare porțiune dintre markere este o vedere structurată peste fișier.
+    """
+
+    name = 'mlg'
+    extensions = ('.mlg',)
+    magic = b'MLVLG'
+
+    HEADER = {
+        1: np.dtype([('magic', 'S6'), ('version', '>i2'), ('timestamp', '>i4'), ('info_start', '>i2'),
+                     ('data_start', '>i4'), ('record_length', '>i2'), ('fields', '>i2')]),
+        2: np.dtype([('magic', 'S6'), ('version', '>i2'), ('timestamp', '>i4'), ('info_start', '>i4'),
+                     ('data_start', '>i4'), ('record_length', '>i2'), ('fields', '>i2')]),
+    }
+    FIELD = np.dtype([('type', 'u1'), ('name', 'S34'), ('units', 'S10'), ('style', 'u1'),
+                      ('scale', '>f4'), ('transform', '>f4'), ('digits', 'i1')])
+    FIELD_V2 = np.dtype(FIELD.descr + [('category', 'S34')])
+    # Tipul câmpului → tipul numpy (big-endian); 10-12 sunt bitfield-uri, citite ca întregi
+    FIELD_TYPES = {0: 'u1', 1: 'i1', 2: '>u2', 3: '>i2', 4: '>u4', 5: '>i4', 6: '>i8', 7: '>f4',
+                   10: 'u1', 11: '>u2', 12: '>u4'}
+    DATA_BLOCK, MARKER_BLOCK = 0, 1
+    MARKER_LENGTH = 50
+    # Unitatea timestamp-ului din blocuri (secunde); coloana de timp dacă logul nu are câmpul Time
+    TICK_S = 1e-5
+    TIME_COLUMN = 'Time'
+
+    def layout(self, data):
+        """(header, câmpuri, nume de coloane, dtype-ul blocului de date) din primii bytes ai fișierului"""
+        if data.size < self.HEADER[1].itemsize or bytes(data[:5]) != self.magic:
+            raise ValueError("Fișier MLG invalid: lipsește semnătura MLVLG")
+        version = int(data[6:8].view('>i2')[0])
+        if version not in self.HEADER:
+            raise ValueError(f"Versiune MLG nesuportată: {version}")
+        header = data[:self.HEADER[version].itemsize].view(self.HEADER[version])[0]
+        field_dtype = self.FIELD if version == 1 else self.FIELD_V2
+        start = self.HEADER[version].itemsize
+        end = start + int(header['fields']) * field_dtype.itemsize
+        if data.size < end:
+            raise ValueError("Fișier MLG trunchiat: descrierea câmpurilor este incompletă")
+        fields = data[start:end].view(field_dtype)
+
+        names = [name.split(b'\0', 1)[0].decode('latin-1') for name in fields['name']]
+        names = _unique_names([name or f'Field {i + 1}' for i, name in enumerate(names)])
+        unknown = sorted({int(t) for t in fields['type']} - set(self.FIELD_TYPES))
+        if unknown:
+            raise ValueError(f"Tipuri de câmp MLG necunoscute: {unknown}")
+        record = np.dtype([(name, self.FIELD_TYPES[int(t)]) for name, t in zip(names, fields['type'])])
+        if record.itemsize != int(header['record_length']):
+            raise ValueError(f"Lungime de înregistrare MLG inconsistentă: {record.itemsize} ≠ {int(header['record_length'])}")
+        block = np.dtype([('block_type', 'u1'), ('counter', 'u1'), ('timestamp', '>u2'), ('record', record),
+                          ('crc', 'u1')])
+        return header, fields, names, block
+
+    def segments(self, data):
+        """Porțiunile de blocuri de date dintre markere, ca vederi structurate peste `data`"""
+        header, _, _, block = self.layout(data)
+        pos = int(header['data_start'])
+        segments = []
+        while pos + block.itemsize <= data.size:
+            count = (data.size - pos) // block.itemsize
+            blocks = data[pos:pos + count * block.itemsize].view(block)
+            other = np.flatnonzero(blocks['block_type'] != self.DATA_BLOCK)
+            end = int(other[0]) if other.size else count
+            if end:
+                segments.append(blocks[:end])
+            pos += end * block.itemsize
+            if end == count:
+                break
+            if data[pos] != self.MARKER_BLOCK:
+                # Bloc necunoscut (fișier corupt): se păstrează datele de până aici
+                break
+            pos += 4 + self.MARKER_LENGTH
+        return segments
+
+    def has_time(self, names):
+        """Logul are deja un câmp de timp ('Time', 'time', 'TIME', ...)"""
+        return any(name.strip().lower() == self.TIME_COLUMN.lower() for name in names)
+
+    def read_header(self, source):
+        _, _, names, _ = self.layout(_buffer(source))
+        if not self.has_time(names):
+            names = [self.TIME_COLUMN] + names
+        return pd.DataFrame(columns=names)
+
+    def read(self, source, usecols=None, dtype=None, time_column=None, rows=None):
+        data = _buffer(source)
+        _, fields, names, _ = self.layout(data)
+        return self._frame(fields, names, self.segments(data), usecols, dtype, time_column, rows)
+
+    def iter_chunks(self, source, chunksize, usecols=None, dtype=None, time_column=None):
+        """Chunk-uri din aceeași mapare a fișierului (layout-ul și markerele se caută o singură dată)"""
+        data = _buffer(source)
+        _, fields, names, _ = self.layout(data)
+        segments = self.segments(data)
+        total = sum(len(segment) for segment in segments)
+        # Ceasul blocurilor (ultimul timestamp, ticks acumulate) continuă de la un chunk la următorul
+        clock = [None, 0]
+        for start in range(0, total, chunksize):
+            chunk = self._frame(fields, names, segments, usecols, dtype, time_column, slice(start, start + chunksize),
+                                clock)
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            yield chunk
+
+    def _frame(self, fields, names, segments, usecols, dtype, time_column, rows, clock=None):
+        """DataFrame-ul rândurilor `rows`, doar cu coloanele `usecols`
+
+        `clock` este starea ceasului blocurilor la rândul `rows.start`
+        (iter_chunks); fără ea se reconstruiește din rândurile anterioare.
+        """
+        counts = np.array([len(segment) for segment in segments], dtype=np.int64)
+        start, stop, _ = (rows or slice(None)).indices(int(counts.sum()))
+        stop = max(start, stop)
+
+        # Feliile de rânduri cerute, ca vederi în fiecare porțiune
+        offsets = np.concatenate(([0], np.cumsum(counts))).tolist()
+        parts = self._rows(segments, offsets, start, stop)
+
+        columns = {}
+        if not self.has_time(names) and (usecols is None or self.TIME_COLUMN in usecols):
+            if clock is None:
+                clock = [None, 0]
+                self._block_time(self._rows(segments, offsets, 0, start), clock)
+            columns[self.TIME_COLUMN] = self._block_time(parts, clock)
+        for i, name in enumerate(names):
+            if usecols is not None and name not in usecols:
+                continue
+            scale, transform = _decimal(fields['scale'][i]), _decimal(fields['transform'][i])
+            # Scale 1/k (0.1, 0.001, ...): împărțirea la k e exactă, ca valorile zecimale din CSV
+            divisor = round(1 / scale) if scale else 0
+            exact = divisor > 1 and _decimal(np.float32(1 / divisor)) == scale
+            values = np.empty(stop - start, dtype=np.float64 if not dtype or name == time_column else dtype)
+            at = 0
+            for part in parts:
+                raw = part['record'][name]
+                raw = raw.astype(np.float64) + transform
+                values[at:at + raw.size] = raw / divisor if exact else raw * scale
+                at += raw.size
+            columns[name] = values
+        return pd.DataFrame(columns, index=pd.RangeIndex(stop - start))
+
+    @staticmethod
+    def _rows(segments, offsets, start, stop):
+        """Feliile rândurilor start..stop, ca vederi în fiecare porțiune"""
+        return [
+            segment[max(start - lo, 0):min(stop, hi) - lo]
+            for segment, lo, hi in zip(segments, offsets[:-1], offsets[1:])
+            if lo < stop and hi > start
+        ]
+
+    def _block_time(self, parts, clock):
+        """Timpul din timestamp-urile blocurilor (10 µs, 16 biți, cu depășire), de la primul bloc
+
+        `clock` = [ultimul timestamp, ticks acumulate] înaintea lui `parts`;
+        se actualizează pe loc, deci fiecare rând se parcurge o singură dată.
+        """
+        if not parts:
+            return np.empty(0)
+        ticks = np.concatenate([part['timestamp'].astype(np.int64) for part in parts])
+        if not ticks.size:
+            return np.empty(0)
+        steps = np.diff(ticks, prepend=ticks[0] if clock[0] is None else clock[0]) % 65536
+        total = clock[1] + np.cumsum(steps)
+        clock[:] = [int(ticks[-1]), int(total[-1])]
+        return total * self.TICK_S
+
+def write_mlg(path, frame, units=None, time_column=None):
+    """Scrie un DataFrame ca MLG versiunea 1 (conversie CSV → MLG, teste și benchmark-uri)
+
+    Canalele se scriu ca float32; `time_column` ca U32 cu rezoluție de 1 ms.
+    """
+    units = units or {}
+    names = list(frame.columns)
+    fields = np.zeros(len(names), dtype=MLGReader.FIELD)
+    record = []
+    for i, name in enumerate(names):
+        is_time = name == time_column
+        fields[i] = (4 if is_time else 7, name.encode('latin-1')[:33], units.get(name, '').encode('latin-1')[:9],
+                     0, 0.001 if is_time else 1.0, 0.0, 3)
+        record.append((name, '>u4' if is_time else '>f4'))
+    record = np.dtype(record)
+    header_dtype = MLGReader.HEADER[1]
+    data_start = header_dtype.itemsize + fields.nbytes
+    header = np.array([(MLGReader.magic + b'\0', 1, 0, 0, data_start, record.itemsize, len(names))], dtype=header_dtype)
+
+    blocks = np.zeros(len(frame), dtype=[('block_type', 'u1'), ('counter', 'u1'), ('timestamp', '>u2'),
+                                         ('record', record), ('crc', 'u1')])
+    blocks['counter'] = np.arange(len(frame)) % 256
+    for name in names:
+        values = frame[name].to_numpy(dtype=np.float64)
+        if name == time_column:
+            blocks['timestamp'] = np.round(values / MLGReader.TICK_S).astype(np.int64) % 65536
+            values = np.round(values * 1000)
+        blocks['record'][name] = values
+    with open(path, 'wb') as f:
+        f.write(header.tobytes())
+        f.write(fields.tobytes())
+        f.write(blocks.tobytes())
+    return path
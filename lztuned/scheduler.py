@@ -0,0 +1,170 @@
+"""Scheduler DAG: rulează în paralel engine-urile independente (thread pool)
+
+Fiecare task declară semnalele pe care le citește și pe care le produce;
+dependențele rezultă din ele (un task depinde de producătorul fiecărui
+semnal citit). Task-urile gata de rulare pornesc imediat pe un thread pool:
+operațiile NumPy/pandas eliberează GIL-ul, deci engine-urile independente
+rulează efectiv în paralel, iar timpul total tinde spre calea critică.
+"""
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# ======================================================
+# TASKS
+# ======================================================
+class Task:
+    """Un pas din graf: fn(signals) → dict cu semnalele produse"""
+
+    __slots__ = ('name', 'fn', 'reads', 'produces')
+
+    def __init__(self, name, fn, reads=(), produces=()):
+        self.name = name
+        self.fn = fn
+        self.reads = tuple(reads or ())
+        self.produces = tuple(produces or ())
+
+# ======================================================
+# TASK GRAPH
+# ======================================================
+class TaskGraph:
+    """Graful de dependențe al task-urilor; rulează și raportează calea critică
+
+    Semnalele citite pe care nu le produce niciun task sunt intrări (canale
+    brute, chunk-ul curent) și trebuie date la run(). Cu `max_workers=1`
+    task-urile rulează secvențial, în ordine topologică, fără thread-uri.
+    Graful poate rula de mai multe ori (o dată per chunk); duratele se adună.
+    """
+
+    def __init__(self, tasks, max_workers=None):
+        self.tasks = {task.name: task for task in tasks}
+        if len(self.tasks) != len(tasks):
+            raise ValueError("Nume de task duplicat în graf")
+        producers = {}
+        for task in tasks:
+            for signal in task.produces:
+                if signal in producers:
+                    raise ValueError(f"Semnalul '{signal}' e produs de '{producers[signal]}' și de '{task.name}'")
+                producers[signal] = task.name
+        self.deps = {
+            task.name: sorted({producers[s] for s in task.reads if s in producers} - {task.name})
+            for task in tasks
+        }
+        self.order = self._topological_order()
+        self.max_workers = max_workers or min(len(tasks), os.cpu_count() or 1) or 1
+        self._executor = None
+        self.runs = 0
+        self.wall_s = 0.0
+        self.busy = dict.fromkeys(self.tasks, 0.0)
+
+    def _topological_order(self):
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'active':
+                raise ValueError(f"Dependență circulară: {' → '.join(path + [name])}")
+            state[name] = 'active'
+            for dep in self.deps[name]:
+                visit(dep, path + [name])
+            state[name] = 'done'
+            order.append(name)
+
+        for name in self.tasks:
+            visit(name, [])
+        return order
+
+    def run(self, inputs=None, on_done=None):
+        """Rulează toate task-urile; întoarce semnalele (intrări + produse)
+
+        `on_done(name, done, total)` este apelat din thread-ul apelantului
+        după fiecare task terminat (ex. bara de progres din UI).
+        """
+        signals = dict(inputs or {})
+        t0 = time.perf_counter()
+        try:
+            self._run(signals, on_done or (lambda name, done, total: None))
+        finally:
+            self.runs += 1
+            self.wall_s += time.perf_counter() - t0
+        return signals
+
+    def _run(self, signals, on_done):
+        if self.max_workers == 1:
+            for i, name in enumerate(self.order):
+                self._run_task(name, signals)
+                on_done(name, i + 1, len(self.order))
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='lztuned-engine')
+        done, running = set(), {}
+        try:
+            while len(done) < len(self.tasks):
+                for name in self.order:
+                    if name not in done and name not in running.values() and \
+                            all(dep in done for dep in self.deps[name]):
+                        # Task-ul moștenește contextul apelantului (ex. etapa profilerului activ)
+                        future = self._executor.submit(contextvars.copy_context().run,
+                                                       self._run_task, name, signals)
+                        running[future] = name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    future.result()
+                    name = running.pop(future)
+                    done.add(name)
+                    on_done(name, len(done), len(self.tasks))
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+
+    def _run_task(self, name, signals):
+        task = self.tasks[name]
+        start = time.perf_counter()
+        produced = task.fn(signals) or {}
+        self.busy[name] += time.perf_counter() - start
+        # Fiecare semnal are un singur producător, deci scrierile nu se suprapun
+        signals.update((key, produced[key]) for key in task.produces if key in produced)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    # ======================================================
+    # REPORTING
+    # ======================================================
+    def critical_path(self):
+        """Lanțul de dependențe cu cea mai mare durată însumată"""
+        finish, prev = {}, {}
+        for name in self.order:
+            prev[name] = max(self.deps[name], key=finish.get, default=None)
+            finish[name] = self.busy[name] + (finish[prev[name]] if prev[name] else 0.0)
+        if not finish:
+            return [], 0.0
+        name = max(finish, key=finish.get)
+        total = finish[name]
+        path = []
+        while name is not None:
+            path.append(name)
+            name = prev[name]
+        return path[::-1], total
+
+    def report(self):
+        """Rezumat JSON-friendly: timpul per task, wall time, calea critică"""
+        path, path_s = self.critical_path()
+        return {
+            'workers': self.max_workers,
+            'runs': self.runs,
+            'wall_s': round(self.wall_s, 4),
+            'busy_s': round(sum(self.busy.values()), 4),
+            'critical_path': path,
+            'critical_path_s': round(path_s, 4),
+            'tasks': {
+                name: {'busy_s': round(self.busy[name], 4), 'deps': self.deps[name]}
+                for name in self.order
+            },
+        }
@@ -0,0 +1,170 @@
+"""Semnale derivate (Lambda_Avg, Inj_Duty, Knock_Peak, ...): definite o dată, calculate la cerere
+
+Fiecare semnal derivat se înregistrează o singură dată, cu canalele standard
+de care depinde și funcția care îl calculează. SignalStore îl calculează la
+primul acces pentru un log, îl memorează și îl poate evacua când depășește
+bugetul de memorie. DataFrame-ul logului nu este modificat, deci rămâne
+valid în cache, iar exportul datelor brute conține semnalele derivate doar
+la cerere (SignalStore.with_signals).
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .compact import CompactLog
+
+# ======================================================
+# REGISTRY
+# ======================================================
+class DerivedSignal:
+    """Definiția unui semnal derivat: fn(columns) → Series
+
+    `columns` conține canalele din `requires` (obligatorii) și pe cele din
+    `optional` care există în log, după numele standard. Un nume poate fi
+    și al altui semnal derivat (math channel construit peste altul).
+    """
+
+    __slots__ = ('name', 'fn', 'requires', 'optional', 'label')
+
+    def __init__(self, name, fn, requires, optional=(), label=None):
+        self.name = name
+        self.fn = fn
+        self.requires = tuple(requires)
+        self.optional = tuple(optional)
+        self.label = label or name
+
+DERIVED_SIGNALS = {}
+
+def derived_signal(name, requires, optional=(), label=None, registry=None):
+    """Decorator: înregistrează fn(columns) ca semnalul derivat `name`"""
+    registry = DERIVED_SIGNALS if registry is None else registry
+
+    def register(fn):
+        if name in registry:
+            raise ValueError(f"Semnalul derivat '{name}' este deja definit")
+        registry[name] = DerivedSignal(name, fn, requires, optional, label)
+        return fn
+    return register
+
+@derived_signal('Lambda_Avg', requires=('lambda1',), optional=('lambda2',), label='Lambda Avg')
+def lambda_avg(columns):
+    """Media celor două sonde lambda (doar banc 1 dacă a doua lipsește)"""
+    if 'lambda2' in columns:
+        return (columns['lambda1'] + columns['lambda2']) / 2
+    return columns['lambda1']
+
+@derived_signal('Inj_Duty', requires=('inj_time', 'rpm'), label='Injector Duty %')
+def injector_duty(columns):
+    """Duty cycle-ul injectoarelor (%), din timpul de injecție (ms) și RPM"""
+    rpm_safe = columns['rpm'].replace(0, np.nan)
+    return (columns['inj_time'] * rpm_safe) / 1200
+
+@derived_signal('Knock_Peak', requires=('knock1',), optional=('knock2',), label='Knock Peak')
+def knock_peak(columns):
+    """Maximul celor doi senzori de knock, per eșantion"""
+    if 'knock2' in columns:
+        return np.maximum(columns['knock1'], columns['knock2'])
+    return columns['knock1']
+
+# ======================================================
+# SIGNAL STORE
+# ======================================================
+class SignalStore:
+    """Semnalele derivate ale unui DataFrame, calculate la primul acces și memorate
+
+    Valorile sunt păstrate LRU în limita `max_bytes`; un semnal evacuat se
+    recalculează la următorul acces. Accesul e sincronizat: engine-urile
+    rulate în paralel de scheduler calculează fiecare semnal o singură dată.
+    """
+
+    MAX_BYTES = 256 * 1024 ** 2
+
+    def __init__(self, frame, channels, registry=None, max_bytes=None):
+        self.frame = frame
+        self.channels = channels
+        self.registry = DERIVED_SIGNALS if registry is None else registry
+        self.max_bytes = self.MAX_BYTES if max_bytes is None else max_bytes
+        self.nbytes = 0
+        self.computed = 0
+        self._values = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, name):
+        """Semnalul e definit și toate dependențele lui există în log"""
+        signal = self.registry.get(name)
+        return signal is not None and all(
+            req in self.channels or req in self for req in signal.requires
+        )
+
+    def __getitem__(self, name):
+        value = self.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def available(self):
+        """Numele semnalelor derivate care pot fi calculate pentru acest log"""
+        return [name for name in self.registry if name in self]
+
+    def get(self, name, default=None):
+        """Valoarea semnalului (calculată acum dacă nu e memorată) sau `default`"""
+        if name not in self:
+            return default
+        with self._lock:
+            if name in self._values:
+                self._values.move_to_end(name)
+                return self._values[name]
+            value = self.registry[name].fn(self._inputs(self.registry[name]))
+            self.computed += 1
+            self._put(name, value)
+            return value
+
+    def _inputs(self, signal):
+        columns = {}
+        for name in signal.requires + signal.optional:
+            if name in self.channels:
+                columns[name] = self.frame[self.channels[name]]
+            elif name in self:
+                columns[name] = self[name]
+        return columns
+
+    def _put(self, name, value):
+        size = int(value.memory_usage(index=False, deep=False)) if isinstance(value, pd.Series) \
+            else int(np.asarray(value).nbytes)
+        self._values[name] = value
+        self._sizes[name] = size
+        self.nbytes += size
+        # Cel mai recent semnal rămâne mereu, chiar dacă singur depășește bugetul
+        while self.nbytes > self.max_bytes and len(self._values) > 1:
+            self._drop(next(iter(self._values)))
+
+    def _drop(self, name):
+        del self._values[name]
+        self.nbytes -= self._sizes.pop(name)
+
+    def evict(self, name=None):
+        """Eliberează un semnal memorat (sau pe toate); se recalculează la cerere"""
+        with self._lock:
+            for key in ([name] if name is not None else list(self._values)):
+                if key in self._values:
+                    self._drop(key)
+
+    def max_nbytes(self):
+        """Memoria maximă ocupată dacă toate semnalele disponibile sunt memorate (float64)"""
+        return min(self.max_bytes, 8 * len(self.frame) * len(self.available()))
+
+    def with_signals(self, frame=None, names=None):
+        """Copie a datelor brute cu semnalele derivate adăugate, pentru export
+
+        `frame` implicit este DataFrame-ul analizat; poate fi și tabelul
+        complet al aceluiași log (același număr de rânduri).
+        """
+        frame = self.frame if frame is None else frame
+        if isinstance(frame, CompactLog):
+            frame = frame.to_frame()
+        names = self.available() if names is None else [name for name in names if name in self]
+        derived = pd.DataFrame({name: np.asarray(self[name]) for name in names}, index=frame.index)
+        return pd.concat([frame, derived], axis=1)
@@ -0,0 +1,224 @@
+"""Sursele logurilor: arhive comprimate citite în flux și dialectul CSV
+
+Logurile vin și ca .csv.gz, .zip sau .zst. Compresia se detectează după
+semnătura de la începutul fișierului (nu după extensie), iar open_log()
+dă un stream decomprimat care merge direct în parser-ul CSV pe chunk-uri
+(pandas / pyarrow): textul necomprimat nu este construit întreg în
+memorie. Logurile necomprimate trec mai departe neschimbate (calea
+fișierului ajunge direct la parser).
+
+O arhivă zip cu mai multe loguri se analizează ca batch: archive_members()
+dă câte un ArchiveMember per log, o sursă ca oricare alta (load_log,
+analyze_log, BatchRunner).
+
+sniff_dialect() detectează separatorul, virgula zecimală și encoding-ul
+din primii bytes decomprimați: BOM (UTF-8 / UTF-16), apoi UTF-8 strict,
+cu fallback la cp1252 / latin-1 pentru exporturile ECU de pe Windows.
+"""
+import codecs
+import contextlib
+import gzip
+import os
+import re
+import zipfile
+
+# Decompresie zstd, dacă pachetul zstandard este instalat
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Semnăturile formatelor comprimate
+COMPRESSION_MAGIC = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'PK\x03\x04', 'zip'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+)
+# Bytes decomprimați folosiți pentru detecția dialectului
+SAMPLE_BYTES = 1 << 16
+# Rânduri de date inspectate pentru virgula zecimală
+SNIFF_LINES = 50
+
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+DECIMAL_COMMA = re.compile(r'-?\d+,\d+')
+DECIMAL_POINT = re.compile(r'-?\d*\.\d+')
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+# ======================================================
+# ARCHIVE MEMBERS
+# ======================================================
+class ArchiveMember:
+    """Un log din interiorul unei arhive zip (arhiva ca cale sau buffer)"""
+
+    __slots__ = ('archive', 'member')
+
+    def __init__(self, archive, member):
+        self.archive = archive
+        self.member = member
+
+    @property
+    def name(self):
+        """Numele logului în arhivă (extensia lui alege cititorul, ca la fișiere)"""
+        return self.member
+
+    def __str__(self):
+        archive = self.archive if _is_path(self.archive) else getattr(self.archive, 'name', 'archive')
+        return f"{os.fspath(archive)}!{self.member}"
+
+    def __repr__(self):
+        return f"ArchiveMember({str(self)!r})"
+
+def _zip_logs(archive):
+    """Numele fișierelor din arhivă, fără directoare și metadate (__MACOSX, fișiere ascunse)"""
+    return [info.filename for info in archive.infolist()
+            if not info.is_dir() and not info.filename.startswith('__MACOSX/')
+            and not os.path.basename(info.filename).startswith('.')]
+
+def archive_members(source):
+    """Câte un ArchiveMember per log dintr-o arhivă zip; [] dacă sursa nu e zip"""
+    if isinstance(source, ArchiveMember) or compression(source) != 'zip':
+        return []
+    with _open_raw(source) as raw, zipfile.ZipFile(raw) as archive:
+        return [ArchiveMember(source, name) for name in _zip_logs(archive)]
+
+# ======================================================
+# DECOMPRESSION
+# ======================================================
+@contextlib.contextmanager
+def _open_raw(source):
+    """Stream binar peste bytes-ii sursei (buffer-ul e repoziționat la 0 la ieșire)"""
+    if _is_path(source):
+        with open(source, 'rb') as f:
+            yield f
+        return
+    source.seek(0)
+    try:
+        yield source
+    finally:
+        source.seek(0)
+
+def compression(source):
+    """Formatul de compresie după semnătură ('gzip', 'zip', 'zstd'); None = necomprimat"""
+    if isinstance(source, ArchiveMember):
+        return 'zip'
+    if not _is_path(source) and not hasattr(source, 'seek'):
+        return None
+    with _open_raw(source) as raw:
+        head = raw.read(4)
+    if isinstance(head, str):
+        return None
+    for magic, kind in COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return kind
+    return None
+
+def _zip_member(archive, source):
+    """Membrul de citit: cel cerut sau singurul log din arhivă"""
+    if isinstance(source, ArchiveMember):
+        return source.member
+    names = _zip_logs(archive)
+    if not names:
+        raise ValueError("Arhiva zip nu conține niciun log")
+    if len(names) > 1:
+        raise ValueError(f"Arhiva zip conține {len(names)} loguri; analizează-le ca batch (archive_members)")
+    return names[0]
+
+@contextlib.contextmanager
+def open_log(source):
+    """Logul decomprimat ca stream binar, citit în flux
+
+    Pentru logurile necomprimate dă sursa însăși (calea sau buffer-ul
+    repoziționat la 0), deci parser-ele citesc exact ca înainte.
+    """
+    kind = compression(source)
+    if kind is None:
+        if _is_path(source) or not hasattr(source, 'seek'):
+            yield source
+            return
+        with _open_raw(source) as raw:
+            yield raw
+        return
+
+    with contextlib.ExitStack() as stack:
+        raw = stack.enter_context(_open_raw(source.archive if isinstance(source, ArchiveMember) else source))
+        if kind == 'gzip':
+            stream = gzip.GzipFile(fileobj=raw, mode='rb')
+        elif kind == 'zstd':
+            if zstandard is None:
+                raise ValueError("Logurile .zst necesită pachetul zstandard (pip install zstandard)")
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=False)
+        else:
+            archive = stack.enter_context(zipfile.ZipFile(raw))
+            stream = archive.open(_zip_member(archive, source))
+        yield stack.enter_context(stream)
+
+def sample(source, size=SAMPLE_BYTES):
+    """Primii `size` bytes decomprimați ai logului"""
+    with open_log(source) as stream:
+        if _is_path(stream):
+            with open(stream, 'rb') as f:
+                return f.read(size)
+        head = stream.read(size)
+    return head if isinstance(head, bytes) else head.encode('utf-8', errors='ignore')
+
+# ======================================================
+# DIALECT
+# ======================================================
+def detect_encoding(data):
+    """Encoding-ul unui eșantion de bytes: BOM, apoi UTF-8 strict, apoi cp1252 / latin-1"""
+    for bom, encoding in BOMS:
+        if data.startswith(bom):
+            return encoding
+    try:
+        # Eșantionul poate tăia un caracter multi-byte la final
+        codecs.getincrementaldecoder('utf-8')().decode(data, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    try:
+        data.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+def detect_separator(sample):
+    """Detectează separatorul CSV din linia de header a unui eșantion de text"""
+    header = sample.lstrip('\ufeff').split('\n', 1)[0]
+    for sep in (';', '\t'):
+        if sep in header:
+            return sep
+    return ','
+
+def detect_decimal(lines, sep):
+    """',' dacă rândurile de date folosesc virgula zecimală (doar cu separator diferit de ',')"""
+    if sep == ',':
+        return '.'
+    comma = point = False
+    for line in lines:
+        for field in line.split(sep):
+            field = field.strip()
+            comma = comma or bool(DECIMAL_COMMA.fullmatch(field))
+            point = point or bool(DECIMAL_POINT.fullmatch(field))
+    return ',' if comma and not point else '.'
+
+def detect_dialect(data):
+    """{'sep', 'decimal', 'encoding'} dintr-un eșantion de bytes de la începutul logului"""
+    encoding = detect_encoding(data)
+    text = data.decode(encoding, errors='ignore')
+    lines = text.lstrip('\ufeff').splitlines()
+    sep = detect_separator(text)
+    return {
+        'sep': sep,
+        'decimal': detect_decimal(lines[1:SNIFF_LINES + 1], sep),
+        'encoding': encoding,
+    }
+
+def sniff_dialect(source):
+    """Dialectul CSV al unui log (cale, buffer sau arhivă), din primii bytes decomprimați"""
+    return detect_dialect(sample(source))
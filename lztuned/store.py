@@ -0,0 +1,128 @@
+"""Cache columnar pe disc: coloane .npy memory-mapped per log"""
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .engines import ENGINE_VERSION
+
+# Versiunea formatului de pe disc; se incrementează la orice schimbare de layout
+STORE_VERSION = 1
+
+# ======================================================
+# COLUMN STORE
+# ======================================================
+class ColumnStore:
+    """Sidecar columnar pentru logurile deja parsate
+
+    Fiecare log (identificat prin hash-ul conținutului) are un director cu
+    câte un fișier .npy per coloană, măștile de regim și un meta.json cu
+    maparea canalelor. La redeschidere coloanele sunt memory-mapped
+    (zero-copy), deci analiza pornește fără re-parsarea CSV-ului.
+    Intrările scrise de altă versiune de format sau de engine sunt ignorate.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _entry_dir(self, data_hash):
+        return os.path.join(self.root, data_hash)
+
+    def _read_meta(self, data_hash):
+        try:
+            with open(os.path.join(self._entry_dir(data_hash), 'meta.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def has(self, data_hash, variant=None):
+        """True dacă există o intrare validă pentru versiunea curentă"""
+        meta = self._read_meta(data_hash)
+        return meta is not None and self._is_current(meta, variant)
+
+    def _is_current(self, meta, variant):
+        return (meta.get('store_version') == STORE_VERSION and
+                meta.get('engine_version') == ENGINE_VERSION and
+                meta.get('variant') == variant)
+
+    def load(self, data_hash, variant=None):
+        """Returnează (df, channels, modes) memory-mapped sau None dacă lipsește"""
+        meta = self._read_meta(data_hash)
+        if meta is None or not self._is_current(meta, variant):
+            return None
+
+        entry = self._entry_dir(data_hash)
+        try:
+            columns = {
+                name: np.load(os.path.join(entry, filename), mmap_mode='r')
+                for name, filename in meta['columns']
+            }
+            modes = {
+                name: np.load(os.path.join(entry, filename), mmap_mode='r')
+                for name, filename in meta['modes']
+            }
+        except (OSError, ValueError):
+            return None
+
+        df = pd.DataFrame(columns, copy=False)
+        df.attrs['source_columns'] = meta['source_columns']
+        modes_df = pd.DataFrame(modes, index=df.index, copy=False) if modes else None
+        return df, meta['channels'], modes_df
+
+    def save(self, data_hash, df, channels, modes=None, variant=None):
+        """Scrie atomic o intrare; returnează False dacă df are coloane ne-numerice"""
+        if not all(isinstance(dtype, np.dtype) and dtype.kind in 'biuf' for dtype in df.dtypes):
+            return False
+
+        tmp = tempfile.mkdtemp(prefix='.tmp-', dir=self.root)
+        try:
+            meta = {
+                'store_version': STORE_VERSION,
+                'engine_version': ENGINE_VERSION,
+                'variant': variant,
+                'rows': len(df),
+                'source_columns': list(df.attrs.get('source_columns', df.columns)),
+                'channels': channels,
+                'columns': [],
+                'modes': [],
+            }
+            # Numele fișierelor sunt indecși: header-ele ECU conțin '#', '/', '.' etc.
+            for i, col in enumerate(df.columns):
+                filename = f'c{i:04d}.npy'
+                np.save(os.path.join(tmp, filename), np.ascontiguousarray(df[col].to_numpy()))
+                meta['columns'].append([col, filename])
+
+            if modes is not None:
+                for i, mode in enumerate(modes.columns):
+                    filename = f'm{i:02d}.npy'
+                    np.save(os.path.join(tmp, filename), modes[mode].to_numpy(dtype=bool))
+                    meta['modes'].append([mode, filename])
+
+            with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+
+            entry = self._entry_dir(data_hash)
+            if os.path.exists(entry):
+                shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+            return True
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    def purge_stale(self):
+        """Șterge intrările scrise de alte versiuni de format/engine"""
+        removed = 0
+        for name in os.listdir(self.root):
+            if name.startswith('.tmp-'):
+                continue
+            meta = self._read_meta(name)
+            if meta is None or meta.get('store_version') != STORE_VERSION or \
+                    meta.get('engine_version') != ENGINE_VERSION:
+                shutil.rmtree(self._entry_dir(name), ignore_errors=True)
+                removed += 1
+        return removed
@@ -0,0 +1,162 @@
+"""Generator de loguri ECU sintetice, pentru benchmark-uri și teste de scalare
+
+Logul simulează o sesiune reală: încălzire (rampe termice), croazieră,
+tracțiuni WOT periodice urmate de decelerare și ralanti, rafale de knock
+în unele tracțiuni, căderi de senzori (goluri NaN), pași de timp neregulați
+cu goluri și timestamp-uri duplicate. Totul e determinist pentru un `seed`
+dat și se scrie în blocuri, deci memoria nu depinde de numărul de rânduri.
+"""
+import numpy as np
+import pandas as pd
+
+# Writer CSV multithreaded, dacă pyarrow este instalat (~10× mai rapid decât to_csv)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+from .engines import ChannelDetectionEngine
+
+# Dialectele CSV: separator, coloana de timp și unitatea ei (factor față de secunde)
+DIALECTS = {
+    'semicolon': (';', 'time', 1000.0),
+    'comma': (',', 'Time (s)', 1.0),
+}
+
+SAMPLE_RATE_HZ = 20.0
+# Un ciclu: croazieră, tracțiune WOT, decelerare, ralanti
+CYCLE_S = 90.0
+PULL_START_S = 30.0
+PULL_LENGTH_S = 6.0
+OVERRUN_S = 4.0
+IDLE_START_S = 70.0
+# Fracțiunea tracțiunilor cu rafale de knock
+KNOCKY_PULLS = 0.3
+# Celule per bloc scris (rânduri × coloane)
+BLOCK_CELLS = 1 << 23
+
+def _cycle(t):
+    """Poziția în ciclu și măștile de regim pentru timpii t (secunde)"""
+    phase = t % CYCLE_S
+    pull = (phase >= PULL_START_S) & (phase < PULL_START_S + PULL_LENGTH_S)
+    overrun = (phase >= PULL_START_S + PULL_LENGTH_S) & (phase < PULL_START_S + PULL_LENGTH_S + OVERRUN_S)
+    idle = phase >= IDLE_START_S
+    return phase, pull, overrun, idle
+
+def synth_channels(t, rng, cycle_index):
+    """Canalele standard pentru timpii t: {nume standard: array float32}"""
+    n = t.size
+    phase, pull, overrun, idle = _cycle(t)
+    noise = lambda scale: rng.normal(0.0, scale, n)
+    pull_frac = np.clip((phase - PULL_START_S) / PULL_LENGTH_S, 0.0, 1.0)
+
+    rpm = 2200 + 600 * np.sin(2 * np.pi * t / 37.0) + noise(25)
+    rpm = np.where(pull, 2500 + 4500 * pull_frac, rpm)
+    rpm = np.where(overrun, 7000 - 1200 * (phase - PULL_START_S - PULL_LENGTH_S), rpm)
+    rpm = np.where(idle, 850 + noise(15), rpm)
+
+    tps = np.where(pull, 100.0, np.where(overrun | idle, 0.0, 18 + 6 * np.sin(2 * np.pi * t / 23.0) + noise(0.05)))
+    load = np.where(pull, 96 + noise(1.5), np.where(overrun, 5 + noise(1), np.where(idle, 20 + noise(1), 45 + noise(4))))
+
+    lambda1 = np.where(pull, 0.82, np.where(overrun, 1.5, 1.0)) + noise(0.015)
+    lambda2 = lambda1 + noise(0.01)
+
+    # Rafale de knock: o parte din tracțiuni, la turație mare
+    knocky = (cycle_index * 2654435761 % 1000) < KNOCKY_PULLS * 1000
+    burst = pull & knocky & (pull_frac > 0.55) & (pull_frac < 0.7)
+    knock1 = np.abs(0.35 + noise(0.12)) + burst * (1.1 + np.abs(noise(0.3)))
+    knock2 = np.abs(0.3 + noise(0.12)) + burst * (0.9 + np.abs(noise(0.3)))
+
+    # Rampe termice: încălzire exponențială + încărcare în tracțiuni
+    coolant = 90 - 70 * np.exp(-t / 400.0) + 3 * pull_frac * pull + noise(0.2)
+    oil = 108 - 88 * np.exp(-t / 900.0) + 6 * pull_frac * pull + noise(0.2)
+    iat = 30 + 12 * (1 - np.exp(-t / 600.0)) + noise(0.3)
+    egt1 = 380 + 5.5 * load + noise(8)
+    egt2 = egt1 + noise(6)
+
+    battery = 13.9 + noise(0.05)
+    battery[rng.random(n) < 0.0005] = 11.4
+
+    return {
+        'rpm': rpm,
+        'load': load,
+        'lambda1': lambda1,
+        'lambda2': lambda2,
+        'knock1': knock1,
+        'knock2': knock2,
+        'inj_time': 0.5 + 0.14 * load + noise(0.05),
+        'oil_temp': oil,
+        'coolant_temp': coolant,
+        'iat': iat,
+        'egt1': egt1,
+        'egt2': egt2,
+        'boost': 100 + 1.6 * np.clip(load - 50, 0, None) + noise(1),
+        'fuel_pressure': 400 + noise(3),
+        'ignition_timing': 32 - 0.22 * load - 3.0 * burst + noise(0.3),
+        'battery_voltage': battery,
+        'tps': tps,
+        'stft': noise(2.5),
+        'ltft': 2.0 + 0.5 * np.sin(2 * np.pi * t / 3600.0),
+    }
+
+def column_names(columns, dialect='semicolon'):
+    """Header-ul: timpul, canalele standard (primul alias), apoi canale auxiliare"""
+    time_column = DIALECTS[dialect][1]
+    standard = {name: aliases[0].strip() for name, aliases in ChannelDetectionEngine.CHANNEL_MAP.items()}
+    names = list(standard.values())[:max(columns - 1, 0)]
+    names += [f'Aux channel {i}' for i in range(max(columns - 1 - len(names), 0))]
+    return time_column, dict(zip(standard, names)), names
+
+def iter_blocks(rows, columns=20, dialect='semicolon', seed=0, rate_hz=SAMPLE_RATE_HZ):
+    """DataFrame-uri succesive care formează împreună logul sintetic"""
+    time_column, standard, names = column_names(columns, dialect)
+    scale = DIALECTS[dialect][2]
+    block_rows = max(1024, BLOCK_CELLS // max(columns, 1))
+    t_last = 0.0
+    for start in range(0, rows, block_rows):
+        n = min(block_rows, rows - start)
+        rng = np.random.default_rng([seed, start])
+
+        # Pas neregulat: jitter, goluri rare de logger, timestamp-uri duplicate
+        dt = (1.0 / rate_hz) * (1.0 + rng.normal(0.0, 0.05, n).clip(-0.5, 0.5))
+        dt[rng.random(n) < 1e-5] += 2.0
+        dt[rng.random(n) < 1e-4] = 0.0
+        t = t_last + np.cumsum(dt)
+        t_last = float(t[-1])
+
+        values = synth_channels(t, rng, (t // CYCLE_S).astype(np.int64))
+        data = {time_column: np.round(t * scale, 3) if scale != 1.0 else np.round(t, 4)}
+        for name, col in standard.items():
+            if col in names:
+                data[col] = values[name].astype(np.float32)
+        for i, col in enumerate(names[len(data) - 1:]):
+            data[col] = (np.cumsum(rng.normal(0.0, 0.1, n)) + i).astype(np.float32)
+
+        frame = pd.DataFrame(data)
+        # Căderi de senzori: segmente NaN în canale aleatoare
+        for _ in range(max(1, n // 20000)):
+            col = names[int(rng.integers(len(names)))]
+            at = int(rng.integers(n))
+            frame.iloc[at:at + int(rng.integers(20, 200)), frame.columns.get_loc(col)] = np.nan
+        yield frame
+
+def write_log(path, rows, columns=20, dialect='semicolon', seed=0, rate_hz=SAMPLE_RATE_HZ):
+    """Scrie un log sintetic de `rows` × `columns` în dialectul CSV dat"""
+    sep = DIALECTS[dialect][0]
+    with open(path, 'wb') as f:
+        for i, block in enumerate(iter_blocks(rows, columns, dialect, seed, rate_hz)):
+            if i == 0:
+                f.write((sep.join(block.columns) + '\n').encode('utf-8'))
+            if pa is not None:
+                # NaN devine null, adică un câmp gol, ca în logurile reale
+                pa_csv.write_csv(pa.Table.from_pandas(block, preserve_index=False), f,
+                                 pa_csv.WriteOptions(include_header=False, delimiter=sep))
+            else:
+                f.write(block.to_csv(sep=sep, index=False, header=False, float_format='%.7g',
+                                     lineterminator='\n').encode('utf-8'))
+    return path
+
+def synthetic_frame(rows, columns=20, dialect='semicolon', seed=0, rate_hz=SAMPLE_RATE_HZ):
+    """Logul sintetic direct ca DataFrame (fără CSV)"""
+    return pd.concat(list(iter_blocks(rows, columns, dialect, seed, rate_hz)), ignore_index=True)
@@ -0,0 +1,288 @@
+"""Baza de timp a logului: dt real per eșantion, rată de eșantionare, goluri"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from .accumulators import as_float_array
+
+TIME_UNITS = {'s': 1.0, 'ms': 1e-3, 'us': 1e-6}
+
+def infer_time_unit(column, steps):
+    """Deduce unitatea coloanei de timp din nume, apoi din pasul median"""
+    name = (column or '').lower()
+    match = re.search(r'\((s|ms|us|sec|msec)\)|\[(s|ms|us)\]', name)
+    if match:
+        unit = match.group(1) or match.group(2)
+        return {'sec': 's', 'msec': 'ms'}.get(unit, unit)
+    if 'ms' in name or 'milli' in name:
+        return 'ms'
+
+    steps = steps[steps > 0]
+    if steps.size == 0:
+        return 's'
+    # Un ECU nu loghează la un eșantion la câteva secunde: pași mari = ms
+    median = np.median(steps)
+    if median > 1000:
+        return 'us'
+    if median > 2:
+        return 'ms'
+    return 's'
+
+# ======================================================
+# CHUNK TIME
+# ======================================================
+class ChunkTime:
+    """Timpul unui chunk: `dt` pentru durate, `step` pentru rate
+
+    `dt` este pasul față de eșantionul anterior, în secunde, limitat la
+    pasul nominal peste goluri și resetări (un gol nu se numără ca timp
+    petrecut într-o stare). `step` este pasul real (NaN dacă ≤ 0), folosit
+    pentru derivate: o variație peste un gol se împarte la durata golului.
+    `t_first` (brut, poate fi NaN) și `t_last` (ultimul valid) permit
+    reconstruirea pasului de la granița dintre două partiții.
+    """
+
+    __slots__ = ('dt', 'step', 't_first', 't_last', 'nominal_dt')
+
+    def __init__(self, dt, step, t_first=None, t_last=None, nominal_dt=1.0):
+        self.dt = dt
+        self.step = step
+        self.t_first = t_first
+        self.t_last = t_last
+        self.nominal_dt = nominal_dt
+
+    @classmethod
+    def uniform(cls, n, rate_hz=1.0):
+        dt = np.full(n, 1.0 / rate_hz)
+        return cls(dt, dt, nominal_dt=1.0 / rate_hz)
+
+    def duration(self, mask):
+        """Secunde petrecute în eșantioanele din mască"""
+        return float(self.dt[np.asarray(mask, dtype=bool)].sum())
+
+    def rate(self, diffs):
+        """Rata de variație pe secundă pentru diferențele consecutive date"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.asarray(diffs, dtype=np.float64) / self.step
+
+def boundary_time(t_last, t_first, nominal_dt, gap_factor=5.0):
+    """(dt, step) al primului eșantion după `t_last`, cu regulile din Timebase.update
+
+    Fără coloană de timp (t_* None) pasul este cel nominal.
+    """
+    if t_first is None:
+        return nominal_dt, nominal_dt
+    step = np.nan if t_last is None else t_first - t_last
+    if step <= 0:
+        return nominal_dt, np.nan
+    if np.isnan(step) or step > gap_factor * nominal_dt:
+        return nominal_dt, step
+    return step, step
+
+# ======================================================
+# TIMEBASE
+# ======================================================
+class Timebase:
+    """Detectează și validează coloana de timp; oferă dt per eșantion
+
+    Pasul nominal se calibrează din primele CALIBRATION_SAMPLES eșantioane,
+    identic în modul in-memory și în streaming. Fără coloană de timp se
+    presupune `assumed_rate` Hz (1 Hz, comportamentul istoric).
+    """
+
+    CALIBRATION_SAMPLES = 4096
+    GAP_FACTOR = 5.0
+
+    def __init__(self, column=None, unit=None, assumed_rate=1.0):
+        self.column = column
+        self.unit = unit
+        self.assumed_rate = assumed_rate
+        self.nominal_dt = None if column else 1.0 / assumed_rate
+        self.rows = 0
+        self.first = None
+        self.last = None
+        self.gaps = []
+        self.non_monotonic = 0
+        self._t_start = np.nan
+        # ChunkTime pentru ultimul chunk procesat (tot logul în modul in-memory)
+        self.chunk_time = None
+
+    @classmethod
+    def from_frame(cls, df, column, unit=None, assumed_rate=1.0):
+        """Timebase complet pentru un DataFrame încărcat în memorie"""
+        timebase = cls(column if column in df.columns else None, unit, assumed_rate)
+        if timebase.column:
+            timebase.calibrate(df[timebase.column].iloc[:cls.CALIBRATION_SAMPLES])
+        timebase.update(df)
+        return timebase
+
+    @property
+    def has_time(self):
+        return self.column is not None
+
+    @staticmethod
+    def _is_numeric(values):
+        return isinstance(values.dtype, np.dtype) and values.dtype.kind in 'biuf'
+
+    def _raw(self, values):
+        """Timpul ca float în unitatea coloanei (timestamp-urile text devin secunde)"""
+        if self._is_numeric(values):
+            return as_float_array(values).astype(np.float64)
+        stamps = pd.to_datetime(pd.Series(values), errors='coerce')
+        return (stamps - pd.Timestamp(0)).dt.total_seconds().to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def calibrate(self, values):
+        """Stabilește unitatea și pasul nominal din primele eșantioane"""
+        t = self._raw(values)
+        t = t[~np.isnan(t)]
+        steps = np.diff(t)
+        if not self._is_numeric(values):
+            self.unit = 's'
+        elif self.unit is None:
+            self.unit = infer_time_unit(self.column, steps)
+        steps = steps[steps > 0] * TIME_UNITS[self.unit]
+        self.nominal_dt = float(np.median(steps)) if steps.size else 1.0 / self.assumed_rate
+        return self
+
+    def update(self, chunk):
+        """Calculează ChunkTime pentru un chunk (continuă de la chunk-ul anterior)"""
+        n = len(chunk)
+        start = self.rows
+        self.rows += n
+        if not self.has_time:
+            self.chunk_time = ChunkTime.uniform(n, self.assumed_rate)
+            return self.chunk_time
+
+        t = self._raw(chunk[self.column]) * TIME_UNITS[self.unit]
+        prev = np.nan if self.last is None else self.last
+        step = np.diff(t, prepend=prev)
+
+        valid_t = t[~np.isnan(t)]
+        if valid_t.size:
+            if self.first is None:
+                self.first = float(valid_t[0])
+            self.last = float(valid_t[-1])
+        t_first = float(t[0]) if n else np.nan
+        if start == 0:
+            self._t_start = t_first
+
+        # Resetări / duplicate (pas ≤ 0) și goluri (pas ≫ nominal)
+        bad = step <= 0
+        self.non_monotonic += int(bad.sum())
+        gap = step > self.GAP_FACTOR * self.nominal_dt
+        for i in np.flatnonzero(gap):
+            self.gaps.append((start + int(i), float(step[i])))
+
+        dt = np.where(bad | gap | np.isnan(step), self.nominal_dt, step)
+        step = np.where(bad, np.nan, step)
+        self.chunk_time = ChunkTime(dt, step, t_first, self.last, self.nominal_dt)
+        return self.chunk_time
+
+    def fork(self):
+        """Timebase gol cu aceeași calibrare, pentru o partiție procesată separat"""
+        part = Timebase(self.column, self.unit, self.assumed_rate)
+        part.nominal_dt = self.nominal_dt
+        return part
+
+    def merge(self, other):
+        """Adaugă partiția următoare (fork al aceleiași calibrări)"""
+        if other.rows == 0:
+            return self
+        if self.has_time and other.first is not None:
+            step = other._t_start - self.last if self.last is not None else np.nan
+            if step <= 0:
+                self.non_monotonic += 1
+            elif step > self.GAP_FACTOR * self.nominal_dt:
+                self.gaps.append((self.rows, float(step)))
+        self.gaps.extend((self.rows + i, g) for i, g in other.gaps)
+        self.non_monotonic += other.non_monotonic
+        if self.first is None:
+            self.first = other.first
+        if other.last is not None:
+            self.last = other.last
+        self.rows += other.rows
+        return self
+
+    @property
+    def duration_s(self):
+        """Durata logului, fără goluri"""
+        if not self.has_time or self.first is None:
+            return self.rows * self.nominal_dt
+        return (self.last - self.first) - sum(g for _, g in self.gaps) + \
+            len(self.gaps) * self.nominal_dt
+
+    @property
+    def sample_rate(self):
+        """Rata nominală de eșantionare (Hz)"""
+        return 1.0 / self.nominal_dt if self.nominal_dt else np.nan
+
+    def window_samples(self, seconds):
+        """Numărul de eșantioane dintr-o fereastră de `seconds` secunde"""
+        return max(1, int(round(seconds / self.nominal_dt)))
+
+    def seconds(self, df):
+        """Timpul fiecărui eșantion, în secunde de la începutul logului"""
+        if not self.has_time:
+            return np.arange(len(df)) * self.nominal_dt
+        t = self._raw(df[self.column]) * TIME_UNITS[self.unit]
+        return t - (self.first if self.first is not None else np.nanmin(t))
+
+    def rolling(self, df, column, seconds):
+        """Fereastră rulantă de `seconds` secunde pe o coloană din df
+
+        Pe timp real când coloana de timp e monotonă, altfel pe numărul
+        echivalent de eșantioane la rata nominală.
+        """
+        if self.has_time and self.non_monotonic == 0:
+            index = pd.to_timedelta(self.seconds(df), unit='s')
+            series = pd.Series(df[column].to_numpy(), index=index)
+            return series.rolling(pd.Timedelta(seconds=seconds), min_periods=1)
+        return df[column].rolling(self.window_samples(seconds), min_periods=1)
+
+    def report(self):
+        """Rezumat JSON-friendly al bazei de timp"""
+        return {
+            'source': 'column' if self.has_time else 'assumed',
+            'column': self.column,
+            'unit': self.unit,
+            'sample_rate_hz': round(self.sample_rate, 3),
+            'nominal_dt_s': round(self.nominal_dt, 6),
+            'duration_s': round(self.duration_s, 3),
+            'gaps': len(self.gaps),
+            'gap_time_s': round(sum(g for _, g in self.gaps), 3),
+            'non_monotonic': self.non_monotonic,
+        }
+
+# ======================================================
+# RESAMPLING
+# ======================================================
+def resample_uniform(df, timebase, rate_hz, columns=None):
+    """Reeșantionează pe o grilă uniformă de `rate_hz` Hz (interpolare liniară)
+
+    Fiecare coloană e interpolată vectorizat cu np.interp, ignorând
+    valorile lipsă; necesită timp monoton crescător.
+    """
+    t = timebase.seconds(df)
+    order = np.argsort(t, kind='stable')
+    t = t[order]
+    valid_t = ~np.isnan(t)
+    grid = np.arange(np.nanmin(t), np.nanmax(t) + 1e-12, 1.0 / rate_hz)
+
+    out = {}
+    for col in (columns or df.columns):
+        if col == timebase.column:
+            continue
+        values = as_float_array(df[col])[order]
+        mask = valid_t & ~np.isnan(values)
+        if mask.any():
+            out[col] = np.interp(grid, t[mask], values[mask]).astype(values.dtype)
+        else:
+            out[col] = np.full(grid.size, np.nan, dtype=values.dtype)
+
+    resampled = pd.DataFrame(out)
+    if timebase.column:
+        origin = timebase.first if timebase.first is not None else 0.0
+        resampled.insert(0, timebase.column, (grid + origin) / TIME_UNITS[timebase.unit])
+    resampled.attrs.update(df.attrs)
+    return resampled
@@ -0,0 +1,410 @@
+"""Interogări pe ferestre [start, end) din log, fără reanaliză (selecția din grafic)
+
+WindowIndex precalculează, pe blocuri de BLOCK eșantioane, sumele prefix
+ale termenilor aditivi (număr de valori, sumă, sumă de pătrate, produse
+încrucișate, eșantioane / secunde peste prag, fronturi crescătoare) și un
+sparse table peste minimele / maximele blocurilor. O fereastră combină
+blocurile întregi în O(1) și reduce direct cele cel mult 2 × BLOCK
+eșantioane de la capete, deci costul nu depinde de lungimea ferestrei, iar
+indexul ocupă O(rânduri / BLOCK) per semnal. Indexurile se construiesc la
+prima interogare a fiecărui semnal (și regim / prag) și se păstrează.
+
+Sumele de pătrate se calculează față de o valoare de referință a
+semnalului (prima validă), ca varianța să nu piardă precizie; pragurile se
+compară cu exceeds(), ca în engine-uri. verdicts() construiește
+pentru fereastră trăsăturile fazelor score() (fuel, ignition, thermal) și
+riscul, ca și cum engine-urile ar fi rulat doar pe df.iloc[start:end].
+"""
+import threading
+
+import numpy as np
+
+from .accumulators import as_float_array, exceeds
+from .engines import (
+    FuelAnalysisEngine,
+    IgnitionAnalysisEngine,
+    ThermalStressEngine,
+    PredictiveRiskEngine,
+    threshold_profile,
+)
+
+# Eșantioane per bloc: capetele unei ferestre costă cel mult 2 × BLOCK
+BLOCK = 1024
+# Rânduri citite deodată la construcția indexului (multiplu de BLOCK)
+BUILD_ROWS = 256 * BLOCK
+
+# ======================================================
+# BLOCK INDEXES
+# ======================================================
+class _BlockSums:
+    """Sume prefix pe blocuri ale unor termeni aditivi
+
+    `terms(a, b)` întoarce matricea termenilor (k × (b - a)) pentru rândurile
+    [a, b); query() adună blocurile întregi din prefix și capetele direct.
+    """
+
+    __slots__ = ('terms', 'block', 'prefix')
+
+    def __init__(self, terms, rows, block=BLOCK):
+        self.terms = terms
+        self.block = block
+        parts = [np.zeros((terms(0, 0).shape[0], 0))]
+        for a in range(0, rows - rows % block, BUILD_ROWS):
+            b = min(a + BUILD_ROWS, rows - rows % block)
+            values = terms(a, b)
+            parts.append(values.reshape(values.shape[0], -1, block).sum(axis=2))
+        blocks = np.concatenate(parts, axis=1)
+        self.prefix = np.concatenate((np.zeros((blocks.shape[0], 1)), np.cumsum(blocks, axis=1)), axis=1)
+
+    @property
+    def nbytes(self):
+        return int(self.prefix.nbytes)
+
+    def query(self, start, end):
+        """Sumele termenilor pe [start, end)"""
+        first, last = -(-start // self.block), end // self.block
+        if first >= last:
+            return self.terms(start, end).sum(axis=1)
+        return (self.prefix[:, last] - self.prefix[:, first]
+                + self.terms(start, first * self.block).sum(axis=1)
+                + self.terms(last * self.block, end).sum(axis=1))
+
+class _BlockExtremes:
+    """Minimul / maximul pe orice fereastră: sparse table peste blocuri + capetele directe
+
+    NaN-urile sunt ignorate (fmin / fmax); o fereastră fără valori dă NaN.
+    """
+
+    __slots__ = ('values', 'block', 'low', 'high')
+
+    def __init__(self, values, rows, block=BLOCK):
+        self.values = values
+        self.block = block
+        full = rows - rows % block
+        lows, highs = [np.empty(0)], [np.empty(0)]
+        for a in range(0, full, BUILD_ROWS):
+            chunk = values(a, min(a + BUILD_ROWS, full)).reshape(-1, block)
+            lows.append(np.fmin.reduce(chunk, axis=1))
+            highs.append(np.fmax.reduce(chunk, axis=1))
+        self.low = self._table(np.concatenate(lows), np.fmin)
+        self.high = self._table(np.concatenate(highs), np.fmax)
+
+    @staticmethod
+    def _table(level, reduce):
+        """Nivelul j reține extremul pe 2^j blocuri consecutive"""
+        levels = [level]
+        width = 1
+        while 2 * width <= level.size:
+            level = reduce(level[:-width], level[width:])
+            levels.append(level)
+            width *= 2
+        return levels
+
+    @staticmethod
+    def _range(levels, reduce, first, last):
+        j = (last - first).bit_length() - 1
+        return reduce(levels[j][first], levels[j][last - (1 << j)])
+
+    @property
+    def nbytes(self):
+        return int(sum(level.nbytes for level in self.low + self.high))
+
+    def query(self, start, end):
+        """(min, max) pe [start, end)"""
+        first, last = -(-start // self.block), end // self.block
+        if first < last:
+            edges = np.concatenate((self.values(start, first * self.block), self.values(last * self.block, end)))
+            low = self._range(self.low, np.fmin, first, last)
+            high = self._range(self.high, np.fmax, first, last)
+        else:
+            edges = self.values(start, end)
+            low = high = np.nan
+        if edges.size:
+            low = np.fmin(low, np.fmin.reduce(edges))
+            high = np.fmax(high, np.fmax.reduce(edges))
+        return float(low), float(high)
+
+# ======================================================
+# WINDOW INDEX
+# ======================================================
+class WindowIndex:
+    """Statistici, evenimente și verdicte pentru orice fereastră [start, end) de rânduri
+
+    `signals` este SignalStore-ul logului (semnalele derivate), `intervals`
+    intervalele regimurilor (results['mode_intervals']), iar `chunk_time`
+    pasul de timp al logului întreg (Timebase.chunk_time); fără el un
+    eșantion = o secundă. Canalele se citesc felie cu felie prin df.iloc,
+    deci merge și pe un CompactLog fără decodarea coloanelor întregi.
+    """
+
+    def __init__(self, df, channels, signals=None, intervals=None, chunk_time=None, block=BLOCK):
+        self.df = df
+        self.channels = channels
+        self.signals = signals
+        self.intervals = intervals or {}
+        self.chunk_time = chunk_time
+        self.rows = len(df)
+        self.block = block
+        self._indexes = {}
+        self._refs = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"WindowIndex({self.rows} rows, {len(self._indexes)} indexes, {self.nbytes / 1024:.0f} KB)"
+
+    @property
+    def nbytes(self):
+        return sum(index.nbytes for index in self._indexes.values())
+
+    def __contains__(self, name):
+        return name in self.channels or (self.signals is not None and name in self.signals)
+
+    # ======================================================
+    # DATA ACCESS
+    # ======================================================
+    def values(self, name, a, b):
+        """Valorile semnalului pe rândurile [a, b) (canal standard sau semnal derivat)"""
+        if name in self.channels:
+            return as_float_array(self.df.iloc[a:b][self.channels[name]])
+        if self.signals is not None and name in self.signals:
+            return as_float_array(self.signals[name].iloc[a:b])
+        raise KeyError(name)
+
+    def mask(self, mode, a, b):
+        """Masca regimului pe [a, b) din intervale; None = toate rândurile"""
+        if mode is None:
+            return None
+        intervals = self.intervals[mode]
+        lo = np.searchsorted(intervals.ends, a, side='right')
+        hi = np.searchsorted(intervals.starts, b, side='left')
+        delta = np.zeros(b - a + 1, dtype=np.int64)
+        np.add.at(delta, np.clip(intervals.starts[lo:hi] - a, 0, b - a), 1)
+        np.add.at(delta, np.clip(intervals.ends[lo:hi] - a, 0, b - a), -1)
+        return np.cumsum(delta[:-1]) > 0
+
+    def dt(self, a, b):
+        """Pasul (secunde) fiecărui eșantion din [a, b), pentru durate"""
+        if self.chunk_time is None:
+            return np.ones(b - a)
+        return self.chunk_time.dt[a:b]
+
+    def _step(self, a, b):
+        if self.chunk_time is None:
+            return np.ones(b - a)
+        return self.chunk_time.step[a:b]
+
+    def _index(self, key, build):
+        """Indexul pentru `key`, construit la prima cerere"""
+        index = self._indexes.get(key)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(key)
+                if index is None:
+                    index = self._indexes[key] = build()
+        return index
+
+    def _reference(self, name):
+        """Prima valoare validă a semnalului (referința sumelor de pătrate); 0 dacă nu există"""
+        if name not in self._refs:
+            values = self.values(name, 0, min(self.rows, BUILD_ROWS))
+            valid = values[~np.isnan(values)]
+            self._refs[name] = float(valid[0]) if valid.size else 0.0
+        return self._refs[name]
+
+    def _bounds(self, start, end):
+        start, end = int(start), int(end)
+        if not 0 <= start <= end <= self.rows:
+            raise ValueError(f"Fereastră invalidă [{start}, {end}) pentru {self.rows} rânduri")
+        return start, end
+
+    # ======================================================
+    # QUERIES
+    # ======================================================
+    def span(self, start, end, mode=None):
+        """Eșantioanele și secundele din fereastră, opțional doar în regimul `mode`"""
+        start, end = self._bounds(start, end)
+
+        def terms(a, b):
+            rows = np.ones(b - a, dtype=bool) if mode is None else self.mask(mode, a, b)
+            return np.vstack((rows, np.where(rows, self.dt(a, b), 0.0)))
+
+        index = self._index(('span', mode), lambda: _BlockSums(terms, self.rows, self.block))
+        rows, seconds = index.query(start, end)
+        return {'rows': int(round(rows)), 'duration_s': float(seconds)}
+
+    def stats(self, name, start, end, mode=None):
+        """count / mean / std (ddof=1) / min / max ale semnalului, opțional doar în regimul `mode`"""
+        start, end = self._bounds(start, end)
+        ref = self._reference(name)
+
+        def terms(a, b):
+            x = self.values(name, a, b).astype(np.float64)
+            valid = ~np.isnan(x)
+            if mode is not None:
+                valid &= self.mask(mode, a, b)
+            d = np.where(valid, x - ref, 0.0)
+            return np.vstack((valid, d, d * d))
+
+        def masked(a, b):
+            x = self.values(name, a, b).astype(np.float64)
+            return x if mode is None else np.where(self.mask(mode, a, b), x, np.nan)
+
+        sums = self._index(('sums', name, mode), lambda: _BlockSums(terms, self.rows, self.block))
+        extremes = self._index(('extremes', name, mode), lambda: _BlockExtremes(masked, self.rows, self.block))
+        n, s1, s2 = sums.query(start, end)
+        low, high = extremes.query(start, end)
+        n = int(round(n))
+        var = max(s2 - s1 * s1 / n, 0.0) / (n - 1) if n > 1 else np.nan
+        return {
+            'count': n,
+            'mean': float(ref + s1 / n) if n else np.nan,
+            'std': float(np.sqrt(var)) if n > 1 else np.nan,
+            'min': low,
+            'max': high,
+        }
+
+    def events(self, name, threshold, start, end):
+        """Eșantioanele > prag, episoadele (fronturi ≤ → >) și secundele peste prag
+
+        Ca RisingEdgeCounter pe df.iloc[start:end]: primul eșantion al
+        ferestrei nu deschide un episod.
+        """
+        start, end = self._bounds(start, end)
+
+        def terms(a, b):
+            x = self.values(name, max(a - 1, 0), b)
+            above = exceeds(x, threshold)
+            rising = above[1:] & ~above[:-1]
+            if a == 0:
+                rising = np.concatenate((np.zeros(min(b, 1), dtype=bool), rising))
+            above = above[-(b - a):] if b > a else above[:0]
+            return np.vstack((above, rising, np.where(above, self.dt(a, b), 0.0)))
+
+        index = self._index(('events', name, float(threshold)), lambda: _BlockSums(terms, self.rows, self.block))
+        events = index.query(start, end)
+        rising = index.query(start + 1, end)[1] if end > start + 1 else 0.0
+        return {'events': int(round(events[0])), 'bursts': int(round(rising)), 'duration_s': float(events[2])}
+
+    def max_rate(self, name, start, end):
+        """|Δx / Δt| maximă (pe pasul real) între eșantioanele consecutive din fereastră"""
+        start, end = self._bounds(start, end)
+
+        def rate(a, b):
+            x = self.values(name, max(a - 1, 0), b).astype(np.float64)
+            diffs = np.diff(x, prepend=np.nan) if a == 0 else np.diff(x)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.abs(diffs / self._step(a, b))
+
+        index = self._index(('rate', name), lambda: _BlockExtremes(rate, self.rows, self.block))
+        return index.query(start + 1, end)[1] if end > start + 1 else np.nan
+
+    def corr(self, x, y, start, end, mode=None):
+        """Corelația Pearson pe perechile complete și r-ul de tip linregress (NaN dacă lipsesc valori)"""
+        start, end = self._bounds(start, end)
+        ref = (self._reference(x), self._reference(y))
+
+        def terms(a, b):
+            vx = self.values(x, a, b).astype(np.float64)
+            vy = self.values(y, a, b).astype(np.float64)
+            rows = np.ones(b - a, dtype=bool) if mode is None else self.mask(mode, a, b)
+            valid = rows & ~(np.isnan(vx) | np.isnan(vy))
+            dx = np.where(valid, vx - ref[0], 0.0)
+            dy = np.where(valid, vy - ref[1], 0.0)
+            return np.vstack((rows, valid, dx, dy, dx * dx, dy * dy, dx * dy))
+
+        index = self._index(('corr', x, y, mode), lambda: _BlockSums(terms, self.rows, self.block))
+        rows, n, sx, sy, sxx, syy, sxy = index.query(start, end)
+        n = int(round(n))
+        if n < 2:
+            corr = np.nan
+            m2x = m2y = 0.0
+        else:
+            m2x, m2y = sxx - sx * sx / n, syy - sy * sy / n
+            cxy = sxy - sx * sy / n
+            corr = float(np.clip(cxy / np.sqrt(m2x * m2y), -1.0, 1.0)) if m2x > 0 and m2y > 0 else np.nan
+        if n != int(round(rows)) or n < 2:
+            r_value = np.nan
+        else:
+            r_value = 0.0 if np.isnan(corr) else corr
+        return {'rows': int(round(rows)), 'n': n, 'corr': corr, 'r_value': r_value}
+
+    # ======================================================
+    # VERDICTS
+    # ======================================================
+    def features(self, start, end, thresholds=None):
+        """Trăsăturile fuel / ignition / thermal ale ferestrei, ca din extract_features()"""
+        start, end = self._bounds(start, end)
+        profile = threshold_profile(thresholds)
+        has = lambda *names: all(name in self.channels for name in names)
+        wot = 'WOT' if 'WOT' in self.intervals else None
+        wot_rows = self.span(start, end, wot)['rows'] if wot else 0
+
+        fuel = {'wot_rows': wot_rows, 'lambda': None, 'duty': None, 'stft': None,
+                'ltft': has('ltft'), 'duty_lambda_corr': None}
+        if has('lambda1'):
+            fuel['lambda'] = {'sensors': 2 if has('lambda2') else 1}
+            if wot_rows > 0:
+                stats = self.stats('Lambda_Avg', start, end, wot)
+                fuel['lambda'].update(mean=stats['mean'], std=stats['std'], min=stats['min'])
+        if has('inj_time', 'rpm'):
+            fuel['duty'] = {
+                'max': self.stats('Inj_Duty', start, end)['max'],
+                'linearity': abs(self.corr('rpm', 'Inj_Duty', start, end, wot)['r_value']) if wot_rows > 10 else 0,
+            }
+        if has('stft'):
+            stats = self.stats('stft', start, end)
+            fuel['stft'] = {'mean': stats['mean'], 'std': stats['std']}
+        if has('lambda1', 'inj_time', 'rpm') and wot_rows > 10:
+            fuel['duty_lambda_corr'] = self.corr('Inj_Duty', 'Lambda_Avg', start, end, wot)['corr']
+
+        ignition = {'rows': end - start, 'knock': None, 'timing_std': None, 'knock_lambda_corr': None}
+        if has('knock1'):
+            stats = self.stats('Knock_Peak', start, end)
+            counts = self.events('Knock_Peak', profile['knock_event'], start, end)
+            ignition['knock'] = {'max': stats['max'], 'mean': stats['mean'], 'sensors': 2 if has('knock2') else 1,
+                                 'events': counts['events'], 'bursts': counts['bursts']}
+            knock_lambda = self.corr('Knock_Peak', 'Lambda_Avg', start, end) if 'Lambda_Avg' in self else None
+            if knock_lambda is not None and knock_lambda['rows'] > 0:
+                ignition['knock_lambda_corr'] = knock_lambda['corr']
+        if has('ignition_timing') and wot_rows > 0:
+            ignition['timing_std'] = self.stats('ignition_timing', start, end, wot)['std']
+
+        thermal = {'oil': None, 'coolant_max': None, 'egt_max': None}
+        if has('oil_temp'):
+            thermal['oil'] = {
+                'max': self.stats('oil_temp', start, end)['max'],
+                'high_s': self.events('oil_temp', ThermalStressEngine.OIL_HIGH, start, end)['duration_s'],
+                'max_rate': self.max_rate('oil_temp', start, end),
+            }
+        if has('coolant_temp'):
+            thermal['coolant_max'] = self.stats('coolant_temp', start, end)['max']
+        if has('egt1'):
+            thermal['egt_max'] = self.stats('egt1', start, end)['max']
+        return {'fuel': fuel, 'ignition': ignition, 'thermal': thermal}
+
+    def verdicts(self, start, end, thresholds=None, electrical=None):
+        """Verdictele fuel / ignition / thermal și riscul pentru fereastră
+
+        `electrical` (results['electrical']) intră în risc neschimbat: sănătatea
+        senzorilor nu are sens pe o fereastră.
+        """
+        start, end = self._bounds(start, end)
+        profile = threshold_profile(thresholds)
+        features = self.features(start, end, profile)
+        fuel = FuelAnalysisEngine.score(features['fuel'], profile)
+        ignition = IgnitionAnalysisEngine.score(features['ignition'], profile)
+        thermal = ThermalStressEngine.score(features['thermal'])
+        all_results = {**fuel, **ignition, **thermal, **(electrical or {})}
+        wot = self.span(start, end, 'WOT') if 'WOT' in self.intervals else {'rows': 0, 'duration_s': 0.0}
+        return {
+            'start': start,
+            'end': end,
+            **self.span(start, end),
+            'wot_rows': wot['rows'],
+            'wot_s': wot['duration_s'],
+            'fuel': fuel,
+            'ignition': ignition,
+            'thermal': thermal,
+            'all_results': all_results,
+            'risk': PredictiveRiskEngine(all_results).assess(),
+        }
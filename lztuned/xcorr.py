@@ -0,0 +1,87 @@
+"""Corelație încrucișată cu decalaj (lag), prin FFT
+
+Cauza și efectul într-un motor sunt decalate: lambda urmează durata de
+injecție cu întârzierea de transport, temperatura uleiului urmează sarcina
+cu zeci de secunde. xcorr() calculează corelația pentru toate decalajele
+dintr-o singură corelație FFT, O(n log n). lagged_sums() dă aceleași
+produse necentrate, pe bucăți de semnal: RunningXcorr le adună pe chunk-uri
+și centrează abia la final, deci vârful are rezoluția unui eșantion și în
+streaming.
+
+Cu semnul așteptat al relației (`sign`, de ex. -1 pentru durata de
+injecție → lambda) vârful maximizează sign·r: un vârf mai mare de semn
+opus, la un decalaj fără sens fizic, nu mai câștigă.
+
+Convenția: decalaj pozitiv = y urmează x, r[k] = corr(x[t], y[t + k]).
+Normalizarea e pe tot semnalul (semnale centrate, valorile lipsă înlocuite
+cu media), deci la decalaj 0 r este corelația Pearson.
+"""
+import numpy as np
+
+def _centered(values):
+    """Semnalul minus media lui, cu valorile lipsă pe 0 (adică pe medie)"""
+    x = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(x)
+    if not valid.any():
+        return np.zeros(x.size)
+    return np.where(valid, x - x[valid].mean(), 0.0)
+
+def _norm(x, y):
+    return float(np.sqrt(np.dot(x, x) * np.dot(y, y)))
+
+def xcorr(x, y, max_lag):
+    """(decalaje, r) pentru decalajele -max_lag..max_lag, dintr-o singură corelație FFT"""
+    x = _centered(x)
+    y = _centered(y)
+    n = min(x.size, y.size)
+    x, y = x[:n], y[:n]
+    max_lag = max(0, min(int(max_lag), n - 1))
+    lags = np.arange(-max_lag, max_lag + 1)
+    norm = _norm(x, y)
+    if n == 0 or norm == 0:
+        return lags, np.full(lags.size, np.nan)
+    # Zero-padding peste n + max_lag: corelația circulară nu se întoarce peste decalajele cerute
+    size = 1 << int(n + max_lag - 1).bit_length()
+    spectrum = np.conj(np.fft.rfft(x, size)) * np.fft.rfft(y, size)
+    return lags, np.fft.irfft(spectrum, size)[lags % size] / norm
+
+def lagged_sums(x, y, max_lag):
+    """Sumele decalate pentru k = -max_lag..max_lag, cu valorile lipsă pe 0
+
+    Rândurile: Σ x·y, Σ x·[y valid], Σ [x valid]·y, Σ [x valid]·[y valid],
+    pe perechile (t, t + k). Din ele corelația se centrează cu mediile
+    întregului semnal, cunoscute abia la final (RunningXcorr).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = min(x.size, y.size)
+    lags = np.arange(-max_lag, max_lag + 1)
+    out = np.zeros((4, lags.size))
+    if n == 0:
+        return out
+    vx = ~np.isnan(x[:n])
+    vy = ~np.isnan(y[:n])
+    size = 1 << int(n + max_lag - 1).bit_length()
+    fx = np.conj(np.fft.rfft([np.where(vx, x[:n], 0.0), vx], size))
+    fy = np.fft.rfft([np.where(vy, y[:n], 0.0), vy], size)
+    full = np.fft.irfft(fx[:, None, :] * fy[None, :, :], size).reshape(4, size)
+    keep = np.abs(lags) < n
+    out[:, keep] = full[:, lags[keep] % size]
+    # Numărul perechilor valide este întreg
+    out[3] = np.round(out[3])
+    return out
+
+def _best(r, sign):
+    """Indexul vârfului: r·sign maxim, sau |r| maxim fără semn așteptat"""
+    return int(np.nanargmax(r * sign if sign else np.abs(r)))
+
+def peak_lag(lags, r, sign=0):
+    """Vârful corelației, în eșantioane: {'lag', 'corr', 'zero_lag_corr'}
+
+    Vârful maximizează r·sign (sign = ±1, semnul așteptat) sau |r| cu
+    sign = 0. None dacă corelația nu e definită (semnal constant sau lipsă).
+    """
+    if not np.isfinite(r).any():
+        return None
+    i = _best(r, sign)
+    return {'lag': int(lags[i]), 'corr': float(r[i]), 'zero_lag_corr': float(r[lags.size // 2])}
@@ -1,1871 +1,1428 @@
-import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from scipy import stats
-from collections import defaultdict
-import warnings
-warnings.filterwarnings('ignore')
-
-# ====================================================== 
-# CONFIGURATION & STYLING
-# ======================================================
-st.set_page_config(
-    page_title="LZTuned Architect Pro - ECU Interpretation Engine",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-st.markdown("""
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700&family=Orbitron:wght@700;900&display=swap');
-
-.stApp {
-    background: #ffffff;
-}
-
-html, body, [class*="css"] {
-    font-family: 'Inter', sans-serif;
-    color: #0b0f14;
-}
-
-.header-box {
-    background: linear-gradient(180deg, #ffffff 0%, #f1f3f5 100%);
-    padding: 50px 20px;
-    border-bottom: 1px solid #dee2e6;
-    text-align: center;
-    margin: -60px -4rem 40px;
-}
-
-.header-box h1 {
-    font-family: 'Orbitron', sans-serif;
-    font-size: 42px;
-    font-weight: 900;
-    color: #0b0f14;
-    margin: 0;
-    letter-spacing: -1px;
-}
-
-.header-box p {
-    font-size: 13px;
-    color: #6c757d;
-    letter-spacing: 3px;
-    margin-top: 8px;
-}
-
-.section-title {
-    font-family: 'Orbitron', sans-serif;
-    font-size: 16px;
-    letter-spacing: 2px;
-    margin: 40px 0 20px;
-    padding-left: 12px;
-    border-left: 5px solid #d90429;
-    color: #0b0f14;
-    text-transform: uppercase;
-}
-
-.expert-card {
-    background: #ffffff;
-    border: 1px solid #e9ecef;
-    padding: 20px;
-    border-radius: 14px;
-    min-height: 280px;
-    box-shadow: 0 4px 10px rgba(0,0,0,0.02);
-}
-
-.resolution-box {
-    background: #f8f9fa;
-    border: 1px solid #dee2e6;
-    padding: 25px;
-    border-radius: 16px;
-    margin-bottom: 20px;
-}
-
-.res-title {
-    font-family: 'Orbitron', sans-serif;
-    font-size: 14px;
-    font-weight: 700;
-    margin-bottom: 10px;
-}
-
-.res-body {
-    font-size: 14px;
-    line-height: 1.6;
-    color: #495057;
-}
-
-.confidence-badge {
-    display: inline-block;
-    padding: 4px 12px;
-    border-radius: 12px;
-    font-size: 11px;
-    font-weight: 700;
-    letter-spacing: 1px;
-}
-
-.why-box {
-    background: #fff3cd;
-    border-left: 4px solid #ffc107;
-    padding: 15px;
-    margin-top: 15px;
-    border-radius: 8px;
-}
-
-.detection-box {
-    background: #e7f5ff;
-    border: 1px solid #74c0fc;
-    padding: 20px;
-    border-radius: 12px;
-    margin: 20px 0;
-}
-
-.anomaly-alert {
-    background: #fff5f5;
-    border-left: 4px solid #d90429;
-    padding: 15px;
-    margin: 10px 0;
-    border-radius: 8px;
-}
-</style>
-""", unsafe_allow_html=True)
-
-# ======================================================
-# CORE: CHANNEL DETECTION & NORMALIZATION ENGINE
-# ======================================================
-class ChannelDetectionEngine:
-    """Detectează și normalizează coloanele din orice log ECU"""
-    
-    CHANNEL_MAP = {
-        'rpm': ['Motor RPM', 'RPM', 'Engine RPM', 'EngineRPM', 'rpm'],
-        'load': ['Engine load', 'Load', 'Engine Load', 'MAP', 'Manifold Pressure'],
-        'lambda1': ['Lambda #1 integrator ', 'Lambda 1', 'AFR 1', 'Lambda#1', 'O2 Sensor 1'],
-        'lambda2': ['Lambda #2 integrator', 'Lambda 2', 'AFR 2', 'Lambda#2', 'O2 Sensor 2'],
-        'knock1': ['Knock sensor #1', 'Knock 1', 'KnockSensor1', 'Knock #1'],
-        'knock2': ['Knock sensor #2', 'Knock 2', 'KnockSensor2', 'Knock #2'],
-        'inj_time': ['Injection time', 'Injector PW', 'Pulse Width', 'InjTime'],
-        'oil_temp': ['Oil temp.', 'Oil Temp', 'Oil Temperature', 'OilTemp'],
-        'coolant_temp': ['Coolant temp.', 'Coolant Temp', 'Water Temp', 'ECT'],
-        'iat': ['IAT', 'Intake Air Temp', 'Air Temp', 'IntakeTemp'],
-        'egt1': ['EGT 1', 'Exhaust Gas Temp 1', 'EGT#1'],
-        'egt2': ['EGT 2', 'Exhaust Gas Temp 2', 'EGT#2'],
-        'boost': ['Boost', 'Turbo Pressure', 'Manifold Pressure'],
-        'fuel_pressure': ['Fuel Pressure', 'FuelPress', 'Rail Pressure'],
-        'ignition_timing': ['Ignition timing', 'Timing', 'Spark Advance', 'IgnTiming'],
-        'battery_voltage': ['Battery voltage', 'Voltage', 'Batt V', 'VBatt'],
-        'tps': ['TPS', 'Throttle Position', 'Throttle %'],
-        'stft': ['STFT', 'Short Term Fuel Trim', 'FuelTrimShort'],
-        'ltft': ['LTFT', 'Long Term Fuel Trim', 'FuelTrimLong'],
-    }
-    
-    def __init__(self, df):
-        self.df = df
-        self.detected = {}
-        self.missing = []
-        self.noisy = []
-        self.confidence = {}
-        
-    def detect_channels(self):
-        """Mapează automat coloanele din CSV către canale standard"""
-        for std_name, variants in self.CHANNEL_MAP.items():
-            found = False
-            for variant in variants:
-                if variant in self.df.columns:
-                    self.detected[std_name] = variant
-                    self.confidence[std_name] = self._assess_signal_quality(variant)
-                    found = True
-                    break
-            if not found:
-                self.missing.append(std_name)
-        
-        return self.detected
-    
-    def _assess_signal_quality(self, col):
-        """Evaluează calitatea semnalului pentru o coloană"""
-        data = self.df[col].dropna()
-        
-        if len(data) == 0:
-            return 0.0
-        
-        # Verificări de calitate
-        null_pct = self.df[col].isnull().sum() / len(self.df) * 100
-        constant_check = data.std() == 0
-        
-        # Detectare flatline (valori constante consecutive)
-        flatline_pct = 0
-        if not constant_check:
-            consecutive_same = (data.diff() == 0).sum() / len(data) * 100
-            flatline_pct = consecutive_same
-        
-        # Scor de confidence
-        confidence = 100.0
-        confidence -= null_pct
-        if constant_check:
-            confidence = 0
-        elif flatline_pct > 50:
-            confidence -= 40
-            self.noisy.append(col)
-        
-        return max(0, min(100, confidence))
-    
-    def get_report(self):
-        """Returnează raport detaliat despre detectare"""
-        total_possible = len(self.CHANNEL_MAP)
-        detected_count = len(self.detected)
-        
-        report = {
-            'total_channels': len(self.df.columns),
-            'detected': detected_count,
-            'missing': len(self.missing),
-            'noisy': len(self.noisy),
-            'coverage': (detected_count / total_possible) * 100
-        }
-        
-        return report
-
-# ======================================================
-# CORE: OPERATING MODE DETECTION ENGINE
-# ======================================================
-class OperatingModeEngine:
-    """Identifică regimurile de funcționare ale motorului"""
-    
-    def __init__(self, df, channels):
-        self.df = df
-        self.channels = channels
-        self.modes = pd.DataFrame(index=df.index)
-        
-    def detect_modes(self):
-        """Detectează toate regimurile de funcționare"""
-        rpm = self._get_channel('rpm', 0)
-        load = self._get_channel('load', 0)
-        tps = self._get_channel('tps', 0)
-        
-        # IDLE: RPM < 1500, Load < 30%
-        self.modes['Idle'] = (rpm < 1500) & (load < 30)
-        
-        # CRUISE: RPM 1500-4000, Load 30-60%, TPS stabil
-        self.modes['Cruise'] = (rpm >= 1500) & (rpm <= 4000) & (load >= 30) & (load <= 60)
-        
-        # ACCELERATION: TPS rate > 5%/s, Load crescător
-        if 'tps' in self.channels:
-            tps_rate = tps.diff().fillna(0)
-            self.modes['Acceleration'] = (tps_rate > 5) & (load > 40)
-        else:
-            load_rate = load.diff().fillna(0)
-            self.modes['Acceleration'] = (load_rate > 10) & (rpm > 2000)
-        
-        # WOT: Load > 70%, RPM > 3000
-        self.modes['WOT'] = (load > 70) & (rpm > 3000)
-        
-        # OVERRUN: TPS < 5%, RPM > 2000 (deceleration cu motor brake)
-        if 'tps' in self.channels:
-            self.modes['Overrun'] = (tps < 5) & (rpm > 2000)
-        else:
-            self.modes['Overrun'] = (load < 20) & (rpm > 2000)
-        
-        # HEAT SOAK: Coolant > 95°C sau Oil > 110°C
-        coolant = self._get_channel('coolant_temp', 0)
-        oil = self._get_channel('oil_temp', 0)
-        self.modes['Heat_Soak'] = (coolant > 95) | (oil > 110)
-        
-        return self.modes
-    
-    def _get_channel(self, name, default):
-        """Helper pentru a obține canal cu fallback"""
-        if name in self.channels:
-            col = self.channels[name]
-            return self.df[col].fillna(default)
-        return pd.Series(default, index=self.df.index)
-    
-    def get_mode_summary(self):
-        """Returnează statistici despre regimuri"""
-        summary = {}
-        for mode in self.modes.columns:
-            count = self.modes[mode].sum()
-            pct = (count / len(self.modes)) * 100
-            summary[mode] = {'count': int(count), 'percentage': round(pct, 1)}
-        return summary
-
-# ======================================================
-# CORE: ADVANCED FUEL ANALYSIS ENGINE
-# ======================================================
-class FuelAnalysisEngine:
-    """Analiză avansată a sistemului de alimentare"""
-    
-    def __init__(self, df, channels, modes):
-        self.df = df
-        self.channels = channels
-        self.modes = modes
-        self.results = {}
-        
-    def analyze(self):
-        """Rulează analiza completă de fuel"""
-        self._analyze_lambda()
-        self._analyze_injector_duty()
-        self._analyze_fuel_trims()
-        self._analyze_linearity()
-        
-        return self.results
-    
-    def _analyze_lambda(self):
-        """Analiză Lambda cu separare pe regimuri"""
-        l1 = self._get_channel('lambda1')
-        l2 = self._get_channel('lambda2')
-        
-        if l1 is None:
-            self.results['lambda'] = {'status': 'NO_DATA', 'confidence': 0}
-            return
-        
-        # Calculează media
-        if l2 is not None:
-            lambda_avg = (l1 + l2) / 2
-        else:
-            lambda_avg = l1
-        
-        self.df['Lambda_Avg'] = lambda_avg
-        
-        # Analiză pe WOT
-        wot_lambda = lambda_avg[self.modes['WOT']]
-        
-        if len(wot_lambda) > 0:
-            mean_wot = wot_lambda.mean()
-            std_wot = wot_lambda.std()
-            
-            # Verdict
-            if mean_wot > 0.86:
-                status = 'LEAN_DANGER'
-                severity = 'CRITICAL'
-            elif mean_wot < 0.78:
-                status = 'RICH_INEFFICIENT'
-                severity = 'WARNING'
-            else:
-                status = 'OPTIMAL'
-                severity = 'SAFE'
-            
-            self.results['lambda'] = {
-                'status': status,
-                'severity': severity,
-                'mean_wot': round(mean_wot, 3),
-                'std_wot': round(std_wot, 3),
-                'min_wot': round(wot_lambda.min(), 3),
-                'confidence': 95 if l2 is not None else 75
-            }
-        else:
-            self.results['lambda'] = {
-                'status': 'NO_WOT_DATA',
-                'confidence': 0
-            }
-    
-    def _analyze_injector_duty(self):
-        """Analiză duty cycle injectoare"""
-        inj_time = self._get_channel('inj_time')
-        rpm = self._get_channel('rpm')
-        
-        if inj_time is None or rpm is None:
-            self.results['duty'] = {'status': 'NO_DATA', 'confidence': 0}
-            return
-        
-        # Calculează Duty Cycle
-        rpm_safe = rpm.replace(0, np.nan)
-        duty = (inj_time * rpm_safe) / 1200
-        self.df['Inj_Duty'] = duty
-        
-        max_duty = duty.max()
-        
-        # Analiză slope (linearity)
-        wot_duty = duty[self.modes['WOT']]
-        wot_rpm = rpm[self.modes['WOT']]
-        
-        if len(wot_duty) > 10:
-            slope, intercept, r_value, _, _ = stats.linregress(wot_rpm, wot_duty)
-            linearity = abs(r_value)
-        else:
-            linearity = 0
-        
-        # Verdict
-        if max_duty > 90:
-            status = 'SATURATED'
-            severity = 'CRITICAL'
-        elif max_duty > 85:
-            status = 'NEAR_LIMIT'
-            severity = 'WARNING'
-        else:
-            status = 'HEALTHY'
-            severity = 'SAFE'
-        
-        self.results['duty'] = {
-            'status': status,
-            'severity': severity,
-            'max_duty': round(max_duty, 1),
-            'linearity': round(linearity, 2),
-            'confidence': 90
-        }
-    
-    def _analyze_fuel_trims(self):
-        """Analiză fuel trim (STFT/LTFT)"""
-        stft = self._get_channel('stft')
-        ltft = self._get_channel('ltft')
-        
-        if stft is None and ltft is None:
-            self.results['fuel_trim'] = {'status': 'NO_DATA', 'confidence': 0}
-            return
-        
-        # Analiză deviație
-        if stft is not None:
-            stft_mean = stft.mean()
-            stft_std = stft.std()
-            
-            if abs(stft_mean) > 10:
-                status = 'ADAPTATION_ACTIVE'
-                severity = 'WARNING'
-            else:
-                status = 'STABLE'
-                severity = 'SAFE'
-            
-            self.results['fuel_trim'] = {
-                'status': status,
-                'severity': severity,
-                'stft_mean': round(stft_mean, 2),
-                'stft_std': round(stft_std, 2),
-                'confidence': 85
-            }
-    
-    def _analyze_linearity(self):
-        """Verifică liniaritatea fuel delivery"""
-        if 'Inj_Duty' not in self.df.columns or 'Lambda_Avg' not in self.df.columns:
-            return
-        
-        wot_duty = self.df.loc[self.modes['WOT'], 'Inj_Duty']
-        wot_lambda = self.df.loc[self.modes['WOT'], 'Lambda_Avg']
-        
-        if len(wot_duty) > 10:
-            # Duty crescător ar trebui să producă Lambda descrescător
-            correlation = wot_duty.corr(wot_lambda)
-            
-            if correlation > -0.3:  # Corelație slabă sau pozitivă = PROBLEMĂ
-                self.results['linearity'] = {
-                    'status': 'NON_LINEAR',
-                    'severity': 'WARNING',
-                    'correlation': round(correlation, 2),
-                    'explanation': 'Creșterea duty-ului nu produce scădere lambda → injectoare subdimensionate sau presiune inconsistentă'
-                }
-    
-    def _get_channel(self, name):
-        """Helper cu None fallback"""
-        if name in self.channels:
-            return self.df[self.channels[name]]
-        return None
-
-# ======================================================
-# CORE: ADVANCED IGNITION ANALYSIS ENGINE
-# ======================================================
-class IgnitionAnalysisEngine:
-    """Analiză avansată a sistemului de aprindere"""
-    
-    def __init__(self, df, channels, modes):
-        self.df = df
-        self.channels = channels
-        self.modes = modes
-        self.results = {}
-        
-    def analyze(self):
-        """Rulează analiza completă de ignition"""
-        self._analyze_knock()
-        self._analyze_timing_stability()
-        self._analyze_knock_correlation()
-        
-        return self.results
-    
-    def _analyze_knock(self):
-        """Analiză detonație cu clustering și threshold adaptat"""
-        k1 = self._get_channel('knock1')
-        k2 = self._get_channel('knock2')
-        
-        if k1 is None:
-            self.results['knock'] = {'status': 'NO_DATA', 'confidence': 0}
-            return
-        
-        # Calculează peak knock
-        if k2 is not None:
-            knock_peak = np.maximum(k1, k2)
-        else:
-            knock_peak = k1
-        
-        self.df['Knock_Peak'] = knock_peak
-        
-        # Statistici
-        max_knock = knock_peak.max()
-        mean_knock = knock_peak.mean()
-        
-        # Detectare evenimente knock (peste 1.2V)
-        knock_events = (knock_peak > 1.2).sum()
-        knock_event_pct = (knock_events / len(knock_peak)) * 100
-        
-        # Knock clustering (eventi în burst vs sporadic)
-        knock_mask = knock_peak > 1.2
-        knock_bursts = (knock_mask.astype(int).diff() == 1).sum()
-        
-        # Verdict
-        if max_knock > 1.5:
-            status = 'SEVERE_DETONATION'
-            severity = 'CRITICAL'
-        elif max_knock > 1.2:
-            if knock_event_pct > 5:
-                status = 'SUSTAINED_KNOCK'
-                severity = 'CRITICAL'
-            else:
-                status = 'SPORADIC_KNOCK'
-                severity = 'WARNING'
-        else:
-            status = 'SAFE'
-            severity = 'SAFE'
-        
-        self.results['knock'] = {
-            'status': status,
-            'severity': severity,
-            'max_knock': round(max_knock, 3),
-            'mean_knock': round(mean_knock, 3),
-            'events': int(knock_events),
-            'event_pct': round(knock_event_pct, 2),
-            'bursts': int(knock_bursts),
-            'confidence': 90 if k2 is not None else 70
-        }
-    
-    def _analyze_timing_stability(self):
-        """Analiză stabilitate avans la aprindere"""
-        timing = self._get_channel('ignition_timing')
-        
-        if timing is None:
-            return
-        
-        wot_timing = timing[self.modes['WOT']]
-        
-        if len(wot_timing) > 0:
-            std_timing = wot_timing.std()
-            
-            if std_timing > 3:
-                status = 'UNSTABLE'
-                severity = 'WARNING'
-            else:
-                status = 'STABLE'
-                severity = 'SAFE'
-            
-            self.results['timing_stability'] = {
-                'status': status,
-                'severity': severity,
-                'std': round(std_timing, 2),
-                'confidence': 80
-            }
-    
-    def _analyze_knock_correlation(self):
-        """Analiză corelație knock cu alți parametri"""
-        if 'Knock_Peak' not in self.df.columns:
-            return
-        
-        knock = self.df['Knock_Peak']
-        
-        # Corelație cu Lambda
-        if 'Lambda_Avg' in self.df.columns:
-            lambda_corr = knock.corr(self.df['Lambda_Avg'])
-            
-            if abs(lambda_corr) < 0.2:
-                # Knock independent de lambda = PROBLEMA MECHANICĂ
-                self.results['knock_cause'] = {
-                    'type': 'MECHANICAL',
-                    'explanation': 'Knock apare independent de lambda → zgomot mecanic sau timing problem, nu fueling'
-                }
-            else:
-                self.results['knock_cause'] = {
-                    'type': 'FUELING_RELATED',
-                    'explanation': 'Knock corelat cu lambda → verifică amestec și calitate combustibil'
-                }
-    
-    def _get_channel(self, name):
-        if name in self.channels:
-            return self.df[self.channels[name]]
-        return None
-
-# ======================================================
-# CORE: THERMAL & MECHANICAL STRESS ENGINE
-# ======================================================
-class ThermalStressEngine:
-    """Analiză stres termic și mecanic"""
-    
-    def __init__(self, df, channels):
-        self.df = df
-        self.channels = channels
-        self.results = {}
-        
-    def analyze(self):
-        """Rulează analiza termică completă"""
-        self._analyze_oil_stress()
-        self._analyze_coolant_stress()
-        self._analyze_egt()
-        self._analyze_thermal_rate()
-        
-        return self.results
-    
-    def _analyze_oil_stress(self):
-        """Analiză stres termic ulei"""
-        oil = self._get_channel('oil_temp')
-        
-        if oil is None:
-            self.results['oil'] = {'status': 'NO_DATA'}
-            return
-        
-        max_oil = oil.max()
-        
-        # Detectare sustained high temp
-        high_temp_duration = (oil > 110).sum()
-        high_temp_minutes = high_temp_duration / 60  # presupunem 1Hz sampling
-        
-        if max_oil > 125:
-            status = 'CRITICAL_OVERHEAT'
-            severity = 'CRITICAL'
-        elif max_oil > 115:
-            status = 'OVERHEAT'
-            severity = 'WARNING'
-        elif high_temp_minutes > 5:
-            status = 'SUSTAINED_HIGH'
-            severity = 'WARNING'
-        else:
-            status = 'HEALTHY'
-            severity = 'SAFE'
-        
-        self.results['oil'] = {
-            'status': status,
-            'severity': severity,
-            'max': round(max_oil, 1),
-            'sustained_high_min': round(high_temp_minutes, 1),
-            'confidence': 90
-        }
-    
-    def _analyze_coolant_stress(self):
-        """Analiză stres termic coolant"""
-        coolant = self._get_channel('coolant_temp')
-        
-        if coolant is None:
-            return
-        
-        max_coolant = coolant.max()
-        
-        if max_coolant > 105:
-            status = 'OVERHEATING'
-            severity = 'CRITICAL'
-        elif max_coolant > 98:
-            status = 'HIGH'
-            severity = 'WARNING'
-        else:
-            status = 'NORMAL'
-            severity = 'SAFE'
-        
-        self.results['coolant'] = {
-            'status': status,
-            'severity': severity,
-            'max': round(max_coolant, 1),
-            'confidence': 90
-        }
-    
-    def _analyze_egt(self):
-        """Analiză EGT (Exhaust Gas Temperature)"""
-        egt1 = self._get_channel('egt1')
-        
-        if egt1 is None:
-            return
-        
-        max_egt = egt1.max()
-        
-        if max_egt > 950:
-            status = 'TURBO_RISK'
-            severity = 'CRITICAL'
-        elif max_egt > 900:
-            status = 'HIGH'
-            severity = 'WARNING'
-        else:
-            status = 'SAFE'
-            severity = 'SAFE'
-        
-        self.results['egt'] = {
-            'status': status,
-            'severity': severity,
-            'max': round(max_egt, 0),
-            'confidence': 85
-        }
-    
-    def _analyze_thermal_rate(self):
-        """Analiză rată de creștere termică"""
-        oil = self._get_channel('oil_temp')
-        
-        if oil is None:
-            return
-        
-        # Calculează delta rate (°C/sec)
-        oil_rate = oil.diff().abs()
-        max_rate = oil_rate.max()
-        
-        if max_rate > 5:
-            self.results['thermal_shock'] = {
-                'status': 'RAPID_CHANGE',
-                'severity': 'WARNING',
-                'max_rate': round(max_rate, 2),
-                'explanation': 'Schimbare termică rapidă poate cauza stress material'
-            }
-    
-    def _get_channel(self, name):
-        if name in self.channels:
-            return self.df[self.channels[name]]
-        return None
-
-# ======================================================
-# CORE: ELECTRICAL HEALTH ENGINE
-# ======================================================
-class ElectricalHealthEngine:
-    """Analiză sănătate electrică și senzori"""
-    
-    def __init__(self, df, channels):
-        self.df = df
-        self.channels = channels
-        self.results = {}
-        
-    def analyze(self):
-        """Rulează analiza electrică"""
-        self._analyze_voltage()
-        self._analyze_sensor_health()
-        
-        return self.results
-    
-    def _analyze_voltage(self):
-        """Analiză stabilitate voltage"""
-        voltage = self._get_channel('battery_voltage')
-        
-        if voltage is None:
-            return
-        
-        min_v = voltage.min()
-        max_v = voltage.max()
-        std_v = voltage.std()
-        
-        if min_v < 12.5:
-            status = 'LOW_VOLTAGE'
-            severity = 'WARNING'
-        elif std_v > 1.0:
-            status = 'UNSTABLE'
-            severity = 'WARNING'
-        else:
-            status = 'STABLE'
-            severity = 'SAFE'
-        
-        self.results['voltage'] = {
-            'status': status,
-            'severity': severity,
-            'min': round(min_v, 2),
-            'max': round(max_v, 2),
-            'std': round(std_v, 2),
-            'confidence': 85
-        }
-    
-    def _analyze_sensor_health(self):
-        """Detectare senzori defecți (flatline, dropout)"""
-        sensor_issues = []
-        
-        for sensor_name, col_name in self.channels.items():
-            data = self.df[col_name]
-            
-            # Flatline detection
-            if data.std() == 0:
-                sensor_issues.append({
-                    'sensor': sensor_name,
-                    'issue': 'FLATLINE',
-                    'description': f'{sensor_name} returnează valoare constantă'
-                })
-            
-            # Dropout detection (mai mult de 10% null)
-            null_pct = data.isnull().sum() / len(data) * 100
-            if null_pct > 10:
-                sensor_issues.append({
-                    'sensor': sensor_name,
-                    'issue': 'DROPOUT',
-                    'description': f'{sensor_name} are {null_pct:.1f}% date lipsă'
-                })
-        
-        if sensor_issues:
-            self.results['sensor_health'] = {
-                'status': 'ISSUES_DETECTED',
-                'issues': sensor_issues,
-                'confidence': 75
-            }
-    
-    def _get_channel(self, name):
-        if name in self.channels:
-            return self.df[self.channels[name]]
-        return None
-
-# ======================================================
-# CORE: ANOMALY DETECTION ENGINE
-# ======================================================
-class AnomalyDetectionEngine:
-    """Detectare anomalii și pattern-uri rare"""
-    
-    def __init__(self, df, channels):
-        self.df = df
-        self.channels = channels
-        self.anomalies = []
-        
-    def detect(self):
-        """Detectează anomalii în toate canalele principale"""
-        
-        # Detectare spike-uri (valori > 3 std dev)
-        for sensor_name, col_name in self.channels.items():
-            data = self.df[col_name].dropna()
-            
-            if len(data) < 10:
-                continue
-            
-            mean = data.mean()
-            std = data.std()
-            
-            if std == 0:
-                continue
-            
-            # Z-score method
-            z_scores = np.abs((data - mean) / std)
-            spikes = z_scores > 3
-            
-            if spikes.sum() > 0:
-                spike_indices = data[spikes].index.tolist()
-                self.anomalies.append({
-                    'type': 'SPIKE',
-                    'sensor': sensor_name,
-                    'count': int(spikes.sum()),
-                    'max_deviation': round(z_scores.max(), 2),
-                    'indices': spike_indices[:5],  # Primele 5
-                    'severity': 'WARNING' if spikes.sum() < 3 else 'CRITICAL'
-                })
-        
-        # Detectare sudden drops (căderi bruște)
-        rpm_col = self.channels.get('rpm')
-        if rpm_col:
-            rpm = self.df[rpm_col]
-            rpm_diff = rpm.diff().abs()
-            sudden_drops = rpm_diff > 1000  # Drop > 1000 RPM
-            
-            if sudden_drops.sum() > 0:
-                self.anomalies.append({
-                    'type': 'SUDDEN_DROP',
-                    'sensor': 'rpm',
-                    'count': int(sudden_drops.sum()),
-                    'explanation': 'Posibil wheel hop, misfire sau întrerupere în log',
-                    'severity': 'WARNING'
-                })
-        
-        return self.anomalies
-
-# ======================================================
-# CORE: CORRELATION ENGINE
-# ======================================================
-class CorrelationEngine:
-    """Analiză corelații între parametri"""
-    
-    def __init__(self, df, channels):
-        self.df = df
-        self.channels = channels
-        self.correlations = {}
-        
-    def analyze(self):
-        """Calculează corelații importante"""
-        
-        # RPM vs Knock
-        if 'rpm' in self.channels and 'Knock_Peak' in self.df.columns:
-            rpm = self.df[self.channels['rpm']]
-            knock = self.df['Knock_Peak']
-            corr = rpm.corr(knock)
-            
-            self.correlations['rpm_knock'] = {
-                'value': round(corr, 3),
-                'interpretation': self._interpret_correlation(corr, 'rpm', 'knock')
-            }
-        
-        # Lambda vs EGT
-        if 'Lambda_Avg' in self.df.columns and 'egt1' in self.channels:
-            lambda_avg = self.df['Lambda_Avg']
-            egt = self.df[self.channels['egt1']]
-            corr = lambda_avg.corr(egt)
-            
-            self.correlations['lambda_egt'] = {
-                'value': round(corr, 3),
-                'interpretation': self._interpret_correlation(corr, 'lambda', 'egt')
-            }
-        
-        # Duty vs Load
-        if 'Inj_Duty' in self.df.columns and 'load' in self.channels:
-            duty = self.df['Inj_Duty']
-            load = self.df[self.channels['load']]
-            corr = duty.corr(load)
-            
-            self.correlations['duty_load'] = {
-                'value': round(corr, 3),
-                'interpretation': self._interpret_correlation(corr, 'duty', 'load')
-            }
-        
-        return self.correlations
-    
-    def _interpret_correlation(self, corr, param1, param2):
-        """Interpretează semnificația corelației"""
-        abs_corr = abs(corr)
-        
-        if abs_corr > 0.8:
-            strength = "corelație PUTERNICĂ"
-        elif abs_corr > 0.5:
-            strength = "corelație MODERATĂ"
-        elif abs_corr > 0.3:
-            strength = "corelație SLABĂ"
-        else:
-            strength = "corelație NEGLIJABILĂ"
-        
-        direction = "pozitivă" if corr > 0 else "negativă"
-        
-        return f"{strength} {direction} între {param1} și {param2}"
-
-# ======================================================
-# CORE: PREDICTIVE RISK ENGINE
-# ======================================================
-class PredictiveRiskEngine:
-    """Evaluare risc predictiv pe baza pattern-urilor"""
-    
-    def __init__(self, results_dict):
-        self.results = results_dict
-        self.risk_score = 0
-        self.risk_factors = []
-        
-    def assess(self):
-        """Calculează risk score global"""
-        
-        # Factor risc: Knock
-        if 'knock' in self.results:
-            knock = self.results['knock']
-            if knock.get('severity') == 'CRITICAL':
-                self.risk_score += 40
-                self.risk_factors.append({
-                    'factor': 'DETONATION',
-                    'impact': 'HIGH',
-                    'consequence': 'Risc deteriorare piston, segmenți sau chiuloasă'
-                })
-            elif knock.get('severity') == 'WARNING':
-                self.risk_score += 20
-                self.risk_factors.append({
-                    'factor': 'KNOCK_EVENTS',
-                    'impact': 'MEDIUM',
-                    'consequence': 'Uzură accelerată în timp'
-                })
-        
-        # Factor risc: Lambda lean
-        if 'lambda' in self.results:
-            lamb = self.results['lambda']
-            if lamb.get('status') == 'LEAN_DANGER':
-                self.risk_score += 35
-                self.risk_factors.append({
-                    'factor': 'LEAN_MIXTURE',
-                    'impact': 'HIGH',
-                    'consequence': 'Risc topire piston, ardere supape evacuare'
-                })
-        
-        # Factor risc: Oil overheat
-        if 'oil' in self.results:
-            oil = self.results['oil']
-            if oil.get('severity') == 'CRITICAL':
-                self.risk_score += 30
-                self.risk_factors.append({
-                    'factor': 'OIL_OVERHEAT',
-                    'impact': 'HIGH',
-                    'consequence': 'Pierdere viscozitate, risc gripare lagăre'
-                })
-            elif oil.get('sustained_high_min', 0) > 5:
-                self.risk_score += 15
-                self.risk_factors.append({
-                    'factor': 'SUSTAINED_HIGH_OIL',
-                    'impact': 'MEDIUM',
-                    'consequence': 'Degradare accelerată a uleiului'
-                })
-        
-        # Factor risc: Injector saturation
-        if 'duty' in self.results:
-            duty = self.results['duty']
-            if duty.get('severity') == 'CRITICAL':
-                self.risk_score += 25
-                self.risk_factors.append({
-                    'factor': 'INJECTOR_LIMIT',
-                    'impact': 'MEDIUM',
-                    'consequence': 'Risc amestec sărac la turații mari'
-                })
-        
-        # Factor risc: EGT
-        if 'egt' in self.results:
-            egt = self.results['egt']
-            if egt.get('severity') == 'CRITICAL':
-                self.risk_score += 30
-                self.risk_factors.append({
-                    'factor': 'EGT_CRITICAL',
-                    'impact': 'HIGH',
-                    'consequence': 'Risc deteriorare turbină'
-                })
-        
-        return {
-            'risk_score': min(100, self.risk_score),
-            'risk_level': self._get_risk_level(),
-            'factors': self.risk_factors
-        }
-    
-    def _get_risk_level(self):
-        """Returnează nivelul de risc"""
-        if self.risk_score >= 70:
-            return 'CRITICAL'
-        elif self.risk_score >= 40:
-            return 'HIGH'
-        elif self.risk_score >= 20:
-            return 'MEDIUM'
-        else:
-            return 'LOW'
-
-# ======================================================
-# RENDERING FUNCTIONS
-# ======================================================
-
-def render_detection_report(report, detected, missing, noisy, confidence):
-    """Renderează raportul de detectare canale"""
-    st.markdown("<h2 class='section-title'>📡 Channel Detection & Signal Quality</h2>", unsafe_allow_html=True)
-    
-    col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Total Channels", report['total_channels'])
-    col2.metric("Detected", f"{report['detected']}/{len(ChannelDetectionEngine.CHANNEL_MAP)}")
-    col3.metric("Coverage", f"{report['coverage']:.0f}%")
-    col4.metric("Noisy Signals", len(noisy))
-    
-    # Detalii detectare
-    st.markdown("""
-    <div class="detection-box">
-        <h4 style="margin-top:0;">🔍 Detection Details</h4>
-    """, unsafe_allow_html=True)
-    
-    if detected:
-        st.markdown("**✅ Detected Channels:**")
-        for std_name, col_name in detected.items():
-            conf = confidence.get(std_name, 0)
-            conf_color = "#10b981" if conf > 80 else "#f59e0b" if conf > 50 else "#d90429"
-            st.markdown(f"- **{std_name}** → `{col_name}` <span class='confidence-badge' style='background:{conf_color}20;color:{conf_color}'>CONFIDENCE: {conf:.0f}%</span>", unsafe_allow_html=True)
-    
-    if missing:
-        st.markdown("**⚠️ Missing Channels:**")
-        for m in missing[:10]:  # Primele 10
-            st.markdown(f"- {m}")
-        if len(missing) > 10:
-            st.markdown(f"*... și încă {len(missing)-10} canale*")
-    
-    if noisy:
-        st.markdown("**🔊 Noisy/Suspect Signals:**")
-        for n in noisy:
-            st.markdown(f"- {n} (flatline detection sau zgomot excesiv)")
-    
-    st.markdown("</div>", unsafe_allow_html=True)
-    
-    # WHY explainer
-    st.markdown("""
-    <div class="why-box">
-        <b>💡 WHY THIS MATTERS:</b><br>
-        Channel detection este primul pas critic. Fără identificarea corectă a semnalelor, orice analiză ulterioară este inutilă. 
-        Un semnal "noisy" poate indica cablaj defect, împământare proastă sau senzor în curs de defectare.
-    </div>
-    """, unsafe_allow_html=True)
-
-def render_operating_modes(mode_summary, modes_df):
-    """Renderează analiza regimurilor de funcționare"""
-    st.markdown("<h2 class='section-title'>⚙️ Operating Mode Analysis</h2>", unsafe_allow_html=True)
-    
-    cols = st.columns(len(mode_summary))
-    for i, (mode, data) in enumerate(mode_summary.items()):
-        with cols[i]:
-            st.metric(mode.replace('_', ' '), f"{data['percentage']}%", f"{data['count']} samples")
-    
-    # Grafic timeline
-    fig = go.Figure()
-    
-    for mode in modes_df.columns:
-        fig.add_trace(go.Scatter(
-            y=modes_df[mode].astype(int),
-            mode='lines',
-            name=mode,
-            line=dict(width=1),
-            stackgroup='one'
-        ))
-    
-    fig.update_layout(
-        title="Operating Modes Timeline",
-        xaxis_title="Sample Index",
-        yaxis_title="Active Mode",
-        template="plotly_white",
-        height=300
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    st.markdown("""
-    <div class="why-box">
-        <b>💡 WHY THIS MATTERS:</b><br>
-        Problemele apar rar uniform. De exemplu, knock-ul poate apărea DOAR în WOT @ 4500 RPM, nu la Idle. 
-        Separarea pe regimuri îți arată EXACT unde e problema, nu doar "că există".
-    </div>
-    """, unsafe_allow_html=True)
-
-def render_fuel_analysis(fuel_results):
-    """Renderează analiza fuel detaliată"""
-    st.markdown("<h2 class='section-title'>⛽ Advanced Fuel System Analysis</h2>", unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    # Lambda Analysis
-    if 'lambda' in fuel_results and fuel_results['lambda']['status'] != 'NO_DATA':
-        lamb = fuel_results['lambda']
-        color = get_severity_color(lamb.get('severity', 'SAFE'))
-        
-        with col1:
-            st.markdown(f"""
-            <div class="expert-card" style="border-top: 5px solid {color};">
-                <div style="color:{color}; font-weight:900; font-size:13px; font-family:Orbitron;">{lamb['status']}</div>
-                <div style="font-size:11px; color:#6c757d;">LAMBDA (AFR) WOT</div>
-                <div style="font-size:38px; font-weight:700; margin:12px 0;">{lamb['mean_wot']:.3f}</div>
-                <div style="font-size:13px; line-height:1.5;">
-                    Min: {lamb['min_wot']:.3f} | StdDev: {lamb['std_wot']:.3f}<br>
-                    <span class='confidence-badge' style='background:#e7f5ff;color:#1971c2;margin-top:8px;'>
-                        CONFIDENCE: {lamb['confidence']}%
-                    </span>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            if lamb['status'] == 'LEAN_DANGER':
-                render_resolution(
-                    "LEAN MIXTURE - CRITICAL ACTION REQUIRED",
-                    "CRITICAL",
-                    f"Lambda WOT medie este {lamb['mean_wot']:.3f}, peste limita de 0.86. Acest lucru înseamnă că gazele de evacuare sunt EXTREM de fierbinți, putând cauza:\n- Topirea pistonului\n- Arderea supapelor de evacuare\n- Deteriorarea turbinei\n- Crăparea chiuloasei",
-                    "ACȚIUNE IMEDIATĂ: Crește Fuel Target Map cu 8-12% în zona WOT sau verifică:\n1. Presiunea în rampa de benzină (min 3.5 bar)\n2. Filtru combustibil înfundat\n3. Pompă slabă\n4. Injectoare murdare\n\nTarget optim: 0.80-0.82 lambda pentru protecție termică maximă."
-                )
-    
-    # Duty Analysis
-    if 'duty' in fuel_results and fuel_results['duty']['status'] != 'NO_DATA':
-        duty = fuel_results['duty']
-        color = get_severity_color(duty.get('severity', 'SAFE'))
-        
-        with col2:
-            st.markdown(f"""
-            <div class="expert-card" style="border-top: 5px solid {color};">
-                <div style="color:{color}; font-weight:900; font-size:13px; font-family:Orbitron;">{duty['status']}</div>
-                <div style="font-size:11px; color:#6c757d;">INJECTOR DUTY CYCLE</div>
-                <div style="font-size:38px; font-weight:700; margin:12px 0;">{duty['max_duty']:.1f}%</div>
-                <div style="font-size:13px; line-height:1.5;">
-                    Linearity: {duty['linearity']:.2f}<br>
-                    <span class='confidence-badge' style='background:#e7f5ff;color:#1971c2;margin-top:8px;'>
-                        CONFIDENCE: {duty['confidence']}%
-                    </span>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            if duty['status'] in ['SATURATED', 'NEAR_LIMIT']:
-                render_resolution(
-                    "INJECTOR CAPACITY LIMIT REACHED",
-                    duty['severity'],
-                    f"Duty cycle a atins {duty['max_duty']:.1f}%. Peste 85%, injectoarele nu mai pot menține presiunea necesară, rezultând amestec sărac forțat la turații mari.",
-                    "SOLUȚII:\n1. UPGRADE injectoare (ex: de la 440cc la 550cc+)\n2. Crește presiunea în rampă (+0.5 bar)\n3. Verifică regulator presiune\n4. LIMITEAZĂ boost-ul până la upgrade\n\nDacă linearity < 0.70, injectoarele sunt subdimensionate sau presiunea e inconsistentă."
-                )
-    
-    # Fuel Trim
-    if 'fuel_trim' in fuel_results and fuel_results['fuel_trim']['status'] != 'NO_DATA':
-        trim = fuel_results['fuel_trim']
-        
-        st.markdown(f"""
-        <div class="resolution-box">
-            <div class="res-title" style="color:{get_severity_color(trim['severity'])};">
-                FUEL TRIM ADAPTATION // {trim['status']}
-            </div>
-            <div class="res-body">
-                <b>SHORT TERM:</b> Mean = {trim['stft_mean']:.2f}% | StdDev = {trim['stft_std']:.2f}%<br>
-                {'⚠️ ECU-ul compensează activ diferențe în fueling. Verifică vacuum leaks sau senzor O2.' if abs(trim['stft_mean']) > 10 else '✅ Adaptare minimă, sistemul e calibrat corect.'}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Linearity Issue
-    if 'linearity' in fuel_results:
-        lin = fuel_results['linearity']
-        st.markdown(f"""
-        <div class="anomaly-alert">
-            <b>⚠️ NON-LINEAR FUEL DELIVERY DETECTED</b><br>
-            Correlation Duty ↔ Lambda: {lin['correlation']:.2f}<br>
-            {lin['explanation']}
-        </div>
-        """, unsafe_allow_html=True)
-
-def render_ignition_analysis(ign_results):
-    """Renderează analiza ignition detaliată"""
-    st.markdown("<h2 class='section-title'>⚡ Advanced Ignition System Analysis</h2>", unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    # Knock Analysis
-    if 'knock' in ign_results and ign_results['knock']['status'] != 'NO_DATA':
-        knock = ign_results['knock']
-        color = get_severity_color(knock.get('severity', 'SAFE'))
-        
-        with col1:
-            st.markdown(f"""
-            <div class="expert-card" style="border-top: 5px solid {color};">
-                <div style="color:{color}; font-weight:900; font-size:13px; font-family:Orbitron;">{knock['status']}</div>
-                <div style="font-size:11px; color:#6c757d;">KNOCK / DETONATION</div>
-                <div style="font-size:38px; font-weight:700; margin:12px 0;">{knock['max_knock']:.2f}V</div>
-                <div style="font-size:13px; line-height:1.5;">
-                    Mean: {knock['mean_knock']:.2f}V | Events: {knock['events']}<br>
-                    Event %: {knock['event_pct']:.1f}% | Bursts: {knock['bursts']}<br>
-                    <span class='confidence-badge' style='background:#e7f5ff;color:#1971c2;margin-top:8px;'>
-                        CONFIDENCE: {knock['confidence']}%
-                    </span>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            if knock['status'] in ['SEVERE_DETONATION', 'SUSTAINED_KNOCK']:
-                render_resolution(
-                    "DETONATION DETECTED - IMMEDIATE ACTION",
-                    "CRITICAL",
-                    f"Peak knock: {knock['max_knock']:.2f}V (Limită: 1.2V). {knock['events']} evenimente detectate ({knock['event_pct']:.1f}% din log).\n\nDetonația înseamnă că amestecul se aprinde ÎNAINTE de scânteie din cauza:\n- Avans prea mare\n- Temperatura prea mare în cameră\n- Cifră octanică insuficientă\n- Puncte fierbinți (carbon deposits)",
-                    "ACȚIUNE IMEDIATĂ:\n1. RETARD ignition cu 3-4 grade în zona Load/RPM unde apare\n2. Verifică bujiile (heat range prea cald?)\n3. Testează cu combustibil mai bun (98+ RON)\n4. Verifică temperatura IAT (dacă > 50°C, intercooler insuficient)\n5. Dacă persistă: cleaning injectoare + decarbonizare\n\nNU ignora knock-ul - poate distruge motorul în secunde."
-                )
-            elif knock['status'] == 'SPORADIC_KNOCK':
-                st.markdown("""
-                <div class="resolution-box">
-                    <div class="res-title" style="color:#f59e0b;">SPORADIC KNOCK EVENTS // WARNING</div>
-                    <div class="res-body">
-                        <b>OBSERVAȚIE:</b> Knock sporadic (sub 5% din timp) poate fi normal sau cauzat de zgomot extern.<br><br>
-                        <b>RECOMANDARE:</b> Monitorizează în continuare. Dacă crește frecvența, aplică retard preventiv de 1-2 grade.
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-    
-    # Timing Stability
-    if 'timing_stability' in ign_results:
-        timing = ign_results['timing_stability']
-        color = get_severity_color(timing['severity'])
-        
-        with col2:
-            st.markdown(f"""
-            <div class="expert-card" style="border-top: 5px solid {color};">
-                <div style="color:{color}; font-weight:900; font-size:13px; font-family:Orbitron;">{timing['status']}</div>
-                <div style="font-size:11px; color:#6c757d;">TIMING STABILITY</div>
-                <div style="font-size:38px; font-weight:700; margin:12px 0;">{timing['std']:.1f}°</div>
-                <div style="font-size:13px; line-height:1.5;">
-                    Standard Deviation WOT<br>
-                    <span class='confidence-badge' style='background:#e7f5ff;color:#1971c2;margin-top:8px;'>
-                        CONFIDENCE: {timing['confidence']}%
-                    </span>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    # Knock Cause Analysis
-    if 'knock_cause' in ign_results:
-        cause = ign_results['knock_cause']
-        st.markdown(f"""
-        <div class="why-box">
-            <b>🔍 KNOCK ROOT CAUSE ANALYSIS:</b><br>
-            Type: <b>{cause['type']}</b><br>
-            {cause['explanation']}
-        </div>
-        """, unsafe_allow_html=True)
-
-def render_thermal_analysis(thermal_results):
-    """Renderează analiza termică"""
-    st.markdown("<h2 class='section-title'>🌡️ Thermal & Mechanical Stress Analysis</h2>", unsafe_allow_html=True)
-    
-    cols = st.columns(3)
-    
-    # Oil
-    if 'oil' in thermal_results and thermal_results['oil']['status'] != 'NO_DATA':
-        oil = thermal_results['oil']
-        color = get_severity_color(oil['severity'])
-        
-        with cols[0]:
-            st.markdown(f"""
-            <div class="expert-card" style="border-top: 5px solid {color};">
-                <div style="color:{color}; font-weight:900; font-size:13px; font-family:Orbitron;">{oil['status']}</div>
-                <div style="font-size:11px; color:#6c757d;">OIL TEMPERATURE</div>
-                <div style="font-size:38px; font-weight:700; margin:12px 0;">{oil['max']:.0f}°C</div>
-                <div style="font-size:13px; line-height:1.5;">
-                    Sustained High: {oil['sustained_high_min']:.1f} min
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            if oil['severity'] != 'SAFE':
-                st.markdown(f"""
-                <div class="resolution-box">
-                    <div class="res-title" style="color:{color};">OIL THERMAL STRESS</div>
-                    <div class="res-body">
-                        Peste 115°C, uleiul își pierde viscozitatea și capacitatea de lubrifiere. 
-                        {oil['sustained_high_min']:.1f} minute la temperatură mare accelerează degradarea.<br><br>
-                        <b>SOLUȚIE:</b> Oil cooler, ventilație îmbunătățită sau verifică termostat blocat.
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-    
-    # Coolant
-    if 'coolant' in thermal_results:
-        coolant = thermal_results['coolant']
-        color = get_severity_color(coolant['severity'])
-        
-        with cols[1]:
-            st.markdown(f"""
-            <div class="expert-card" style="border-top: 5px solid {color};">
-                <div style="color:{color}; font-weight:900; font-size:13px; font-family:Orbitron;">{coolant['status']}</div>
-                <div style="font-size:11px; color:#6c757d;">COOLANT TEMPERATURE</div>
-                <div style="font-size:38px; font-weight:700; margin:12px 0;">{coolant['max']:.0f}°C</div>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    # EGT
-    if 'egt' in thermal_results:
-        egt = thermal_results['egt']
-        color = get_severity_color(egt['severity'])
-        
-        with cols[2]:
-            st.markdown(f"""
-            <div class="expert-card" style="border-top: 5px solid {color};">
-                <div style="color:{color}; font-weight:900; font-size:13px; font-family:Orbitron;">{egt['status']}</div>
-                <div style="font-size:11px; color:#6c757d;">EXHAUST GAS TEMP</div>
-                <div style="font-size:38px; font-weight:700; margin:12px 0;">{egt['max']:.0f}°C</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            if egt['severity'] == 'CRITICAL':
-                st.markdown("""
-                <div class="anomaly-alert">
-                    <b>⚠️ EGT CRITICAL - TURBO AT RISK</b><br>
-                    EGT peste 950°C poate deteriora paletele turbinei. Cauze: amestec prea sărac, boost excesiv, timing prea avansat.
-                </div>
-                """, unsafe_allow_html=True)
-    
-    # Thermal Shock
-    if 'thermal_shock' in thermal_results:
-        shock = thermal_results['thermal_shock']
-        st.markdown(f"""
-        <div class="anomaly-alert">
-            <b>⚠️ RAPID THERMAL CHANGE</b><br>
-            Max rate: {shock['max_rate']:.2f}°C/sec<br>
-            {shock['explanation']}
-        </div>
-        """, unsafe_allow_html=True)
-
-def render_predictive_risk(risk_data):
-    """Renderează analiza de risc predictivă"""
-    st.markdown("<h2 class='section-title'>🎯 Predictive Risk Assessment</h2>", unsafe_allow_html=True)
-    
-    risk_score = risk_data['risk_score']
-    risk_level = risk_data['risk_level']
-    
-    # Risk gauge
-    if risk_level == 'CRITICAL':
-        color = "#d90429"
-    elif risk_level == 'HIGH':
-        color = "#f59e0b"
-    elif risk_level == 'MEDIUM':
-        color = "#ffc107"
-    else:
-        color = "#10b981"
-    
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number",
-        value=risk_score,
-        domain={'x': [0, 1], 'y': [0, 1]},
-        title={'text': f"RISK LEVEL: {risk_level}", 'font': {'size': 24, 'family': 'Orbitron'}},
-        gauge={
-            'axis': {'range': [0, 100]},
-            'bar': {'color': color},
-            'steps': [
-                {'range': [0, 20], 'color': "#e7f5ff"},
-                {'range': [20, 40], 'color': "#fff9db"},
-                {'range': [40, 70], 'color': "#ffe8cc"},
-                {'range': [70, 100], 'color': "#ffe0e0"}
-            ],
-            'threshold': {
-                'line': {'color': "red", 'width': 4},
-                'thickness': 0.75,
-                'value': 70
-            }
-        }
-    ))
-    
-    fig.update_layout(height=350, template="plotly_white")
-    st.plotly_chart(fig, use_container_width=True)
-    
-    # Risk Factors
-    if risk_data['factors']:
-        st.markdown("### 🔴 Identified Risk Factors")
-        for factor in risk_data['factors']:
-            impact_color = "#d90429" if factor['impact'] == 'HIGH' else "#f59e0b"
-            st.markdown(f"""
-            <div class="resolution-box">
-                <div class="res-title" style="color:{impact_color};">
-                    {factor['factor']} // IMPACT: {factor['impact']}
-                </div>
-                <div class="res-body">
-                    <b>CONSEQUENCE:</b> {factor['consequence']}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    st.markdown("""
-    <div class="why-box">
-        <b>💡 WHY THIS MATTERS:</b><br>
-        Risk score-ul agregă TOATE problemele detectate și calculează probabilitatea de deteriorare. 
-        Un score peste 70 înseamnă că motorul operează în condiții periculoase și necesită intervenție IMEDIATĂ.
-    </div>
-    """, unsafe_allow_html=True)
-
-def render_anomalies(anomalies):
-    """Renderează anomaliile detectate"""
-    if not anomalies:
-        return
-    
-    st.markdown("<h2 class='section-title'>🚨 Anomaly Detection Report</h2>", unsafe_allow_html=True)
-    
-    for anom in anomalies:
-        color = "#d90429" if anom['severity'] == 'CRITICAL' else "#f59e0b"
-        
-        st.markdown(f"""
-        <div class="anomaly-alert">
-            <b style="color:{color};">{anom['type']} - {anom['sensor'].upper()}</b><br>
-            Count: {anom['count']}
-            {f"| Max Deviation: {anom['max_deviation']} σ" if 'max_deviation' in anom else ""}
-            {f"<br><i>{anom['explanation']}</i>" if 'explanation' in anom else ""}
-        </div>
-        """, unsafe_allow_html=True)
-
-def render_correlations(correlations):
-    """Renderează analiza de corelații"""
-    if not correlations:
-        return
-    
-    st.markdown("<h2 class='section-title'>📊 Parameter Correlation Analysis</h2>", unsafe_allow_html=True)
-    
-    for name, data in correlations.items():
-        st.markdown(f"""
-        <div class="resolution-box">
-            <div class="res-title">{name.upper().replace('_', ' ↔ ')}</div>
-            <div class="res-body">
-                <b>Correlation:</b> {data['value']:.3f}<br>
-                <b>Interpretation:</b> {data['interpretation']}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-
-def render_resolution(title, status, observation, action):
-    """Renderează un resolution box"""
-    color = "#d90429" if status in ["CRITICAL", "DANGER"] else "#f59e0b" if status == "WARNING" else "#10b981"
-    
-    st.markdown(f"""
-    <div class="resolution-box">
-        <div class="res-title" style="color:{color};">{title} // {status}</div>
-        <div class="res-body"><b>OBSERVAȚIE:</b> {observation}</div>
-        <div class="res-body" style="margin-top:15px; border-top:1px solid #ddd; padding-top:15px;">
-            <b style="color:#0b0f14;">RECOMANDARE TEHNICĂ:</b><br>{action}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-def get_severity_color(severity):
-    """Returnează culoarea pentru severity"""
-    colors = {
-        'CRITICAL': '#d90429',
-        'WARNING': '#f59e0b',
-        'SAFE': '#10b981',
-        'STABLE': '#10b981',
-        'OK': '#10b981'
-    }
-    return colors.get(severity, '#6c757d')
-
-def render_advanced_charts(df, channels, modes):
-    """Renderează grafice avansate multi-panel"""
-    st.markdown("<h2 class='section-title'>📈 Advanced Multi-Panel Visualization</h2>", unsafe_allow_html=True)
-    
-    # Create subplots
-    fig = make_subplots(
-        rows=4, cols=1,
-        subplot_titles=('Engine RPM & Load', 'Knock Detection', 'Lambda (AFR)', 'Thermal Monitoring'),
-        vertical_spacing=0.08,
-        row_heights=[0.25, 0.25, 0.25, 0.25]
-    )
-    
-    # Panel 1: RPM & Load
-    if 'rpm' in channels:
-        fig.add_trace(
-            go.Scatter(y=df[channels['rpm']], name='RPM', line=dict(color='#0066cc', width=1)),
-            row=1, col=1
-        )
-    
-    if 'load' in channels:
-        fig.add_trace(
-            go.Scatter(y=df[channels['load']], name='Load %', line=dict(color='#00cc66', width=1)),
-            row=1, col=1
-        )
-    
-    # WOT overlay
-    if 'WOT' in modes.columns:
-        wot_indices = modes[modes['WOT']].index
-        if len(wot_indices) > 0:
-            fig.add_trace(
-                go.Scatter(
-                    x=wot_indices,
-                    y=[100] * len(wot_indices),
-                    mode='markers',
-                    marker=dict(color='red', size=3, opacity=0.3),
-                    name='WOT',
-                    showlegend=True
-                ),
-                row=1, col=1
-            )
-    
-    # Panel 2: Knock
-    if 'Knock_Peak' in df.columns:
-        fig.add_trace(
-            go.Scatter(y=df['Knock_Peak'], name='Knock Peak', line=dict(color='#d90429', width=1)),
-            row=2, col=1
-        )
-        fig.add_hline(y=1.2, line_dash="dash", line_color="red", annotation_text="LIMIT (1.2V)", row=2, col=1)
-    
-    # Panel 3: Lambda
-    if 'Lambda_Avg' in df.columns:
-        fig.add_trace(
-            go.Scatter(y=df['Lambda_Avg'], name='Lambda Avg', line=dict(color='#7c3aed', width=1)),
-            row=3, col=1
-        )
-        fig.add_hline(y=0.86, line_dash="dash", line_color="orange", annotation_text="LEAN LIMIT", row=3, col=1)
-        fig.add_hline(y=0.78, line_dash="dash", line_color="blue", annotation_text="RICH LIMIT", row=3, col=1)
-    
-    # Panel 4: Thermal
-    if 'oil_temp' in channels:
-        fig.add_trace(
-            go.Scatter(y=df[channels['oil_temp']], name='Oil Temp', line=dict(color='#f59e0b', width=1)),
-            row=4, col=1
-        )
-    
-    if 'coolant_temp' in channels:
-        fig.add_trace(
-            go.Scatter(y=df[channels['coolant_temp']], name='Coolant', line=dict(color='#06b6d4', width=1)),
-            row=4, col=1
-        )
-    
-    fig.update_layout(
-        height=1200,
-        showlegend=True,
-        template="plotly_white",
-        hovermode='x unified'
-    )
-    
-    fig.update_xaxes(title_text="Sample Index")
-    
-    st.plotly_chart(fig, use_container_width=True)
-
-def render_engineer_mode(df, all_results):
-    """Mod expert cu detalii tehnice complete"""
-    with st.expander("🔧 ENGINEER MODE - Technical Details & Raw Data"):
-        st.markdown("### 📋 Analysis Results (Raw)")
-        st.json(all_results)
-        
-        st.markdown("### 📊 Complete Dataset")
-        st.dataframe(df, use_container_width=True)
-        
-        st.markdown("### 📥 Export Options")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Export processed CSV
-            csv = df.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label="Download Processed CSV",
-                data=csv,
-                file_name="lztuned_processed_log.csv",
-                mime="text/csv"
-            )
-        
-        with col2:
-            # Export JSON report
-            import json
-            report_json = json.dumps(all_results, indent=2)
-            st.download_button(
-                label="Download Analysis Report (JSON)",
-                data=report_json,
-                file_name="lztuned_analysis_report.json",
-                mime="application/json"
-            )
-
-# ======================================================
-# MAIN APPLICATION
-# ======================================================
-def main():
-    """Aplicația principală"""
-    
-    # Header
-    st.markdown('''
-    <div class="header-box">
-        <h1>🏁 LZTUNED ARCHITECT PRO</h1>
-        <p>ADVANCED ECU INTERPRETATION ENGINE // PRODUCTION v1.0</p>
-    </div>
-    ''', unsafe_allow_html=True)
-    
-    # Sidebar
-    with st.sidebar:
-        st.markdown("## ⚙️ Analysis Settings")
-        
-        st.markdown("### 🎯 Detection Thresholds")
-        knock_threshold = st.slider("Knock Limit (V)", 0.5, 2.0, 1.2, 0.1)
-        duty_threshold = st.slider("Injector Duty Limit (%)", 70, 95, 85, 5)
-        lambda_max_wot = st.slider("Lambda Max WOT", 0.75, 0.95, 0.86, 0.01)
-        
-        st.markdown("### 📊 Display Options")
-        show_engineer_mode = st.checkbox("Engineer Mode", value=False)
-        show_anomalies = st.checkbox("Show Anomalies", value=True)
-        show_correlations = st.checkbox("Show Correlations", value=True)
-        
-        st.markdown("---")
-        st.markdown("""
-        **About LZTuned Architect**
-        
-        Professional ECU log interpretation engine designed for:
-        - Motorsport teams
-        - Professional tuners
-        - Advanced enthusiasts
-        
-        Supports: Benzină, E85, Diesel, NA, Turbo, Twin-Turbo, OEM & Standalone ECUs
-        """)
-    
-    # File Upload
-    st.markdown("## 📂 Load ECU Log File")
-    uploaded_file = st.file_uploader(
-        "Upload CSV log (separator: `;` or `,`)",
-        type=['csv'],
-        help="Supported: MegaSquirt, ECUMASTER, Haltech, Link, AEM, OEM logs"
-    )
-    
-    if uploaded_file is not None:
-        
-        # Progress indicator
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        try:
-            # Step 1: Load data
-            status_text.text("📥 Loading data...")
-            progress_bar.progress(10)
-            
-            # Detectare separator
-            sample = uploaded_file.read(1024).decode('utf-8')
-            uploaded_file.seek(0)
-            separator = ';' if ';' in sample else ','
-            
-            df = pd.read_csv(uploaded_file, sep=separator)
-            progress_bar.progress(20)
-            
-            # Step 2: Channel Detection
-            status_text.text("🔍 Detecting channels...")
-            detector = ChannelDetectionEngine(df)
-            detected_channels = detector.detect_channels()
-            detection_report = detector.get_report()
-            progress_bar.progress(35)
-            
-            # Step 3: Operating Modes
-            status_text.text("⚙️ Analyzing operating modes...")
-            mode_engine = OperatingModeEngine(df, detected_channels)
-            modes = mode_engine.detect_modes()
-            mode_summary = mode_engine.get_mode_summary()
-            progress_bar.progress(50)
-            
-            # Step 4: Fuel Analysis
-            status_text.text("⛽ Running fuel analysis...")
-            fuel_engine = FuelAnalysisEngine(df, detected_channels, modes)
-            fuel_results = fuel_engine.analyze()
-            progress_bar.progress(65)
-            
-            # Step 5: Ignition Analysis
-            status_text.text("⚡ Running ignition analysis...")
-            ign_engine = IgnitionAnalysisEngine(df, detected_channels, modes)
-            ign_results = ign_engine.analyze()
-            progress_bar.progress(75)
-            
-            # Step 6: Thermal Analysis
-            status_text.text("🌡️ Running thermal analysis...")
-            thermal_engine = ThermalStressEngine(df, detected_channels)
-            thermal_results = thermal_engine.analyze()
-            progress_bar.progress(85)
-            
-            # Step 7: Electrical Analysis
-            status_text.text("🔌 Checking electrical health...")
-            elec_engine = ElectricalHealthEngine(df, detected_channels)
-            elec_results = elec_engine.analyze()
-            progress_bar.progress(90)
-            
-            # Step 8: Anomalies & Correlations
-            status_text.text("🚨 Detecting anomalies...")
-            anom_engine = AnomalyDetectionEngine(df, detected_channels)
-            anomalies = anom_engine.detect() if show_anomalies else []
-            
-            corr_engine = CorrelationEngine(df, detected_channels)
-            correlations = corr_engine.analyze() if show_correlations else {}
-            progress_bar.progress(95)
-            
-            # Step 9: Risk Assessment
-            status_text.text("🎯 Computing risk score...")
-            all_results = {**fuel_results, **ign_results, **thermal_results, **elec_results}
-            risk_engine = PredictiveRiskEngine(all_results)
-            risk_assessment = risk_engine.assess()
-            progress_bar.progress(100)
-            
-            # Clear progress
-            status_text.empty()
-            progress_bar.empty()
-            
-            # Success message
-            st.success(f"✅ Analysis complete! Processed {len(df)} samples with {detection_report['coverage']:.0f}% channel coverage.")
-            
-            # ============================================
-            # RENDER ALL SECTIONS
-            # ============================================
-            
-            # 1. Detection Report
-            render_detection_report(
-                detection_report, 
-                detected_channels, 
-                detector.missing, 
-                detector.noisy,
-                detector.confidence
-            )
-            
-            # 2. Operating Modes
-            render_operating_modes(mode_summary, modes)
-            
-            # 3. KPI Summary
-            st.markdown("<h2 class='section-title'>🎯 Key Performance Indicators</h2>", unsafe_allow_html=True)
-            kpi_cols = st.columns(5)
-            
-            if 'rpm' in detected_channels:
-                kpi_cols[0].metric("Peak RPM", f"{int(df[detected_channels['rpm']].max())}")
-            
-            if 'Knock_Peak' in df.columns:
-                max_knock = df['Knock_Peak'].max()
-                kpi_cols[1].metric(
-                    "Peak Knock", 
-                    f"{max_knock:.2f}V",
-                    delta="CRITICAL" if max_knock > knock_threshold else "SAFE",
-                    delta_color="inverse"
-                )
-            
-            if 'Inj_Duty' in df.columns:
-                kpi_cols[2].metric("Max Duty", f"{df['Inj_Duty'].max():.1f}%")
-            
-            if 'Lambda_Avg' in df.columns and modes['WOT'].sum() > 0:
-                min_lambda = df[modes['WOT']]['Lambda_Avg'].min()
-                kpi_cols[3].metric("Min Lambda WOT", f"{min_lambda:.2f}")
-            
-            if 'oil_temp' in detected_channels:
-                kpi_cols[4].metric("Max Oil Temp", f"{df[detected_channels['oil_temp']].max():.0f}°C")
-            
-            # 4. Fuel Analysis
-            render_fuel_analysis(fuel_results)
-            
-            # 5. Ignition Analysis
-            render_ignition_analysis(ign_results)
-            
-            # 6. Thermal Analysis
-            render_thermal_analysis(thermal_results)
-            
-            # 7. Electrical Health
-            if elec_results:
-                st.markdown("<h2 class='section-title'>🔌 Electrical System Health</h2>", unsafe_allow_html=True)
-                
-                if 'voltage' in elec_results:
-                    volt = elec_results['voltage']
-                    st.markdown(f"""
-                    <div class="resolution-box">
-                        <div class="res-title" style="color:{get_severity_color(volt['severity'])};">
-                            VOLTAGE STABILITY // {volt['status']}
-                        </div>
-                        <div class="res-body">
-                            Min: {volt['min']}V | Max: {volt['max']}V | StdDev: {volt['std']:.2f}V<br>
-                            {'⚠️ Voltage instability poate cauza misfire-uri și probleme ECU.' if volt['severity'] != 'SAFE' else '✅ Alimentare electrică stabilă.'}
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                if 'sensor_health' in elec_results:
-                    st.markdown("### 🔧 Sensor Health Issues")
-                    for issue in elec_results['sensor_health']['issues']:
-                        st.markdown(f"""
-                        <div class="anomaly-alert">
-                            <b>⚠️ {issue['sensor'].upper()} - {issue['issue']}</b><br>
-                            {issue['description']}
-                        </div>
-                        """, unsafe_allow_html=True)
-            
-            # 8. Risk Assessment
-            render_predictive_risk(risk_assessment)
-            
-            # 9. Anomalies
-            if anomalies:
-                render_anomalies(anomalies)
-            
-            # 10. Correlations
-            if correlations:
-                render_correlations(correlations)
-            
-            # 11. Advanced Charts
-            render_advanced_charts(df, detected_channels, modes)
-            
-            # 12. Engineer Mode
-            if show_engineer_mode:
-                render_engineer_mode(df, all_results)
-            
-            # Footer
-            st.markdown("---")
-            st.markdown("""
-            <div style="text-align:center; color:#6c757d; font-size:12px; padding:20px;">
-                <b>LZTuned Architect Pro v1.0</b> - Professional ECU Interpretation Engine<br>
-                Built for motorsport teams, professional tuners & advanced enthusiasts<br>
-                © 2024 - All analysis recommendations are for reference only. Always verify on dyno or controlled environment.
-            </div>
-            """, unsafe_allow_html=True)
-            
-        except Exception as e:
-            st.error(f"❌ Error processing file: {str(e)}")
-            st.exception(e)
-    
-    else:
-        # Landing state
-        st.info("""
-        ### 🚀 Bine ai venit la LZTuned Architect Pro!
-        
-        Acest tool analizează **orice tip de log ECU** și oferă:
-        
-        ✅ **Channel Detection** automat - recunoaște coloanele indiferent de format  
-        ✅ **Operating Mode Detection** - Idle, Cruise, WOT, Heat Soak, etc.  
-        ✅ **Advanced Fuel Analysis** - Lambda, Duty, Fuel Trim, Linearity  
-        ✅ **Ignition Analysis** - Knock clustering, Timing stability, Root cause  
-        ✅ **Thermal Stress** - Oil, Coolant, EGT cu sustained monitoring  
-        ✅ **Electrical Health** - Voltage stability, Sensor dropout detection  
-        ✅ **Anomaly Detection** - Spike-uri, pattern-uri rare  
-        ✅ **Correlation Engine** - Relații între parametri  
-        ✅ **Predictive Risk** - Score de risc agregat  
-        
-        **Upload un fișier CSV pentru a începe analiza.**
-        """)
-
-if __name__ == "__main__":
-    main()
-
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+import os
+import warnings
+warnings.filterwarnings('ignore')
+
+from lztuned import (ChannelDetectionEngine, DEFAULT_THRESHOLDS, ResultCache, analyze_log, load_full_table,
+                     rescore, threshold_profile)
+from lztuned.accumulators import SegmentStats
+from lztuned.decimate import DECIMATORS, MAX_POINTS, decimate, mask_intervals
+from lztuned.live import LiveSession, open_source
+from lztuned.sources import archive_members
+
+# ====================================================== 
+# CONFIGURATION & STYLING
+# ======================================================
+st.set_page_config(
+    page_title="LZTuned Architect Pro - ECU Interpretation Engine",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+st.markdown("""
+<style>
+@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700&family=Orbitron:wght@700;900&display=swap');
+
+.stApp {
+    background: #ffffff;
+}
+
+html, body, [class*="css"] {
+    font-family: 'Inter', sans-serif;
+    color: #0b0f14;
+}
+
+.header-box {
+    background: linear-gradient(180deg, #ffffff 0%, #f1f3f5 100%);
+    padding: 50px 20px;
+    border-bottom: 1px solid #dee2e6;
+    text-align: center;
+    margin: -60px -4rem 40px;
+}
+
+.header-box h1 {
+    font-family: 'Orbitron', sans-serif;
+    font-size: 42px;
+    font-weight: 900;
+    color: #0b0f14;
+    margin: 0;
+    letter-spacing: -1px;
+}
+
+.header-box p {
+    font-size: 13px;
+    color: #6c757d;
+    letter-spacing: 3px;
+    margin-top: 8px;
+}
+
+.section-title {
+    font-family: 'Orbitron', sans-serif;
+    font-size: 16px;
+    letter-spacing: 2px;
+    margin: 40px 0 20px;
+    padding-left: 12px;
+    border-left: 5px solid #d90429;
+    color: #0b0f14;
+    text-transform: uppercase;
+}
+
+.expert-card {
+    background: #ffffff;
+    border: 1px solid #e9ecef;
+    padding: 20px;
+    border-radius: 14px;
+    min-height: 280px;
+    box-shadow: 0 4px 10px rgba(0,0,0,0.02);
+}
+
+.resolution-box {
+    background: #f8f9fa;
+    border: 1px solid #dee2e6;
+    padding: 25px;
+    border-radius: 16px;
+    margin-bottom: 20px;
+}
+
+.res-title {
+    font-family: 'Orbitron', sans-serif;
+    font-size: 14px;
+    font-weight: 700;
+    margin-bottom: 10px;
+}
+
+.res-body {
+    font-size: 14px;
+    line-height: 1.6;
+    color: #495057;
+}
+
+.confidence-badge {
+    display: inline-block;
+    padding: 4px 12px;
+    border-radius: 12px;
+    font-size: 11px;
+    font-weight: 700;
+    letter-spacing: 1px;
+}
+
+.why-box {
+    background: #fff3cd;
+    border-left: 4px solid #ffc107;
+    padding: 15px;
+    margin-top: 15px;
+    border-radius: 8px;
+}
+
+.detection-box {
+    background: #e7f5ff;
+    border: 1px solid #74c0fc;
+    padding: 20px;
+    border-radius: 12px;
+    margin: 20px 0;
+}
+
+.anomaly-alert {
+    background: #fff5f5;
+    border-left: 4px solid #d90429;
+    padding: 15px;
+    margin: 10px 0;
+    border-radius: 8px;
+}
+</style>
+""", unsafe_allow_html=True)
+
+# ======================================================
+# RESULT CACHE
+# ======================================================
+@st.cache_resource
+def get_result_cache():
+    """Cache-ul de rezultate partajat între sesiuni și rerun-uri"""
+    return ResultCache(max_entries=8, max_bytes=2 * 1024 ** 3)
+
+# ======================================================
+# RENDERING FUNCTIONS
+# ======================================================
+
+def render_detection_report(report, detected, missing, noisy, confidence, timebase=None, channel_stats=None):
+    """Renderează raportul de detectare canale"""
+    st.markdown("<h2 class='section-title'>📡 Channel Detection & Signal Quality</h2>", unsafe_allow_html=True)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Total Channels", report['total_channels'])
+    col2.metric("Detected", f"{report['detected']}/{len(ChannelDetectionEngine.CHANNEL_MAP)}")
+    col3.metric("Coverage", f"{report['coverage']:.0f}%")
+    col4.metric("Noisy Signals", len(noisy))
+    
+    # Detalii detectare
+    st.markdown("""
+    <div class="detection-box">
+        <h4 style="margin-top:0;">🔍 Detection Details</h4>
+    """, unsafe_allow_html=True)
+    
+    if detected:
+        st.markdown("**✅ Detected Channels:**")
+        for std_name, col_name in detected.items():
+            conf = confidence.get(std_name, 0)
+            conf_color = "#10b981" if conf > 80 else "#f59e0b" if conf > 50 else "#d90429"
+            fuzzy = report.get('fuzzy_matches', {}).get(std_name)
+            match = f" <em>(fuzzy match {fuzzy['score']:.2f})</em>" if fuzzy else ""
+            st.markdown(f"- **{std_name}** → `{col_name}`{match} <span class='confidence-badge' style='background:{conf_color}20;color:{conf_color}'>CONFIDENCE: {conf:.0f}%</span>", unsafe_allow_html=True)
+    
+    if missing:
+        st.markdown("**⚠️ Missing Channels:**")
+        for m in missing[:10]:  # Primele 10
+            st.markdown(f"- {m}")
+        if len(missing) > 10:
+            st.markdown(f"*... și încă {len(missing)-10} canale*")
+    
+    if noisy:
+        st.markdown("**🔊 Noisy/Suspect Signals:**")
+        for n in noisy:
+            st.markdown(f"- {n} (flatline detection sau zgomot excesiv)")
+    
+    issues = report.get('header_issues') or {}
+    if issues.get('duplicates'):
+        st.markdown("**🧬 Duplicate Header Columns:**")
+        for group in issues['duplicates']:
+            names = ", ".join(f"`{c}`" for c in group['columns'])
+            used = f" → se folosește `{group['used']}`" if group['used'] else ""
+            st.markdown(f"- {names}{used}")
+    
+    if timebase:
+        st.markdown("**⏱️ Timebase:**")
+        if timebase['source'] == 'column':
+            st.markdown(f"- `{timebase['column']}` ({timebase['unit']}) → {timebase['sample_rate_hz']:.2f} Hz, {timebase['duration_s']:.1f}s")
+            if timebase['gaps'] or timebase['non_monotonic']:
+                st.markdown(f"- ⚠️ {timebase['gaps']} goluri ({timebase['gap_time_s']:.1f}s), {timebase['non_monotonic']} resetări/duplicate de timp")
+        else:
+            st.markdown(f"- ⚠️ Fără coloană de timp: se presupune {timebase['sample_rate_hz']:.0f} Hz")
+    
+    if channel_stats:
+        st.markdown("**📊 Channel Statistics:**")
+        st.dataframe(pd.DataFrame.from_dict(channel_stats, orient='index'), use_container_width=True)
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+    
+    # WHY explainer
+    st.markdown("""
+    <div class="why-box">
+        <b>💡 WHY THIS MATTERS:</b><br>
+        Channel detection este primul pas critic. Fără identificarea corectă a semnalelor, orice analiză ulterioară este inutilă. 
+        Un semnal "noisy" poate indica cablaj defect, împământare proastă sau senzor în curs de defectare.
+    </div>
+    """, unsafe_allow_html=True)
+
+def render_operating_modes(mode_summary, modes_df):
+    """Renderează analiza regimurilor de funcționare"""
+    st.markdown("<h2 class='section-title'>⚙️ Operating Mode Analysis</h2>", unsafe_allow_html=True)
+    
+    cols = st.columns(len(mode_summary))
+    for i, (mode, data) in enumerate(mode_summary.items()):
+        with cols[i]:
+            st.metric(mode.replace('_', ' '), f"{data['percentage']}%", f"{data['count']} samples")
+    
+    # Grafic timeline (lipsește în modul live, unde există doar sumarul)
+    if modes_df is not None:
+        fig = go.Figure()
+        
+        for mode in modes_df.columns:
+            fig.add_trace(go.Scatter(
+                y=modes_df[mode].astype(int),
+                mode='lines',
+                name=mode,
+                line=dict(width=1),
+                stackgroup='one'
+            ))
+        
+        fig.update_layout(
+            title="Operating Modes Timeline",
+            xaxis_title="Sample Index",
+            yaxis_title="Active Mode",
+            template="plotly_white",
+            height=300
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown("""
+    <div class="why-box">
+        <b>💡 WHY THIS MATTERS:</b><br>
+        Problemele apar rar uniform. De exemplu, knock-ul poate apărea DOAR în WOT @ 4500 RPM, nu la Idle. 
+        Separarea pe regimuri îți arată EXACT unde e problema, nu doar "că există".
+    </div>
+    """, unsafe_allow_html=True)
+
+def render_fuel_analysis(fuel_results, thresholds=DEFAULT_THRESHOLDS):
+    """Renderează analiza fuel detaliată"""
+    st.markdown("<h2 class='section-title'>⛽ Advanced Fuel System Analysis</h2>", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    # Lambda Analysis
+    if 'lambda' in fuel_results and fuel_results['lambda']['status'] != 'NO_DATA':
+        lamb = fuel_results['lambda']
+        color = get_severity_color(lamb.get('severity', 'SAFE'))
+        
+        with col1:
+            st.markdown(f"""
+            <div class="expert-card" style="border-top: 5px solid {color};">
+                <div style="color:{color}; font-weight:900; font-size:13px; font-family:Orbitron;">{lamb['status']}</div>
+                <div style="font-size:11px; color:#6c757d;">LAMBDA (AFR) WOT</div>
+                <div style="font-size:38px; font-weight:700; margin:12px 0;">{lamb['mean_wot']:.3f}</div>
+                <div style="font-size:13px; line-height:1.5;">
+                    Min: {lamb['min_wot']:.3f} | StdDev: {lamb['std_wot']:.3f}<br>
+                    <span class='confidence-badge' style='background:#e7f5ff;color:#1971c2;margin-top:8px;'>
+                        CONFIDENCE: {lamb['confidence']}%
+                    </span>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            if lamb['status'] == 'LEAN_DANGER':
+                render_resolution(
+                    "LEAN MIXTURE - CRITICAL ACTION REQUIRED",
+                    "CRITICAL",
+                    f"Lambda WOT medie este {lamb['mean_wot']:.3f}, peste limita de {thresholds['lambda_lean']:.2f}. Acest lucru înseamnă că gazele de evacuare sunt EXTREM de fierbinți, putând cauza:\n- Topirea pistonului\n- Arderea supapelor de evacuare\n- Deteriorarea turbinei\n- Crăparea chiuloasei",
+                    "ACȚIUNE IMEDIATĂ: Crește Fuel Target Map cu 8-12% în zona WOT sau verifică:\n1. Presiunea în rampa de benzină (min 3.5 bar)\n2. Filtru combustibil înfundat\n3. Pompă slabă\n4. Injectoare murdare\n\nTarget optim: 0.80-0.82 lambda pentru protecție termică maximă."
+                )
+    
+    # Duty Analysis
+    if 'duty' in fuel_results and fuel_results['duty']['status'] != 'NO_DATA':
+        duty = fuel_results['duty']
+        color = get_severity_color(duty.get('severity', 'SAFE'))
+        
+        with col2:
+            st.markdown(f"""
+            <div class="expert-card" style="border-top: 5px solid {color};">
+                <div style="color:{color}; font-weight:900; font-size:13px; font-family:Orbitron;">{duty['status']}</div>
+                <div style="font-size:11px; color:#6c757d;">INJECTOR DUTY CYCLE</div>
+                <div style="font-size:38px; font-weight:700; margin:12px 0;">{duty['max_duty']:.1f}%</div>
+                <div style="font-size:13px; line-height:1.5;">
+                    Linearity: {duty['linearity']:.2f}<br>
+                    <span class='confidence-badge' style='background:#e7f5ff;color:#1971c2;margin-top:8px;'>
+                        CONFIDENCE: {duty['confidence']}%
+                    </span>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            if duty['status'] in ['SATURATED', 'NEAR_LIMIT']:
+                render_resolution(
+                    "INJECTOR CAPACITY LIMIT REACHED",
+                    duty['severity'],
+                    f"Duty cycle a atins {duty['max_duty']:.1f}%. Peste {thresholds['duty_warning']:.0f}%, injectoarele nu mai pot menține presiunea necesară, rezultând amestec sărac forțat la turații mari.",
+                    "SOLUȚII:\n1. UPGRADE injectoare (ex: de la 440cc la 550cc+)\n2. Crește presiunea în rampă (+0.5 bar)\n3. Verifică regulator presiune\n4. LIMITEAZĂ boost-ul până la upgrade\n\nDacă linearity < 0.70, injectoarele sunt subdimensionate sau presiunea e inconsistentă."
+                )
+    
+    # Fuel Trim
+    if 'fuel_trim' in fuel_results and fuel_results['fuel_trim']['status'] != 'NO_DATA':
+        trim = fuel_results['fuel_trim']
+        
+        st.markdown(f"""
+        <div class="resolution-box">
+            <div class="res-title" style="color:{get_severity_color(trim['severity'])};">
+                FUEL TRIM ADAPTATION // {trim['status']}
+            </div>
+            <div class="res-body">
+                <b>SHORT TERM:</b> Mean = {trim['stft_mean']:.2f}% | StdDev = {trim['stft_std']:.2f}%<br>
+                {'⚠️ ECU-ul compensează activ diferențe în fueling. Verifică vacuum leaks sau senzor O2.' if abs(trim['stft_mean']) > 10 else '✅ Adaptare minimă, sistemul e calibrat corect.'}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Linearity Issue
+    if 'linearity' in fuel_results:
+        lin = fuel_results['linearity']
+        st.markdown(f"""
+        <div class="anomaly-alert">
+            <b>⚠️ NON-LINEAR FUEL DELIVERY DETECTED</b><br>
+            Correlation Duty ↔ Lambda: {lin['correlation']:.2f}<br>
+            {lin['explanation']}
+        </div>
+        """, unsafe_allow_html=True)
+
+def render_ignition_analysis(ign_results, thresholds=DEFAULT_THRESHOLDS):
+    """Renderează analiza ignition detaliată"""
+    st.markdown("<h2 class='section-title'>⚡ Advanced Ignition System Analysis</h2>", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    # Knock Analysis
+    if 'knock' in ign_results and ign_results['knock']['status'] != 'NO_DATA':
+        knock = ign_results['knock']
+        color = get_severity_color(knock.get('severity', 'SAFE'))
+        
+        with col1:
+            st.markdown(f"""
+            <div class="expert-card" style="border-top: 5px solid {color};">
+                <div style="color:{color}; font-weight:900; font-size:13px; font-family:Orbitron;">{knock['status']}</div>
+                <div style="font-size:11px; color:#6c757d;">KNOCK / DETONATION</div>
+                <div style="font-size:38px; font-weight:700; margin:12px 0;">{knock['max_knock']:.2f}V</div>
+                <div style="font-size:13px; line-height:1.5;">
+                    Mean: {knock['mean_knock']:.2f}V | Events: {knock['events']}<br>
+                    Event %: {knock['event_pct']:.1f}% | Bursts: {knock['bursts']}<br>
+                    <span class='confidence-badge' style='background:#e7f5ff;color:#1971c2;margin-top:8px;'>
+                        CONFIDENCE: {knock['confidence']}%
+                    </span>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            if knock['status'] in ['SEVERE_DETONATION', 'SUSTAINED_KNOCK']:
+                render_resolution(
+                    "DETONATION DETECTED - IMMEDIATE ACTION",
+                    "CRITICAL",
+                    f"Peak knock: {knock['max_knock']:.2f}V (Limită: {thresholds['knock_event']:.1f}V). {knock['events']} evenimente detectate ({knock['event_pct']:.1f}% din log).\n\nDetonația înseamnă că amestecul se aprinde ÎNAINTE de scânteie din cauza:\n- Avans prea mare\n- Temperatura prea mare în cameră\n- Cifră octanică insuficientă\n- Puncte fierbinți (carbon deposits)",
+                    "ACȚIUNE IMEDIATĂ:\n1. RETARD ignition cu 3-4 grade în zona Load/RPM unde apare\n2. Verifică bujiile (heat range prea cald?)\n3. Testează cu combustibil mai bun (98+ RON)\n4. Verifică temperatura IAT (dacă > 50°C, intercooler insuficient)\n5. Dacă persistă: cleaning injectoare + decarbonizare\n\nNU ignora knock-ul - poate distruge motorul în secunde."
+                )
+            elif knock['status'] == 'SPORADIC_KNOCK':
+                st.markdown("""
+                <div class="resolution-box">
+                    <div class="res-title" style="color:#f59e0b;">SPORADIC KNOCK EVENTS // WARNING</div>
+                    <div class="res-body">
+                        <b>OBSERVAȚIE:</b> Knock sporadic (sub 5% din timp) poate fi normal sau cauzat de zgomot extern.<br><br>
+                        <b>RECOMANDARE:</b> Monitorizează în continuare. Dacă crește frecvența, aplică retard preventiv de 1-2 grade.
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+    
+    # Timing Stability
+    if 'timing_stability' in ign_results:
+        timing = ign_results['timing_stability']
+        color = get_severity_color(timing['severity'])
+        
+        with col2:
+            st.markdown(f"""
+            <div class="expert-card" style="border-top: 5px solid {color};">
+                <div style="color:{color}; font-weight:900; font-size:13px; font-family:Orbitron;">{timing['status']}</div>
+                <div style="font-size:11px; color:#6c757d;">TIMING STABILITY</div>
+                <div style="font-size:38px; font-weight:700; margin:12px 0;">{timing['std']:.1f}°</div>
+                <div style="font-size:13px; line-height:1.5;">
+                    Standard Deviation WOT<br>
+                    <span class='confidence-badge' style='background:#e7f5ff;color:#1971c2;margin-top:8px;'>
+                        CONFIDENCE: {timing['confidence']}%
+                    </span>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # Knock Cause Analysis
+    if 'knock_cause' in ign_results:
+        cause = ign_results['knock_cause']
+        st.markdown(f"""
+        <div class="why-box">
+            <b>🔍 KNOCK ROOT CAUSE ANALYSIS:</b><br>
+            Type: <b>{cause['type']}</b><br>
+            {cause['explanation']}
+        </div>
+        """, unsafe_allow_html=True)
+
+def render_thermal_analysis(thermal_results):
+    """Renderează analiza termică"""
+    st.markdown("<h2 class='section-title'>🌡️ Thermal & Mechanical Stress Analysis</h2>", unsafe_allow_html=True)
+    
+    cols = st.columns(3)
+    
+    # Oil
+    if 'oil' in thermal_results and thermal_results['oil']['status'] != 'NO_DATA':
+        oil = thermal_results['oil']
+        color = get_severity_color(oil['severity'])
+        
+        with cols[0]:
+            st.markdown(f"""
+            <div class="expert-card" style="border-top: 5px solid {color};">
+                <div style="color:{color}; font-weight:900; font-size:13px; font-family:Orbitron;">{oil['status']}</div>
+                <div style="font-size:11px; color:#6c757d;">OIL TEMPERATURE</div>
+                <div style="font-size:38px; font-weight:700; margin:12px 0;">{oil['max']:.0f}°C</div>
+                <div style="font-size:13px; line-height:1.5;">
+                    Sustained High: {oil['sustained_high_min']:.1f} min
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            if oil['severity'] != 'SAFE':
+                st.markdown(f"""
+                <div class="resolution-box">
+                    <div class="res-title" style="color:{color};">OIL THERMAL STRESS</div>
+                    <div class="res-body">
+                        Peste 115°C, uleiul își pierde viscozitatea și capacitatea de lubrifiere. 
+                        {oil['sustained_high_min']:.1f} minute la temperatură mare accelerează degradarea.<br><br>
+                        <b>SOLUȚIE:</b> Oil cooler, ventilație îmbunătățită sau verifică termostat blocat.
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+    
+    # Coolant
+    if 'coolant' in thermal_results:
+        coolant = thermal_results['coolant']
+        color = get_severity_color(coolant['severity'])
+        
+        with cols[1]:
+            st.markdown(f"""
+            <div class="expert-card" style="border-top: 5px solid {color};">
+                <div style="color:{color}; font-weight:900; font-size:13px; font-family:Orbitron;">{coolant['status']}</div>
+                <div style="font-size:11px; color:#6c757d;">COOLANT TEMPERATURE</div>
+                <div style="font-size:38px; font-weight:700; margin:12px 0;">{coolant['max']:.0f}°C</div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # EGT
+    if 'egt' in thermal_results:
+        egt = thermal_results['egt']
+        color = get_severity_color(egt['severity'])
+        
+        with cols[2]:
+            st.markdown(f"""
+            <div class="expert-card" style="border-top: 5px solid {color};">
+                <div style="color:{color}; font-weight:900; font-size:13px; font-family:Orbitron;">{egt['status']}</div>
+                <div style="font-size:11px; color:#6c757d;">EXHAUST GAS TEMP</div>
+                <div style="font-size:38px; font-weight:700; margin:12px 0;">{egt['max']:.0f}°C</div>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            if egt['severity'] == 'CRITICAL':
+                st.markdown("""
+                <div class="anomaly-alert">
+                    <b>⚠️ EGT CRITICAL - TURBO AT RISK</b><br>
+                    EGT peste 950°C poate deteriora paletele turbinei. Cauze: amestec prea sărac, boost excesiv, timing prea avansat.
+                </div>
+                """, unsafe_allow_html=True)
+    
+    # Thermal Shock
+    if 'thermal_shock' in thermal_results:
+        shock = thermal_results['thermal_shock']
+        st.markdown(f"""
+        <div class="anomaly-alert">
+            <b>⚠️ RAPID THERMAL CHANGE</b><br>
+            Max rate: {shock['max_rate']:.2f}°C/sec<br>
+            {shock['explanation']}
+        </div>
+        """, unsafe_allow_html=True)
+
+def render_electrical_health(elec_results):
+    """Renderează sănătatea sistemului electric"""
+    if not elec_results:
+        return
+    
+    st.markdown("<h2 class='section-title'>🔌 Electrical System Health</h2>", unsafe_allow_html=True)
+    
+    if 'voltage' in elec_results:
+        volt = elec_results['voltage']
+        st.markdown(f"""
+        <div class="resolution-box">
+            <div class="res-title" style="color:{get_severity_color(volt['severity'])};">
+                VOLTAGE STABILITY // {volt['status']}
+            </div>
+            <div class="res-body">
+                Min: {volt['min']}V | Max: {volt['max']}V | StdDev: {volt['std']:.2f}V<br>
+                {'⚠️ Voltage instability poate cauza misfire-uri și probleme ECU.' if volt['severity'] != 'SAFE' else '✅ Alimentare electrică stabilă.'}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    if 'sensor_health' in elec_results:
+        st.markdown("### 🔧 Sensor Health Issues")
+        for issue in elec_results['sensor_health']['issues']:
+            st.markdown(f"""
+            <div class="anomaly-alert">
+                <b>⚠️ {issue['sensor'].upper()} - {issue['issue']}</b><br>
+                {issue['description']}
+            </div>
+            """, unsafe_allow_html=True)
+
+def render_predictive_risk(risk_data):
+    """Renderează analiza de risc predictivă"""
+    st.markdown("<h2 class='section-title'>🎯 Predictive Risk Assessment</h2>", unsafe_allow_html=True)
+    
+    risk_score = risk_data['risk_score']
+    risk_level = risk_data['risk_level']
+    
+    # Risk gauge
+    if risk_level == 'CRITICAL':
+        color = "#d90429"
+    elif risk_level == 'HIGH':
+        color = "#f59e0b"
+    elif risk_level == 'MEDIUM':
+        color = "#ffc107"
+    else:
+        color = "#10b981"
+    
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=risk_score,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': f"RISK LEVEL: {risk_level}", 'font': {'size': 24, 'family': 'Orbitron'}},
+        gauge={
+            'axis': {'range': [0, 100]},
+            'bar': {'color': color},
+            'steps': [
+                {'range': [0, 20], 'color': "#e7f5ff"},
+                {'range': [20, 40], 'color': "#fff9db"},
+                {'range': [40, 70], 'color': "#ffe8cc"},
+                {'range': [70, 100], 'color': "#ffe0e0"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 70
+            }
+        }
+    ))
+    
+    fig.update_layout(height=350, template="plotly_white")
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Risk Factors
+    if risk_data['factors']:
+        st.markdown("### 🔴 Identified Risk Factors")
+        for factor in risk_data['factors']:
+            impact_color = "#d90429" if factor['impact'] == 'HIGH' else "#f59e0b"
+            st.markdown(f"""
+            <div class="resolution-box">
+                <div class="res-title" style="color:{impact_color};">
+                    {factor['factor']} // IMPACT: {factor['impact']}
+                </div>
+                <div class="res-body">
+                    <b>CONSEQUENCE:</b> {factor['consequence']}
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    st.markdown("""
+    <div class="why-box">
+        <b>💡 WHY THIS MATTERS:</b><br>
+        Risk score-ul agregă TOATE problemele detectate și calculează probabilitatea de deteriorare. 
+        Un score peste 70 înseamnă că motorul operează în condiții periculoase și necesită intervenție IMEDIATĂ.
+    </div>
+    """, unsafe_allow_html=True)
+
+def _on_anomaly_select():
+    """Rândul selectat din tabelul de anomalii → zoom pe grafic în jurul evenimentului"""
+    event = st.session_state.get('anomaly_events')
+    rows = event.selection.get('rows', []) if event else []
+    table = st.session_state.get('anomaly_table')
+    if not rows or table is None:
+        return
+    start, end = int(table['start'].iat[rows[0]]), int(table['end'].iat[rows[0]])
+    pad = max(50, (end - start) * 5)
+    last = st.session_state.get('chart_rows', end) - 1
+    st.session_state['chart_range'] = (max(0, start - pad), min(last, end + pad))
+
+def render_anomalies(anomalies, table=None):
+    """Renderează anomaliile detectate"""
+    if not anomalies:
+        return
+    
+    st.markdown("<h2 class='section-title'>🚨 Anomaly Detection Report</h2>", unsafe_allow_html=True)
+    
+    for anom in anomalies:
+        color = "#d90429" if anom['severity'] == 'CRITICAL' else "#f59e0b"
+        
+        st.markdown(f"""
+        <div class="anomaly-alert">
+            <b style="color:{color};">{anom['type']} - {anom['sensor'].upper()}</b><br>
+            Count: {anom['count']}
+            {f"| Events: {anom['events']}" if 'events' in anom else ""}
+            {f"| Max Deviation: {anom['max_deviation']} σ" if 'max_deviation' in anom else ""}
+            {f"<br><i>{anom['explanation']}</i>" if 'explanation' in anom else ""}
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Tabelul complet de evenimente; selectarea unui rând face zoom pe grafic
+    if table is not None and len(table) > 0:
+        st.session_state['anomaly_table'] = table
+        st.markdown(f"**📍 All anomaly events ({len(table):,})** — select a row to jump to it in the charts")
+        st.dataframe(
+            table, use_container_width=True, height=300, hide_index=True,
+            key='anomaly_events', on_select=_on_anomaly_select, selection_mode='single-row'
+        )
+
+def render_correlations(correlations, matrix=None, lags=None):
+    """Renderează analiza de corelații: perechile, decalajele și matricea tuturor canalelor"""
+    if not correlations and not matrix and not lags:
+        return
+    
+    st.markdown("<h2 class='section-title'>📊 Parameter Correlation Analysis</h2>", unsafe_allow_html=True)
+    
+    for name, data in correlations.items():
+        st.markdown(f"""
+        <div class="resolution-box">
+            <div class="res-title">{name.upper().replace('_', ' ↔ ')}</div>
+            <div class="res-body">
+                <b>Correlation:</b> {data['value']:.3f}<br>
+                <b>Interpretation:</b> {data['interpretation']}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    if lags:
+        st.markdown("### ⏱️ Lagged Cross-Correlation")
+        st.dataframe(pd.DataFrame([
+            {'Cause': data['x'], 'Effect': data['y'], 'Expected sign': '+' if data['expected_sign'] > 0 else
+             ('−' if data['expected_sign'] < 0 else 'any'), 'Lag (s)': data['lag_s'], 'Peak r': data['corr'],
+             'r at lag 0': data['zero_lag_corr'], 'Resolution (s)': data['resolution_s'],
+             'Interpretation': data['interpretation']}
+            for data in lags.values()
+        ]), use_container_width=True, hide_index=True)
+    
+    if matrix:
+        fig = go.Figure(go.Heatmap(
+            z=matrix['corr'],
+            x=matrix['channels'],
+            y=matrix['channels'],
+            zmin=-1,
+            zmax=1,
+            colorscale='RdBu_r',
+            texttemplate="%{z:.2f}",
+            hoverongaps=False,
+            colorbar=dict(title="r"),
+        ))
+        fig.update_layout(
+            title="Channel Correlation Matrix",
+            template="plotly_white",
+            height=max(420, 28 * len(matrix['channels'])),
+            yaxis_autorange='reversed'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown("""
+    <div class="why-box">
+        <b>💡 WHY THIS MATTERS:</b><br>
+        Cauza și efectul sunt decalate: lambda răspunde la injecție după întârzierea de transport, uleiul
+        se încălzește la zeci de secunde după sarcină. Corelația la decalaj 0 subestimează legătura; vârful
+        corelației încrucișate arată cât de puternică e și după cât timp apare.
+    </div>
+    """, unsafe_allow_html=True)
+
+# Statisticile afișabile pe o hartă RPM × Load: cheie → (etichetă, scală de culori)
+CELL_MAP_STATS = {
+    'mean': ("Mean", 'RdYlGn_r'),
+    'p95': ("P95", 'RdYlGn_r'),
+    'min': ("Min", 'RdYlGn_r'),
+    'max': ("Max", 'RdYlGn_r'),
+    'count': ("Samples", 'Blues'),
+    'events': ("Knock events", 'Reds'),
+    'time_s': ("Time in cell (s)", 'Blues'),
+}
+
+def render_cell_maps(cell_maps):
+    """Renderează hărțile RPM × Load ca heatmap-uri, în stilul tabelelor din ECU"""
+    if not cell_maps or not cell_maps.get('maps'):
+        return
+    
+    st.markdown("<h2 class='section-title'>🗺️ RPM × Load Maps</h2>", unsafe_allow_html=True)
+    
+    maps = cell_maps['maps']
+    map_col, stat_col = st.columns(2)
+    with map_col:
+        name = st.selectbox("Map", list(maps), format_func=lambda key: maps[key]['label'], key='cell_map')
+    cell_map = maps[name]
+    available = [key for key in CELL_MAP_STATS if key in cell_map or key == 'time_s']
+    with stat_col:
+        stat = st.selectbox("Statistic", available, format_func=lambda key: CELL_MAP_STATS[key][0],
+                            key='cell_map_stat')
+    
+    values = np.asarray(cell_maps['time_s'] if stat == 'time_s' else cell_map[stat], dtype=float)
+    if stat in ('count', 'events', 'time_s'):
+        # Celulele nevizitate rămân goale, ca cele fără date din hărțile de medii
+        values = np.where(np.asarray(cell_maps['samples']) > 0, values, np.nan)
+    
+    fig = go.Figure(go.Heatmap(
+        z=values,
+        x=[str(v) for v in cell_maps['rpm_axis']],
+        y=[str(v) for v in cell_maps['load_axis']],
+        colorscale=CELL_MAP_STATS[stat][1],
+        texttemplate="%{z:.3~g}",
+        hoverongaps=False,
+        colorbar=dict(title=CELL_MAP_STATS[stat][0]),
+    ))
+    fig.update_layout(
+        title=f"{cell_map['label']} — {CELL_MAP_STATS[stat][0]}",
+        xaxis_title="RPM",
+        yaxis_title="Load",
+        template="plotly_white",
+        height=520
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown("""
+    <div class="why-box">
+        <b>💡 WHY THIS MATTERS:</b><br>
+        Tabelele din ECU sunt pe celule RPM × Load. O valoare globală (ex. lambda medie în WOT)
+        ascunde celula în care amestecul sărăcește sau apare knock-ul; harta arată exact ce celulă trebuie corectată.
+    </div>
+    """, unsafe_allow_html=True)
+
+def render_wot_pulls(pulls):
+    """Tabel per tracțiune WOT: durată, RPM, lambda, duty, knock, heat soak"""
+    if not pulls or not pulls.get('pulls'):
+        return
+    
+    st.markdown("<h2 class='section-title'>🏁 WOT Pulls</h2>", unsafe_allow_html=True)
+    
+    kpi_cols = st.columns(3)
+    kpi_cols[0].metric("Pulls", pulls['events'])
+    kpi_cols[1].metric("Time at WOT", f"{pulls['duration_s']:.1f}s")
+    kpi_cols[2].metric("Flagged pulls", pulls['flagged'])
+    
+    table = pd.DataFrame(pulls['pulls'])
+    table['flags'] = table['flags'].map(lambda flags: ', '.join(flags) or '✅')
+    st.dataframe(
+        table[['pull', 't_start_s', 'duration_s', 'rpm_start', 'rpm_end', 'lambda_min', 'lambda_mean',
+               'lambda_max', 'duty_max', 'knock_max', 'knock_events', 'heat_soak_s', 'flags']],
+        use_container_width=True, hide_index=True,
+        column_config={
+            'pull': st.column_config.NumberColumn("#"),
+            't_start_s': st.column_config.NumberColumn("Start (s)", format="%.1f"),
+            'duration_s': st.column_config.NumberColumn("Duration (s)", format="%.2f"),
+            'rpm_start': st.column_config.NumberColumn("RPM start", format="%d"),
+            'rpm_end': st.column_config.NumberColumn("RPM end", format="%d"),
+            'lambda_min': st.column_config.NumberColumn("λ min", format="%.3f"),
+            'lambda_mean': st.column_config.NumberColumn("λ mean", format="%.3f"),
+            'lambda_max': st.column_config.NumberColumn("λ max", format="%.3f"),
+            'duty_max': st.column_config.NumberColumn("Max duty %", format="%.1f"),
+            'knock_max': st.column_config.NumberColumn("Max knock", format="%.2f"),
+            'knock_events': st.column_config.NumberColumn("Knock events"),
+            'heat_soak_s': st.column_config.NumberColumn("Heat soak (s)", format="%.1f"),
+            'flags': st.column_config.TextColumn("Flags"),
+        }
+    )
+    
+    st.markdown("""
+    <div class="why-box">
+        <b>💡 WHY THIS MATTERS:</b><br>
+        Media pe tot WOT-ul amestecă tracțiunile între ele. Per tracțiune se vede dacă amestecul sărăcește doar
+        în a treia tracțiune la rând, după heat soak, sau dacă knock-ul apare numai la capătul de turație.
+    </div>
+    """, unsafe_allow_html=True)
+
+def render_resolution(title, status, observation, action):
+    """Renderează un resolution box"""
+    color = "#d90429" if status in ["CRITICAL", "DANGER"] else "#f59e0b" if status == "WARNING" else "#10b981"
+    
+    st.markdown(f"""
+    <div class="resolution-box">
+        <div class="res-title" style="color:{color};">{title} // {status}</div>
+        <div class="res-body"><b>OBSERVAȚIE:</b> {observation}</div>
+        <div class="res-body" style="margin-top:15px; border-top:1px solid #ddd; padding-top:15px;">
+            <b style="color:#0b0f14;">RECOMANDARE TEHNICĂ:</b><br>{action}
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+def get_severity_color(severity):
+    """Returnează culoarea pentru severity"""
+    colors = {
+        'CRITICAL': '#d90429',
+        'WARNING': '#f59e0b',
+        'SAFE': '#10b981',
+        'STABLE': '#10b981',
+        'OK': '#10b981'
+    }
+    return colors.get(severity, '#6c757d')
+
+def _on_chart_select():
+    """Box select pe grafic → zoom: fereastra selectată e re-decimată la rezoluție mai mare"""
+    event = st.session_state.get('advanced_chart')
+    boxes = event.selection.get('box', []) if event else []
+    if boxes and boxes[0].get('x'):
+        x0, x1 = sorted(boxes[0]['x'])
+        last = st.session_state['chart_rows'] - 1
+        st.session_state['chart_range'] = (max(0, int(x0)), min(last, int(np.ceil(x1))))
+
+def render_window_verdicts(window):
+    """Statisticile și verdictele ferestrei selectate (WindowIndex.verdicts)"""
+    st.markdown(f"### 🔎 Selected Window — samples {window['start']:,}–{window['end'] - 1:,}")
+    cols = st.columns(5)
+    cols[0].metric("Duration", f"{window['duration_s']:.1f}s", f"{window['rows']:,} samples", delta_color="off")
+    cols[1].metric("WOT", f"{window['wot_s']:.1f}s", f"{window['wot_rows']:,} samples", delta_color="off")
+    
+    knock = window['ignition'].get('knock', {})
+    if 'max_knock' in knock:
+        cols[2].metric("Peak Knock", f"{knock['max_knock']:.2f}V",
+                       f"{knock['events']} events / {knock['bursts']} bursts", delta_color="off")
+    
+    lamb = window['fuel'].get('lambda', {})
+    if 'mean_wot' in lamb:
+        cols[3].metric("Lambda WOT", f"{lamb['mean_wot']:.3f}", f"min {lamb['min_wot']:.3f}", delta_color="off")
+    
+    risk = window['risk']
+    cols[4].metric("Risk", f"{risk['risk_score']}/100", risk['risk_level'], delta_color="off")
+    
+    verdicts = [
+        {'check': f"{section} / {name}", 'status': result['status'], 'severity': result['severity']}
+        for section in ('fuel', 'ignition', 'thermal')
+        for name, result in window[section].items() if 'severity' in result
+    ]
+    if verdicts:
+        st.dataframe(pd.DataFrame(verdicts), use_container_width=True, hide_index=True)
+
+def render_advanced_charts(df, channels, modes, signals=None, thresholds=DEFAULT_THRESHOLDS, windows=None,
+                           electrical=None):
+    """Renderează grafice avansate multi-panel (WebGL, decimate pe fereastra vizibilă)
+
+    Cu `windows` (results['windows']), sub grafic apar statisticile și
+    verdictele doar pentru fereastra selectată, din indexul de sume prefix.
+    """
+    st.markdown("<h2 class='section-title'>📈 Advanced Multi-Panel Visualization</h2>", unsafe_allow_html=True)
+    
+    # Fereastra vizibilă: slider sau box select pe grafic; se resetează la un log nou
+    n = len(df)
+    if st.session_state.get('chart_rows') != n:
+        st.session_state['chart_rows'] = n
+        st.session_state['chart_range'] = (0, max(n - 1, 0))
+    
+    zoom_col, method_col = st.columns([4, 1])
+    with zoom_col:
+        start, stop = st.slider("Zoom (sample range)", 0, max(n - 1, 1), key='chart_range')
+    with method_col:
+        method = st.selectbox("Decimation", list(DECIMATORS), key='chart_decimation')
+    stop += 1
+    
+    def trace(values, name, color, row):
+        x, y = decimate(values, start, stop, MAX_POINTS, method)
+        fig.add_trace(
+            go.Scattergl(x=x, y=y, name=name, line=dict(color=color, width=1)),
+            row=row, col=1
+        )
+    
+    # Create subplots
+    fig = make_subplots(
+        rows=4, cols=1,
+        subplot_titles=('Engine RPM & Load', 'Knock Detection', 'Lambda (AFR)', 'Thermal Monitoring'),
+        vertical_spacing=0.08,
+        row_heights=[0.25, 0.25, 0.25, 0.25],
+        shared_xaxes=True
+    )
+    
+    # Panel 1: RPM & Load
+    if 'rpm' in channels:
+        trace(df[channels['rpm']], 'RPM', '#0066cc', 1)
+    
+    if 'load' in channels:
+        trace(df[channels['load']], 'Load %', '#00cc66', 1)
+    
+    # WOT overlay: intervale umbrite (unite sub rezoluția graficului), nu un marker per eșantion
+    if modes is not None and 'WOT' in modes.columns:
+        starts, ends = mask_intervals(modes['WOT'].to_numpy(), start, stop, min_gap=(stop - start) // MAX_POINTS)
+        if len(starts) > 0:
+            fig.update_layout(shapes=[
+                dict(type='rect', xref='x', yref='y domain', x0=s0, x1=s1 - 1, y0=0, y1=1,
+                     fillcolor='red', opacity=0.12, line_width=0, layer='below')
+                for s0, s1 in zip(starts.tolist(), ends.tolist())
+            ])
+            fig.add_trace(
+                go.Scattergl(x=[None], y=[None], mode='markers', name='WOT',
+                             marker=dict(color='red', size=10, symbol='square', opacity=0.3)),
+                row=1, col=1
+            )
+    
+    # Panel 2: Knock (semnalele derivate se calculează la primul acces)
+    if signals is not None and 'Knock_Peak' in signals:
+        trace(signals['Knock_Peak'], 'Knock Peak', '#d90429', 2)
+        fig.add_hline(y=thresholds['knock_event'], line_dash="dash", line_color="red",
+                      annotation_text=f"LIMIT ({thresholds['knock_event']:.1f}V)", row=2, col=1)
+    
+    # Panel 3: Lambda
+    if signals is not None and 'Lambda_Avg' in signals:
+        trace(signals['Lambda_Avg'], 'Lambda Avg', '#7c3aed', 3)
+        fig.add_hline(y=thresholds['lambda_lean'], line_dash="dash", line_color="orange", annotation_text="LEAN LIMIT", row=3, col=1)
+        fig.add_hline(y=thresholds['lambda_rich'], line_dash="dash", line_color="blue", annotation_text="RICH LIMIT", row=3, col=1)
+    
+    # Panel 4: Thermal
+    if 'oil_temp' in channels:
+        trace(df[channels['oil_temp']], 'Oil Temp', '#f59e0b', 4)
+    
+    if 'coolant_temp' in channels:
+        trace(df[channels['coolant_temp']], 'Coolant', '#06b6d4', 4)
+    
+    fig.update_layout(
+        height=1200,
+        showlegend=True,
+        template="plotly_white",
+        hovermode='x unified',
+        dragmode='select',
+        selectdirection='h'
+    )
+    
+    fig.update_xaxes(title_text="Sample Index", row=4, col=1)
+    
+    st.plotly_chart(
+        fig, use_container_width=True, key='advanced_chart',
+        on_select=_on_chart_select, selection_mode='box'
+    )
+    st.caption(f"Showing samples {start:,}–{stop - 1:,} ({method}, max {MAX_POINTS} points/trace). "
+               "Drag a box on the chart to zoom in; widen the slider to zoom out.")
+    
+    # Verdictele ferestrei: doar când graficul nu arată tot logul (altfel sunt cele de mai sus)
+    if windows is not None and stop - start < n:
+        render_window_verdicts(windows.verdicts(start, min(stop, n), thresholds, electrical))
+
+def render_archive_batch(members, options, thresholds):
+    """Arhivă zip cu mai multe loguri: rezumatul batch și logul ales pentru analiza detaliată"""
+    st.markdown(f"## 🗂️ Archive Batch ({len(members)} logs)")
+    progress_bar = st.progress(0)
+    rows = []
+    for i, member in enumerate(members):
+        try:
+            results = rescore(analyze_log(member, options, cache=get_result_cache()), thresholds)
+            risk = results['risk']
+            rows.append({'Log': member.name, 'Samples': results['rows'],
+                         'Risk Score': risk['risk_score'], 'Risk Level': risk['risk_level']})
+        except Exception as e:
+            rows.append({'Log': member.name, 'Samples': None, 'Risk Score': None, 'Risk Level': f"❌ {e}"})
+        progress_bar.progress(int(100 * (i + 1) / len(members)))
+    progress_bar.empty()
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    
+    names = [member.name for member in members]
+    selected = st.selectbox("🔍 Log for detailed analysis", names)
+    return members[names.index(selected)]
+
+def render_stage_profile(profile):
+    """Tabel flame-style: fiecare etapă indentată sub părintele ei, cu ponderea din timpul total"""
+    table = pd.DataFrame(profile)
+    table['stage'] = ['\u2003' * depth + ('└ ' if depth else '') + name
+                      for depth, name in zip(table['depth'], table['name'])]
+    table['rows'] = table['rows'].astype('Int64')
+    table['rows_per_s'] = table['rows_per_s'].astype('Int64')
+    st.dataframe(
+        table[['stage', 'share_pct', 'wall_s', 'cpu_s', 'rss_peak_delta_mb', 'rows', 'rows_per_s', 'calls']],
+        use_container_width=True, hide_index=True,
+        column_config={
+            'stage': st.column_config.TextColumn("Stage"),
+            'share_pct': st.column_config.ProgressColumn("Share of total", format="%.1f%%",
+                                                         min_value=0, max_value=100),
+            'wall_s': st.column_config.NumberColumn("Wall (s)", format="%.4f"),
+            'cpu_s': st.column_config.NumberColumn("CPU (s)", format="%.4f"),
+            'rss_peak_delta_mb': st.column_config.NumberColumn("Peak RSS Δ (MB)", format="%.1f"),
+            'rows': st.column_config.NumberColumn("Rows"),
+            'rows_per_s': st.column_config.NumberColumn("Rows/s"),
+            'calls': st.column_config.NumberColumn("Calls"),
+        }
+    )
+    st.caption("CPU time is process-wide, so engines running in parallel share it. "
+               "Peak RSS Δ is how much a stage raised the process high-water mark.")
+
+def render_engineer_mode(df, all_results, signals=None, profile=None, memory=None):
+    """Mod expert cu detalii tehnice complete
+
+    Tabelul și exportul CSV conțin datele brute; semnalele derivate se
+    adaugă doar dacă sunt cerute explicit. `profile` (results['profile'])
+    este afișat ca tabel per etapă și inclus în raportul JSON; `memory`
+    (results['memory']) arată cât ocupă logul compact în memorie.
+    """
+    with st.expander("🔧 ENGINEER MODE - Technical Details & Raw Data"):
+        st.markdown("### 📋 Analysis Results (Raw)")
+        st.json(all_results)
+        
+        if profile:
+            st.markdown("### ⏱️ Stage Profile")
+            render_stage_profile(profile)
+        
+        if memory:
+            st.markdown("### 🧮 In-Memory Log")
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Compact", f"{memory['compact_mb']:.1f} MB")
+            col2.metric("As float64", f"{memory['float64_mb']:.1f} MB")
+            col3.metric("Ratio", f"{memory['ratio']:.0%}")
+            st.dataframe(pd.Series(memory['encodings'], name='encoding'), use_container_width=True)
+        
+        st.markdown("### 📊 Complete Dataset")
+        st.dataframe(df, use_container_width=True)
+        
+        st.markdown("### 📥 Export Options")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Export processed CSV
+            if signals is not None and len(signals.frame) == len(df) and \
+                    st.checkbox("Include derived signals (" + ", ".join(signals.available()) + ")"):
+                df = signals.with_signals(df)
+            csv = df.to_csv(index=False).encode('utf-8')
+            st.download_button(
+                label="Download Processed CSV",
+                data=csv,
+                file_name="lztuned_processed_log.csv",
+                mime="text/csv"
+            )
+        
+        with col2:
+            # Export JSON report
+            import json
+            report = all_results if not profile else {**all_results, 'profile': profile}
+            report_json = json.dumps(report, indent=2)
+            st.download_button(
+                label="Download Analysis Report (JSON)",
+                data=report_json,
+                file_name="lztuned_analysis_report.json",
+                mime="application/json"
+            )
+
+# ======================================================
+# LIVE TELEMETRY
+# ======================================================
+LIVE_REFRESH_S = 0.25
+
+def get_live_session(spec):
+    """O singură sesiune live per sursă, păstrată între rerulări"""
+    session = st.session_state.get('live_session')
+    if session is None or st.session_state.get('live_spec') != spec:
+        if session is not None:
+            session.close()
+        session = LiveSession(open_source(spec))
+        st.session_state['live_session'] = session
+        st.session_state['live_spec'] = spec
+    return session
+
+def render_live_kpis(results, thresholds):
+    """KPI-urile live, din verdictele incrementale"""
+    kpi_cols = st.columns(5)
+    if results['kpi']['peak_rpm'] is not None:
+        kpi_cols[0].metric("Peak RPM", f"{int(results['kpi']['peak_rpm'])}")
+    
+    knock = results['ignition'].get('knock', {})
+    if 'max_knock' in knock:
+        kpi_cols[1].metric(
+            "Peak Knock",
+            f"{knock['max_knock']:.2f}V",
+            delta="CRITICAL" if knock['max_knock'] > thresholds['knock_event'] else "SAFE",
+            delta_color="inverse"
+        )
+    
+    duty = results['fuel'].get('duty', {})
+    if 'max_duty' in duty:
+        kpi_cols[2].metric("Max Duty", f"{duty['max_duty']:.1f}%")
+    
+    lam = results['fuel'].get('lambda', {})
+    if lam.get('min_wot') is not None:
+        kpi_cols[3].metric("Min Lambda WOT", f"{lam['min_wot']:.2f}")
+    
+    oil = results['thermal'].get('oil', {})
+    if oil.get('max') is not None:
+        kpi_cols[4].metric("Max Oil Temp", f"{oil['max']:.0f}°C", f"{oil['sustained_high_min']} min > 110°C")
+
+def render_live_chart(frame, channels):
+    """Ultimele eșantioane din ring buffer, decimate, cu WOT umbrit"""
+    panels = [(channels.get('rpm'), 'RPM', '#0066cc'), ('Knock_Peak', 'Knock Peak', '#d90429'),
+              ('Lambda_Avg', 'Lambda Avg', '#7c3aed')]
+    panels = [p for p in panels if p[0] is not None and p[0] in frame.columns]
+    if not panels:
+        return
+    
+    fig = make_subplots(rows=len(panels), cols=1, shared_xaxes=True, vertical_spacing=0.05)
+    x0 = frame.index[0]
+    for row, (col, name, color) in enumerate(panels, start=1):
+        idx, y = decimate(frame[col], max_points=MAX_POINTS)
+        fig.add_trace(go.Scattergl(x=idx + x0, y=y, name=name, line=dict(color=color, width=1)), row=row, col=1)
+    
+    starts, ends = mask_intervals(frame['WOT'].to_numpy() > 0, min_gap=len(frame) // MAX_POINTS)
+    fig.update_layout(
+        shapes=[dict(type='rect', xref='x', yref='paper', x0=a + x0, x1=b + x0 - 1, y0=0, y1=1,
+                     fillcolor='red', opacity=0.08, line_width=0, layer='below')
+                for a, b in zip(starts.tolist(), ends.tolist())],
+        height=150 + 200 * len(panels), template="plotly_white", showlegend=True,
+        margin=dict(t=20, b=20), uirevision='live'
+    )
+    st.plotly_chart(fig, use_container_width=True, key='live_chart')
+
+LIVE_PANELS = {
+    'modes': lambda results, _: render_operating_modes(results['modes'], None),
+    'fuel': lambda results, thresholds: render_fuel_analysis(results['fuel'], thresholds),
+    'ignition': lambda results, thresholds: render_ignition_analysis(results['ignition'], thresholds),
+    'thermal': lambda results, _: render_thermal_analysis(results['thermal']),
+    'electrical': lambda results, _: render_electrical_health(results['electrical']),
+    'risk': lambda results, _: render_predictive_risk(results['risk']),
+    'kpi': lambda results, thresholds: render_live_kpis(results, thresholds),
+}
+
+@st.fragment(run_every=LIVE_REFRESH_S)
+def render_live_panels(session, placeholders, thresholds):
+    """Tick live: procesează rândurile noi și redesenează doar panourile modificate"""
+    changed = session.tick()
+    results = session.results
+    if not results:
+        st.info("⏳ Waiting for data...")
+        return
+    
+    tb = results['timebase']
+    st.caption(f"🟢 {results['rows']:,} samples | {tb['sample_rate_hz']:.1f} Hz | "
+               f"tick {session.last_tick_s * 1000:.0f} ms | refresh {LIVE_REFRESH_S * 1000:.0f} ms")
+    
+    # Placeholder-ele sunt create la rularea completă; fragmentul le rescrie doar pe cele schimbate
+    drawn = st.session_state.setdefault('live_drawn', set())
+    for panel, render in LIVE_PANELS.items():
+        if panel in changed or panel not in drawn:
+            with placeholders[panel].container():
+                render(results, thresholds)
+            drawn.add(panel)
+    
+    render_live_chart(session.frame(), results['channels'])
+
+def render_live_dashboard(spec, thresholds):
+    """Dashboard-ul live pentru o sursă în creștere (fișier sau tcp://host:port)"""
+    st.markdown("## 📡 Live Telemetry")
+    try:
+        session = get_live_session(spec)
+    except OSError as e:
+        st.error(f"❌ Cannot open live source: {e}")
+        return
+    
+    # Sliderele de praguri: verdictele se recalculează din agregatele sesiunii
+    session.set_thresholds(thresholds)
+    live_body = st.container()
+    placeholders = {panel: st.empty() for panel in ('kpi', 'risk', 'modes', 'fuel', 'ignition', 'thermal', 'electrical')}
+    st.session_state['live_drawn'] = set()
+    with live_body:
+        render_live_panels(session, placeholders, thresholds)
+
+# ======================================================
+# MAIN APPLICATION
+# ======================================================
+def main():
+    """Aplicația principală"""
+    
+    # Header
+    st.markdown('''
+    <div class="header-box">
+        <h1>🏁 LZTUNED ARCHITECT PRO</h1>
+        <p>ADVANCED ECU INTERPRETATION ENGINE // PRODUCTION v1.0</p>
+    </div>
+    ''', unsafe_allow_html=True)
+    
+    # Sidebar
+    with st.sidebar:
+        st.markdown("## ⚙️ Analysis Settings")
+        
+        st.markdown("### 🎯 Detection Thresholds")
+        knock_threshold = st.slider("Knock Limit (V)", 0.5, 2.0, 1.2, 0.1)
+        duty_threshold = st.slider("Injector Duty Limit (%)", 70, 95, 85, 5)
+        lambda_max_wot = st.slider("Lambda Max WOT", 0.75, 0.95, 0.86, 0.01)
+        thresholds = threshold_profile({
+            'knock_event': knock_threshold,
+            'duty_warning': duty_threshold,
+            'lambda_lean': lambda_max_wot,
+        })
+        
+        st.markdown("### 📊 Display Options")
+        show_engineer_mode = st.checkbox("Engineer Mode", value=False)
+        show_anomalies = st.checkbox("Show Anomalies", value=True)
+        show_correlations = st.checkbox("Show Correlations", value=True)
+        
+        st.markdown("### 📡 Live Telemetry")
+        live_mode = st.toggle("Live mode", value=False)
+        live_source = st.text_input(
+            "Live source",
+            placeholder="/path/to/logger.csv or tcp://host:port",
+            help="Fișierul în care scrie loggerul (tail) sau un stream CSV pe TCP"
+        )
+        
+        st.markdown("---")
+        st.markdown("""
+        **About LZTuned Architect**
+        
+        Professional ECU log interpretation engine designed for:
+        - Motorsport teams
+        - Professional tuners
+        - Advanced enthusiasts
+        
+        Supports: Benzină, E85, Diesel, NA, Turbo, Twin-Turbo, OEM & Standalone ECUs
+        """)
+    
+    if live_mode and live_source:
+        render_live_dashboard(live_source, thresholds)
+        return
+    
+    # File Upload
+    st.markdown("## 📂 Load ECU Log File")
+    uploaded_file = st.file_uploader(
+        "Upload CSV log (separator: `;`, `,` or tab) or MegaLogViewer binary log (`.mlg`), "
+        "plain or compressed (`.gz`, `.zip`, `.zst`)",
+        type=['csv', 'mlg', 'gz', 'zip', 'zst'],
+        help="Supported: MegaSquirt, ECUMASTER, Haltech, Link, AEM, OEM logs. "
+             "A zip with several logs is analyzed as a batch."
+    )
+    
+    if uploaded_file is not None:
+        # Opțiunile de afișare nu intră în cheia de cache: anomaliile și
+        # corelațiile se calculează mereu și doar se ascund la randare
+        options = {'store_dir': os.environ.get('LZTUNED_STORE_DIR'),
+                   'profile_dir': os.environ.get('LZTUNED_PROFILE_DIR'),
+                   'compact': True}
+        
+        # Progress indicator
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        
+        try:
+            def on_progress(pct, message):
+                status_text.text(message)
+                progress_bar.progress(pct)
+            
+            # Arhivă cu mai multe loguri: rezumat batch, apoi analiza detaliată a logului ales
+            members = archive_members(uploaded_file)
+            if len(members) > 1:
+                uploaded_file = render_archive_batch(members, options, thresholds)
+            
+            results = analyze_log(
+                uploaded_file,
+                options,
+                progress=on_progress,
+                cache=get_result_cache()
+            )
+            # Sliderele nu reanalizează logul: verdictele și riscul se recalculează din trăsături
+            results = rescore(results, thresholds)
+            
+            df = results['df']
+            signals = results['signals']
+            detected_channels = results['channels']
+            detection_report = results['detection_report']
+            modes = results['modes']
+            fuel_results = results['fuel']
+            ign_results = results['ignition']
+            thermal_results = results['thermal']
+            elec_results = results['electrical']
+            anomalies = results['anomalies'] if show_anomalies else []
+            correlations = results['correlations'] if show_correlations else {}
+            correlation_matrix = results['correlation_matrix'] if show_correlations else None
+            lags = results['lags'] if show_correlations else {}
+            all_results = results['all_results']
+            risk_assessment = results['risk']
+            
+            # Clear progress
+            status_text.empty()
+            progress_bar.empty()
+            
+            # Success message
+            st.success(f"✅ Analysis complete! Processed {len(df)} samples with {detection_report['coverage']:.0f}% channel coverage.")
+            
+            # ============================================
+            # RENDER ALL SECTIONS
+            # ============================================
+            
+            # 1. Detection Report
+            render_detection_report(
+                detection_report, 
+                detected_channels, 
+                results['missing'], 
+                results['noisy'],
+                results['confidence'],
+                results.get('timebase'),
+                results.get('channel_stats')
+            )
+            
+            # 2. Operating Modes
+            render_operating_modes(results['mode_summary'], modes)
+            
+            # 3. KPI Summary
+            st.markdown("<h2 class='section-title'>🎯 Key Performance Indicators</h2>", unsafe_allow_html=True)
+            kpi_cols = st.columns(5)
+            
+            channel_stats = results['channel_stats']
+            if 'rpm' in detected_channels and channel_stats['rpm']['max'] is not None:
+                kpi_cols[0].metric("Peak RPM", f"{int(channel_stats['rpm']['max'])}")
+            
+            if 'Knock_Peak' in signals:
+                max_knock = signals['Knock_Peak'].max()
+                kpi_cols[1].metric(
+                    "Peak Knock", 
+                    f"{max_knock:.2f}V",
+                    delta="CRITICAL" if max_knock > thresholds['knock_event'] else "SAFE",
+                    delta_color="inverse"
+                )
+            
+            if 'Inj_Duty' in signals:
+                kpi_cols[2].metric("Max Duty", f"{signals['Inj_Duty'].max():.1f}%")
+            
+            # Minimul pe feliile intervalelor WOT, fără gather după mască
+            wot = results['mode_intervals']['WOT']
+            if 'Lambda_Avg' in signals and len(wot):
+                min_lambda = np.nanmin(SegmentStats.from_slices(signals['Lambda_Avg'], wot.starts, wot.ends).min)
+                kpi_cols[3].metric("Min Lambda WOT", f"{min_lambda:.2f}")
+            
+            if 'oil_temp' in detected_channels and channel_stats['oil_temp']['max'] is not None:
+                kpi_cols[4].metric("Max Oil Temp", f"{channel_stats['oil_temp']['max']:.0f}°C")
+            
+            # 4. Fuel Analysis
+            render_fuel_analysis(fuel_results, thresholds)
+            
+            # 5. Ignition Analysis
+            render_ignition_analysis(ign_results, thresholds)
+            
+            # 6. Thermal Analysis
+            render_thermal_analysis(thermal_results)
+            
+            # 7. Electrical Health
+            render_electrical_health(elec_results)
+            
+            # 8. Risk Assessment
+            render_predictive_risk(risk_assessment)
+            
+            # 9. Anomalies
+            if anomalies:
+                render_anomalies(anomalies, results.get('anomaly_table'))
+            
+            # 10. Correlations
+            if correlations or correlation_matrix or lags:
+                render_correlations(correlations, correlation_matrix, lags)
+            
+            # 11. RPM × Load Maps
+            render_cell_maps(results.get('cell_maps'))
+            
+            # 12. WOT Pulls
+            render_wot_pulls(results.get('pulls'))
+            
+            # 13. Advanced Charts
+            render_advanced_charts(df, detected_channels, modes, signals, thresholds, results['windows'], elec_results)
+            
+            # 14. Engineer Mode
+            # Analiza citește doar canalele detectate; tabelul complet se
+            # încarcă la cerere, doar pentru Engineer Mode
+            if show_engineer_mode:
+                full_df = load_full_table(uploaded_file, results, cache=get_result_cache())
+                render_engineer_mode(full_df, all_results, signals, results.get('profile'), results.get('memory'))
+            
+            # Footer
+            st.markdown("---")
+            st.markdown("""
+            <div style="text-align:center; color:#6c757d; font-size:12px; padding:20px;">
+                <b>LZTuned Architect Pro v1.0</b> - Professional ECU Interpretation Engine<br>
+                Built for motorsport teams, professional tuners & advanced enthusiasts<br>
+                © 2024 - All analysis recommendations are for reference only. Always verify on dyno or controlled environment.
+            </div>
+            """, unsafe_allow_html=True)
+            
+        except Exception as e:
+            st.error(f"❌ Error processing file: {str(e)}")
+            st.exception(e)
+    
+    else:
+        # Landing state
+        st.info("""
+        ### 🚀 Bine ai venit la LZTuned Architect Pro!
+        
+        Acest tool analizează **orice tip de log ECU** și oferă:
+        
+        ✅ **Channel Detection** automat - recunoaște coloanele indiferent de format  
+        ✅ **Operating Mode Detection** - Idle, Cruise, WOT, Heat Soak, etc.  
+        ✅ **Advanced Fuel Analysis** - Lambda, Duty, Fuel Trim, Linearity  
+        ✅ **Ignition Analysis** - Knock clustering, Timing stability, Root cause  
+        ✅ **Thermal Stress** - Oil, Coolant, EGT cu sustained monitoring  
+        ✅ **Electrical Health** - Voltage stability, Sensor dropout detection  
+        ✅ **Anomaly Detection** - Spike-uri, pattern-uri rare  
+        ✅ **Correlation Engine** - Relații între parametri  
+        ✅ **Predictive Risk** - Score de risc agregat  
+        
+        **Upload un fișier CSV pentru a începe analiza.**
+        """)
+
+if __name__ == "__main__":
+    main()
+